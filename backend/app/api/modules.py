@@ -0,0 +1,67 @@
+"""Модули API: роутер, префикс и теги каждого раздела.
+
+Приложение подключает только включенные модули (настройка ENABLED_MODULES), и роутер
+модуля импортируется лишь при подключении — выключенные разделы не загружают свои
+схемы и сервисы. Модели регистрируются все: связи между ними задаются по имени класса.
+"""
+from importlib import import_module
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import FastAPI
+
+API_V1 = "/api/v1"
+
+# Имя модуля → (модуль роутера, префикс, теги)
+MODULES: Dict[str, Tuple[str, str, List[str]]] = {
+    "projects": ("app.api.v1.projects", "/projects", ["Проекты"]),
+    "project_stages": ("app.api.v1.project_stages", "/project-stages", ["Этапы проекта"]),
+    "executive_docs": ("app.api.v1.executive_docs", "/executive-docs", ["Исполнительная документация"]),
+    "ks2": ("app.api.v1.ks2", "/ks2", ["КС-2"]),
+    "ks3": ("app.api.v1.ks3", "/ks3", ["КС-3"]),
+    "gpr": ("app.api.v1.gpr", "/gpr", ["ГПР"]),
+    "ppr": ("app.api.v1.ppr", "/ppr", ["ППР"]),
+    "applications": ("app.api.v1.applications", "/applications", ["Заявки"]),
+    "contracts": ("app.api.v1.contracts", "/contracts", ["Договора"]),
+    "tenders": ("app.api.v1.tenders", "/tenders", ["Тендеры"]),
+    "estimates": ("app.api.v1.estimates", "/estimates", ["Сметы"]),
+    "invoices": ("app.api.v1.invoices", "/invoices", ["Счета на оплату"]),
+    "departments": ("app.api.v1.departments", "/departments", ["Подразделения"]),
+    "object_constructs": ("app.api.v1.object_constructs", "/object-constructs", ["Конструктивы"]),
+    "standard_rates": ("app.api.v1.standard_rates", "/standard-rates", ["Нормативные расценки"]),
+    "project_documentation": ("app.api.v1.project_documentation", "/project-documentation", ["Проектная документация"]),
+    "executive_surveys": ("app.api.v1.executive_surveys", "/executive-surveys", ["Исполнительные съемки"]),
+    "work_volumes": ("app.api.v1.work_volumes", "/work-volumes", ["Учет объемов работ"]),
+    "project_changes": ("app.api.v1.project_changes", "/project-changes", ["Изменения проекта"]),
+    "materials": ("app.api.v1.materials", "/materials", ["Материалы и склады"]),
+    "application_workflow": ("app.api.v1.application_workflow", "/workflow", ["Workflow заявок"]),
+    "document_versions": ("app.api.v1.document_versions", "/document-versions", ["Версии документов"]),
+    "integration_1c": ("app.api.v1.integration_1c", "/integration/1c", ["Интеграция с 1С"]),
+    "estimate_validation": ("app.api.v1.estimate_validation", "/validation", ["Проверка смет"]),
+    "users": ("app.api.v1.users", "", ["Пользователи и роли"]),
+    "references": ("app.api.v1.references", "", ["Справочники"]),
+    "receivables": ("app.api.v1.receivables", "/receivables", ["Дебиторская задолженность"]),
+    "sales": ("app.api.v1.sales", "/sales", ["Отдел продаж"]),
+    "document_roadmap": ("app.api.v1.document_roadmap", "/document-roadmap", ["Дорожная карта документов"]),
+    "personnel": ("app.api.v1.personnel", "/personnel", ["Кадры"]),
+    "lab_tests": ("app.api.v1.lab_tests", "/lab-tests", ["Лабораторные испытания"]),
+    "calendar": ("app.api.v1.calendar", "/calendar", ["Производственный календарь"]),
+}
+
+
+def resolve_modules(value: str) -> List[str]:
+    """Список модулей из настройки: «*» — все, иначе имена через запятую (ValueError при неизвестном)."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if not names or "*" in names:
+        return list(MODULES)
+    unknown = [name for name in names if name not in MODULES]
+    if unknown:
+        raise ValueError(f"Неизвестные модули API: {', '.join(unknown)}. Доступны: {', '.join(MODULES)}")
+    return list(dict.fromkeys(names))
+
+
+def include_modules(app: FastAPI, names: Iterable[str]):
+    """Импортировать роутеры модулей и подключить их к приложению."""
+    for name in names:
+        module_path, prefix, tags = MODULES[name]
+        router = import_module(module_path).router
+        app.include_router(router, prefix=API_V1 + prefix, tags=tags)
@@ -0,0 +1,167 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import extract
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import date, datetime
+
+from app.db.database import get_db
+from app.models.calendar import Holiday as HolidayModel, ProjectCalendarException as ProjectCalendarExceptionModel
+from app.models.project import Project as ProjectModel
+from app.services.work_calendar import MAX_WORKING_DAYS, get_calendar, national_holidays
+
+router = APIRouter()
+
+
+class HolidayBase(BaseModel):
+    date: date
+    name: Optional[str] = None
+    is_working: bool = False
+
+
+class HolidayCreate(HolidayBase):
+    pass
+
+
+class Holiday(HolidayBase):
+    id: int
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CalendarExceptionBase(BaseModel):
+    date: date
+    is_working: bool = False
+    reason: Optional[str] = None
+
+
+class CalendarExceptionCreate(CalendarExceptionBase):
+    pass
+
+
+class CalendarException(CalendarExceptionBase):
+    id: int
+    project_id: int
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+@router.get("/holidays", response_model=List[Holiday])
+def get_holidays(year: Optional[int] = None, db: Session = Depends(get_db)):
+    """Получить праздники и переносы производственного календаря"""
+    query = db.query(HolidayModel)
+    if year:
+        query = query.filter(extract("year", HolidayModel.date) == year)
+    return query.order_by(HolidayModel.date).all()
+
+
+@router.post("/holidays", response_model=Holiday)
+def create_holiday(holiday: HolidayCreate, db: Session = Depends(get_db)):
+    """Добавить праздник или перенос выходного"""
+    if db.query(HolidayModel).filter(HolidayModel.date == holiday.date).first():
+        raise HTTPException(status_code=400, detail="Дата уже есть в производственном календаре")
+    db_holiday = HolidayModel(**holiday.model_dump())
+    db.add(db_holiday)
+    db.commit()
+    db.refresh(db_holiday)
+    return db_holiday
+
+
+@router.post("/holidays/national")
+def fill_national_holidays(year: int, db: Session = Depends(get_db)):
+    """Заполнить нерабочие праздничные дни года из настройки NATIONAL_HOLIDAYS
+    (уже внесенные даты не меняются)"""
+    existing = {
+        d for (d,) in db.query(HolidayModel.date).filter(extract("year", HolidayModel.date) == year)
+    }
+    created = 0
+    for month, day, name in national_holidays():
+        try:
+            holiday_date = date(year, month, day)
+        except ValueError:  # 29 февраля в невисокосном году
+            continue
+        if holiday_date not in existing:
+            db.add(HolidayModel(date=holiday_date, name=name, is_working=False))
+            created += 1
+    db.commit()
+    return {"year": year, "created": created}
+
+
+@router.delete("/holidays/{holiday_id}")
+def delete_holiday(holiday_id: int, db: Session = Depends(get_db)):
+    """Удалить запись производственного календаря"""
+    holiday = db.query(HolidayModel).filter(HolidayModel.id == holiday_id).first()
+    if not holiday:
+        raise HTTPException(status_code=404, detail="Запись календаря не найдена")
+    db.delete(holiday)
+    db.commit()
+    return {"message": "Запись календаря удалена"}
+
+
+@router.get("/projects/{project_id}/exceptions", response_model=List[CalendarException])
+def get_project_exceptions(project_id: int, db: Session = Depends(get_db)):
+    """Получить исключения календаря объекта"""
+    return (
+        db.query(ProjectCalendarExceptionModel)
+        .filter(ProjectCalendarExceptionModel.project_id == project_id)
+        .order_by(ProjectCalendarExceptionModel.date)
+        .all()
+    )
+
+
+@router.post("/projects/{project_id}/exceptions", response_model=CalendarException)
+def create_project_exception(project_id: int, exception: CalendarExceptionCreate, db: Session = Depends(get_db)):
+    """Добавить исключение календаря объекта (остановка площадки или работа в выходной)"""
+    if not db.query(ProjectModel.id).filter(ProjectModel.id == project_id).first():
+        raise HTTPException(status_code=404, detail="Проект не найден")
+    if db.query(ProjectCalendarExceptionModel).filter(
+        ProjectCalendarExceptionModel.project_id == project_id,
+        ProjectCalendarExceptionModel.date == exception.date,
+    ).first():
+        raise HTTPException(status_code=400, detail="Исключение на эту дату уже есть")
+    db_exception = ProjectCalendarExceptionModel(project_id=project_id, **exception.model_dump())
+    db.add(db_exception)
+    db.commit()
+    db.refresh(db_exception)
+    return db_exception
+
+
+@router.delete("/projects/{project_id}/exceptions/{exception_id}")
+def delete_project_exception(project_id: int, exception_id: int, db: Session = Depends(get_db)):
+    """Удалить исключение календаря объекта"""
+    exception = db.query(ProjectCalendarExceptionModel).filter(
+        ProjectCalendarExceptionModel.id == exception_id,
+        ProjectCalendarExceptionModel.project_id == project_id,
+    ).first()
+    if not exception:
+        raise HTTPException(status_code=404, detail="Исключение календаря не найдено")
+    db.delete(exception)
+    db.commit()
+    return {"message": "Исключение календаря удалено"}
+
+
+@router.get("/working-days")
+def count_working_days(start: date, end: date, project_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Число рабочих дней в интервале [start, end] по календарю объекта"""
+    if end < start:
+        raise HTTPException(status_code=400, detail="Дата окончания раньше даты начала")
+    return {"start": start, "end": end, "working_days": get_calendar(db, project_id).working_days_between(start, end)}
+
+
+@router.get("/add-working-days")
+def add_working_days(
+    start: date,
+    days: int = Query(..., ge=1, le=MAX_WORKING_DAYS, description="Длительность в рабочих днях"),
+    project_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """Дата окончания работы длительностью days рабочих дней с началом в start"""
+    try:
+        end = get_calendar(db, project_id).add_working_days(start, days)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"start": start, "days": days, "end": end}
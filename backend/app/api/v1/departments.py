@@ -1,33 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.db.database import get_db, engine
+from app.db.database import get_db
 from app.models.department import Department as DepartmentModel
+from app.services.department_tree import get_descendant_ids
 from pydantic import BaseModel
 from datetime import datetime
 
 router = APIRouter()
 
 
-def _ensure_parent_id_column():
-    """Добавить колонку parent_id в departments, если её нет (миграция для существующих БД)."""
-    try:
-        with engine.connect() as conn:
-            r = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='departments'"))
-            if r.fetchone():
-                r2 = conn.execute(text("PRAGMA table_info(departments)"))
-                cols = [row[1] for row in r2.fetchall()]
-                if "parent_id" not in cols:
-                    conn.execute(text("ALTER TABLE departments ADD COLUMN parent_id INTEGER REFERENCES departments(id)"))
-                    conn.commit()
-    except Exception:
-        pass
-
-
-_ensure_parent_id_column()
-
-
 class DepartmentBase(BaseModel):
     parent_id: Optional[int] = None
     code: str
@@ -72,16 +54,6 @@ class Department(DepartmentBase):
         from_attributes = True
 
 
-def _get_descendant_ids(db: Session, department_id: int) -> set:
-    """Рекурсивно получить id всех потомков подразделения (защита от циклов)."""
-    result = set()
-    children = db.query(DepartmentModel.id).filter(DepartmentModel.parent_id == department_id).all()
-    for (cid,) in children:
-        result.add(cid)
-        result.update(_get_descendant_ids(db, cid))
-    return result
-
-
 @router.get("/", response_model=List[Department])
 def get_departments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Получить список подразделений (с parent для построения дерева)"""
@@ -125,7 +97,7 @@ def update_department(department_id: int, department: DepartmentUpdate, db: Sess
         if new_parent_id is not None:
             if new_parent_id == department_id:
                 raise HTTPException(status_code=400, detail="Подразделение не может быть родителем самого себя")
-            descendants = _get_descendant_ids(db, department_id)
+            descendants = get_descendant_ids(db, department_id)
             if new_parent_id in descendants:
                 raise HTTPException(status_code=400, detail="Родителем не может быть дочернее подразделение (цикл)")
             parent = db.query(DepartmentModel).filter(DepartmentModel.id == new_parent_id).first()
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, select
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -8,7 +10,7 @@ from urllib.parse import quote
 import json
 import os
 import shutil
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db, get_write_db
 from app.models.document_roadmap import (
     DocumentRoadmapSection as SectionModel,
     DocumentSectionStatus as StatusModel,
@@ -27,16 +29,14 @@ from app.models.project import Project
 from app.models.project_documentation import ProjectDocumentation as ProjectDocumentationModel
 from app.models.executive_survey import ExecutiveSurvey as ExecutiveSurveyModel
 from app.models.executive_doc import ExecutiveDocument as ExecutiveDocumentModel
+from app.services.reference_cache import reference_cache
 from pydantic import BaseModel
 
 router = APIRouter()
 
-# Настройки для хранения файлов
+# Настройки для хранения файлов (каталоги создаются при первой записи)
 UPLOAD_DIR = Path("uploads/documents")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
 NPA_UPLOAD_DIR = Path("uploads/npa")
-NPA_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
 # Pydantic схемы
@@ -357,10 +357,12 @@ def _sync_status_from_sources(project_id: int, status: StatusModel, section_code
 
 # Endpoints для секций дорожной карты
 @router.get("/sections/", response_model=List[Section])
-def get_sections(db: Session = Depends(get_db)):
+def get_sections(request: Request, db: Session = Depends(get_db)):
     """Получить все секции дорожной карты"""
-    sections = db.query(SectionModel).filter(SectionModel.is_active == True).order_by(SectionModel.order_number).all()
-    return sections
+    return reference_cache.response(
+        request, db, "roadmap_sections", List[Section],
+        lambda: db.query(SectionModel).filter(SectionModel.is_active == True).order_by(SectionModel.order_number).all(),
+    )
 
 
 @router.get("/sections/{section_code}", response_model=Section)
@@ -373,24 +375,24 @@ def get_section(section_code: str, db: Session = Depends(get_db)):
 
 
 @router.get("/all-files", response_model=List[RoadmapFileRow])
-def get_all_roadmap_files(
+async def get_all_roadmap_files(
     project_id: Optional[int] = None,
     section_code: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Список всех файлов, загруженных в блоки дорожной карты (для раздела «Разрешительные документы»)."""
-    query = (
-        db.query(FileModel, StatusModel, SectionModel, Project)
+    stmt = (
+        select(FileModel, StatusModel, SectionModel, Project)
         .join(StatusModel, FileModel.status_id == StatusModel.id)
         .join(SectionModel, StatusModel.section_id == SectionModel.id)
         .join(Project, StatusModel.project_id == Project.id)
-        .filter(FileModel.is_active == True)
+        .where(FileModel.is_active == True)
     )
     if project_id is not None:
-        query = query.filter(StatusModel.project_id == project_id)
+        stmt = stmt.where(StatusModel.project_id == project_id)
     if section_code is not None:
-        query = query.filter(StatusModel.section_code == section_code)
-    rows = query.order_by(FileModel.uploaded_at.desc()).all()
+        stmt = stmt.where(StatusModel.section_code == section_code)
+    rows = (await db.execute(stmt.order_by(FileModel.uploaded_at.desc()))).all()
 
     return [
         RoadmapFileRow(
@@ -449,7 +451,7 @@ async def create_npa(
     date_value: Optional[str] = Form(None, alias="date"),
     section_codes: str = Form("[]"),
     file: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Создать НПА и привязать его к блокам дорожной карты."""
     try:
@@ -468,9 +470,9 @@ async def create_npa(
     file_name: Optional[str] = None
     if file:
         safe_name = quote(file.filename)
+        NPA_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
         dest = NPA_UPLOAD_DIR / safe_name
-        with dest.open("wb") as f:
-            f.write(await file.read())
+        await run_in_threadpool(dest.write_bytes, await file.read())
         stored_path = str(dest)
         file_name = file.filename
 
@@ -483,14 +485,11 @@ async def create_npa(
         file_name=file_name,
     )
     db.add(npa)
-    db.flush()
+    await db.flush()
 
+    sections = []
     if codes:
-        sections = (
-            db.query(SectionModel)
-            .filter(SectionModel.code.in_(codes))
-            .all()
-        )
+        sections = (await db.scalars(select(SectionModel).where(SectionModel.code.in_(codes)))).all()
         for section in sections:
             db.add(
                 NPASection(
@@ -500,10 +499,10 @@ async def create_npa(
                 )
             )
 
-    db.commit()
-    db.refresh(npa)
+    await db.commit()
+    await db.refresh(npa, ["created_at", "updated_at"])
 
-    actual_codes = [rel.section_code for rel in npa.sections]
+    actual_codes = [section.code for section in sections]
     return NPAOut(
         id=npa.id,
         title=npa.title,
@@ -636,7 +635,7 @@ def delete_npa(npa_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/projects/{project_id}/init-statuses", response_model=List[Status])
-def init_project_statuses(project_id: int, db: Session = Depends(get_db)):
+def init_project_statuses(project_id: int, db: Session = Depends(get_write_db)):
     """
     Массовая инициализация блоков дорожной карты для объекта (проекта).
     Создаёт статусы для всех секций, где их ещё нет, и подтягивает данные из разделов:
@@ -694,17 +693,27 @@ def init_project_statuses(project_id: int, db: Session = Depends(get_db)):
 
 
 # Endpoints для статусов
+def _active_files_count(status_ids):
+    """Количество активных файлов по статусам: {status_id: count} одним запросом."""
+    return (
+        select(FileModel.status_id, func.count(FileModel.id))
+        .where(FileModel.status_id.in_(status_ids), FileModel.is_active == True)
+        .group_by(FileModel.status_id)
+    )
+
+
 @router.get("/statuses/", response_model=List[Status])
-def get_statuses(project_id: Optional[int] = None, section_code: Optional[str] = None, db: Session = Depends(get_db)):
+async def get_statuses(project_id: Optional[int] = None, section_code: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """Получить статусы узлов дорожной карты"""
-    query = db.query(StatusModel)
+    stmt = select(StatusModel)
     
     if project_id:
-        query = query.filter(StatusModel.project_id == project_id)
+        stmt = stmt.where(StatusModel.project_id == project_id)
     if section_code:
-        query = query.filter(StatusModel.section_code == section_code)
+        stmt = stmt.where(StatusModel.section_code == section_code)
     
-    statuses = query.all()
+    statuses = (await db.scalars(stmt)).all()
+    files_counts = dict((await db.execute(_active_files_count([s.id for s in statuses]))).all()) if statuses else {}
     
     # Рассчитываем статусы документов и добавляем количество файлов
     result = []
@@ -715,14 +724,9 @@ def get_statuses(project_id: Optional[int] = None, section_code: Optional[str] =
             status.document_status = doc_status.value
             status.document_status_calculated_at = datetime.now()
         
-        # Подсчитываем файлы
-        files_count = db.query(FileModel).filter(
-            and_(FileModel.status_id == status.id, FileModel.is_active == True)
-        ).count()
-        
         status_dict = {
             **{c.name: getattr(status, c.name) for c in status.__table__.columns},
-            "files_count": files_count
+            "files_count": files_counts.get(status.id, 0)
         }
         if status.document_status:
             status_dict["document_status"] = status.document_status
@@ -733,9 +737,9 @@ def get_statuses(project_id: Optional[int] = None, section_code: Optional[str] =
 
 
 @router.get("/statuses/{status_id}", response_model=Status)
-def get_status(status_id: int, db: Session = Depends(get_db)):
+async def get_status(status_id: int, db: AsyncSession = Depends(get_async_db)):
     """Получить статус по ID"""
-    status = db.query(StatusModel).filter(StatusModel.id == status_id).first()
+    status = await db.get(StatusModel, status_id)
     if not status:
         raise HTTPException(status_code=404, detail="Статус не найден")
     
@@ -744,9 +748,7 @@ def get_status(status_id: int, db: Session = Depends(get_db)):
         status.document_status = doc_status.value
         status.document_status_calculated_at = datetime.now()
     
-    files_count = db.query(FileModel).filter(
-        and_(FileModel.status_id == status.id, FileModel.is_active == True)
-    ).count()
+    files_count = dict((await db.execute(_active_files_count([status.id]))).all()).get(status.id, 0)
     
     status_dict = {
         **{c.name: getattr(status, c.name) for c in status.__table__.columns},
@@ -759,7 +761,7 @@ def get_status(status_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/statuses/", response_model=Status)
-def create_status(status: StatusCreate, db: Session = Depends(get_db)):
+def create_status(status: StatusCreate, db: Session = Depends(get_write_db)):
     """Создать статус узла дорожной карты"""
     # Проверяем существование проекта
     project = db.query(Project).filter(Project.id == status.project_id).first()
@@ -823,7 +825,7 @@ def create_status(status: StatusCreate, db: Session = Depends(get_db)):
 
 
 @router.put("/statuses/{status_id}", response_model=Status)
-def update_status(status_id: int, status_update: StatusUpdate, db: Session = Depends(get_db)):
+def update_status(status_id: int, status_update: StatusUpdate, db: Session = Depends(get_write_db)):
     """Обновить статус узла дорожной карты"""
     db_status = db.query(StatusModel).filter(StatusModel.id == status_id).first()
     if not db_status:
@@ -887,7 +889,7 @@ def update_status(status_id: int, status_update: StatusUpdate, db: Session = Dep
 
 
 @router.delete("/statuses/{status_id}")
-def delete_status(status_id: int, db: Session = Depends(get_db)):
+def delete_status(status_id: int, db: Session = Depends(get_write_db)):
     """Удалить статус узла дорожной карты"""
     status = db.query(StatusModel).filter(StatusModel.id == status_id).first()
     if not status:
@@ -904,10 +906,10 @@ async def upload_file(
     status_id: int,
     file: UploadFile = File(...),
     description: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Загрузить файл к статусу узла дорожной карты"""
-    status = db.query(StatusModel).filter(StatusModel.id == status_id).first()
+    status = await db.get(StatusModel, status_id)
     if not status:
         raise HTTPException(status_code=404, detail="Статус не найден")
     
@@ -918,12 +920,15 @@ async def upload_file(
     # Сохраняем файл
     file_ext = Path(file.filename).suffix
     unique_filename = f"{status_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{file_ext}"
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     file_path = UPLOAD_DIR / unique_filename
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    def _save():
+        with open(file_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+        return file_path.stat().st_size
     
-    file_size = file_path.stat().st_size
+    file_size = await run_in_threadpool(_save)
     
     # Создаем запись в БД
     db_file = FileModel(
@@ -935,22 +940,24 @@ async def upload_file(
         description=description
     )
     db.add(db_file)
-    db.commit()
-    db.refresh(db_file)
+    await db.commit()
+    await db.refresh(db_file)
     
     return FileInfo(**{c.name: getattr(db_file, c.name) for c in db_file.__table__.columns})
 
 
 @router.get("/statuses/{status_id}/files", response_model=List[FileInfo])
-def get_files(status_id: int, db: Session = Depends(get_db)):
+async def get_files(status_id: int, db: AsyncSession = Depends(get_async_db)):
     """Получить список файлов статуса"""
-    status = db.query(StatusModel).filter(StatusModel.id == status_id).first()
+    status = await db.get(StatusModel, status_id)
     if not status:
         raise HTTPException(status_code=404, detail="Статус не найден")
     
-    files = db.query(FileModel).filter(
-        and_(FileModel.status_id == status_id, FileModel.is_active == True)
-    ).order_by(FileModel.uploaded_at.desc()).all()
+    files = (await db.scalars(
+        select(FileModel)
+        .where(FileModel.status_id == status_id, FileModel.is_active == True)
+        .order_by(FileModel.uploaded_at.desc())
+    )).all()
     
     return [FileInfo(**{c.name: getattr(f, c.name) for c in f.__table__.columns}) for f in files]
 
@@ -973,11 +980,11 @@ def delete_file(file_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/files/{file_id}/view")
-async def view_file(file_id: int, db: Session = Depends(get_db)):
+async def view_file(file_id: int, db: AsyncSession = Depends(get_async_db)):
     """Открыть файл для просмотра в браузере (Content-Disposition: inline, например PDF во вкладке)."""
     from fastapi.responses import FileResponse
     
-    file = db.query(FileModel).filter(FileModel.id == file_id).first()
+    file = await db.get(FileModel, file_id)
     if not file:
         raise HTTPException(status_code=404, detail="Файл не найден")
     
@@ -993,11 +1000,11 @@ async def view_file(file_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/files/{file_id}/download")
-async def download_file(file_id: int, db: Session = Depends(get_db)):
+async def download_file(file_id: int, db: AsyncSession = Depends(get_async_db)):
     """Скачать файл (Content-Disposition: attachment)."""
     from fastapi.responses import FileResponse
     
-    file = db.query(FileModel).filter(FileModel.id == file_id).first()
+    file = await db.get(FileModel, file_id)
     if not file:
         raise HTTPException(status_code=404, detail="Файл не найден")
     
@@ -4,7 +4,8 @@ from typing import List, Optional
 from decimal import Decimal
 from app.db.database import get_db
 from app.models.estimate import Estimate as EstimateModel, EstimateItem as EstimateItemModel, RelatedCost as RelatedCostModel
-from app.schemas.estimate import Estimate, EstimateCreate, EstimateUpdate
+from app.schemas.estimate import Estimate, EstimateCreate, EstimateUpdate, EstimateDiff
+from app.services.estimate_diff import diff_estimates
 from datetime import date, datetime
 
 router = APIRouter()
@@ -28,6 +29,19 @@ def get_estimate(estimate_id: int, db: Session = Depends(get_db)):
     return estimate
 
 
+@router.get("/{estimate_a_id}/diff/{estimate_b_id}", response_model=EstimateDiff)
+def get_estimate_diff(estimate_a_id: int, estimate_b_id: int, db: Session = Depends(get_db)):
+    """Сравнить две версии сметы: добавленные, удалённые и изменённые позиции (B относительно A)"""
+    found = {
+        row[0] for row in
+        db.query(EstimateModel.id).filter(EstimateModel.id.in_([estimate_a_id, estimate_b_id])).all()
+    }
+    for estimate_id in (estimate_a_id, estimate_b_id):
+        if estimate_id not in found:
+            raise HTTPException(status_code=404, detail=f"Смета {estimate_id} не найдена")
+    return diff_estimates(db, estimate_a_id, estimate_b_id)
+
+
 @router.post("/", response_model=Estimate)
 def create_estimate(estimate: EstimateCreate, db: Session = Depends(get_db)):
     """Создать новую смету (объектно-центрированный подход)"""
@@ -54,25 +54,18 @@ class ExecutiveDoc(ExecutiveDocBase):
 def get_executive_docs(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Получить список исполнительной документации"""
     try:
-        from sqlalchemy import text
-        
-        # Используем raw SQL для обхода проблем с Enum
-        sql = """
-            SELECT id, project_id, doc_type, name, number, date, description, 
-                   file_path, created_by, approved_by, status, department, ks2_id,
-                   created_at, updated_at
-            FROM executive_documents
-        """
-        params = {}
+        from sqlalchemy import select
         
+        m = ExecutiveDocument
+        stmt = select(
+            m.id, m.project_id, m.doc_type, m.name, m.number, m.date, m.description,
+            m.file_path, m.created_by, m.approved_by, m.status, m.department, m.ks2_id,
+            m.created_at, m.updated_at,
+        )
         if project_id:
-            sql += " WHERE project_id = :project_id"
-            params["project_id"] = project_id
-        
-        # SQLite требует использовать позиционные параметры для LIMIT/OFFSET
-        sql += f" LIMIT {limit} OFFSET {skip}"
+            stmt = stmt.where(m.project_id == project_id)
         
-        rows = db.execute(text(sql), params).fetchall()
+        rows = db.execute(stmt.order_by(m.id).offset(skip).limit(limit)).fetchall()
         
         if not rows:
             return []
@@ -56,26 +56,19 @@ class ExecutiveSurvey(ExecutiveSurveyBase):
 def get_surveys(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Получить список исполнительных съемок"""
     try:
-        from sqlalchemy import text
-        
-        # Используем raw SQL для обхода проблем с Enum
-        sql = """
-            SELECT id, project_id, survey_type, number, survey_date, surveyor,
-                   department, description, coordinates, file_path, drawing_path,
-                   status, notes, created_at, updated_at
-            FROM executive_surveys
-        """
-        params = {}
+        from sqlalchemy import String, select, type_coerce
         
+        # Колонки без ORM-объектов: тип съемки читается строкой, как хранится (без проверки Enum)
+        m = ExecutiveSurveyModel
+        stmt = select(
+            m.id, m.project_id, type_coerce(m.survey_type, String), m.number, m.survey_date, m.surveyor,
+            m.department, m.description, m.coordinates, m.file_path, m.drawing_path,
+            m.status, m.notes, m.created_at, m.updated_at,
+        )
         if project_id:
-            sql += " WHERE project_id = :project_id"
-            params["project_id"] = project_id
-        
-        sql += " LIMIT :limit OFFSET :skip"
-        params["limit"] = limit
-        params["skip"] = skip
+            stmt = stmt.where(m.project_id == project_id)
         
-        rows = db.execute(text(sql), params).fetchall()
+        rows = db.execute(stmt.order_by(m.id).offset(skip).limit(limit)).fetchall()
         
         if not rows:
             return []
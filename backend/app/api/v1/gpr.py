@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from app.db.database import get_db
 from app.models.gpr import GPR as GPRModel, GPRTask as GPRTaskModel
+from app.services.gpr_schedule import (
+    ScheduleCycleError, get_schedule, propagate_changes, schedule_cache, working_duration,
+)
+from app.services.resource_histogram import build_histogram
+from app.services.work_calendar import MAX_WORKING_DAYS, WorkCalendar, get_calendar
 from pydantic import BaseModel
 from datetime import date, datetime
 
@@ -22,7 +29,8 @@ class GPRTaskBase(BaseModel):
 
 
 class GPRTaskCreate(GPRTaskBase):
-    pass
+    # Без даты окончания она выводится из начала и длительности в рабочих днях
+    end_date: Optional[date] = None
 
 
 class GPRTask(GPRTaskBase):
@@ -51,9 +59,30 @@ class GPRBase(BaseModel):
 
 
 class GPRCreate(GPRBase):
+    # Без даты окончания берется окончание последней задачи
+    end_date: Optional[date] = None
     tasks: List[GPRTaskCreate] = []
 
 
+class GPRTaskUpdate(BaseModel):
+    name: Optional[str] = None
+    work_type: Optional[str] = None
+    responsible: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    planned_duration: Optional[int] = None
+    status: Optional[str] = None
+    dependencies: Optional[str] = None
+    notes: Optional[str] = None
+    actual_start_date: Optional[date] = None
+    actual_end_date: Optional[date] = None
+    progress: Optional[int] = None
+
+
+class GPRTaskUpdateItem(GPRTaskUpdate):
+    id: int
+
+
 class GPRUpdate(BaseModel):
     name: Optional[str] = None
     version: Optional[str] = None
@@ -63,6 +92,7 @@ class GPRUpdate(BaseModel):
     approved_by: Optional[str] = None
     status: Optional[str] = None
     description: Optional[str] = None
+    tasks: Optional[List[GPRTaskUpdateItem]] = None
 
 
 class GPR(GPRBase):
@@ -75,14 +105,173 @@ class GPR(GPRBase):
         from_attributes = True
 
 
+class AffectedTask(BaseModel):
+    id: int
+    name: str
+    previous_start_date: date
+    previous_end_date: date
+    start_date: date
+    end_date: date
+    shift_days: int
+
+
+class GPRTaskUpdateResult(BaseModel):
+    task: GPRTask
+    affected: List[AffectedTask] = []
+
+
+class GPRUpdateResult(GPR):
+    """ГПР после обновления и задачи, сдвинутые пересчетом последователей измененных задач"""
+    affected: List[AffectedTask] = []
+
+
+class CriticalPathTask(BaseModel):
+    id: int
+    name: str
+    duration: int
+    early_start: date
+    early_finish: date
+    late_start: date
+    late_finish: date
+    total_float: int
+    free_float: int
+    is_critical: bool
+
+
+class MissingDependency(BaseModel):
+    task_id: int
+    dependency_id: int
+
+
+class CriticalPath(BaseModel):
+    gpr_id: int
+    project_start: date
+    project_finish: date
+    duration_days: int
+    critical_path: List[int]
+    tasks: List[CriticalPathTask]
+    missing_dependencies: List[MissingDependency] = []
+
+
+class PersonnelLoad(BaseModel):
+    personnel_id: int
+    full_name: Optional[str] = None
+    position: Optional[str] = None
+    tasks_count: int
+    load: List[int]
+    peak: int
+    overloaded_days: List[int]
+    leveled_load: Optional[List[int]] = None
+    leveled_overloaded_days: Optional[List[int]] = None
+
+
+class LevelingProposal(BaseModel):
+    task_id: int
+    gpr_id: int
+    personnel_id: int
+    name: str
+    start_date: date
+    end_date: date
+    proposed_start_date: date
+    proposed_end_date: date
+    shift_days: int
+    slack_days: int
+
+
+class ResourceHistogram(BaseModel):
+    date_from: date
+    date_to: date
+    capacity: int
+    personnel: List[PersonnelLoad]
+    proposals: Optional[List[LevelingProposal]] = None
+
+
+# Колонки задач в формате columnar: имя в ответе → колонка модели.
+# Даты передаются смещением в днях от даты начала ГПР.
+COLUMNAR_FIELDS = {
+    "id": GPRTaskModel.id,
+    "name": GPRTaskModel.name,
+    "work_type": GPRTaskModel.work_type,
+    "responsible": GPRTaskModel.responsible,
+    "start": GPRTaskModel.start_date,
+    "end": GPRTaskModel.end_date,
+    "planned_duration": GPRTaskModel.planned_duration,
+    "actual_start": GPRTaskModel.actual_start_date,
+    "actual_end": GPRTaskModel.actual_end_date,
+    "progress": GPRTaskModel.progress,
+    "status": GPRTaskModel.status,
+    "dependencies": GPRTaskModel.dependencies,
+    "notes": GPRTaskModel.notes,
+}
+COLUMNAR_DATES = {"start", "end", "actual_start", "actual_end"}
+COLUMNAR_DEFAULTS = {"progress": 0, "status": "planned"}
+
+
+def _check_format(format: Optional[str]) -> bool:
+    """True для format=columnar; по умолчанию — обычный JSON."""
+    if format not in (None, "json", "columnar"):
+        raise HTTPException(status_code=400, detail="Формат должен быть json или columnar")
+    return format == "columnar"
+
+
+def _columnar_response(db: Session, gprs: List[GPRModel]) -> List[dict]:
+    """ГПР с задачами в виде параллельных массивов: задачи всех ГПР читаются одним запросом по колонкам."""
+    result = {}
+    origins = {}
+    for gpr in gprs:
+        origins[gpr.id] = gpr.start_date
+        result[gpr.id] = {
+            "id": gpr.id,
+            "project_id": gpr.project_id,
+            "name": gpr.name,
+            "version": gpr.version,
+            "start_date": gpr.start_date.isoformat(),
+            "end_date": gpr.end_date.isoformat(),
+            "created_by": gpr.created_by,
+            "approved_by": gpr.approved_by,
+            "status": gpr.status or "draft",
+            "description": gpr.description,
+            "created_at": gpr.created_at.isoformat() if gpr.created_at else None,
+            "updated_at": gpr.updated_at.isoformat() if gpr.updated_at else None,
+            "task_count": 0,
+            "tasks": {name: [] for name in COLUMNAR_FIELDS},
+        }
+    if not result:
+        return []
+
+    names = list(COLUMNAR_FIELDS)
+    rows = db.execute(
+        select(GPRTaskModel.gpr_id, *COLUMNAR_FIELDS.values())
+        .where(GPRTaskModel.gpr_id.in_(list(result)))
+        .order_by(GPRTaskModel.gpr_id, GPRTaskModel.start_date, GPRTaskModel.id)
+    )
+    for gpr_id, *values in rows:
+        item = result[gpr_id]
+        origin = origins[gpr_id]
+        columns = item["tasks"]
+        for name, value in zip(names, values):
+            if name in COLUMNAR_DATES:
+                value = (value - origin).days if value is not None else None
+            elif value is None:
+                value = COLUMNAR_DEFAULTS.get(name)
+            columns[name].append(value)
+        item["task_count"] += 1
+    return list(result.values())
+
+
 @router.get("/", response_model=List[GPR])
-def get_gprs(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Получить список ГПР"""
+def get_gprs(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, format: Optional[str] = None,
+             db: Session = Depends(get_db)):
+    """Получить список ГПР (format=columnar — задачи параллельными массивами, даты смещением от начала ГПР)"""
+    columnar = _check_format(format)
     try:
         query = db.query(GPRModel)
         if project_id:
             query = query.filter(GPRModel.project_id == project_id)
-        gprs = query.offset(skip).limit(limit).all()
+        if columnar:
+            gprs = query.order_by(GPRModel.id).offset(skip).limit(limit).all()
+            return JSONResponse(_columnar_response(db, gprs))
+        gprs = query.options(selectinload(GPRModel.tasks)).offset(skip).limit(limit).all()
         
         result = []
         for gpr in gprs:
@@ -136,12 +325,42 @@ def get_gprs(project_id: Optional[int] = None, skip: int = 0, limit: int = 100,
         return []
 
 
+@router.get("/resources/histogram", response_model=ResourceHistogram)
+def get_resource_histogram(
+    date_from: date,
+    date_to: date,
+    project_id: Optional[int] = None,
+    personnel_id: Optional[List[int]] = Query(None),
+    capacity: int = 1,
+    include_drafts: bool = False,
+    level: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Загрузка ответственных по дням по всем действующим ГПР (load[k] — день date_from + k).
+
+    level=true — предложить сдвиги некритичных задач в пределах резерва для снятия перегрузки.
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="Дата окончания раньше даты начала")
+    if (date_to - date_from).days > 3660:
+        raise HTTPException(status_code=400, detail="Период не должен превышать 10 лет")
+    if capacity < 1:
+        raise HTTPException(status_code=400, detail="Допустимая загрузка должна быть не меньше 1")
+    return build_histogram(
+        db, date_from, date_to, project_id=project_id, personnel_ids=personnel_id,
+        capacity=capacity, include_drafts=include_drafts, level=level,
+    )
+
+
 @router.get("/{gpr_id}", response_model=GPR)
-def get_gpr(gpr_id: int, db: Session = Depends(get_db)):
-    """Получить ГПР по ID"""
+def get_gpr(gpr_id: int, format: Optional[str] = None, db: Session = Depends(get_db)):
+    """Получить ГПР по ID (format=columnar — задачи параллельными массивами)"""
+    columnar = _check_format(format)
     gpr = db.query(GPRModel).filter(GPRModel.id == gpr_id).first()
     if not gpr:
         raise HTTPException(status_code=404, detail="ГПР не найден")
+    if columnar:
+        return JSONResponse(_columnar_response(db, [gpr])[0])
     
     gpr_dict = {
         "id": gpr.id,
@@ -180,18 +399,44 @@ def get_gpr(gpr_id: int, db: Session = Depends(get_db)):
     return GPR(**gpr_dict)
 
 
+@router.get("/{gpr_id}/critical-path", response_model=CriticalPath)
+def get_gpr_critical_path(gpr_id: int, db: Session = Depends(get_db)):
+    """Критический путь ГПР: ранние/поздние даты, резервы и цепочка критических задач"""
+    gpr = db.query(GPRModel).filter(GPRModel.id == gpr_id).first()
+    if not gpr:
+        raise HTTPException(status_code=404, detail="ГПР не найден")
+    try:
+        return get_schedule(db, gpr)
+    except ScheduleCycleError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "cycle": e.cycle})
+
+
 @router.post("/", response_model=GPR)
 def create_gpr(gpr: GPRCreate, db: Session = Depends(get_db)):
     """Создать новый ГПР"""
-    tasks_data = gpr.tasks
+    calendar = get_calendar(db, gpr.project_id)
+    tasks_data = []
+    for task_data in gpr.tasks:
+        data = task_data.model_dump()
+        data["end_date"], data["planned_duration"] = _resolve_task_dates(
+            calendar, data["start_date"], data["end_date"], data["planned_duration"]
+        )
+        tasks_data.append(data)
+
     gpr_data = gpr.model_dump(exclude={"tasks"})
+    if gpr_data["end_date"] is None:
+        if not tasks_data:
+            raise HTTPException(status_code=400, detail="Укажите дату окончания ГПР или задачи графика")
+        gpr_data["end_date"] = max(data["end_date"] for data in tasks_data)
+    if gpr_data["end_date"] < gpr_data["start_date"]:
+        raise HTTPException(status_code=400, detail="Дата окончания ГПР раньше даты начала")
     
     db_gpr = GPRModel(**gpr_data)
     db.add(db_gpr)
     db.flush()
     
-    for task_data in tasks_data:
-        task = GPRTaskModel(gpr_id=db_gpr.id, **task_data.model_dump())
+    for data in tasks_data:
+        task = GPRTaskModel(gpr_id=db_gpr.id, **data)
         db.add(task)
     
     db.commit()
@@ -234,18 +479,38 @@ def create_gpr(gpr: GPRCreate, db: Session = Depends(get_db)):
     return GPR(**gpr_dict)
 
 
-@router.put("/{gpr_id}", response_model=GPR)
+@router.put("/{gpr_id}", response_model=GPRUpdateResult)
 def update_gpr(gpr_id: int, gpr: GPRUpdate, db: Session = Depends(get_db)):
-    """Обновить ГПР"""
+    """Обновить ГПР; при сдвиге сроков задач пересчитываются зависящие от них задачи"""
     db_gpr = db.query(GPRModel).filter(GPRModel.id == gpr_id).first()
     if not db_gpr:
         raise HTTPException(status_code=404, detail="ГПР не найден")
     
-    update_data = gpr.model_dump(exclude_unset=True)
+    update_data = gpr.model_dump(exclude_unset=True, exclude={"tasks"})
     for field, value in update_data.items():
         setattr(db_gpr, field, value)
-    
+
+    affected = []
+    if gpr.tasks:
+        tasks = {
+            task.id: task
+            for task in db.query(GPRTaskModel).filter(
+                GPRTaskModel.gpr_id == gpr_id, GPRTaskModel.id.in_([t.id for t in gpr.tasks])
+            )
+        }
+        missing = [t.id for t in gpr.tasks if t.id not in tasks]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Задачи не найдены в ГПР: {missing}")
+        calendar = get_calendar(db, db_gpr.project_id)
+        changed = [
+            item.id for item in gpr.tasks
+            if _apply_task_update(tasks[item.id], item.model_dump(exclude_unset=True, exclude={"id"}), calendar)
+        ]
+        affected = _propagate(db, gpr_id, changed, calendar)
+
     db.commit()
+    if gpr.tasks:
+        schedule_cache.invalidate(gpr_id)
     db.refresh(db_gpr)
     
     gpr_dict = {
@@ -282,7 +547,117 @@ def update_gpr(gpr_id: int, gpr: GPRUpdate, db: Session = Depends(get_db)):
             } for task in (db_gpr.tasks or [])
         ]
     }
-    return GPR(**gpr_dict)
+    return GPRUpdateResult(**gpr_dict, affected=affected)
+
+
+# Поля задачи, изменение которых сдвигает последователей
+SCHEDULE_FIELDS = {
+    "start_date", "end_date", "planned_duration", "dependencies",
+    "actual_start_date", "actual_end_date", "progress",
+}
+
+
+def _resolve_task_dates(calendar: WorkCalendar, start: date, end: Optional[date],
+                        duration: Optional[int]) -> tuple:
+    """Согласовать окончание и длительность задачи (в рабочих днях) по календарю объекта.
+
+    Без окончания оно выводится из начала и длительности, без длительности — считается
+    по датам; если заданы оба, они должны совпадать.
+    """
+    if duration is not None and duration <= 0:
+        raise HTTPException(status_code=400, detail="Длительность задачи должна быть больше нуля")
+    if duration is not None and duration > MAX_WORKING_DAYS:
+        raise HTTPException(status_code=400, detail=f"Длительность задачи больше {MAX_WORKING_DAYS} рабочих дней")
+    if end is None:
+        if duration is None:
+            raise HTTPException(status_code=400, detail="Укажите дату окончания или длительность задачи")
+        return calendar.add_working_days(start, duration), duration
+    if end < start:
+        raise HTTPException(status_code=400, detail="Дата окончания задачи раньше даты начала")
+    working_days = calendar.working_days_between(start, end)
+    if duration is None:
+        return end, working_days
+    if duration != working_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Длительность {duration} раб. дн. не соответствует датам {start} — {end} ({working_days} раб. дн.)",
+        )
+    return end, duration
+
+
+def _apply_task_update(task: GPRTaskModel, update_data: dict, calendar: WorkCalendar) -> bool:
+    """Применить изменения к задаче; True, если изменились поля, влияющие на график.
+
+    При сдвиге начала без новых окончания и длительности задача сохраняет длительность
+    в рабочих днях, посчитанную по прежним датам; новое окончание без длительности
+    пересчитывает длительность.
+    """
+    if "progress" in update_data and update_data["progress"] is not None \
+            and not 0 <= update_data["progress"] <= 100:
+        raise HTTPException(status_code=400, detail="Процент выполнения должен быть от 0 до 100")
+    before = {field: getattr(task, field) for field in SCHEDULE_FIELDS}
+    for field, value in update_data.items():
+        if field in ("start_date", "end_date", "planned_duration") and value is None:
+            continue
+        setattr(task, field, value)
+
+    if update_data.keys() & {"start_date", "end_date", "planned_duration"}:
+        end = update_data.get("end_date")
+        duration = update_data.get("planned_duration")
+        if end is None and duration is None:
+            duration = working_duration(calendar, before["start_date"], before["end_date"])
+        task.end_date, task.planned_duration = _resolve_task_dates(calendar, task.start_date, end, duration)
+    return any(getattr(task, field) != value for field, value in before.items())
+
+
+def _propagate(db: Session, gpr_id: int, changed: List[int], calendar: WorkCalendar) -> List[dict]:
+    """Сдвинуть последователей измененных задач; цикл в зависимостях — 400 с откатом."""
+    if not changed:
+        return []
+    try:
+        return propagate_changes(db, gpr_id, changed, calendar=calendar)
+    except ScheduleCycleError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail={"message": str(e), "cycle": e.cycle})
+
+
+@router.put("/{gpr_id}/tasks/{task_id}", response_model=GPRTaskUpdateResult)
+def update_gpr_task(gpr_id: int, task_id: int, task: GPRTaskUpdate, propagate: bool = True,
+                    db: Session = Depends(get_db)):
+    """Обновить задачу ГПР; при сдвиге сроков пересчитываются только зависящие от нее задачи"""
+    db_task = db.query(GPRTaskModel).filter(GPRTaskModel.id == task_id, GPRTaskModel.gpr_id == gpr_id).first()
+    if not db_task:
+        raise HTTPException(status_code=404, detail="Задача ГПР не найдена")
+
+    calendar = get_calendar(db, db_task.gpr.project_id)
+    changed = _apply_task_update(db_task, task.model_dump(exclude_unset=True), calendar)
+    affected = _propagate(db, gpr_id, [task_id], calendar) if changed and propagate else []
+
+    db.commit()
+    schedule_cache.invalidate(gpr_id)
+    db.refresh(db_task)
+
+    return {
+        "task": {
+            "id": db_task.id,
+            "gpr_id": db_task.gpr_id,
+            "name": db_task.name,
+            "work_type": db_task.work_type,
+            "responsible": db_task.responsible,
+            "start_date": db_task.start_date,
+            "end_date": db_task.end_date,
+            "planned_duration": db_task.planned_duration,
+            "status": db_task.status or "planned",
+            "dependencies": db_task.dependencies,
+            "notes": db_task.notes,
+            "actual_start_date": db_task.actual_start_date,
+            "actual_end_date": db_task.actual_end_date,
+            "progress": db_task.progress or 0,
+            "created_at": db_task.created_at,
+            "updated_at": db_task.updated_at
+        },
+        "affected": affected,
+    }
 
 
 @router.delete("/{gpr_id}")
@@ -1,14 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime
 from decimal import Decimal
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.models.ks2 import KS2 as KS2Model, KS2Item
 from app.models.ks3 import KS3 as KS3Model, KS3Item
 from app.models.invoice import Invoice as InvoiceModel
 from app.models.material import MaterialMovement, MaterialWriteOff as MaterialWriteOffModel
 from app.models.work_volume import WorkVolume as WorkVolumeModel
+from app.services.change_log import CHANGE_TYPES, read_changes
+from app.services.export_1c import (
+    iter_documents,
+    ks2_to_dict,
+    ks3_to_dict,
+    ndjson_lines,
+    parse_cursor,
+    parse_types,
+    write_off_to_dict,
+    xml_chunks,
+)
+from app.services.payments_1c import DUPLICATE, IMPORTED, INVALID, NOT_FOUND, import_payments
+from app.services.receivables import overview_cache
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -70,33 +84,96 @@ class PaymentImport(BaseModel):
     amount: Decimal
 
 
+class PaymentImportBatch(BaseModel):
+    """Пакет платежей из 1С"""
+    payments: List[PaymentImport]
+
+
+class PaymentImportLine(BaseModel):
+    """Результат импорта строки пакета (imported, duplicate, not_found, invalid)"""
+    index: int
+    payment_number: Optional[str] = None
+    invoice_id: Optional[int] = None
+    receivable_id: Optional[int] = None
+    status: str
+    message: Optional[str] = None
+
+
+class PaymentImportBatchResult(BaseModel):
+    imported: int
+    duplicates: int
+    not_found: int
+    invalid: int
+    lines: List[PaymentImportLine]
+
+
+@router.get("/export")
+def export_documents_to_1c(
+    types: str = Query("ks2,ks3,write_offs", description="Типы документов через запятую: ks2, ks3, write_offs"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    after: Optional[str] = Query(None, description="Продолжить после документа «тип:id» (поле cursor последней записи)"),
+    format: str = Query("ndjson", description="ndjson или xml"),
+):
+    """Потоковая выгрузка документов в 1С (NDJSON или XML) с продолжением по позиции"""
+    try:
+        doc_types = parse_types(types)
+        cursor = parse_cursor(after, doc_types)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format not in ("ndjson", "xml"):
+        raise HTTPException(status_code=400, detail="Формат выгрузки должен быть ndjson или xml")
+
+    def stream():
+        # Собственная сессия: ответ отдается после выхода из обработчика
+        db = SessionLocal()
+        try:
+            documents = iter_documents(db, doc_types, date_from, date_to, cursor)
+            yield from (ndjson_lines(documents) if format == "ndjson" else xml_chunks(documents))
+        finally:
+            db.close()
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/xml"
+    return StreamingResponse(stream(), media_type=media_type)
+
+
+class ChangeEntry(BaseModel):
+    """Изменение документа в журнале синхронизации"""
+    token: int
+    entity_type: str
+    entity_id: int
+    operation: str
+    changed_at: Optional[datetime] = None
+
+
+class ChangesPage(BaseModel):
+    """Страница журнала изменений; next_token передается в следующий запрос как since"""
+    changes: List[ChangeEntry]
+    next_token: int
+    has_more: bool
+
+
+@router.get("/changes", response_model=ChangesPage)
+def get_changes_for_1c(
+    since: int = Query(0, ge=0, description="Токен синхронизации (next_token предыдущего ответа)"),
+    limit: int = Query(1000, ge=1, le=10000),
+    types: Optional[str] = Query(None, description="Типы документов через запятую: " + ", ".join(CHANGE_TYPES)),
+    db: Session = Depends(get_db),
+):
+    """Документы, измененные после токена since (инкрементальная синхронизация с 1С)"""
+    doc_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    if doc_types and any(t not in CHANGE_TYPES for t in doc_types):
+        raise HTTPException(status_code=400, detail="Допустимые типы документов: " + ", ".join(CHANGE_TYPES))
+    return read_changes(db, since, limit, doc_types)
+
+
 @router.get("/export/ks2/{ks2_id}", response_model=KS2Export)
 def export_ks2_to_1c(ks2_id: int, db: Session = Depends(get_db)):
     """Экспорт КС-2 в 1С"""
-    ks2 = db.query(KS2).filter(KS2.id == ks2_id).first()
+    ks2 = db.query(KS2Model).filter(KS2Model.id == ks2_id).first()
     if not ks2:
         raise HTTPException(status_code=404, detail="КС-2 не найден")
-    
-    items = []
-    for item in ks2.items:
-        items.append({
-            "work_name": item.work_name,
-            "unit": item.unit,
-            "volume_completed": str(item.volume_completed),
-            "price": str(item.price) if item.price else None,
-            "amount": str(item.amount) if item.amount else None
-        })
-    
-    return KS2Export(
-        id=ks2.id,
-        number=ks2.number,
-        date=ks2.date,
-        project_name=ks2.project.name if ks2.project else "",
-        customer=ks2.customer,
-        contractor=ks2.contractor,
-        total_amount=ks2.total_amount,
-        items=items
-    )
+    return KS2Export(**ks2_to_dict(ks2))
 
 
 @router.get("/export/ks3/{ks3_id}", response_model=KS3Export)
@@ -105,74 +182,47 @@ def export_ks3_to_1c(ks3_id: int, db: Session = Depends(get_db)):
     ks3 = db.query(KS3Model).filter(KS3Model.id == ks3_id).first()
     if not ks3:
         raise HTTPException(status_code=404, detail="КС-3 не найден")
-    
-    items = []
-    for item in ks3.items:
-        items.append({
-            "work_name": item.work_name,
-            "unit": item.unit,
-            "volume": str(item.volume),
-            "price": str(item.price) if item.price else None,
-            "amount": str(item.amount) if item.amount else None,
-            "vat_rate": str(item.vat_rate) if item.vat_rate else None,
-            "vat_amount": str(item.vat_amount) if item.vat_amount else None,
-            "amount_with_vat": str(item.amount_with_vat) if item.amount_with_vat else None
-        })
-    
-    return KS3Export(
-        id=ks3.id,
-        number=ks3.number,
-        date=ks3.date,
-        project_name=ks3.project.name if ks3.project else "",
-        customer=ks3.customer,
-        contractor=ks3.contractor,
-        total_amount=ks3.total_amount,
-        total_vat=ks3.total_vat,
-        total_with_vat=ks3.total_with_vat,
-        items=items
-    )
+    return KS3Export(**ks3_to_dict(ks3))
 
 
 @router.get("/export/write-offs/{write_off_id}", response_model=MaterialWriteOffExport)
 def export_write_off_to_1c(write_off_id: int, db: Session = Depends(get_db)):
     """Экспорт списания материалов в 1С"""
-    write_off = db.query(MaterialWriteOff).filter(MaterialWriteOff.id == write_off_id).first()
+    write_off = db.query(MaterialWriteOffModel).filter(MaterialWriteOffModel.id == write_off_id).first()
     if not write_off:
         raise HTTPException(status_code=404, detail="Списание не найдено")
-    
-    items = []
-    for item in write_off.items:
-        items.append({
-            "material_code": item.material.code if item.material else "",
-            "material_name": item.material.name if item.material else "",
-            "quantity": str(item.quantity),
-            "price": str(item.price) if item.price else None,
-            "amount": str(item.amount) if item.amount else None
-        })
-    
-    return MaterialWriteOffExport(
-        id=write_off.id,
-        write_off_number=write_off.write_off_number,
-        write_off_date=write_off.write_off_date,
-        project_name=write_off.project.name if write_off.project else "",
-        total_amount=write_off.total_amount,
-        items=items
-    )
+    return MaterialWriteOffExport(**write_off_to_dict(write_off))
 
 
 @router.post("/import/payment")
 def import_payment_from_1c(payment: PaymentImport, db: Session = Depends(get_db)):
-    """Импорт платежа из 1С"""
-    invoice = db.query(InvoiceModel).filter(InvoiceModel.id == payment.invoice_id).first()
-    if not invoice:
+    """Импорт платежа из 1С (повторная загрузка того же платежного поручения не проводится)"""
+    result = import_payments(db, [payment.model_dump()])[0]
+    if result["status"] == NOT_FOUND:
         raise HTTPException(status_code=404, detail="Счет не найден")
-    
-    invoice.status = "paid"
-    invoice.paid_date = payment.payment_date
-    invoice.payment_number = payment.payment_number
-    
-    db.commit()
-    return {"message": "Платеж импортирован", "invoice_id": invoice.id}
+    if result["status"] == INVALID:
+        raise HTTPException(status_code=400, detail=result["message"])
+    overview_cache.invalidate()
+    if result["status"] == DUPLICATE:
+        return {"message": "Платеж уже импортирован", "invoice_id": payment.invoice_id}
+    return {"message": "Платеж импортирован", "invoice_id": payment.invoice_id}
+
+
+@router.post("/import/payments", response_model=PaymentImportBatchResult)
+def import_payments_from_1c(batch: PaymentImportBatch, db: Session = Depends(get_db)):
+    """Пакетный импорт платежей из 1С с результатом по каждой строке (идемпотентно по номеру поручения)"""
+    lines = import_payments(db, [p.model_dump() for p in batch.payments])
+    overview_cache.invalidate()
+    counts = {status: 0 for status in (IMPORTED, DUPLICATE, NOT_FOUND, INVALID)}
+    for line in lines:
+        counts[line["status"]] += 1
+    return PaymentImportBatchResult(
+        imported=counts[IMPORTED],
+        duplicates=counts[DUPLICATE],
+        not_found=counts[NOT_FOUND],
+        invalid=counts[INVALID],
+        lines=lines,
+    )
 
 
 @router.get("/export/volumes/{project_id}")
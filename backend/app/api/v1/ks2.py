@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from decimal import Decimal
 from app.db.database import get_db
@@ -93,101 +93,8 @@ class KS2(KS2Base):
         from_attributes = True
 
 
-@router.get("/", response_model=List[KS2])
-def get_ks2_forms(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Получить список форм КС-2"""
-    try:
-        from sqlalchemy import text
-        
-        if project_id:
-            sql = text("""
-                SELECT id, project_id, number, date, period_from, period_to, customer, contractor,
-                       object_name, total_amount, contractor_signature, customer_signature, status, notes,
-                       created_at, updated_at
-                FROM ks2
-                WHERE project_id = :project_id
-                LIMIT :limit OFFSET :skip
-            """)
-            rows = db.execute(sql, {"project_id": project_id, "limit": limit, "skip": skip}).fetchall()
-        else:
-            sql = text("""
-                SELECT id, project_id, number, date, period_from, period_to, customer, contractor,
-                       object_name, total_amount, contractor_signature, customer_signature, status, notes,
-                       created_at, updated_at
-                FROM ks2
-                LIMIT :limit OFFSET :skip
-            """)
-            rows = db.execute(sql, {"limit": limit, "skip": skip}).fetchall()
-        
-        if not rows:
-            return []
-        
-        result = []
-        for row in rows:
-            try:
-                # Получаем items для этой формы
-                items_sql = "SELECT id, ks2_id, line_number, work_name, unit, volume_estimated, volume_completed, volume_total, price, amount, notes, created_at FROM ks2_items WHERE ks2_id = :ks2_id"
-                items_rows = db.execute(text(items_sql), {"ks2_id": row[0]}).fetchall()
-                
-                items = []
-                for item_row in items_rows:
-                    items.append({
-                        "id": item_row[0],
-                        "ks2_id": item_row[1],
-                        "line_number": item_row[2],
-                        "work_name": item_row[3],
-                        "unit": item_row[4],
-                        "volume_estimated": float(item_row[5]) if item_row[5] else None,
-                        "volume_completed": float(item_row[6]) if item_row[6] else None,
-                        "volume_total": float(item_row[7]) if item_row[7] else None,
-                        "price": float(item_row[8]) if item_row[8] else None,
-                        "amount": float(item_row[9]) if item_row[9] else None,
-                        "notes": item_row[10],
-                        "created_at": item_row[11]
-                    })
-                
-                form_dict = {
-                    "id": row[0],
-                    "project_id": row[1],
-                    "number": row[2],
-                    "date": row[3],
-                    "period_from": row[4],
-                    "period_to": row[5],
-                    "customer": row[6],
-                    "contractor": row[7],
-                    "object_name": row[8],
-                    "total_amount": float(row[9]) if row[9] else None,
-                    "contractor_signature": row[10],
-                    "customer_signature": row[11],
-                    "status": row[12] or "draft",
-                    "notes": row[13],
-                    "created_at": row[14],
-                    "updated_at": row[15],
-                    "items": items
-                }
-                result.append(KS2(**form_dict))
-            except Exception as e:
-                import traceback
-                print(f"Error serializing KS2 {row[0] if row else 'unknown'}: {e}")
-                traceback.print_exc()
-                continue
-        
-        return result
-    except Exception as e:
-        import traceback
-        print(f"Error in get_ks2_forms: {e}")
-        traceback.print_exc()
-        return []
-
-
-@router.get("/{ks2_id}", response_model=KS2)
-def get_ks2(ks2_id: int, db: Session = Depends(get_db)):
-    """Получить форму КС-2 по ID"""
-    ks2 = db.query(KS2Model).filter(KS2Model.id == ks2_id).first()
-    if not ks2:
-        raise HTTPException(status_code=404, detail="Форма КС-2 не найдена")
-    
-    form_dict = {
+def _ks2_to_schema(ks2: KS2Model) -> KS2:
+    return KS2(**{
         "id": ks2.id,
         "project_id": ks2.project_id,
         "number": ks2.number,
@@ -220,8 +127,27 @@ def get_ks2(ks2_id: int, db: Session = Depends(get_db)):
                 "created_at": item.created_at
             } for item in (ks2.items or [])
         ]
-    }
-    return KS2(**form_dict)
+    })
+
+
+@router.get("/", response_model=List[KS2])
+def get_ks2_forms(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Получить список форм КС-2"""
+    query = db.query(KS2Model).options(selectinload(KS2Model.items))
+    if project_id:
+        query = query.filter(KS2Model.project_id == project_id)
+    forms = query.order_by(KS2Model.id).offset(skip).limit(limit).all()
+    return [_ks2_to_schema(form) for form in forms]
+
+
+@router.get("/{ks2_id}", response_model=KS2)
+def get_ks2(ks2_id: int, db: Session = Depends(get_db)):
+    """Получить форму КС-2 по ID"""
+    ks2 = db.query(KS2Model).filter(KS2Model.id == ks2_id).first()
+    if not ks2:
+        raise HTTPException(status_code=404, detail="Форма КС-2 не найдена")
+    
+    return _ks2_to_schema(ks2)
 
 
 @router.post("/", response_model=KS2)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from decimal import Decimal
 from app.db.database import get_db
@@ -101,105 +101,8 @@ class KS3(KS3Base):
         from_attributes = True
 
 
-@router.get("/", response_model=List[KS3])
-def get_ks3_forms(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Получить список форм КС-3"""
-    try:
-        from sqlalchemy import text
-        
-        if project_id:
-            sql = text("""
-                SELECT id, project_id, ks2_id, number, date, period_from, period_to, customer, contractor,
-                       object_name, total_amount, total_vat, total_with_vat, contractor_signature, customer_signature, status, notes,
-                       created_at, updated_at
-                FROM ks3
-                WHERE project_id = :project_id
-                LIMIT :limit OFFSET :skip
-            """)
-            rows = db.execute(sql, {"project_id": project_id, "limit": limit, "skip": skip}).fetchall()
-        else:
-            sql = text("""
-                SELECT id, project_id, ks2_id, number, date, period_from, period_to, customer, contractor,
-                       object_name, total_amount, total_vat, total_with_vat, contractor_signature, customer_signature, status, notes,
-                       created_at, updated_at
-                FROM ks3
-                LIMIT :limit OFFSET :skip
-            """)
-            rows = db.execute(sql, {"limit": limit, "skip": skip}).fetchall()
-        
-        if not rows:
-            return []
-        
-        result = []
-        for row in rows:
-            try:
-                # Получаем items для этой формы
-                items_sql = text("SELECT id, ks3_id, line_number, work_name, unit, volume, price, amount, vat_rate, vat_amount, amount_with_vat, notes, created_at FROM ks3_items WHERE ks3_id = :ks3_id")
-                items_rows = db.execute(items_sql, {"ks3_id": row[0]}).fetchall()
-                
-                items = []
-                for item_row in items_rows:
-                    items.append({
-                        "id": item_row[0],
-                        "ks3_id": item_row[1],
-                        "line_number": item_row[2],
-                        "work_name": item_row[3],
-                        "unit": item_row[4],
-                        "volume": float(item_row[5]) if item_row[5] else None,
-                        "price": float(item_row[6]) if item_row[6] else None,
-                        "amount": float(item_row[7]) if item_row[7] else None,
-                        "vat_rate": float(item_row[8]) if item_row[8] else None,
-                        "vat_amount": float(item_row[9]) if item_row[9] else None,
-                        "amount_with_vat": float(item_row[10]) if item_row[10] else None,
-                        "notes": item_row[11],
-                        "created_at": item_row[12]
-                    })
-                
-                form_dict = {
-                    "id": row[0],
-                    "project_id": row[1],
-                    "ks2_id": row[2],
-                    "number": row[3],
-                    "date": row[4],
-                    "period_from": row[5],
-                    "period_to": row[6],
-                    "customer": row[7],
-                    "contractor": row[8],
-                    "object_name": row[9],
-                    "total_amount": float(row[10]) if row[10] else None,
-                    "total_vat": float(row[11]) if row[11] else None,
-                    "total_with_vat": float(row[12]) if row[12] else None,
-                    "contractor_signature": row[13],
-                    "customer_signature": row[14],
-                    "status": row[15] or "draft",
-                    "notes": row[16],
-                    "created_at": row[17],
-                    "updated_at": row[18],
-                    "items": items
-                }
-                result.append(KS3(**form_dict))
-            except Exception as e:
-                import traceback
-                print(f"Error serializing KS3 {row[0] if row else 'unknown'}: {e}")
-                traceback.print_exc()
-                continue
-        
-        return result
-    except Exception as e:
-        import traceback
-        print(f"Error in get_ks3_forms: {e}")
-        traceback.print_exc()
-        return []
-
-
-@router.get("/{ks3_id}", response_model=KS3)
-def get_ks3(ks3_id: int, db: Session = Depends(get_db)):
-    """Получить форму КС-3 по ID"""
-    ks3 = db.query(KS3Model).filter(KS3Model.id == ks3_id).first()
-    if not ks3:
-        raise HTTPException(status_code=404, detail="Форма КС-3 не найдена")
-    
-    form_dict = {
+def _ks3_to_schema(ks3: KS3Model) -> KS3:
+    return KS3(**{
         "id": ks3.id,
         "project_id": ks3.project_id,
         "ks2_id": ks3.ks2_id,
@@ -236,8 +139,27 @@ def get_ks3(ks3_id: int, db: Session = Depends(get_db)):
                 "created_at": item.created_at
             } for item in (ks3.items or [])
         ]
-    }
-    return KS3(**form_dict)
+    })
+
+
+@router.get("/", response_model=List[KS3])
+def get_ks3_forms(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Получить список форм КС-3"""
+    query = db.query(KS3Model).options(selectinload(KS3Model.items))
+    if project_id:
+        query = query.filter(KS3Model.project_id == project_id)
+    forms = query.order_by(KS3Model.id).offset(skip).limit(limit).all()
+    return [_ks3_to_schema(form) for form in forms]
+
+
+@router.get("/{ks3_id}", response_model=KS3)
+def get_ks3(ks3_id: int, db: Session = Depends(get_db)):
+    """Получить форму КС-3 по ID"""
+    ks3 = db.query(KS3Model).filter(KS3Model.id == ks3_id).first()
+    if not ks3:
+        raise HTTPException(status_code=404, detail="Форма КС-3 не найдена")
+    
+    return _ks3_to_schema(ks3)
 
 
 @router.post("/", response_model=KS3)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date, datetime
@@ -10,11 +10,11 @@ from pydantic import BaseModel
 
 from app.db.database import get_db
 from app.models.lab_test import LabTest as LabTestModel, LabTestType as LabTestTypeModel, Laboratory as LaboratoryModel
+from app.services.reference_cache import reference_cache
 
 router = APIRouter()
 
 UPLOAD_DIR = Path("uploads/lab-tests")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
 class LabTestBase(BaseModel):
@@ -104,8 +104,11 @@ class RefUpdate(BaseModel):
 
 
 @router.get("/refs/test-types", response_model=List[RefItem])
-def list_test_types(db: Session = Depends(get_db)):
-    return db.query(LabTestTypeModel).filter(LabTestTypeModel.is_active == True).order_by(LabTestTypeModel.name).all()  # noqa: E712
+def list_test_types(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.response(
+        request, db, "lab_test_types", List[RefItem],
+        lambda: db.query(LabTestTypeModel).filter(LabTestTypeModel.is_active == True).order_by(LabTestTypeModel.name).all(),  # noqa: E712
+    )
 
 
 @router.post("/refs/test-types", response_model=RefItem)
@@ -152,8 +155,11 @@ def delete_test_type(type_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/refs/laboratories", response_model=List[RefItem])
-def list_laboratories(db: Session = Depends(get_db)):
-    return db.query(LaboratoryModel).filter(LaboratoryModel.is_active == True).order_by(LaboratoryModel.name).all()  # noqa: E712
+def list_laboratories(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.response(
+        request, db, "laboratories", List[RefItem],
+        lambda: db.query(LaboratoryModel).filter(LaboratoryModel.is_active == True).order_by(LaboratoryModel.name).all(),  # noqa: E712
+    )
 
 
 @router.post("/refs/laboratories", response_model=RefItem)
@@ -288,6 +294,7 @@ async def upload_lab_test_file(
 
     safe_name = quote(file.filename)
     unique = f"{test_id}_{int(datetime.utcnow().timestamp())}_{safe_name}"
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     dest = UPLOAD_DIR / unique
     with dest.open("wb") as f:
         f.write(await file.read())
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from decimal import Decimal
-from app.db.database import get_db
+from app.db.database import get_db, get_write_db
+from app.db.writer import defer_write
 from app.models.material import (
     Material as MaterialModel, Warehouse as WarehouseModel,
     WarehouseStock as WarehouseStockModel, MaterialMovement as MaterialMovementModel,
     MaterialWriteOff as MaterialWriteOffModel, MaterialWriteOffItem as MaterialWriteOffItemModel,
-    MaterialTypeRef as MaterialTypeRefModel
+    MaterialTypeRef as MaterialTypeRefModel, MovementType,
+    WarehouseStockSnapshot as WarehouseStockSnapshotModel,
 )
+from app.models.project import Project as ProjectModel
+from app.services.stock import (
+    receive_stock, issue_stock, apply_stock_deltas, average_prices, money, StockDelta
+)
+from app.services.stock_ledger import stock_as_of, adjust_snapshots
+from app.services.stock_valuation import revalue
+from app.services.reference_cache import reference_cache
 from pydantic import BaseModel
 from datetime import date, datetime
 
@@ -41,23 +51,12 @@ class MaterialTypeRef(MaterialTypeRefBase):
 
 
 @router.get("/material-types/", response_model=List[MaterialTypeRef])
-def list_material_types(db: Session = Depends(get_db)):
-    q = db.query(MaterialTypeRefModel).filter(MaterialTypeRefModel.is_active == True).order_by(MaterialTypeRefModel.name)  # noqa: E712
-    rows = q.all()
-    # авто-сид (если справочник пустой) — коды должны совпадать с MaterialType enum
-    if not rows:
-        defaults = [
-            {"code": "construction", "name": "Строительные материалы"},
-            {"code": "equipment", "name": "Оборудование"},
-            {"code": "tools", "name": "Инструменты"},
-            {"code": "consumables", "name": "Расходные материалы"},
-            {"code": "other", "name": "Прочее"},
-        ]
-        for d in defaults:
-            db.add(MaterialTypeRefModel(**d, is_active=True))
-        db.commit()
-        rows = q.all()
-    return rows
+def list_material_types(request: Request, db: Session = Depends(get_db)):
+    # Типы по умолчанию добавляет миграция 0003 (коды совпадают с MaterialType enum)
+    return reference_cache.response(
+        request, db, "material_types", List[MaterialTypeRef],
+        lambda: db.query(MaterialTypeRefModel).filter(MaterialTypeRefModel.is_active == True).order_by(MaterialTypeRefModel.name).all(),  # noqa: E712
+    )
 
 
 @router.post("/material-types/", response_model=MaterialTypeRef)
@@ -147,12 +146,42 @@ class WarehouseStock(BaseModel):
     material_id: int
     quantity: Decimal
     reserved_quantity: Decimal
+    amount: Optional[Decimal] = None
+    average_price: Optional[Decimal] = None
     last_movement_date: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+class WarehouseStockBalance(BaseModel):
+    """Остаток на дату (из складского регистра)"""
+    warehouse_id: int
+    material_id: int
+    quantity: Decimal
+    amount: Decimal
+    as_of: date
+    snapshot_date: Optional[date] = None
+
+
+class StockValuationRow(BaseModel):
+    """Строка ведомости стоимости остатков"""
+    warehouse_id: int
+    material_id: int
+    quantity: Decimal
+    amount: Decimal
+    average_price: Optional[Decimal] = None
+
+
+class StockRevaluationResult(BaseModel):
+    events: int
+    movements_updated: int
+    write_off_items_updated: int
+    write_offs_updated: int
+    snapshots: int
+    stocks_updated: int
+
+
 # MaterialMovement schemas
 class MaterialMovementBase(BaseModel):
     movement_type: str
@@ -185,6 +214,23 @@ class MaterialMovement(MaterialMovementBase):
         from_attributes = True
 
 
+class MaterialMovementBatchCreate(BaseModel):
+    movements: List[MaterialMovementCreate]
+
+
+class MaterialMovementBatchLine(BaseModel):
+    line: int
+    ok: bool
+    id: Optional[int] = None
+    amount: Optional[Decimal] = None
+    errors: List[str] = []
+
+
+class MaterialMovementBatchResult(BaseModel):
+    created: int
+    lines: List[MaterialMovementBatchLine]
+
+
 # MaterialWriteOff schemas
 class MaterialWriteOffItemBase(BaseModel):
     material_id: int
@@ -276,11 +322,72 @@ def create_warehouse(warehouse: WarehouseCreate, db: Session = Depends(get_db)):
     return db_warehouse
 
 
-@router.get("/warehouses/{warehouse_id}/stocks", response_model=List[WarehouseStock])
-def get_warehouse_stocks(warehouse_id: int, db: Session = Depends(get_db)):
-    """Получить остатки на складе"""
-    stocks = db.query(WarehouseStockModel).filter(WarehouseStockModel.warehouse_id == warehouse_id).all()
-    return stocks
+@router.get("/warehouses/{warehouse_id}/stocks", response_model=Union[List[WarehouseStock], List[WarehouseStockBalance]])
+def get_warehouse_stocks(warehouse_id: int, as_of: Optional[date] = None, db: Session = Depends(get_db)):
+    """Получить остатки на складе (текущие или на конец дня as_of)"""
+    if as_of is None:
+        stocks = db.query(WarehouseStockModel).filter(WarehouseStockModel.warehouse_id == warehouse_id).all()
+        return stocks
+    snapshot_date, balances = stock_as_of(db, warehouse_id, as_of)
+    return [
+        WarehouseStockBalance(
+            warehouse_id=warehouse_id,
+            material_id=material_id,
+            quantity=quantity,
+            amount=amount,
+            as_of=as_of,
+            snapshot_date=snapshot_date,
+        )
+        for material_id, (quantity, amount) in sorted(balances.items())
+        if quantity != 0 or amount != 0
+    ]
+
+
+@router.get("/valuation/", response_model=List[StockValuationRow])
+def get_stock_valuation(
+    warehouse_id: Optional[int] = None,
+    period_end: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """Ведомость стоимости остатков: текущая или на конец закрытого месяца (из снимков)"""
+    if period_end is None:
+        query = db.query(
+            WarehouseStockModel.warehouse_id,
+            WarehouseStockModel.material_id,
+            WarehouseStockModel.quantity,
+            WarehouseStockModel.amount,
+            WarehouseStockModel.average_price,
+        )
+        if warehouse_id:
+            query = query.filter(WarehouseStockModel.warehouse_id == warehouse_id)
+        rows = query.order_by(WarehouseStockModel.warehouse_id, WarehouseStockModel.material_id).all()
+        return [
+            StockValuationRow(warehouse_id=w, material_id=m, quantity=q or 0, amount=a or 0, average_price=p)
+            for w, m, q, a, p in rows
+        ]
+
+    query = db.query(
+        WarehouseStockSnapshotModel.warehouse_id,
+        WarehouseStockSnapshotModel.material_id,
+        WarehouseStockSnapshotModel.quantity,
+        WarehouseStockSnapshotModel.amount,
+    ).filter(WarehouseStockSnapshotModel.period_end == period_end)
+    if warehouse_id:
+        query = query.filter(WarehouseStockSnapshotModel.warehouse_id == warehouse_id)
+    rows = query.order_by(WarehouseStockSnapshotModel.warehouse_id, WarehouseStockSnapshotModel.material_id).all()
+    return [
+        StockValuationRow(
+            warehouse_id=w, material_id=m, quantity=q, amount=a,
+            average_price=(Decimal(str(a)) / Decimal(str(q))).quantize(Decimal("0.0001")) if q else None,
+        )
+        for w, m, q, a in rows
+    ]
+
+
+@router.post("/valuation/revalue", response_model=StockRevaluationResult)
+def revalue_stock(since: Optional[date] = None, db: Session = Depends(get_db)):
+    """Переоценить движения, списания и остатки по скользящей средней начиная с даты since"""
+    return revalue(db, since)
 
 
 # Movement endpoints
@@ -312,7 +419,7 @@ def get_movements(
 
 
 @router.post("/movements/", response_model=MaterialMovement)
-def create_movement(movement: MaterialMovementCreate, db: Session = Depends(get_db)):
+def create_movement(movement: MaterialMovementCreate, db: Session = Depends(get_write_db)):
     """Создать движение материалов (обязательная привязка к объекту - объектно-центрированный подход)"""
     movement_data = movement.model_dump()
     if movement_data.get("price") and movement_data.get("quantity"):
@@ -321,38 +428,143 @@ def create_movement(movement: MaterialMovementCreate, db: Session = Depends(get_
     db_movement = MaterialMovementModel(**movement_data)
     db.add(db_movement)
     
-    # Обновление остатков на складе
-    if movement.to_warehouse_id:
-        stock = db.query(WarehouseStockModel).filter(
-            WarehouseStockModel.warehouse_id == movement.to_warehouse_id,
-            WarehouseStockModel.material_id == movement.material_id
-        ).first()
-        if stock:
-            stock.quantity += movement.quantity
-            stock.last_movement_date = datetime.now()
-        else:
-            stock = WarehouseStockModel(
-                warehouse_id=movement.to_warehouse_id,
-                material_id=movement.material_id,
-                quantity=movement.quantity,
-                last_movement_date=datetime.now()
+    # Обновление остатков на складе (атомарно, без чтения строки остатка) — в транзакции
+    # фиксации, при очереди записи ее выполняет писатель.
+    # Расход и перемещение оцениваются по средней себестоимости склада-отправителя.
+    moved_at = datetime.now()
+
+    def post_stock(session: Session):
+        if movement.from_warehouse_id:
+            cost_price = issue_stock(
+                session, movement.from_warehouse_id, movement.material_id, movement.quantity, moved_at,
             )
-            db.add(stock)
-    
-    if movement.from_warehouse_id:
-        stock = db.query(WarehouseStockModel).filter(
-            WarehouseStockModel.warehouse_id == movement.from_warehouse_id,
-            WarehouseStockModel.material_id == movement.material_id
-        ).first()
-        if stock:
-            stock.quantity -= movement.quantity
-            stock.last_movement_date = datetime.now()
-    
+            if cost_price is not None:
+                db_movement.price = cost_price
+                db_movement.amount = money(cost_price * movement.quantity)
+        if movement.to_warehouse_id:
+            average_price = receive_stock(
+                session, movement.to_warehouse_id, movement.material_id, movement.quantity,
+                db_movement.amount, moved_at,
+            )
+            if db_movement.amount is None:
+                db_movement.amount = money(average_price * movement.quantity)
+        adjust_snapshots(session, _movement_ledger([{
+            "to_warehouse_id": movement.to_warehouse_id, "from_warehouse_id": movement.from_warehouse_id,
+            "material_id": movement.material_id, "movement_date": movement.movement_date,
+            "quantity": movement.quantity, "amount": db_movement.amount,
+        }]))
+
+    defer_write(db, post_stock)
     db.commit()
     db.refresh(db_movement)
     return db_movement
 
 
+def _movement_ledger(rows: List[dict]):
+    """Строки регистра (склад, материал, дата, количество, стоимость со знаком) для движений."""
+    for row in rows:
+        quantity, amount = row["quantity"], row.get("amount") or 0
+        if row.get("to_warehouse_id"):
+            yield row["to_warehouse_id"], row["material_id"], row["movement_date"], quantity, amount
+        if row.get("from_warehouse_id"):
+            yield row["from_warehouse_id"], row["material_id"], row["movement_date"], -quantity, -amount
+
+
+def _existing_ids(db: Session, model, ids: set) -> set:
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(model.id).filter(model.id.in_(ids)).all()}
+
+
+@router.post("/movements/batch", response_model=MaterialMovementBatchResult)
+def create_movements_batch(batch: MaterialMovementBatchCreate, db: Session = Depends(get_write_db)):
+    """Пакетное проведение документа движения (приходная накладная на сотни строк).
+
+    Документ проверяется целиком; при ошибке хотя бы в одной строке ничего не записывается
+    и возвращается 400 с результатами по строкам. Иначе все движения вставляются одной
+    транзакцией, а остатки обновляются агрегированно по паре (склад, материал).
+    """
+    movements = batch.movements
+    if not movements:
+        raise HTTPException(status_code=400, detail="Документ не содержит строк")
+
+    material_ids = _existing_ids(db, MaterialModel, {m.material_id for m in movements})
+    project_ids = _existing_ids(db, ProjectModel, {m.project_id for m in movements})
+    warehouse_ids = _existing_ids(db, WarehouseModel, {
+        w for m in movements for w in (m.from_warehouse_id, m.to_warehouse_id) if w is not None
+    })
+    movement_types = {t.value for t in MovementType}
+    # Себестоимость на начало документа: для перемещений и приходов без цены
+    prices = average_prices(db, {
+        (w, m.material_id) for m in movements for w in (m.from_warehouse_id, m.to_warehouse_id) if w
+    })
+
+    lines = []
+    rows = []
+    deltas = {}
+    for line_no, movement in enumerate(movements, start=1):
+        errors = []
+        if movement.movement_type not in movement_types:
+            errors.append(f"Неизвестный тип движения: {movement.movement_type}")
+        if movement.quantity <= 0:
+            errors.append("Количество должно быть больше нуля")
+        if movement.material_id not in material_ids:
+            errors.append(f"Материал {movement.material_id} не найден")
+        if movement.project_id not in project_ids:
+            errors.append(f"Проект {movement.project_id} не найден")
+        if not movement.from_warehouse_id and not movement.to_warehouse_id:
+            errors.append("Не указан склад")
+        for warehouse_id in (movement.from_warehouse_id, movement.to_warehouse_id):
+            if warehouse_id and warehouse_id not in warehouse_ids:
+                errors.append(f"Склад {warehouse_id} не найден")
+        if movement.from_warehouse_id and movement.from_warehouse_id == movement.to_warehouse_id:
+            errors.append("Склад-отправитель совпадает со складом-получателем")
+
+        row = movement.model_dump()
+        if movement.from_warehouse_id and (movement.from_warehouse_id, movement.material_id) in prices:
+            row["price"] = prices[(movement.from_warehouse_id, movement.material_id)]
+        if row.get("price") is not None:
+            row["amount"] = money(row["price"] * row["quantity"])
+        elif movement.to_warehouse_id and (movement.to_warehouse_id, movement.material_id) in prices:
+            row["amount"] = money(prices[(movement.to_warehouse_id, movement.material_id)] * row["quantity"])
+        lines.append(MaterialMovementBatchLine(line=line_no, ok=not errors, amount=row.get("amount"), errors=errors))
+        if errors:
+            continue
+        rows.append(row)
+        if movement.to_warehouse_id:
+            deltas.setdefault((movement.to_warehouse_id, movement.material_id), StockDelta()).receive(
+                movement.quantity, row.get("amount"),
+            )
+        if movement.from_warehouse_id:
+            deltas.setdefault((movement.from_warehouse_id, movement.material_id), StockDelta()).issue(movement.quantity)
+
+    if len(rows) != len(movements):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Документ содержит ошибки, движения не проведены",
+                "lines": [line.model_dump(mode="json") for line in lines],
+            },
+        )
+
+    ids = []
+
+    def post_rows(session: Session):
+        ids.extend(session.scalars(
+            insert(MaterialMovementModel).returning(MaterialMovementModel.id, sort_by_parameter_order=True),
+            rows,
+        ).all())
+        apply_stock_deltas(session, deltas)
+        adjust_snapshots(session, _movement_ledger(rows))
+
+    defer_write(db, post_rows)
+    db.commit()
+
+    for line, movement_id in zip(lines, ids):
+        line.id = movement_id
+    return MaterialMovementBatchResult(created=len(ids), lines=lines)
+
+
 # Write-off endpoints
 @router.get("/write-offs/", response_model=List[MaterialWriteOff])
 def get_write_offs(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
@@ -365,36 +577,39 @@ def get_write_offs(project_id: Optional[int] = None, skip: int = 0, limit: int =
 
 
 @router.post("/write-offs/", response_model=MaterialWriteOff)
-def create_write_off(write_off: MaterialWriteOffCreate, db: Session = Depends(get_db)):
+def create_write_off(write_off: MaterialWriteOffCreate, db: Session = Depends(get_write_db)):
     """Создать списание материалов"""
     items_data = write_off.items
     write_off_data = write_off.model_dump(exclude={"items"})
     
     db_write_off = MaterialWriteOffModel(**write_off_data)
+    db_write_off.items = [MaterialWriteOffItemModel(**item_data.model_dump()) for item_data in items_data]
     db.add(db_write_off)
-    db.flush()
-    
-    total_amount = Decimal(0)
-    for item_data in items_data:
-        item_dict = item_data.model_dump()
-        if not item_dict.get("amount") and item_dict.get("price") and item_dict.get("quantity"):
-            item_dict["amount"] = item_dict["price"] * item_dict["quantity"]
-        item = MaterialWriteOffItemModel(write_off_id=db_write_off.id, **item_dict)
-        db.add(item)
-        if item.amount:
-            total_amount += item.amount
-        
-        # Обновление остатков на складе
-        if db_write_off.warehouse_id:
-            stock = db.query(WarehouseStockModel).filter(
-                WarehouseStockModel.warehouse_id == db_write_off.warehouse_id,
-                WarehouseStockModel.material_id == item.material_id
-            ).first()
-            if stock:
-                stock.quantity -= item.quantity
-                stock.last_movement_date = datetime.now()
-    
-    db_write_off.total_amount = total_amount
+
+    def post_stock(session: Session):
+        total_amount = Decimal(0)
+        for item in db_write_off.items:
+            # Обновление остатков на складе. Позиция со склада оценивается по средней
+            # себестоимости, по которой списан остаток, — та же сумма идет в итог
+            # и в снимок остатков; цена из запроса — только для позиций без остатка
+            cost_price = None
+            if db_write_off.warehouse_id:
+                cost_price = issue_stock(session, db_write_off.warehouse_id, item.material_id, item.quantity)
+            if cost_price is not None:
+                item.price = cost_price
+                item.amount = money(cost_price * item.quantity)
+            elif not item.amount and item.price and item.quantity:
+                item.amount = money(item.price * item.quantity)
+            if item.amount:
+                total_amount += item.amount
+        db_write_off.total_amount = total_amount
+        adjust_snapshots(session, (
+            (db_write_off.warehouse_id, item.material_id, db_write_off.write_off_date,
+             -item.quantity, -(item.amount or 0))
+            for item in db_write_off.items
+        ))
+
+    defer_write(db, post_stock)
     db.commit()
     db.refresh(db_write_off)
     return db_write_off
\ No newline at end of file
@@ -21,10 +21,10 @@ from app.models.personnel import (
     PersonnelHistoryAction,
 )
 from app.models.department import Department
+from app.services.department_tree import department_filter
 from pydantic import BaseModel, Field
 
 UPLOAD_DIR = Path(__file__).resolve().parents[3] / "uploads" / "personnel"
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 router = APIRouter()
 
@@ -177,6 +177,7 @@ def get_personnel(
     skip: int = 0,
     limit: int = 100,
     department_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
+    include_subtree: bool = Query(False, description="Включая дочерние подразделения"),
     status: Optional[str] = Query(None, description="Фильтр по статусу"),
     search: Optional[str] = Query(None, description="Поиск по ФИО, должности, табельному"),
     is_active: Optional[bool] = Query(None),
@@ -185,7 +186,7 @@ def get_personnel(
     """Получить список сотрудников"""
     q = db.query(PersonnelModel)
     if department_id is not None:
-        q = q.filter(PersonnelModel.department_id == department_id)
+        q = q.filter(department_filter(PersonnelModel.department_id, department_id, include_subtree))
     if status:
         q = q.filter(PersonnelModel.status == status)
     if is_active is not None:
@@ -87,28 +87,20 @@ class ProjectChange(ProjectChangeBase):
 def get_project_changes(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Получить список изменений проекта"""
     try:
-        from sqlalchemy import text
-        
-        # Используем raw SQL для обхода проблем с Enum
-        sql = """
-            SELECT id, project_id, change_type, change_number, title, description,
-                   justification, impact_volume, impact_cost, impact_schedule,
-                   related_document_id, related_construct_id, initiator, initiator_date,
-                   status, approved_date, implemented_date, file_path, notes,
-                   created_at, updated_at
-            FROM project_changes
-        """
-        params = {}
+        from sqlalchemy import select
         
+        m = ProjectChangeModel
+        stmt = select(
+            m.id, m.project_id, m.change_type, m.change_number, m.title, m.description,
+            m.justification, m.impact_volume, m.impact_cost, m.impact_schedule,
+            m.related_document_id, m.related_construct_id, m.initiator, m.initiator_date,
+            m.status, m.approved_date, m.implemented_date, m.file_path, m.notes,
+            m.created_at, m.updated_at,
+        )
         if project_id:
-            sql += " WHERE project_id = :project_id"
-            params["project_id"] = project_id
-        
-        sql += " LIMIT :limit OFFSET :skip"
-        params["limit"] = limit
-        params["skip"] = skip
+            stmt = stmt.where(m.project_id == project_id)
         
-        rows = db.execute(text(sql), params).fetchall()
+        rows = db.execute(stmt.order_by(m.id).offset(skip).limit(limit)).fetchall()
         
         if not rows:
             return []
@@ -117,17 +109,16 @@ def get_project_changes(project_id: Optional[int] = None, skip: int = 0, limit:
         change_ids = [row[0] for row in rows]
         approvals_map = {}
         if change_ids:
-            # Используем параметризованный запрос для безопасности
-            placeholders = ",".join([f":id{i}" for i in range(len(change_ids))])
-            approvals_sql = f"""
-                SELECT id, project_change_id, order_number, approver_role, approver_name,
-                       is_parallel, is_required, status, comment, approved_date,
-                       created_at, updated_at
-                FROM change_approvals
-                WHERE project_change_id IN ({placeholders})
-            """
-            approvals_params = {f"id{i}": change_ids[i] for i in range(len(change_ids))}
-            approvals_rows = db.execute(text(approvals_sql), approvals_params).fetchall()
+            a = ChangeApprovalModel
+            approvals_rows = db.execute(
+                select(
+                    a.id, a.project_change_id, a.order_number, a.approver_role, a.approver_name,
+                    a.is_parallel, a.is_required, a.status, a.comment, a.approved_date,
+                    a.created_at, a.updated_at,
+                )
+                .where(a.project_change_id.in_(change_ids))
+                .order_by(a.project_change_id, a.order_number)
+            ).fetchall()
             
             for app_row in approvals_rows:
                 change_id = app_row[1]
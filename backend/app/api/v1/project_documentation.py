@@ -58,26 +58,18 @@ class ProjectDocumentation(ProjectDocumentationBase):
 def get_project_documentation(project_id: Optional[int] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Получить список проектной документации"""
     try:
-        from sqlalchemy import text
-        
-        # Используем raw SQL для обхода проблем с Enum
-        sql = """
-            SELECT id, project_id, doc_type, name, number, version, development_date,
-                   developer, approved_by, approval_date, file_path, description,
-                   is_active, notes, created_at, updated_at
-            FROM project_documentation
-        """
-        params = {}
+        from sqlalchemy import select
         
+        m = ProjectDocumentationModel
+        stmt = select(
+            m.id, m.project_id, m.doc_type, m.name, m.number, m.version, m.development_date,
+            m.developer, m.approved_by, m.approval_date, m.file_path, m.description,
+            m.is_active, m.notes, m.created_at, m.updated_at,
+        )
         if project_id:
-            sql += " WHERE project_id = :project_id"
-            params["project_id"] = project_id
-        
-        sql += " LIMIT :limit OFFSET :skip"
-        params["limit"] = limit
-        params["skip"] = skip
+            stmt = stmt.where(m.project_id == project_id)
         
-        rows = db.execute(text(sql), params).fetchall()
+        rows = db.execute(stmt.order_by(m.id).offset(skip).limit(limit)).fetchall()
         
         if not rows:
             return []
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy import or_, func, select
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.models.project import Project
 from app.models.department import Department
 from app.models.personnel import Personnel as PersonnelModel, ProjectPersonnel, ProjectPersonnelRole
 from app.schemas.project import ProjectCreate, ProjectUpdate, Project as ProjectSchema, DepartmentInfo
 from app.schemas.common import PaginationMeta
+from app.services.department_tree import department_filter
 
 router = APIRouter()
 
@@ -80,26 +82,24 @@ def project_to_schema(project: Project) -> ProjectSchema:
 
 
 @router.get("/")
-def get_projects(
+async def get_projects(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     department_id: Optional[int] = None,
+    include_subtree: bool = False,
     work_type: Optional[str] = None,
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Получить список проектов с фильтрацией и пагинацией"""
-    # Базовый запрос с join для department
-    query = db.query(Project).outerjoin(Department, Project.department_id == Department.id)
-    
     # Применяем фильтры
     filters = []
     if status:
         filters.append(Project.status == status)
     if department_id:
-        filters.append(Project.department_id == department_id)
+        filters.append(department_filter(Project.department_id, department_id, include_subtree))
     if work_type:
         filters.append(Project.work_type == work_type)
     if is_active is not None:
@@ -114,66 +114,25 @@ def get_projects(
         )
         filters.append(search_filter)
     
-    if filters:
-        query = query.filter(and_(*filters))
-    
     # Получаем общее количество для метаданных
-    total = query.count()
+    total = await db.scalar(select(func.count(Project.id)).where(*filters))
     
+    # Подразделение загружается тем же запросом (join), без отдельных запросов на проект.
     # Сортировка: сначала активные, потом по дате создания (новые первые)
-    query = query.order_by(Project.is_active.desc(), Project.created_at.desc())
-    
-    # Применяем пагинацию
-    projects = query.offset(skip).limit(limit).all()
-    
-    # Преобразуем проекты в схемы с department
-    result = []
-    for p in projects:
-        try:
-            department_info = None
-            if p.department_id and hasattr(p, 'department') and p.department:
-                department_info = DepartmentInfo(
-                    id=p.department.id,
-                    name=p.department.name,
-                    code=getattr(p.department, 'code', None)
-                )
-            elif p.department_id:
-                # Загружаем department отдельно, если не загружен через join
-                dept = db.query(Department).filter(Department.id == p.department_id).first()
-                if dept:
-                    department_info = DepartmentInfo(
-                        id=dept.id,
-                        name=dept.name,
-                        code=getattr(dept, 'code', None)
-                    )
-            
-            result.append(ProjectSchema(
-                id=p.id,
-                name=p.name,
-                code=p.code,
-                address=p.address,
-                customer=p.customer,
-                contractor=p.contractor,
-                description=p.description,
-                work_type=p.work_type,
-                department_id=p.department_id,
-                start_date=p.start_date,
-                end_date=p.end_date,
-                status=p.status,
-                is_active=p.is_active,
-                created_at=p.created_at,
-                updated_at=p.updated_at,
-                department=department_info
-            ))
-        except Exception as e:
-            import traceback
-            print(f"Error creating schema for project {p.id}: {e}")
-            traceback.print_exc()
-            raise
+    stmt = (
+        select(Project)
+        .outerjoin(Project.department)
+        .options(contains_eager(Project.department))
+        .where(*filters)
+        .order_by(Project.is_active.desc(), Project.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    projects = (await db.scalars(stmt)).all()
     
     # Возвращаем стандартизированный формат с метаданными
     return {
-        "data": result,
+        "data": [project_to_schema(p) for p in projects],
         "meta": PaginationMeta(
             total=total,
             skip=skip,
@@ -185,41 +144,14 @@ def get_projects(
 
 
 @router.get("/{project_id}", response_model=ProjectSchema)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+async def get_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """Получить проект по ID"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.scalar(
+        select(Project).options(joinedload(Project.department)).where(Project.id == project_id)
+    )
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден")
-    
-    # Загружаем department
-    department_info = None
-    if project.department_id:
-        dept = db.query(Department).filter(Department.id == project.department_id).first()
-        if dept:
-            department_info = DepartmentInfo(
-                id=dept.id,
-                name=dept.name,
-                code=getattr(dept, 'code', None)
-            )
-    
-    return ProjectSchema(
-        id=project.id,
-        name=project.name,
-        code=project.code,
-        address=project.address,
-        customer=project.customer,
-        contractor=project.contractor,
-        description=project.description,
-        work_type=project.work_type,
-        department_id=project.department_id,
-        start_date=project.start_date,
-        end_date=project.end_date,
-        status=project.status,
-        is_active=project.is_active,
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-        department=department_info
-    )
+    return project_to_schema(project)
 
 
 @router.post("/", response_model=ProjectSchema)
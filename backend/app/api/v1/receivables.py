@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
 from datetime import date, datetime, timedelta
+import io
 from app.db.database import get_db
 from app.models.receivables import (
     Receivable as ReceivableModel,
     ReceivablePayment as ReceivablePaymentModel,
     ReceivableNotification as ReceivableNotificationModel,
     CollectionAction as CollectionActionModel,
+    ReceivableAging as ReceivableAgingModel,
+    BankStatementLine as BankStatementLineModel,
     ReceivableStatus, NotificationType
 )
 from app.models.invoice import Invoice as InvoiceModel
+from app.services.bank_statements import import_statement, iter_client_bank, iter_csv, match_queued_line
+from app.services.receivables import overview_cache, receivables_overview
+from app.services.receivables_aging import run_aging
 from pydantic import BaseModel
 
 router = APIRouter()
 
-
 class ReceivablePaymentBase(BaseModel):
     payment_date: date
     payment_number: Optional[str] = None
@@ -124,6 +129,70 @@ class Receivable(ReceivableBase):
         from_attributes = True
 
 
+class ReceivableAgingRow(BaseModel):
+    project_id: int
+    customer_name: str
+    as_of: date
+    receivables_count: int
+    bucket_0_30: Decimal
+    bucket_31_60: Decimal
+    bucket_61_90: Decimal
+    bucket_90_plus: Decimal
+    total_remaining: Decimal
+
+    class Config:
+        from_attributes = True
+
+
+class AgingRecomputeResult(BaseModel):
+    remaining_updated: int
+    days_overdue_updated: int
+    status_updated: int
+    aging_rows: int
+
+
+class BankStatementImportResult(BaseModel):
+    statement_file: Optional[str] = None
+    lines: int
+    matched: int
+    matched_invoices: int
+    duplicates: int
+    unmatched: int
+    errors: List[dict] = []
+
+
+class BankStatementLine(BaseModel):
+    id: int
+    statement_file: Optional[str] = None
+    line_number: Optional[int] = None
+    document_number: Optional[str] = None
+    document_date: date
+    amount: Decimal
+    payer_name: Optional[str] = None
+    payer_inn: Optional[str] = None
+    payer_account: Optional[str] = None
+    purpose: Optional[str] = None
+    status: str
+    receivable_id: Optional[int] = None
+    invoice_id: Optional[int] = None
+    payment_id: Optional[int] = None
+    resolved_by: Optional[str] = None
+    resolved_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BankStatementLineMatch(BaseModel):
+    receivable_id: int
+    resolved_by: Optional[str] = None
+
+
+class BankStatementLineDismiss(BaseModel):
+    resolved_by: Optional[str] = None
+
+
 @router.get("/", response_model=List[Receivable])
 def get_receivables(
     project_id: Optional[int] = None,
@@ -172,6 +241,7 @@ def create_receivable(receivable: ReceivableCreate, db: Session = Depends(get_db
     db_receivable = ReceivableModel(**receivable_data)
     db.add(db_receivable)
     db.commit()
+    overview_cache.invalidate()
     db.refresh(db_receivable)
     return db_receivable
 
@@ -205,6 +275,7 @@ def add_payment(receivable_id: int, payment: ReceivablePaymentCreate, db: Sessio
             invoice.payment_number = payment.payment_number
     
     db.commit()
+    overview_cache.invalidate()
     db.refresh(db_payment)
     return db_payment
 
@@ -255,6 +326,7 @@ def create_collection_action(receivable_id: int, action: CollectionActionCreate,
         receivable.status = ReceivableStatus.IN_COLLECTION
     
     db.commit()
+    overview_cache.invalidate()
     db.refresh(db_action)
     return db_action
 
@@ -294,22 +366,98 @@ def get_receivable_analytics(receivable_id: int, db: Session = Depends(get_db)):
 
 @router.get("/analytics/overview")
 def get_receivables_overview(db: Session = Depends(get_db)):
-    """Получить общую аналитику по дебиторской задолженности"""
-    all_receivables = db.query(ReceivableModel).all()
-    
-    total_amount = sum(r.total_amount for r in all_receivables)
-    total_paid = sum(r.paid_amount for r in all_receivables)
-    total_remaining = total_amount - total_paid
-    
-    overdue_count = sum(1 for r in all_receivables if r.days_overdue > 0)
-    overdue_amount = sum(r.remaining_amount or 0 for r in all_receivables if r.days_overdue > 0)
-    
-    return {
-        "total_receivables": len(all_receivables),
-        "total_amount": str(total_amount),
-        "total_paid": str(total_paid),
-        "total_remaining": str(total_remaining),
-        "overdue_count": overdue_count,
-        "overdue_amount": str(overdue_amount),
-        "payment_percentage": str((total_paid / total_amount * 100) if total_amount > 0 else 0)
-    }
\ No newline at end of file
+    """Получить общую аналитику по дебиторской задолженности (агрегаты SQL + разрезы)"""
+    return overview_cache.get_or_set("overview", lambda: receivables_overview(db))
+
+
+@router.get("/analytics/aging", response_model=List[ReceivableAgingRow])
+def get_receivables_aging(
+    project_id: Optional[int] = None,
+    customer_name: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Возрастная структура задолженности по заказчикам и проектам (по данным ночного пересчета)"""
+    query = db.query(ReceivableAgingModel)
+    if project_id:
+        query = query.filter(ReceivableAgingModel.project_id == project_id)
+    if customer_name:
+        query = query.filter(ReceivableAgingModel.customer_name == customer_name)
+    return query.order_by(ReceivableAgingModel.total_remaining.desc()).all()
+
+
+@router.post("/analytics/aging/recompute", response_model=AgingRecomputeResult)
+def recompute_receivables_aging(db: Session = Depends(get_db)):
+    """Пересчитать просрочку, статусы и возрастную структуру задолженности вне расписания"""
+    result = run_aging(db)
+    overview_cache.invalidate()
+    return result
+
+
+@router.post("/bank-statements/import", response_model=BankStatementImportResult)
+def import_bank_statement(
+    format: str = Form("1c", description="Формат выписки: 1c (1CClientBankExchange) или csv"),
+    encoding: Optional[str] = Form(None, description="Кодировка файла (по умолчанию cp1251 для 1c, utf-8 для csv)"),
+    account: Optional[str] = Form(None, description="Расчетный счет получателя (только для 1c)"),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """Загрузить банковскую выписку: сопоставить поступления с задолженностями и провести их"""
+    if format not in ("1c", "csv"):
+        raise HTTPException(status_code=400, detail="Формат выписки должен быть 1c или csv")
+    encoding = encoding or ("cp1251" if format == "1c" else "utf-8-sig")
+    try:
+        stream = io.TextIOWrapper(file.file, encoding=encoding, newline="")
+        documents = iter_client_bank(stream, account) if format == "1c" else iter_csv(stream)
+        result = import_statement(db, documents, file.filename)
+    except (UnicodeDecodeError, LookupError, ValueError) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Не удалось прочитать выписку: {e}")
+    overview_cache.invalidate()
+    return result
+
+
+@router.get("/bank-statements/review", response_model=List[BankStatementLine])
+def get_bank_statement_review_queue(
+    status: Optional[str] = "pending",
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    """Очередь разбора: строки выписок, не сопоставленные автоматически"""
+    query = db.query(BankStatementLineModel)
+    if status:
+        query = query.filter(BankStatementLineModel.status == status)
+    return query.order_by(BankStatementLineModel.document_date, BankStatementLineModel.id).offset(skip).limit(limit).all()
+
+
+def _get_pending_line(db: Session, line_id: int) -> BankStatementLineModel:
+    line = db.query(BankStatementLineModel).filter(BankStatementLineModel.id == line_id).first()
+    if not line:
+        raise HTTPException(status_code=404, detail="Строка выписки не найдена")
+    if line.status != "pending":
+        raise HTTPException(status_code=400, detail="Строка выписки уже разобрана")
+    return line
+
+
+@router.post("/bank-statements/review/{line_id}/match", response_model=ReceivablePayment)
+def match_bank_statement_line(line_id: int, data: BankStatementLineMatch, db: Session = Depends(get_db)):
+    """Провести строку выписки по выбранной задолженности"""
+    line = _get_pending_line(db, line_id)
+    receivable = db.query(ReceivableModel).filter(ReceivableModel.id == data.receivable_id).first()
+    if not receivable:
+        raise HTTPException(status_code=404, detail="Задолженность не найдена")
+    payment = match_queued_line(db, line, receivable, data.resolved_by)
+    overview_cache.invalidate()
+    return payment
+
+
+@router.post("/bank-statements/review/{line_id}/dismiss", response_model=BankStatementLine)
+def dismiss_bank_statement_line(line_id: int, data: BankStatementLineDismiss, db: Session = Depends(get_db)):
+    """Исключить строку выписки из разбора (платеж не относится к дебиторской задолженности)"""
+    line = _get_pending_line(db, line_id)
+    line.status = "dismissed"
+    line.resolved_by = data.resolved_by
+    line.resolved_at = datetime.now()
+    db.commit()
+    db.refresh(line)
+    return line
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
@@ -11,6 +11,7 @@ from app.models.references import (
     PaymentType as PaymentTypeModel,
     MaterialKind as MaterialKindModel,
 )
+from app.services.reference_cache import reference_cache
 
 router = APIRouter()
 
@@ -94,8 +95,11 @@ class MaterialKind(MaterialKindBase):
 
 
 @router.get("/organizations/", response_model=List[Organization])
-def list_organizations(db: Session = Depends(get_db)):
-    return db.query(OrganizationModel).filter(OrganizationModel.is_active == True).order_by(OrganizationModel.name).all()  # noqa: E712
+def list_organizations(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.response(
+        request, db, "organizations", List[Organization],
+        lambda: db.query(OrganizationModel).filter(OrganizationModel.is_active == True).order_by(OrganizationModel.name).all(),  # noqa: E712
+    )
 
 
 @router.post("/organizations/", response_model=Organization)
@@ -108,8 +112,11 @@ def create_organization(payload: OrganizationCreate, db: Session = Depends(get_d
 
 
 @router.get("/counterparties/", response_model=List[Counterparty])
-def list_counterparties(db: Session = Depends(get_db)):
-    return db.query(CounterpartyModel).filter(CounterpartyModel.is_active == True).order_by(CounterpartyModel.name).all()  # noqa: E712
+def list_counterparties(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.response(
+        request, db, "counterparties", List[Counterparty],
+        lambda: db.query(CounterpartyModel).filter(CounterpartyModel.is_active == True).order_by(CounterpartyModel.name).all(),  # noqa: E712
+    )
 
 
 @router.post("/counterparties/", response_model=Counterparty)
@@ -122,8 +129,11 @@ def create_counterparty(payload: CounterpartyCreate, db: Session = Depends(get_d
 
 
 @router.get("/payment-types/", response_model=List[PaymentType])
-def list_payment_types(db: Session = Depends(get_db)):
-    return db.query(PaymentTypeModel).filter(PaymentTypeModel.is_active == True).order_by(PaymentTypeModel.name).all()  # noqa: E712
+def list_payment_types(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.response(
+        request, db, "payment_types", List[PaymentType],
+        lambda: db.query(PaymentTypeModel).filter(PaymentTypeModel.is_active == True).order_by(PaymentTypeModel.name).all(),  # noqa: E712
+    )
 
 
 @router.post("/payment-types/", response_model=PaymentType)
@@ -136,8 +146,11 @@ def create_payment_type(payload: PaymentTypeCreate, db: Session = Depends(get_db
 
 
 @router.get("/material-kinds/", response_model=List[MaterialKind])
-def list_material_kinds(db: Session = Depends(get_db)):
-    return db.query(MaterialKindModel).filter(MaterialKindModel.is_active == True).order_by(MaterialKindModel.name).all()  # noqa: E712
+def list_material_kinds(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.response(
+        request, db, "material_kinds", List[MaterialKind],
+        lambda: db.query(MaterialKindModel).filter(MaterialKindModel.is_active == True).order_by(MaterialKindModel.name).all(),  # noqa: E712
+    )
 
 
 @router.post("/material-kinds/", response_model=MaterialKind)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
+import io
 from app.db.database import get_db
 from app.models.standard_rate import StandardRate as StandardRateModel
+from app.services.standard_rates import import_rates, iter_csv_rows, rate_index
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -12,6 +15,7 @@ router = APIRouter()
 
 class StandardRateBase(BaseModel):
     code: str
+    catalog_version: str = ""
     name: str
     unit: Optional[str] = None
     materials_cost: Decimal = 0
@@ -30,6 +34,7 @@ class StandardRateCreate(StandardRateBase):
 
 class StandardRateUpdate(BaseModel):
     code: Optional[str] = None
+    catalog_version: Optional[str] = None
     name: Optional[str] = None
     unit: Optional[str] = None
     materials_cost: Optional[Decimal] = None
@@ -51,17 +56,74 @@ class StandardRate(StandardRateBase):
         from_attributes = True
 
 
+class StandardRateLookup(BaseModel):
+    id: int
+    code: str
+    name: str
+    unit: Optional[str] = None
+    total_cost: Optional[Decimal] = None
+    catalog_version: str
+
+
+class StandardRateImportErrorRow(BaseModel):
+    line: int
+    error: str
+
+
+class StandardRateImportResult(BaseModel):
+    catalog_version: str
+    processed: int
+    batches: int
+    errors: List[StandardRateImportErrorRow] = []
+    truncated: int = 0
+
+
 @router.get("/", response_model=List[StandardRate])
-def get_standard_rates(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_standard_rates(
+    skip: int = 0,
+    limit: int = 100,
+    catalog_version: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """Получить список нормативных расценок"""
-    rates = db.query(StandardRateModel).offset(skip).limit(limit).all()
+    query = db.query(StandardRateModel)
+    if catalog_version is not None:
+        query = query.filter(StandardRateModel.catalog_version == catalog_version)
+    rates = query.order_by(StandardRateModel.id).offset(skip).limit(limit).all()
     return rates
 
 
+@router.get("/lookup", response_model=List[StandardRateLookup])
+def lookup_standard_rates(
+    prefix: str = Query(..., min_length=1, description="Начало кода расценки"),
+    catalog_version: Optional[str] = Query(None, description="Фильтр по версии сборника"),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """Поиск активных расценок по префиксу кода (автодополнение, индекс в памяти)"""
+    return rate_index.lookup(db, prefix, limit=limit, catalog_version=catalog_version)
+
+
+@router.post("/import", response_model=StandardRateImportResult)
+def import_standard_rates(
+    catalog_version: str = Form(..., description="Версия сборника, например ГЭСН-2022"),
+    encoding: str = Form("utf-8-sig"),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """Загрузить сборник расценок из CSV (upsert по коду и версии сборника)"""
+    try:
+        stream = io.TextIOWrapper(file.file, encoding=encoding, newline="")
+        return import_rates(db, iter_csv_rows(stream), catalog_version.strip())
+    except (UnicodeDecodeError, LookupError) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Не удалось прочитать файл: {e}")
+
+
 @router.get("/{rate_id}", response_model=StandardRate)
 def get_standard_rate(rate_id: int, db: Session = Depends(get_db)):
     """Получить расценку по ID"""
-    rate = db.query(StandardRate).filter(StandardRate.id == rate_id).first()
+    rate = db.query(StandardRateModel).filter(StandardRateModel.id == rate_id).first()
     if not rate:
         raise HTTPException(status_code=404, detail="Расценка не найдена")
     return rate
@@ -78,15 +140,20 @@ def create_standard_rate(rate: StandardRateCreate, db: Session = Depends(get_db)
     
     db_rate = StandardRateModel(**rate_data)
     db.add(db_rate)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Расценка с таким кодом уже есть в этой версии сборника")
     db.refresh(db_rate)
+    rate_index.invalidate()
     return db_rate
 
 
 @router.put("/{rate_id}", response_model=StandardRate)
 def update_standard_rate(rate_id: int, rate: StandardRateUpdate, db: Session = Depends(get_db)):
     """Обновить нормативную расценку"""
-    db_rate = db.query(StandardRate).filter(StandardRate.id == rate_id).first()
+    db_rate = db.query(StandardRateModel).filter(StandardRateModel.id == rate_id).first()
     if not db_rate:
         raise HTTPException(status_code=404, detail="Расценка не найдена")
     
@@ -98,17 +165,23 @@ def update_standard_rate(rate_id: int, rate: StandardRateUpdate, db: Session = D
     if any(k in update_data for k in ["materials_cost", "labor_cost", "equipment_cost"]):
         db_rate.total_cost = (db_rate.materials_cost + db_rate.labor_cost + db_rate.equipment_cost)
     
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Расценка с таким кодом уже есть в этой версии сборника")
     db.refresh(db_rate)
+    rate_index.invalidate()
     return db_rate
 
 
 @router.delete("/{rate_id}")
 def delete_standard_rate(rate_id: int, db: Session = Depends(get_db)):
     """Удалить нормативную расценку"""
-    rate = db.query(StandardRate).filter(StandardRate.id == rate_id).first()
+    rate = db.query(StandardRateModel).filter(StandardRateModel.id == rate_id).first()
     if not rate:
         raise HTTPException(status_code=404, detail="Расценка не найдена")
     db.delete(rate)
     db.commit()
+    rate_index.invalidate()
     return {"message": "Расценка удалена"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.database import get_db
@@ -8,9 +8,10 @@ from app.models.user import (
     UserPermission as UserPermissionModel,
     RolePermission as RolePermissionModel,
     Role as RoleModel,
-    UserRole,
 )
 from app.models.personnel import Personnel as PersonnelModel
+from app.services.department_tree import department_filter
+from app.services.reference_cache import reference_cache
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -138,11 +139,12 @@ def _user_to_response(u: UserModel) -> User:
 
 
 @router.get("/users/", response_model=List[User])
-def get_users(department_id: Optional[int] = None, role: Optional[str] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Получить список пользователей"""
+def get_users(department_id: Optional[int] = None, include_subtree: bool = False, role: Optional[str] = None,
+              skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Получить список пользователей (include_subtree — включая дочерние подразделения)"""
     query = db.query(UserModel)
     if department_id:
-        query = query.filter(UserModel.department_id == department_id)
+        query = query.filter(department_filter(UserModel.department_id, department_id, include_subtree))
     if role:
         query = query.filter(UserModel.role == role)
     users = query.offset(skip).limit(limit).all()
@@ -212,10 +214,13 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/permissions/", response_model=List[Permission])
-def get_permissions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_permissions(request: Request, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Получить список разрешений"""
-    permissions = db.query(PermissionModel).offset(skip).limit(limit).all()
-    return permissions
+    return reference_cache.response(
+        request, db, "permissions", List[Permission],
+        lambda: db.query(PermissionModel).offset(skip).limit(limit).all(),
+        params=(skip, limit),
+    )
 
 
 @router.post("/permissions/", response_model=Permission)
@@ -253,41 +258,13 @@ def get_user_permissions(user_id: int, db: Session = Depends(get_db)):
     return permissions
 
 
-# Наименования ролей по умолчанию (для сида)
-_ROLE_DEFAULT_NAMES = {
-    "admin": "Администратор",
-    "pto_head": "Руководитель ПТО",
-    "pto_engineer": "Инженер ПТО",
-    "site_manager": "Начальник участка",
-    "foreman": "Прораб",
-    "master": "Мастер",
-    "storekeeper": "Заведующий складом",
-    "operator": "Оператор СМУ",
-    "geodesist": "Геодезист",
-    "oge_head": "Руководитель ОГЭ",
-    "ogm_head": "Руководитель ОГМ",
-    "architect": "Архитектор",
-    "sales_manager": "Менеджер по продажам",
-    "accountant": "Бухгалтер",
-    "debt_collector": "Отдел дебиторки",
-}
-
-
-def _ensure_roles_seeded(db: Session) -> None:
-    """Заполнить таблицу roles из UserRole, если она пуста."""
-    if db.query(RoleModel).count() > 0:
-        return
-    for role_enum in UserRole:
-        name = _ROLE_DEFAULT_NAMES.get(role_enum.value, role_enum.value)
-        db.add(RoleModel(code=role_enum.value, name=name, is_active=True))
-    db.commit()
-
-
 @router.get("/roles/", response_model=List[RoleOut])
-def get_roles(db: Session = Depends(get_db)):
-    """Список ролей (справочник). При первом запросе заполняется из enum."""
-    _ensure_roles_seeded(db)
-    return db.query(RoleModel).filter(RoleModel.is_active == True).order_by(RoleModel.id).all()
+def get_roles(request: Request, db: Session = Depends(get_db)):
+    """Список ролей (справочник). Роли по умолчанию добавляет миграция 0003."""
+    return reference_cache.response(
+        request, db, "roles", List[RoleOut],
+        lambda: db.query(RoleModel).filter(RoleModel.is_active == True).order_by(RoleModel.id).all(),
+    )
 
 
 @router.post("/roles/", response_model=RoleOut)
@@ -304,9 +281,14 @@ def create_role(role: RoleCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/roles/permissions", response_model=List[RolePermissions])
-def get_roles_permissions(db: Session = Depends(get_db)):
+def get_roles_permissions(request: Request, db: Session = Depends(get_db)):
     """Получить матрицу ролей и разрешений (привязка прав к ролям)."""
-    _ensure_roles_seeded(db)
+    return reference_cache.response(
+        request, db, "role_permissions", List[RolePermissions], lambda: _roles_permissions(db)
+    )
+
+
+def _roles_permissions(db: Session) -> List[RolePermissions]:
     rows = db.query(RolePermissionModel).all()
     mapping: dict[str, set[int]] = {}
     for r in rows:
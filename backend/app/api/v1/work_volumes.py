@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from decimal import Decimal
-from app.db.database import get_db
+from app.db.database import get_db, get_write_db
 from app.models.work_volume import WorkVolume as WorkVolumeModel, WorkVolumeEntry as WorkVolumeEntryModel
 from pydantic import BaseModel
 from datetime import date, datetime
@@ -102,7 +103,7 @@ def get_work_volume(volume_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=WorkVolume)
-def create_work_volume(volume: WorkVolumeCreate, db: Session = Depends(get_db)):
+def create_work_volume(volume: WorkVolumeCreate, db: Session = Depends(get_write_db)):
     """Создать запись объемов работ (объектно-центрированный подход)"""
     # Валидация: если указан stage_id, проверяем что этап принадлежит проекту
     if volume.stage_id:
@@ -125,7 +126,7 @@ def create_work_volume(volume: WorkVolumeCreate, db: Session = Depends(get_db)):
 
 
 @router.put("/{volume_id}", response_model=WorkVolume)
-def update_work_volume(volume_id: int, volume: WorkVolumeUpdate, db: Session = Depends(get_db)):
+def update_work_volume(volume_id: int, volume: WorkVolumeUpdate, db: Session = Depends(get_write_db)):
     """Обновить объем работ"""
     db_volume = db.query(WorkVolumeModel).filter(WorkVolumeModel.id == volume_id).first()
     if not db_volume:
@@ -145,7 +146,7 @@ def update_work_volume(volume_id: int, volume: WorkVolumeUpdate, db: Session = D
 
 
 @router.post("/{volume_id}/entries", response_model=WorkVolumeEntry)
-def add_work_volume_entry(volume_id: int, entry: WorkVolumeEntryCreate, db: Session = Depends(get_db)):
+def add_work_volume_entry(volume_id: int, entry: WorkVolumeEntryCreate, db: Session = Depends(get_write_db)):
     """Добавить запись фактического объема"""
     work_volume = db.query(WorkVolumeModel).filter(WorkVolumeModel.id == volume_id).first()
     if not work_volume:
@@ -160,13 +161,15 @@ def add_work_volume_entry(volume_id: int, entry: WorkVolumeEntryCreate, db: Sess
     db_entry = WorkVolumeEntryModel(work_volume_id=volume_id, **entry.model_dump())
     db.add(db_entry)
     
-    # Обновление фактического объема
-    work_volume.actual_volume = new_total
+    # Обновление фактического объема выражением в UPDATE: параллельные записи
+    # не теряют друг друга (накопленный итог читается в транзакции записи)
+    total = func.coalesce(WorkVolumeModel.actual_volume, 0) + entry.actual_volume
+    work_volume.actual_volume = total
     if work_volume.planned_volume > 0:
-        work_volume.completed_percentage = (new_total / work_volume.planned_volume) * 100
+        work_volume.completed_percentage = total / WorkVolumeModel.planned_volume * 100
     
     if work_volume.estimated_price:
-        work_volume.actual_amount = new_total * work_volume.estimated_price
+        work_volume.actual_amount = total * WorkVolumeModel.estimated_price
     
     db.commit()
     db.refresh(db_entry)
@@ -174,7 +177,7 @@ def add_work_volume_entry(volume_id: int, entry: WorkVolumeEntryCreate, db: Sess
 
 
 @router.delete("/{volume_id}")
-def delete_work_volume(volume_id: int, db: Session = Depends(get_db)):
+def delete_work_volume(volume_id: int, db: Session = Depends(get_write_db)):
     """Удалить объем работ"""
     volume = db.query(WorkVolumeModel).filter(WorkVolumeModel.id == volume_id).first()
     if not volume:
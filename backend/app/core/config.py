@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -9,6 +9,64 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./pto.db"
+    # Реплика для чтения (PostgreSQL): GET-запросы читают из нее, запись — всегда в DATABASE_URL
+    DATABASE_READ_URL: Optional[str] = None
+    # Пул соединений серверной СУБД (QueuePool); для SQLite не используется
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_S: int = 30
+    DB_POOL_RECYCLE_S: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Схема создается миграциями (alembic upgrade head). True — create_all при старте,
+    # только для разработки и тестов на пустой БД
+    AUTO_CREATE_SCHEMA: bool = False
+
+    # Профиль SQLite: применяется к каждому соединению (app.db.database).
+    # WAL — читатели не ждут писателя; NORMAL — fsync только на контрольной точке WAL
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_FOREIGN_KEYS: bool = True
+    # Очередь записи (app.db.writer): фиксации сессий get_write_db выполняет один писатель
+    # пачками до WRITE_QUEUE_BATCH; при переполнении очереди запрос получает 503
+    WRITE_QUEUE_ENABLED: bool = False
+    WRITE_QUEUE_SIZE: int = 256
+    WRITE_QUEUE_BATCH: int = 32
+    WRITE_QUEUE_TIMEOUT_S: float = 30.0
+    
+    # Кэш справочников (app.services.reference_cache). Хранилище версий: local — в памяти
+    # процесса (изменения других воркеров видны через REFERENCE_CACHE_TTL_S), db — таблица
+    # reference_versions, общая для всех воркеров. REFERENCE_CACHE_TTL_S=0 — без кэша ответов
+    REFERENCE_CACHE_BACKEND: str = "local"
+    REFERENCE_CACHE_TTL_S: float = 60.0
+    REFERENCE_CACHE_POLL_S: float = 1.0
+    # Предел числа сохраненных ответов (разные skip/limit — разные записи)
+    REFERENCE_CACHE_MAX_ENTRIES: int = 256
+    
+    # Производственный календарь: нерабочие праздничные дни с постоянной датой
+    # («ММ-ДД Наименование»), которыми POST /calendar/holidays/national заполняет год.
+    # По умолчанию — ст. 113 ТК КР; Орозо айт и Курман айт (по лунному календарю)
+    # и переносы выходных объявляются ежегодно и вносятся в календарь отдельно
+    NATIONAL_HOLIDAYS: List[str] = [
+        "01-01 Новый год",
+        "01-07 Рождество Христово",
+        "02-23 День защитника Отечества",
+        "03-08 Международный женский день",
+        "03-21 Нооруз",
+        "04-07 День народной Апрельской революции",
+        "05-01 Праздник труда",
+        "05-05 День Конституции Кыргызской Республики",
+        "05-09 День Победы",
+        "08-31 День независимости",
+        "11-07 Дни истории и памяти предков",
+        "11-08 Дни истории и памяти предков",
+    ]
+    
+    # Модули API через запятую (см. app.api.modules), «*» — все.
+    # Например, для объектного экземпляра: ENABLED_MODULES=document_roadmap,personnel
+    ENABLED_MODULES: str = "*"
     
     # CORS
     CORS_ORIGINS: List[str] = [
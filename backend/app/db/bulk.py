@@ -0,0 +1,22 @@
+"""Вспомогательные функции для пакетной записи (batched insert / upsert)."""
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(bind, table):
+    """INSERT с поддержкой ON CONFLICT для текущего диалекта (SQLite / PostgreSQL)."""
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[List]:
+    """Разбить поток строк на пачки фиксированного размера."""
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
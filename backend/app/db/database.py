@@ -1,20 +1,152 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.db.routing import RoutingSession
+from app.db.writer import QueuedWriteSession, WriteQueue
 
-# Для SQLite нужен check_same_thread=False
-connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def sqlite_pragmas(config=settings) -> list:
+    """PRAGMA профиля SQLite из настроек, в порядке применения."""
+    return [
+        f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}",
+        # Отрицательное значение — размер в КБ, а не в страницах
+        f"PRAGMA cache_size=-{int(config.SQLITE_CACHE_SIZE_KB)}",
+        f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA foreign_keys={'ON' if config.SQLITE_FOREIGN_KEYS else 'OFF'}",
+    ]
+
+
+def apply_sqlite_profile(engine, pragmas=None):
+    """Выполнять PRAGMA профиля на каждом новом соединении пула."""
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+# Асинхронные драйверы для синхронных URL (асинхронный движок строится по тому же DATABASE_URL)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+
+
+def async_url(url: str) -> URL:
+    """URL для асинхронного движка: драйвер заменяется на асинхронный, если он синхронный."""
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.drivername)
+    return url.set(drivername=driver) if driver else url
+
+
+def _engine_options(url: str, config=settings) -> dict:
+    """Параметры движка: для SQLite — check_same_thread, для серверных СУБД — пул из настроек."""
+    if url.startswith("sqlite"):
+        # Для SQLite нужен check_same_thread=False
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT_S,
+        "pool_recycle": config.DB_POOL_RECYCLE_S,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+
+def create_db_engine(url: str, config=settings):
+    """Движок БД: для SQLite — профиль PRAGMA, для серверных СУБД — QueuePool из настроек."""
+    options = _engine_options(url, config)
+    if not url.startswith("sqlite"):
+        options["poolclass"] = QueuePool
+    db_engine = create_engine(url, **options)
+    if db_engine.dialect.name == "sqlite":
+        apply_sqlite_profile(db_engine, sqlite_pragmas(config))
+    return db_engine
+
+
+def create_async_db_engine(url: str, config=settings) -> AsyncEngine:
+    """Асинхронный движок с теми же настройками пула и профилем SQLite."""
+    db_engine = create_async_engine(async_url(url), **_engine_options(url, config))
+    if db_engine.dialect.name == "sqlite":
+        apply_sqlite_profile(db_engine.sync_engine, sqlite_pragmas(config))
+    return db_engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
+read_engine = create_db_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine,
+    class_=type("ReplicaRoutingSession", (RoutingSession,), {"replica": read_engine}),
+)
+
+# Асинхронные сессии для async-эндпоинтов (get_async_db); чтение GET — из реплики, как у SessionLocal
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+async_read_engine = create_async_db_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+# Синхронный класс сессий под AsyncSession: на нем же регистрируются обработчики событий сессии
+AsyncSyncSession = type(
+    "AsyncReplicaRoutingSession", (RoutingSession,),
+    {"replica": async_read_engine.sync_engine if async_read_engine is not None else None},
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=AsyncSyncSession,
+)
+
+# Сессии записи через очередь одного писателя (только SQLite и WRITE_QUEUE_ENABLED)
+write_queue = None
+WriteSessionLocal = SessionLocal
+if engine.dialect.name == "sqlite" and settings.WRITE_QUEUE_ENABLED:
+    write_queue = WriteQueue(
+        engine,
+        maxsize=settings.WRITE_QUEUE_SIZE,
+        batch_size=settings.WRITE_QUEUE_BATCH,
+        timeout=settings.WRITE_QUEUE_TIMEOUT_S,
+    )
+    WriteSession = type("WriteSession", (QueuedWriteSession,), {"write_queue": write_queue})
+    WriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=WriteSession)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency для получения сессии БД"""
+def get_db(request: Request = None):
+    """Dependency для получения сессии БД (GET/HEAD читают из реплики, если она задана)"""
     db = SessionLocal()
+    if request is not None and request.method in ("GET", "HEAD"):
+        db.use_replica = True
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_write_db():
+    """Dependency для изменяющих эндпоинтов: фиксация через очередь записи, если она включена"""
+    db = WriteSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request = None):
+    """Dependency для async-эндпоинтов: AsyncSession, запросы не блокируют цикл событий"""
+    async with AsyncSessionLocal() as db:
+        if request is not None and request.method in ("GET", "HEAD"):
+            db.sync_session.use_replica = True
+        yield db
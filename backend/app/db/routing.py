@@ -0,0 +1,25 @@
+"""Сессия с чтением из реплики.
+
+Сессия из get_db для GET/HEAD-запросов читает через движок реплики (DATABASE_READ_URL).
+Запись (flush, INSERT/UPDATE/DELETE через execute) всегда идет в основную БД; после
+первой записи сессия до закрытия читает тоже из основной — обработчик видит свои
+изменения, а не отстающую реплику.
+"""
+from sqlalchemy.orm import Session
+
+
+class RoutingSession(Session):
+    """Сессия, направляющая чтение в реплику, пока не было записи."""
+
+    replica = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_replica = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.use_replica = False
+        elif self.use_replica and self.replica is not None:
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
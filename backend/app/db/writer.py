@@ -0,0 +1,294 @@
+"""Очередь записи для SQLite: один писатель и групповая фиксация.
+
+SQLite допускает одну пишущую транзакцию на файл. При всплеске записей каждый запрос
+со своей транзакцией ждет блокировку в busy-обработчике и может получить
+«database is locked». Сессии из get_write_db вместо этого передают свою фиксацию
+в очередь с ограниченной длиной; поток-писатель берет из нее пачку сессий, в одной
+транзакции (BEGIN IMMEDIATE) сбрасывает изменения каждой в свою точку сохранения
+и фиксирует пачку одним COMMIT. Ошибка одной сессии откатывает только её точку
+сохранения. Чтение идет через обычные соединения пула — в WAL читатели пишущего
+не ждут.
+
+Обработчики не меняются: db.add()/db.commit()/db.refresh() работают как с get_db.
+Если обработчик пишет до фиксации (явный flush(), пакетный UPDATE через execute),
+сессия переходит в монопольный режим: берет блокировку писателя и пишет в своем
+соединении до commit/rollback. Чтобы такие выражения (счетчики остатков, вставка
+пакета строк) не выводили запрос из групповой фиксации, их передают в defer_write():
+писатель выполняет их в точке сохранения сессии перед сбросом ее изменений. Между процессами (несколько воркеров uvicorn)
+писатели согласуются файловой блокировкой рядом с файлом БД (где есть fcntl).
+
+Если писатель не взял фиксацию за WRITE_QUEUE_TIMEOUT_S, она отменяется (писатель
+пропустит ее) и запрос получает 503; уже начатая фиксация дожидается завершения.
+"""
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+try:
+    import fcntl
+except ImportError:  # Windows: согласование только внутри процесса
+    fcntl = None
+
+
+class WriteQueueFull(RuntimeError):
+    """Очередь записи переполнена — запрос стоит повторить позже."""
+
+
+class WriteQueueTimeout(WriteQueueFull):
+    """Писатель не взял фиксацию за отведенное время; она отменена и не будет выполнена."""
+
+
+class WriteLock:
+    """Блокировка писателя: поток внутри процесса и файл между процессами."""
+
+    def __init__(self, lock_path: Optional[Path] = None):
+        self._lock = threading.Lock()
+        self._lock_path = lock_path
+        self._file = None
+
+    def acquire(self):
+        self._lock.acquire()
+        if fcntl is not None and self._lock_path is not None:
+            try:
+                self._file = open(self._lock_path, "a")
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except Exception:
+                self._close_file()
+                self._lock.release()
+                raise
+
+    def release(self):
+        self._close_file()
+        self._lock.release()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            finally:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _Job:
+    __slots__ = ("session", "future")
+
+    def __init__(self, session: "QueuedWriteSession"):
+        self.session = session
+        self.future: Future = Future()
+
+
+class WriteQueue:
+    """Ограниченная очередь фиксаций и поток-писатель с групповой фиксацией."""
+
+    def __init__(self, engine, maxsize: int = 256, batch_size: int = 32, timeout: float = 30.0):
+        # Отдельный объект движка (тот же пул): сессия держит соединение чтения для engine
+        # и одновременно присоединяется к соединению писателя
+        self.engine = engine.execution_options(logging_token="writer")
+        self.batch_size = batch_size
+        self.timeout = timeout
+        database = engine.url.database
+        lock_path = Path(database + ".writer.lock") if database and database != ":memory:" else None
+        self.lock = WriteLock(lock_path)
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Поток-писатель: в нем сессии пишут через соединение писателя
+        self._writer_ident: Optional[int] = None
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Дописать очередь и остановить писателя."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def in_writer(self) -> bool:
+        return threading.get_ident() == self._writer_ident
+
+    def submit(self, session: "QueuedWriteSession") -> Future:
+        self.start()
+        job = _Job(session)
+        try:
+            self._queue.put(job, timeout=self.timeout)
+        except queue.Full:
+            raise WriteQueueFull("Очередь записи переполнена")
+        return job.future
+
+    def _take_batch(self, first: _Job) -> List[Optional[_Job]]:
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(job)
+            if job is None:
+                break
+        return batch
+
+    def _run(self):
+        self._writer_ident = threading.get_ident()
+        while True:
+            batch = self._take_batch(self._queue.get())
+            stop = batch[-1] is None
+            jobs = [job for job in batch if job is not None]
+            if jobs:
+                self._commit_batch(jobs)
+            if stop:
+                return
+
+    def _commit_batch(self, jobs: List[_Job]):
+        try:
+            self.lock.acquire()
+        except Exception as e:
+            for job in jobs:
+                if job.future.set_running_or_notify_cancel():
+                    job.future.set_exception(e)
+            return
+        errors = {}
+        try:
+            # Писатель берет фиксацию только под блокировкой: отмененные по таймауту,
+            # пока он ждал блокировку, пропускаются — их сессии уже закрыты
+            jobs = [job for job in jobs if job.future.set_running_or_notify_cancel()]
+            if not jobs:
+                return
+            with self.engine.connect() as conn:
+                # Явный BEGIN IMMEDIATE: блокировка записи сразу, и точки сохранения
+                # сессий остаются внутри общей транзакции
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                for job in jobs:
+                    try:
+                        job.session._commit_on(conn)
+                    except Exception as e:
+                        errors[id(job)] = e
+                conn.commit()
+        except Exception as e:
+            for job in jobs:
+                job.future.set_exception(errors.get(id(job), e))
+            return
+        finally:
+            self.lock.release()
+        for job in jobs:
+            error = errors.get(id(job))
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(None)
+
+
+class QueuedWriteSession(Session):
+    """Сессия, фиксация которой выполняется писателем очереди (см. модуль)."""
+
+    write_queue: Optional[WriteQueue] = None
+
+    def __init__(self, *args, **kwargs):
+        # В общей транзакции писателя сессия работает в своей точке сохранения
+        kwargs.setdefault("join_transaction_mode", "create_savepoint")
+        super().__init__(*args, **kwargs)
+        self._write_bind = None
+        self._exclusive = False
+        self._deferred: List[Callable[[Session], None]] = []
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._write_bind is not None:
+            return self._write_bind
+        if not self._exclusive and (self._flushing or getattr(clause, "is_dml", False)):
+            # Запись до фиксации — монопольный режим до конца транзакции
+            self.write_queue.lock.acquire()
+            self._exclusive = True
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    def _has_changes(self) -> bool:
+        return bool(self._deferred or self.new or self.dirty or self.deleted)
+
+    def defer(self, work: Callable[[Session], None]):
+        """Выполнить work(session) при фиксации, в транзакции, где будут сброшены изменения."""
+        if self._exclusive:
+            work(self)
+        else:
+            self._deferred.append(work)
+
+    def _run_deferred(self):
+        while self._deferred:
+            self._deferred.pop(0)(self)
+
+    def _commit_on(self, conn):
+        """Сбросить и «зафиксировать» сессию в транзакции писателя (вызывается писателем)."""
+        self._write_bind = conn
+        try:
+            self._run_deferred()
+            super().commit()
+        except Exception:
+            self._deferred.clear()
+            super().rollback()
+            raise
+        finally:
+            self._write_bind = None
+
+    def _release_exclusive(self):
+        if self._exclusive:
+            self._exclusive = False
+            self.write_queue.lock.release()
+
+    def commit(self):
+        if self._exclusive:
+            try:
+                self._run_deferred()
+                super().commit()
+            finally:
+                self._release_exclusive()
+        elif self._has_changes() and not self.write_queue.in_writer():
+            self._wait(self.write_queue.submit(self))
+        else:
+            self._run_deferred()
+            super().commit()
+
+    def _wait(self, future: Future):
+        try:
+            future.result(timeout=self.write_queue.timeout)
+        except FutureTimeout:
+            if future.cancel():
+                raise WriteQueueTimeout("Очередь записи не успела зафиксировать изменения")
+            # Писатель уже фиксирует сессию: до конца фиксации она принадлежит ему
+            future.result()
+
+    def rollback(self):
+        self._deferred.clear()
+        try:
+            super().rollback()
+        finally:
+            self._release_exclusive()
+
+    def close(self):
+        self._deferred.clear()
+        try:
+            super().close()
+        finally:
+            self._release_exclusive()
+
+
+def defer_write(db: Session, work: Callable[[Session], None]):
+    """Запись work(session) в транзакции фиксации: для сессии очереди — писателем
+    при групповой фиксации, для обычной сессии — сразу."""
+    if isinstance(db, QueuedWriteSession):
+        db.defer(work)
+    else:
+        work(db)
@@ -1,114 +1,94 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
-from app.db.database import engine, Base
-
-# Импорт моделей для создания таблиц
-from app.models.project import Project
-from app.models.project_stage import ProjectStage
-from app.models.executive_doc import ExecutiveDocument
-from app.models.ks2 import KS2, KS2Item
-from app.models.ks3 import KS3, KS3Item
-from app.models.gpr import GPR, GPRTask
-from app.models.ppr import PPR, PPRSection
-from app.models.application import Application, ApplicationItem
-from app.models.contract import Contract
-from app.models.tender import Tender, Contractor, TenderParticipant, CommercialProposal, CommercialProposalItem
-from app.models.estimate import Estimate, EstimateItem, RelatedCost
-from app.models.invoice import Invoice
-from app.models.department import Department
-from app.models.object_construct import ObjectConstruct, ProjectConstruct
-from app.models.standard_rate import StandardRate
-from app.models.project_documentation import ProjectDocumentation
-from app.models.executive_survey import ExecutiveSurvey
-from app.models.work_volume import WorkVolume, WorkVolumeEntry
-from app.models.project_change import ProjectChange, ChangeApproval, Defect
-from app.models.material import Material, Warehouse, WarehouseStock, MaterialMovement, MaterialWriteOff, MaterialWriteOffItem
-from app.models.document_version import DocumentVersion
-from app.models.application_workflow import ApplicationWorkflow
-from app.models.estimate_validation import EstimateValidation, VolumeProjectMatch, MaterialSpecification, EstimateContractLink, CostControl
-from app.models.user import User, Permission, UserPermission, RolePermission, Role
-from app.models.receivables import Receivable, ReceivablePayment, ReceivableNotification, CollectionAction
-from app.models.sales import SalesProposal, SalesProposalItem, CustomerAgreement
-from app.models.document_roadmap import (
-    DocumentRoadmapSection,
-    DocumentSectionStatus,
-    DocumentFile,
-    NPA,
-    NPASection,
-)
-from app.models.document_notification import DocumentNotification
-from app.models.personnel import Personnel, ProjectPersonnel, PersonnelDocument, PersonnelHistory
-from app.models.lab_test import LabTest, LabTestType, Laboratory
-from app.models.references import Organization, Counterparty, PaymentType, MaterialKind
-
-# Создание таблиц
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Система управления ПТО",
-    description="Система для управления документационным сопровождением строительных проектов",
-    version="1.0.0"
+from app.db.database import (
+    engine, read_engine, async_engine, async_read_engine, Base,
+    SessionLocal, WriteSessionLocal, AsyncSyncSession, write_queue,
 )
+from app.db.writer import WriteQueueFull
 
-# Настройка CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Все модели должны быть зарегистрированы до первого запроса (связи по имени класса)
+from app import models  # noqa: F401
+from app.api.modules import include_modules, resolve_modules
+from app.services.change_log import register_change_tracking
+from app.services.reference_cache import register_reference_tracking
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Старт и остановка воркера. Схема БД создается миграциями (alembic upgrade head),
+    а не при запуске: воркеры не выполняют DDL и не конкурируют за него."""
+    if settings.AUTO_CREATE_SCHEMA:
+        # Только для разработки и тестов на пустой БД
+        Base.metadata.create_all(bind=engine)
+    yield
+    if write_queue is not None:
+        write_queue.stop()
+    engine.dispose()
+    if read_engine is not None:
+        read_engine.dispose()
+    await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
+
+
+def create_app(enabled_modules: Optional[str] = None) -> FastAPI:
+    """Собрать приложение: middleware, роутеры включенных модулей, обработчики событий БД.
+
+    enabled_modules — модули через запятую («*» — все); по умолчанию из настройки ENABLED_MODULES.
+    """
+    app = FastAPI(
+        title="Система управления ПТО",
+        description="Система для управления документационным сопровождением строительных проектов",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    # Журнал изменений документов для синхронизации с 1С
+    register_change_tracking(SessionLocal)
+    register_change_tracking(WriteSessionLocal)
+    register_change_tracking(AsyncSyncSession)
+    # Версии справочников для кэша GET-ответов справочников
+    register_reference_tracking(SessionLocal)
+    register_reference_tracking(WriteSessionLocal)
+    register_reference_tracking(AsyncSyncSession)
+
+    # Переполнение очереди записи и отмененная по таймауту фиксация (WriteQueueTimeout)
+    @app.exception_handler(WriteQueueFull)
+    async def write_queue_full(request: Request, exc: WriteQueueFull):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Сервер перегружен записью, повторите запрос"},
+            headers={"Retry-After": "1"},
+        )
+
+    # Настройка CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Подключение включенных модулей (роутеры импортируются только для них)
+    modules = resolve_modules(settings.ENABLED_MODULES if enabled_modules is None else enabled_modules)
+    include_modules(app, modules)
+    app.state.enabled_modules = modules
+
+    @app.get("/")
+    async def root():
+        return {"message": "Система управления ПТО API", "version": "1.0.0"}
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "ok"}
+
+    return app
 
-# Подключение роутеров
-from app.api.v1 import (
-    projects, project_stages, executive_docs, ks2, ks3, gpr, ppr,
-    applications, contracts, tenders, estimates, invoices,
-    departments, object_constructs, standard_rates,
-    project_documentation, executive_surveys,
-    work_volumes, project_changes, materials,
-    application_workflow, document_versions, integration_1c,
-    estimate_validation, users, receivables, sales, document_roadmap, personnel, lab_tests, references
-)
 
-app.include_router(projects.router, prefix="/api/v1/projects", tags=["Проекты"])
-app.include_router(project_stages.router, prefix="/api/v1/project-stages", tags=["Этапы проекта"])
-app.include_router(executive_docs.router, prefix="/api/v1/executive-docs", tags=["Исполнительная документация"])
-app.include_router(ks2.router, prefix="/api/v1/ks2", tags=["КС-2"])
-app.include_router(ks3.router, prefix="/api/v1/ks3", tags=["КС-3"])
-app.include_router(gpr.router, prefix="/api/v1/gpr", tags=["ГПР"])
-app.include_router(ppr.router, prefix="/api/v1/ppr", tags=["ППР"])
-app.include_router(applications.router, prefix="/api/v1/applications", tags=["Заявки"])
-app.include_router(contracts.router, prefix="/api/v1/contracts", tags=["Договора"])
-app.include_router(tenders.router, prefix="/api/v1/tenders", tags=["Тендеры"])
-app.include_router(estimates.router, prefix="/api/v1/estimates", tags=["Сметы"])
-app.include_router(invoices.router, prefix="/api/v1/invoices", tags=["Счета на оплату"])
-app.include_router(departments.router, prefix="/api/v1/departments", tags=["Подразделения"])
-app.include_router(object_constructs.router, prefix="/api/v1/object-constructs", tags=["Конструктивы"])
-app.include_router(standard_rates.router, prefix="/api/v1/standard-rates", tags=["Нормативные расценки"])
-app.include_router(project_documentation.router, prefix="/api/v1/project-documentation", tags=["Проектная документация"])
-app.include_router(executive_surveys.router, prefix="/api/v1/executive-surveys", tags=["Исполнительные съемки"])
-app.include_router(work_volumes.router, prefix="/api/v1/work-volumes", tags=["Учет объемов работ"])
-app.include_router(project_changes.router, prefix="/api/v1/project-changes", tags=["Изменения проекта"])
-app.include_router(materials.router, prefix="/api/v1/materials", tags=["Материалы и склады"])
-app.include_router(application_workflow.router, prefix="/api/v1/workflow", tags=["Workflow заявок"])
-app.include_router(document_versions.router, prefix="/api/v1/document-versions", tags=["Версии документов"])
-app.include_router(integration_1c.router, prefix="/api/v1/integration/1c", tags=["Интеграция с 1С"])
-app.include_router(estimate_validation.router, prefix="/api/v1/validation", tags=["Проверка смет"])
-app.include_router(users.router, prefix="/api/v1", tags=["Пользователи и роли"])
-app.include_router(references.router, prefix="/api/v1", tags=["Справочники"])
-app.include_router(receivables.router, prefix="/api/v1/receivables", tags=["Дебиторская задолженность"])
-app.include_router(sales.router, prefix="/api/v1/sales", tags=["Отдел продаж"])
-app.include_router(document_roadmap.router, prefix="/api/v1/document-roadmap", tags=["Дорожная карта документов"])
-app.include_router(personnel.router, prefix="/api/v1/personnel", tags=["Кадры"])
-app.include_router(lab_tests.router, prefix="/api/v1/lab-tests", tags=["Лабораторные испытания"])
-
-
-@app.get("/")
-async def root():
-    return {"message": "Система управления ПТО API", "version": "1.0.0"}
-
-
-@app.get("/health")
-async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+app = create_app()
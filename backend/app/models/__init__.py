@@ -18,14 +18,21 @@ from app.models.project_documentation import ProjectDocumentation
 from app.models.executive_survey import ExecutiveSurvey
 from app.models.work_volume import WorkVolume, WorkVolumeEntry
 from app.models.project_change import ProjectChange, ChangeApproval, Defect
-from app.models.material import Material, Warehouse, WarehouseStock, MaterialMovement, MaterialWriteOff, MaterialWriteOffItem
+from app.models.material import Material, Warehouse, WarehouseStock, MaterialMovement, MaterialWriteOff, MaterialWriteOffItem, WarehouseStockSnapshot
 from app.models.document_version import DocumentVersion
 from app.models.application_workflow import ApplicationWorkflow
 from app.models.estimate_validation import EstimateValidation, VolumeProjectMatch, MaterialSpecification, EstimateContractLink, CostControl
-from app.models.user import User, Permission, UserPermission
-from app.models.receivables import Receivable, ReceivablePayment, ReceivableNotification, CollectionAction
+from app.models.user import User, Permission, UserPermission, RolePermission, Role
+from app.models.receivables import Receivable, ReceivablePayment, ReceivableNotification, CollectionAction, ReceivableAging, BankStatementLine, ImportedPayment
 from app.models.sales import SalesProposal, SalesProposalItem, CustomerAgreement
-from app.models.document_roadmap import DocumentRoadmapSection, DocumentSectionStatus, DocumentFile, ExecutionStatus, DocumentStatus
+from app.models.document_roadmap import DocumentRoadmapSection, DocumentSectionStatus, DocumentFile, ExecutionStatus, DocumentStatus, NPA, NPASection
+from app.models.document_notification import DocumentNotification, NotificationType, NotificationChannel
+from app.models.personnel import Personnel, ProjectPersonnel, PersonnelDocument, PersonnelHistory
+from app.models.lab_test import LabTest, LabTestType, Laboratory
+from app.models.references import Organization, Counterparty, PaymentType, MaterialKind
+from app.models.change_log import ChangeLog
+from app.models.reference_version import ReferenceVersion
+from app.models.calendar import Holiday, ProjectCalendarException
 
 __all__ = [
     "Base",
@@ -69,6 +76,7 @@ __all__ = [
     "MaterialMovement",
     "MaterialWriteOff",
     "MaterialWriteOffItem",
+    "WarehouseStockSnapshot",
     "DocumentVersion",
     "ApplicationWorkflow",
     "EstimateValidation",
@@ -79,10 +87,15 @@ __all__ = [
     "User",
     "Permission",
     "UserPermission",
+    "RolePermission",
+    "Role",
     "Receivable",
     "ReceivablePayment",
     "ReceivableNotification",
     "CollectionAction",
+    "ReceivableAging",
+    "BankStatementLine",
+    "ImportedPayment",
     "SalesProposal",
     "SalesProposalItem",
     "CustomerAgreement",
@@ -91,7 +104,24 @@ __all__ = [
     "DocumentFile",
     "ExecutionStatus",
     "DocumentStatus",
+    "NPA",
+    "NPASection",
     "DocumentNotification",
     "NotificationType",
     "NotificationChannel",
+    "Personnel",
+    "ProjectPersonnel",
+    "PersonnelDocument",
+    "PersonnelHistory",
+    "LabTest",
+    "LabTestType",
+    "Laboratory",
+    "Organization",
+    "Counterparty",
+    "PaymentType",
+    "MaterialKind",
+    "ChangeLog",
+    "ReferenceVersion",
+    "Holiday",
+    "ProjectCalendarException",
 ]
\ No newline at end of file
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class Holiday(Base):
+    """Производственный календарь: государственные праздники и перенесенные рабочие дни.
+
+    Суббота и воскресенье считаются выходными без записи в таблице; запись с is_working=True
+    делает выходной рабочим (перенос), с is_working=False — рабочий день нерабочим.
+    """
+    __tablename__ = "calendar_holidays"
+
+    id = Column(Integer, primary_key=True, index=True)
+    date = Column(Date, nullable=False, unique=True, comment="Дата")
+    name = Column(String(200), comment="Наименование праздника или переноса")
+    is_working = Column(Boolean, default=False, nullable=False, comment="Рабочий день (перенос выходного)")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ProjectCalendarException(Base):
+    """Исключения календаря объекта: остановки площадки, дополнительные рабочие дни."""
+    __tablename__ = "project_calendar_exceptions"
+    __table_args__ = (
+        UniqueConstraint("project_id", "date", name="uq_project_calendar_exceptions_project_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    date = Column(Date, nullable=False, comment="Дата")
+    is_working = Column(Boolean, default=False, nullable=False, comment="Рабочий день")
+    reason = Column(String(500), comment="Причина (остановка площадки, работа в выходной)")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
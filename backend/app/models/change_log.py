@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ChangeLog(Base):
+    """Журнал изменений документов для синхронизации с 1С (outbox).
+
+    Заполняется обработчиками событий сессии (app.services.change_log);
+    id служит монотонным токеном синхронизации: выдается в порядке фиксации транзакций.
+    """
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity_type", "entity_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(50), nullable=False, comment="Тип документа (ks2, ks3, invoices, write_offs, work_volumes)")
+    entity_id = Column(Integer, nullable=False, comment="ID документа")
+    operation = Column(String(20), nullable=False, comment="Операция (insert, update, delete)")
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), comment="Дата изменения")
@@ -36,7 +36,7 @@ class Invoice(Base):
     approved_by = Column(String(200), comment="Утвердил")
     approved_date = Column(Date, comment="Дата утверждения")
     paid_date = Column(Date, comment="Дата оплаты")
-    payment_number = Column(String(100), comment="Номер платежного поручения")
+    payment_number = Column(String(100), index=True, comment="Номер платежного поручения")
     notes = Column(Text, comment="Примечания")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
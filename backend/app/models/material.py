@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Numeric, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Numeric, Enum, Boolean, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -90,12 +90,17 @@ class Warehouse(Base):
 class WarehouseStock(Base):
     """Модель остатков на складе"""
     __tablename__ = "warehouse_stocks"
+    __table_args__ = (
+        UniqueConstraint("warehouse_id", "material_id", name="uq_warehouse_stocks_warehouse_material"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False, index=True)
     material_id = Column(Integer, ForeignKey("materials.id"), nullable=False, index=True)
     quantity = Column(Numeric(15, 3), default=0, comment="Количество")
     reserved_quantity = Column(Numeric(15, 3), default=0, comment="Зарезервировано")
+    amount = Column(Numeric(15, 2), default=0, comment="Стоимость остатка (по скользящей средней)")
+    average_price = Column(Numeric(15, 4), default=0, comment="Средняя себестоимость единицы")
     last_movement_date = Column(DateTime(timezone=True), comment="Дата последнего движения")
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -107,6 +112,11 @@ class WarehouseStock(Base):
 class MaterialMovement(Base):
     """Модель движения материалов"""
     __tablename__ = "material_movements"
+    __table_args__ = (
+        # Выборки складского регистра: движения склада за диапазон дат
+        Index("ix_material_movements_to_warehouse_date", "to_warehouse_id", "movement_date"),
+        Index("ix_material_movements_from_warehouse_date", "from_warehouse_id", "movement_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     movement_type = Column(Enum(MovementType), nullable=False, comment="Тип движения")
@@ -182,4 +192,23 @@ class MaterialWriteOffItem(Base):
     # Relationships
     write_off = relationship("MaterialWriteOff", back_populates="items")
     material = relationship("Material")
-    movement = relationship("MaterialMovement")
\ No newline at end of file
+    movement = relationship("MaterialMovement")
+
+class WarehouseStockSnapshot(Base):
+    """Закрывающий остаток по складу и материалу на конец периода (месяца)"""
+    __tablename__ = "warehouse_stock_snapshots"
+    __table_args__ = (
+        UniqueConstraint("warehouse_id", "material_id", "period_end", name="uq_stock_snapshots_warehouse_material_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False, index=True)
+    material_id = Column(Integer, ForeignKey("materials.id"), nullable=False, index=True)
+    period_end = Column(Date, nullable=False, index=True, comment="Последний день периода")
+    quantity = Column(Numeric(15, 3), nullable=False, default=0, comment="Остаток на конец периода")
+    amount = Column(Numeric(15, 2), nullable=False, default=0, comment="Стоимость остатка на конец периода")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    warehouse = relationship("Warehouse")
+    material = relationship("Material")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Numeric, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Numeric, Enum, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -26,6 +26,9 @@ class NotificationType(str, enum.Enum):
 class Receivable(Base):
     """Модель дебиторской задолженности"""
     __tablename__ = "receivables"
+    __table_args__ = (
+        Index("ix_receivables_status_due_date", "status", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
@@ -60,7 +63,7 @@ class ReceivablePayment(Base):
     id = Column(Integer, primary_key=True, index=True)
     receivable_id = Column(Integer, ForeignKey("receivables.id"), nullable=False, index=True)
     payment_date = Column(Date, nullable=False, comment="Дата платежа")
-    payment_number = Column(String(100), comment="Номер платежного поручения")
+    payment_number = Column(String(100), index=True, comment="Номер платежного поручения")
     amount = Column(Numeric(15, 2), nullable=False, comment="Сумма платежа")
     payment_method = Column(String(100), comment="Способ оплаты")
     bank_account = Column(String(200), comment="Банковский счет")
@@ -112,4 +115,80 @@ class CollectionAction(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    receivable = relationship("Receivable", back_populates="collection_actions")
\ No newline at end of file
+    receivable = relationship("Receivable", back_populates="collection_actions")
+
+
+class ReceivableAging(Base):
+    """Возрастная структура открытой задолженности по заказчику и проекту.
+
+    Пересчитывается ночным заданием (receivables_aging.py) вместе с days_overdue
+    и статусами задолженностей; аналитика читает таблицу напрямую.
+    """
+    __tablename__ = "receivable_aging"
+    __table_args__ = (
+        UniqueConstraint("project_id", "customer_name", name="uq_receivable_aging_project_customer"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    customer_name = Column(String(500), nullable=False, index=True, comment="Дебитор (заказчик)")
+    as_of = Column(Date, nullable=False, comment="Дата расчета")
+    receivables_count = Column(Integer, nullable=False, default=0, comment="Открытых задолженностей")
+    bucket_0_30 = Column(Numeric(15, 2), nullable=False, default=0, comment="Просрочка 0–30 дней (включая непросроченную)")
+    bucket_31_60 = Column(Numeric(15, 2), nullable=False, default=0, comment="Просрочка 31–60 дней")
+    bucket_61_90 = Column(Numeric(15, 2), nullable=False, default=0, comment="Просрочка 61–90 дней")
+    bucket_90_plus = Column(Numeric(15, 2), nullable=False, default=0, comment="Просрочка более 90 дней")
+    total_remaining = Column(Numeric(15, 2), nullable=False, default=0, comment="Остаток задолженности")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    project = relationship("Project")
+
+
+class BankStatementLine(Base):
+    """Строка банковской выписки вне дебиторской задолженности.
+
+    Несопоставленные поступления (status=pending) образуют очередь разбора;
+    оплаты счетов без записи о задолженности сохраняются со status=matched.
+    """
+    __tablename__ = "bank_statement_lines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    statement_file = Column(String(500), comment="Имя файла выписки")
+    line_number = Column(Integer, comment="Порядковый номер документа в выписке")
+    document_number = Column(String(100), index=True, comment="Номер платежного поручения")
+    document_date = Column(Date, nullable=False, index=True, comment="Дата платежа")
+    amount = Column(Numeric(15, 2), nullable=False, comment="Сумма платежа")
+    payer_name = Column(String(500), comment="Плательщик")
+    payer_inn = Column(String(20), comment="ИНН плательщика")
+    payer_account = Column(String(50), comment="Счет плательщика")
+    purpose = Column(Text, comment="Назначение платежа")
+    status = Column(String(50), default="pending", index=True, comment="Статус (pending, matched, dismissed)")
+    receivable_id = Column(Integer, ForeignKey("receivables.id"), comment="Сопоставленная задолженность")
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), comment="Оплаченный счет без записи о задолженности")
+    payment_id = Column(Integer, ForeignKey("receivable_payments.id"), comment="Созданный платеж")
+    resolved_by = Column(String(200), comment="Разобрал")
+    resolved_at = Column(DateTime(timezone=True), comment="Дата разбора")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    receivable = relationship("Receivable")
+    invoice = relationship("Invoice")
+    payment = relationship("ReceivablePayment")
+
+
+class ImportedPayment(Base):
+    """Журнал номеров платежных поручений, проведенных импортом из 1С.
+
+    Уникальный номер — ключ идемпотентности импорта (app.services.payments_1c): повтор
+    платежа отбрасывается, даже если номер в счете уже перезаписан следующим платежом.
+    """
+    __tablename__ = "imported_payments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    payment_number = Column(String(100), nullable=False, unique=True, comment="Номер платежного поручения")
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), index=True, comment="Оплаченный счет")
+    receivable_id = Column(Integer, ForeignKey("receivables.id"), comment="Задолженность, по которой проведен платеж")
+    payment_date = Column(Date, comment="Дата платежа")
+    amount = Column(Numeric(15, 2), comment="Сумма платежа")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from app.db.database import Base
+
+class ReferenceVersion(Base):
+    """Версия справочника для общего кэша справочников (app.services.reference_cache).
+
+    Увеличивается в той же транзакции, что и изменение справочника, поэтому все
+    воркеры видят новую версию одновременно с новыми данными.
+    """
+    __tablename__ = "reference_versions"
+
+    name = Column(String(50), primary_key=True, comment="Справочник (organizations, roles, ...)")
+    version = Column(Integer, nullable=False, default=0, comment="Номер версии")
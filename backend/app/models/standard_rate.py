@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -7,9 +7,13 @@ from app.db.database import Base
 class StandardRate(Base):
     """Модель нормативной расценки"""
     __tablename__ = "standard_rates"
+    __table_args__ = (
+        Index("uq_standard_rates_code_version", "code", "catalog_version", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    code = Column(String(100), unique=True, index=True, nullable=False, comment="Код расценки")
+    code = Column(String(100), index=True, nullable=False, comment="Код расценки")
+    catalog_version = Column(String(50), nullable=False, default="", server_default="", comment="Версия сборника (ГЭСН-2022, ФЕР-2020 и т.п.)")
     name = Column(String(1000), nullable=False, comment="Наименование")
     unit = Column(String(50), comment="Единица измерения")
     materials_cost = Column(Numeric(15, 2), default=0, comment="Стоимость материалов")
@@ -99,3 +99,48 @@ class Estimate(EstimateBase):
 
     class Config:
         from_attributes = True
+
+class EstimateDiffLine(BaseModel):
+    line_number: Optional[int] = None
+    item_type: str
+    code: Optional[str] = None
+    work_name: str
+    unit: Optional[str] = None
+    quantity: Decimal
+    unit_price: Optional[Decimal] = None
+    total_price: Decimal
+
+class EstimateDiffChange(BaseModel):
+    code: Optional[str] = None
+    work_name: str
+    unit: Optional[str] = None
+    item_type: str
+    line_number_a: Optional[int] = None
+    line_number_b: Optional[int] = None
+    quantity_a: Decimal
+    quantity_b: Decimal
+    quantity_delta: Decimal
+    unit_price_a: Optional[Decimal] = None
+    unit_price_b: Optional[Decimal] = None
+    unit_price_delta: Decimal
+    total_price_a: Decimal
+    total_price_b: Decimal
+    total_price_delta: Decimal
+
+class EstimateDiffCategoryTotal(BaseModel):
+    item_type: str
+    total_a: Decimal
+    total_b: Decimal
+    delta: Decimal
+
+class EstimateDiff(BaseModel):
+    estimate_a_id: int
+    estimate_b_id: int
+    added: List[EstimateDiffLine] = []
+    removed: List[EstimateDiffLine] = []
+    changed: List[EstimateDiffChange] = []
+    unchanged_count: int = 0
+    category_totals: List[EstimateDiffCategoryTotal] = []
+    total_a: Decimal
+    total_b: Decimal
+    total_delta: Decimal
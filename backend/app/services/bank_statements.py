@@ -0,0 +1,450 @@
+"""Загрузка банковских выписок и сопоставление поступлений с дебиторской задолженностью.
+
+Поддерживаются формат обмена с 1С «1CClientBankExchange» и CSV. Файл читается потоком
+и обрабатывается пачками по IMPORT_CHUNK документов: для пачки одним запросом читаются
+уже проведенные платежи за ее даты, задолженности и счета с упомянутыми номерами или
+с остатком, равным сумме поступления. Поступление сопоставляется по индексу пачки
+(номер счета из назначения платежа, заказчик + сумма). Найденные платежи проводятся
+пакетными INSERT/UPDATE, остальные строки попадают в очередь разбора
+(bank_statement_lines); следующая пачка читает уже обновленные данные. Вся выписка
+фиксируется одной транзакцией.
+"""
+import csv
+import re
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.bulk import chunked
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.receivables import BankStatementLine, Receivable, ReceivablePayment, ReceivableStatus
+
+CLIENT_BANK_HEADER = "1CClientBankExchange"
+PAYMENT_METHOD = "Банковская выписка"
+
+# Документов выписки в одной пачке (параметры IN запросов пачки остаются в пределах SQLite)
+IMPORT_CHUNK = 500
+
+# Реквизиты документа 1С → поля строки выписки
+_CLIENT_BANK_FIELDS = {
+    "Номер": "number",
+    "Дата": "date",
+    "ДатаПоступило": "received_date",
+    "Сумма": "amount",
+    "Плательщик": "payer",
+    "Плательщик1": "payer_name",
+    "ПлательщикИНН": "payer_inn",
+    "ПлательщикСчет": "payer_account",
+    "ПолучательСчет": "recipient_account",
+    "НазначениеПлатежа": "purpose",
+}
+
+# Допустимые заголовки колонок CSV
+_CSV_FIELDS = {
+    "number": "number", "номер": "number",
+    "date": "date", "дата": "date",
+    "amount": "amount", "сумма": "amount",
+    "payer": "payer", "плательщик": "payer",
+    "payer_inn": "payer_inn", "инн": "payer_inn",
+    "payer_account": "payer_account", "счет": "payer_account",
+    "purpose": "purpose", "назначение": "purpose",
+    "invoice_number": "invoice_number", "номер счета": "invoice_number",
+}
+
+_INVOICE_REF = re.compile(r"(?:№|#|\bN)\s*([0-9A-Za-zА-Яа-яЁё][\w\-/]*)")
+_LEGAL_FORMS = re.compile(r"\b(ооо|оао|зао|пао|ао|ип|фгуп|муп|гуп)\b")
+_NON_WORD = re.compile(r"[^\w]+")
+
+_CLOSED = (ReceivableStatus.PAID, ReceivableStatus.WRITTEN_OFF)
+
+
+def _open_receivable():
+    return or_(Receivable.status.is_(None), Receivable.status.notin_(_CLOSED))
+
+
+def _normalize_number(value: Optional[str]) -> str:
+    return (value or "").strip().casefold()
+
+
+def normalize_customer(name: Optional[str]) -> str:
+    """Кавычки, организационно-правовая форма, регистр и пробелы не различаются."""
+    name = (name or "").casefold().replace("ё", "е")
+    name = _LEGAL_FORMS.sub(" ", name)
+    return _NON_WORD.sub(" ", name).strip()
+
+
+def _to_decimal(value) -> Decimal:
+    value = str(value or "").strip().replace(" ", "").replace("\xa0", "").replace(",", ".")
+    try:
+        amount = Decimal(value).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise ValueError(f"некорректная сумма: {value or 'пусто'}")
+    if amount <= 0:
+        raise ValueError(f"сумма должна быть больше нуля: {value}")
+    return amount
+
+
+def _to_date(value) -> date:
+    value = (value or "").strip()
+    for fmt in ("%d.%m.%Y", "%Y-%m-%d", "%d.%m.%y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"некорректная дата: {value or 'пусто'}")
+
+
+def iter_client_bank(stream: IO[str], account: Optional[str] = None) -> Iterator[Dict]:
+    """Документы выписки в формате 1CClientBankExchange (секции СекцияДокумент ... КонецДокумента).
+
+    Если указан account, берутся только поступления на этот расчетный счет.
+    """
+    header = stream.readline().strip().lstrip("\ufeff")
+    if header != CLIENT_BANK_HEADER:
+        raise ValueError(f"файл не в формате {CLIENT_BANK_HEADER}")
+    document = None
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if line.startswith("СекцияДокумент"):
+            document = {}
+        elif line == "КонецДокумента":
+            if document is not None and (not account or document.get("recipient_account") == account):
+                if document.get("payer_name"):
+                    document["payer"] = document.pop("payer_name")
+                yield document
+            document = None
+        elif document is not None and "=" in line:
+            key, value = line.split("=", 1)
+            field = _CLIENT_BANK_FIELDS.get(key.strip())
+            if field:
+                document[field] = value.strip()
+
+
+def iter_csv(stream: IO[str]) -> Iterator[Dict]:
+    """Построчно читать CSV выписки: заголовок с именами колонок, разделитель ; или ,."""
+    header = stream.readline().lstrip("\ufeff")
+    delimiter = ";" if header.count(";") >= header.count(",") else ","
+    fields = [_CSV_FIELDS.get(f.strip().lower(), f.strip().lower())
+              for f in next(csv.reader([header], delimiter=delimiter))]
+    for values in csv.reader(stream, delimiter=delimiter):
+        if not any(v.strip() for v in values):
+            continue
+        yield dict(zip(fields, values))
+
+
+def normalize_line(raw: Dict) -> Dict:
+    """Привести документ выписки к колонкам bank_statement_lines (ValueError при ошибке)."""
+    return {
+        "document_number": (raw.get("number") or "").strip() or None,
+        "document_date": _to_date(raw.get("received_date") or raw.get("date")),
+        "amount": _to_decimal(raw.get("amount")),
+        "payer_name": (raw.get("payer") or "").strip() or None,
+        "payer_inn": (raw.get("payer_inn") or "").strip() or None,
+        "payer_account": (raw.get("payer_account") or "").strip() or None,
+        "purpose": (raw.get("purpose") or "").strip() or None,
+        "invoice_number": (raw.get("invoice_number") or "").strip() or None,
+    }
+
+
+def _raw_refs(line: Dict) -> List[str]:
+    refs = []
+    if line.get("invoice_number"):
+        refs.append(line["invoice_number"].strip())
+    refs.extend(_INVOICE_REF.findall(line.get("purpose") or ""))
+    return refs
+
+
+def invoice_refs(line: Dict) -> List[str]:
+    """Номера счетов: явная колонка CSV и ссылки «№ ...» в назначении платежа."""
+    return [_normalize_number(ref) for ref in _raw_refs(line)]
+
+
+def _ref_variants(lines: Iterable[Dict]) -> set:
+    """Написания номеров счетов для поиска в БД: как в выписке, в нижнем и верхнем регистре.
+
+    Окончательно номера сравниваются в Python без учета регистра; lower/upper SQLite
+    не меняют регистр кириллицы, поэтому варианты перечисляются явно.
+    """
+    variants = set()
+    for line in lines:
+        for ref in _raw_refs(line):
+            variants.update((ref, ref.casefold(), ref.upper()))
+    return variants
+
+
+class OpenReceivable:
+    """Открытая задолженность в индексе сопоставления; суммы меняются по мере проводки."""
+
+    __slots__ = ("id", "invoice_id", "customer", "total", "paid", "last_payment_date")
+
+    def __init__(self, id, invoice_id, customer, total, paid):
+        self.id = id
+        self.invoice_id = invoice_id
+        self.customer = customer
+        self.total = total
+        self.paid = paid
+        self.last_payment_date = None
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.total - self.paid
+
+
+class ReceivableIndex:
+    """Индекс открытых задолженностей и неоплаченных счетов для сопоставления пачки выписки.
+
+    В индекс попадают только кандидаты для строк пачки: задолженности и счета
+    с упомянутыми номерами и задолженности с остатком, равным сумме одной из строк.
+    Строится двумя запросами на пачку; поиск — обращения к словарям.
+    """
+
+    def __init__(self, db: Session, lines: List[Dict]):
+        R = Receivable
+        numbers = _ref_variants(lines)
+        amounts = {line["amount"] for line in lines}
+        number = func.coalesce(R.invoice_number, Invoice.invoice_number)
+        remaining = func.round(R.total_amount - func.coalesce(R.paid_amount, 0), 2)
+        rows = db.execute(
+            select(R.id, R.invoice_id, number, R.customer_name, R.total_amount, R.paid_amount, R.last_payment_date)
+            .outerjoin(Invoice, Invoice.id == R.invoice_id)
+            .where(_open_receivable(), or_(number.in_(numbers), remaining.in_(amounts)))
+            .order_by(R.due_date, R.id)
+        )
+        self.by_number: Dict[str, List[OpenReceivable]] = defaultdict(list)
+        self.by_customer_amount: Dict[Tuple[str, Decimal], List[OpenReceivable]] = defaultdict(list)
+        for receivable_id, invoice_id, number, customer, total, paid, last_date in rows:
+            entry = OpenReceivable(receivable_id, invoice_id, normalize_customer(customer),
+                                   Decimal(str(total or 0)), Decimal(str(paid or 0)))
+            entry.last_payment_date = last_date
+            if number:
+                self.by_number[_normalize_number(number)].append(entry)
+            if entry.remaining > 0:
+                self.by_customer_amount[(entry.customer, entry.remaining)].append(entry)
+
+        # Счета без открытой задолженности: при совпадении номера отмечаются оплаченными
+        self.invoices: Dict[str, int] = {}
+        if numbers:
+            invoices = db.execute(
+                select(Invoice.id, Invoice.invoice_number).where(
+                    Invoice.invoice_number.in_(numbers),
+                    or_(Invoice.status.is_(None), Invoice.status.notin_((InvoiceStatus.PAID, InvoiceStatus.CANCELLED))),
+                    ~select(R.id).where(R.invoice_id == Invoice.id, _open_receivable()).exists(),
+                )
+            )
+            for invoice_id, number in invoices:
+                self.invoices[_normalize_number(number)] = invoice_id
+
+    def match(self, line: Dict) -> Tuple[Optional[str], object]:
+        """Вернуть ("receivable", OpenReceivable), ("invoice", invoice_id) или (None, None)."""
+        payer = normalize_customer(line.get("payer_name"))
+        amount = line["amount"]
+        refs = invoice_refs(line)
+        for ref in refs:
+            candidates = [e for e in self.by_number.get(ref, ()) if e.remaining > 0]
+            if candidates:
+                for entry in candidates:
+                    if entry.customer == payer:
+                        return "receivable", entry
+                for entry in candidates:
+                    if entry.remaining == amount:
+                        return "receivable", entry
+                return "receivable", candidates[0]
+        if payer:
+            candidates = self.by_customer_amount.get((payer, amount))
+            if candidates:
+                return "receivable", candidates[0]
+        for ref in refs:
+            invoice_id = self.invoices.get(ref)
+            if invoice_id:
+                return "invoice", invoice_id
+        return None, None
+
+    def apply(self, entry: OpenReceivable, amount: Decimal, payment_date: date):
+        bucket = self.by_customer_amount.get((entry.customer, entry.remaining))
+        if bucket and entry in bucket:
+            bucket.remove(entry)
+        entry.paid += amount
+        if entry.last_payment_date is None or payment_date > entry.last_payment_date:
+            entry.last_payment_date = payment_date
+        if entry.remaining > 0:
+            self.by_customer_amount[(entry.customer, entry.remaining)].append(entry)
+
+    def take_invoice(self, invoice_id: int):
+        self.invoices = {k: v for k, v in self.invoices.items() if v != invoice_id}
+
+
+def _payment_key(number, payment_date, amount) -> tuple:
+    return (_normalize_number(number), payment_date, Decimal(str(amount)).quantize(Decimal("0.01")))
+
+
+def _known_payments(db: Session, lines: List[Dict]) -> set:
+    """Ключи уже проведенных платежей и строк очереди с датами и суммами строк пачки (повторная загрузка)."""
+    dates = {line["document_date"] for line in lines}
+    amounts = {line["amount"] for line in lines}
+    keys = set()
+    rows = db.execute(
+        select(ReceivablePayment.payment_number, ReceivablePayment.payment_date, ReceivablePayment.amount)
+        .where(ReceivablePayment.payment_date.in_(dates), ReceivablePayment.amount.in_(amounts))
+    )
+    keys.update(_payment_key(*row) for row in rows)
+    rows = db.execute(
+        select(BankStatementLine.document_number, BankStatementLine.document_date, BankStatementLine.amount)
+        .where(BankStatementLine.document_date.in_(dates), BankStatementLine.amount.in_(amounts))
+    )
+    keys.update(_payment_key(*row) for row in rows)
+    return keys
+
+
+def _receivable_status(entry: OpenReceivable) -> ReceivableStatus:
+    if entry.remaining <= 0:
+        return ReceivableStatus.PAID
+    return ReceivableStatus.PARTIALLY_PAID
+
+
+def _queue_row(line: Dict, statement_file: Optional[str], status: str, invoice_id: Optional[int] = None) -> Dict:
+    return {
+        "statement_file": statement_file,
+        "line_number": line["line_number"],
+        "document_number": line["document_number"],
+        "document_date": line["document_date"],
+        "amount": line["amount"],
+        "payer_name": line["payer_name"],
+        "payer_inn": line["payer_inn"],
+        "payer_account": line["payer_account"],
+        "purpose": line["purpose"],
+        "status": status,
+        "invoice_id": invoice_id,
+        "resolved_at": datetime.now() if status != "pending" else None,
+    }
+
+
+def import_statement(db: Session, documents: Iterable[Dict], statement_file: Optional[str] = None) -> Dict:
+    """Загрузить выписку: сопоставить поступления и провести их одной транзакцией.
+
+    Документы обрабатываются пачками по IMPORT_CHUNK, в памяти одновременно только
+    одна пачка. Повторно загруженные платежи (тот же номер, дата и сумма) пропускаются.
+    Возвращает статистику и список ошибок по документам (номер считается с 1).
+    """
+    result = {"statement_file": statement_file, "lines": 0, "matched": 0,
+              "matched_invoices": 0, "duplicates": 0, "unmatched": 0, "errors": []}
+    for chunk in chunked(enumerate(documents, start=1), IMPORT_CHUNK):
+        lines = []
+        for line_no, raw in chunk:
+            try:
+                line = normalize_line(raw)
+            except ValueError as e:
+                result["errors"].append({"line": line_no, "error": str(e)})
+                continue
+            line["line_number"] = line_no
+            lines.append(line)
+        result["lines"] += len(chunk)
+        if lines:
+            _import_chunk(db, lines, statement_file, result)
+    db.commit()
+    return result
+
+
+def _import_chunk(db: Session, lines: List[Dict], statement_file: Optional[str], result: Dict):
+    """Сопоставить и провести пачку строк выписки (без фиксации транзакции)."""
+    known = _known_payments(db, lines)
+    index = ReceivableIndex(db, lines)
+    payments, queue = [], []
+    touched: Dict[int, OpenReceivable] = {}
+    paid_invoices: Dict[int, dict] = {}
+
+    for line in lines:
+        key = _payment_key(line["document_number"], line["document_date"], line["amount"])
+        if key in known:
+            result["duplicates"] += 1
+            continue
+        known.add(key)
+
+        kind, target = index.match(line)
+        if kind == "receivable":
+            index.apply(target, line["amount"], line["document_date"])
+            touched[target.id] = target
+            payments.append({
+                "receivable_id": target.id,
+                "payment_date": line["document_date"],
+                "payment_number": line["document_number"],
+                "amount": line["amount"],
+                "payment_method": PAYMENT_METHOD,
+                "bank_account": line["payer_account"],
+                "notes": line["purpose"],
+            })
+            if target.invoice_id:
+                paid_invoices[target.invoice_id] = {
+                    "id": target.invoice_id, "status": InvoiceStatus.PAID,
+                    "paid_date": line["document_date"], "payment_number": line["document_number"],
+                }
+            result["matched"] += 1
+        elif kind == "invoice":
+            index.take_invoice(target)
+            paid_invoices[target] = {
+                "id": target, "status": InvoiceStatus.PAID,
+                "paid_date": line["document_date"], "payment_number": line["document_number"],
+            }
+            # Строка сохраняется как разобранная: по ней отсекается повторная загрузка
+            queue.append(_queue_row(line, statement_file, "matched", invoice_id=target))
+            result["matched_invoices"] += 1
+        else:
+            queue.append(_queue_row(line, statement_file, "pending"))
+            result["unmatched"] += 1
+
+    # Запись до чтения следующей пачки: ее запросы видят новые платежи, остатки и статусы
+    receivable_updates = [
+        {
+            "id": entry.id,
+            "paid_amount": entry.paid,
+            "remaining_amount": entry.remaining,
+            "last_payment_date": entry.last_payment_date,
+            "status": _receivable_status(entry),
+        }
+        for entry in touched.values()
+    ]
+    if payments:
+        db.execute(insert(ReceivablePayment), payments)
+    if receivable_updates:
+        db.execute(update(Receivable), receivable_updates)
+    if paid_invoices:
+        db.execute(update(Invoice), list(paid_invoices.values()))
+    if queue:
+        db.execute(insert(BankStatementLine), queue)
+
+
+def match_queued_line(db: Session, line: BankStatementLine, receivable: Receivable,
+                      resolved_by: Optional[str] = None) -> ReceivablePayment:
+    """Провести строку из очереди разбора по выбранной вручную задолженности."""
+    payment = ReceivablePayment(
+        receivable_id=receivable.id,
+        payment_date=line.document_date,
+        payment_number=line.document_number,
+        amount=line.amount,
+        payment_method=PAYMENT_METHOD,
+        bank_account=line.payer_account,
+        notes=line.purpose,
+    )
+    db.add(payment)
+    receivable.paid_amount = (receivable.paid_amount or 0) + line.amount
+    receivable.remaining_amount = receivable.total_amount - receivable.paid_amount
+    if receivable.last_payment_date is None or line.document_date > receivable.last_payment_date:
+        receivable.last_payment_date = line.document_date
+    receivable.status = ReceivableStatus.PAID if receivable.remaining_amount <= 0 else ReceivableStatus.PARTIALLY_PAID
+    if receivable.invoice:
+        receivable.invoice.status = InvoiceStatus.PAID
+        receivable.invoice.paid_date = line.document_date
+        receivable.invoice.payment_number = line.document_number
+    db.flush()
+
+    line.status = "matched"
+    line.receivable_id = receivable.id
+    line.payment_id = payment.id
+    line.resolved_by = resolved_by
+    line.resolved_at = datetime.now()
+    db.commit()
+    db.refresh(payment)
+    return payment
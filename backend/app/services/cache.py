@@ -0,0 +1,45 @@
+"""Кэш результатов в памяти процесса с коротким временем жизни."""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Словарь «ключ → значение» с истечением через ttl секунд.
+
+    Подходит для дашбордов, которые часто обновляются, но терпят задержку
+    в несколько секунд. Обработчики, меняющие исходные данные, вызывают invalidate().
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return default
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        value = factory()
+        with self._lock:
+            self._data[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Сбросить одну запись или, без ключа, весь кэш."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
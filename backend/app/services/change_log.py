@@ -0,0 +1,169 @@
+"""Журнал изменений документов для инкрементальной синхронизации с 1С (outbox).
+
+Обработчики событий сессии записывают в change_log каждую вставку, изменение
+и удаление КС-2, КС-3, счетов, актов списания и объемов работ в той же транзакции,
+что и сами изменения. Изменение строки документа (позиции КС-2, строки списания,
+записи объема) регистрируется как изменение документа-владельца.
+
+Токен синхронизации — id записи журнала, и id выдаются в порядке фиксации транзакций:
+изменения копятся в сессии и записываются в журнал непосредственно перед фиксацией.
+В SQLite пишущая транзакция одна. В PostgreSQL транзакция перед записью журнала берет
+транзакционную advisory-блокировку и держит ее до COMMIT, поэтому транзакция с меньшим
+id не может зафиксироваться позже транзакции с большим, и читатель, увидевший id N,
+уже видит все меньшие id. Параллельными остаются сами изменения документов;
+последовательно выполняются только запись журнала и фиксация.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.change_log import ChangeLog
+from app.models.invoice import Invoice
+from app.models.ks2 import KS2, KS2Item
+from app.models.ks3 import KS3, KS3Item
+from app.models.material import MaterialWriteOff, MaterialWriteOffItem
+from app.models.work_volume import WorkVolume, WorkVolumeEntry
+
+# Модель документа → тип в журнале
+TRACKED_DOCUMENTS = {
+    KS2: "ks2",
+    KS3: "ks3",
+    Invoice: "invoices",
+    MaterialWriteOff: "write_offs",
+    WorkVolume: "work_volumes",
+}
+
+# Строки документов → (тип документа-владельца, атрибут со ссылкой на владельца)
+TRACKED_LINES = {
+    KS2Item: ("ks2", "ks2_id"),
+    KS3Item: ("ks3", "ks3_id"),
+    MaterialWriteOffItem: ("write_offs", "write_off_id"),
+    WorkVolumeEntry: ("work_volumes", "work_volume_id"),
+}
+
+CHANGE_TYPES = tuple(TRACKED_DOCUMENTS.values())
+
+# При нескольких изменениях документа в одной транзакции остается самое сильное
+_PRIORITY = {"update": 1, "insert": 2, "delete": 3}
+
+# Ключ session.info: изменения текущей транзакции, еще не записанные в журнал
+_PENDING = "change_log_pending"
+
+
+def _target(obj, operation: str) -> Optional[Tuple[str, int, str]]:
+    cls = type(obj)
+    entity_type = TRACKED_DOCUMENTS.get(cls)
+    if entity_type is not None:
+        return entity_type, obj.id, operation
+    line = TRACKED_LINES.get(cls)
+    if line is not None:
+        owner_id = getattr(obj, line[1])
+        if owner_id is not None:
+            return line[0], owner_id, "update"
+    return None
+
+
+def _merge(changes: Dict[Tuple[str, int], str], entity_type: str, entity_id: int, operation: str):
+    key = (entity_type, entity_id)
+    current = changes.get(key)
+    if current is None or _PRIORITY[operation] > _PRIORITY[current]:
+        changes[key] = operation
+
+
+def _pending(session: Session) -> Dict[Tuple[str, int], str]:
+    return session.info.setdefault(_PENDING, {})
+
+
+def _after_flush(session: Session, flush_context):
+    changes = _pending(session)
+    for operation, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if operation == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            target = _target(obj, operation)
+            if target is not None:
+                _merge(changes, *target)
+
+
+def _do_orm_execute(state):
+    """Пакетные UPDATE/DELETE по первичному ключу (db.execute(update(Model), [{"id": ...}, ...]))."""
+    if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+        return
+    entity_type = TRACKED_DOCUMENTS.get(state.bind_mapper.class_)
+    if entity_type is None:
+        return
+    params = state.parameters
+    if not isinstance(params, list):
+        return
+    changes = _pending(state.session)
+    operation = "update" if state.is_update else "delete"
+    for row in params:
+        if row.get("id") is not None:
+            _merge(changes, entity_type, row["id"], operation)
+
+
+def _before_commit(session: Session):
+    """Записать изменения транзакции в журнал: id выдаются в порядке фиксации (см. модуль)."""
+    # Событие приходит до flush, выполняемого фиксацией: его изменения тоже должны попасть в журнал
+    session.flush()
+    changes = session.info.pop(_PENDING, None)
+    if not changes:
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.pg_advisory_xact_lock(func.hashtext(ChangeLog.__tablename__))))
+    connection.execute(
+        insert(ChangeLog.__table__),
+        [{"entity_type": t, "entity_id": i, "operation": op} for (t, i), op in changes.items()],
+    )
+
+
+def _after_transaction_end(session: Session, transaction):
+    if transaction.parent is None:
+        # Откат: накопленные изменения не записываются
+        session.info.pop(_PENDING, None)
+
+
+def register_change_tracking(session_factory):
+    """Подключить журнал изменений к фабрике сессий (повторный вызов ничего не делает)."""
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+        event.listen(session_factory, "do_orm_execute", _do_orm_execute)
+        event.listen(session_factory, "before_commit", _before_commit)
+        event.listen(session_factory, "after_transaction_end", _after_transaction_end)
+
+
+def read_changes(session: Session, since: int = 0, limit: int = 1000,
+                 types: Optional[List[str]] = None) -> Dict:
+    """Изменения после токена since: не больше limit записей журнала.
+
+    Повторные изменения одного документа в пределах страницы сворачиваются
+    в последнее; next_token — токен для следующего запроса.
+    """
+    stmt = select(ChangeLog).where(ChangeLog.id > since)
+    if types:
+        stmt = stmt.where(ChangeLog.entity_type.in_(types))
+    rows = session.scalars(stmt.order_by(ChangeLog.id).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest: Dict[Tuple[str, int], ChangeLog] = {}
+    for row in rows:
+        key = (row.entity_type, row.entity_id)
+        latest.pop(key, None)
+        latest[key] = row
+    return {
+        "changes": [
+            {
+                "token": row.id,
+                "entity_type": row.entity_type,
+                "entity_id": row.entity_id,
+                "operation": row.operation,
+                "changed_at": row.changed_at,
+            }
+            for row in latest.values()
+        ],
+        "next_token": rows[-1].id if rows else since,
+        "has_more": has_more,
+    }
@@ -0,0 +1,36 @@
+"""Иерархия подразделений: поддерево одним запросом WITH RECURSIVE.
+
+Рекурсивное CTE обходит departments.parent_id на стороне БД (SQLite и PostgreSQL),
+поэтому поддерево любой глубины — один запрос, а фильтры «подразделение с дочерними»
+подставляют его как подзапрос IN (...). UNION (без ALL) отбрасывает повторные строки,
+так что случайный цикл в parent_id не зацикливает запрос.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.department import Department
+
+
+def subtree_ids(department_id: int):
+    """SELECT id подразделения и всех его потомков (для подстановки в IN)."""
+    tree = (
+        select(Department.id)
+        .where(Department.id == department_id)
+        .cte("department_tree", recursive=True)
+    )
+    tree = tree.union(select(Department.id).where(Department.parent_id == tree.c.id))
+    return select(tree.c.id)
+
+
+def department_filter(column, department_id: int, include_subtree: bool = False):
+    """Условие по колонке department_id: само подразделение или всё поддерево."""
+    if include_subtree:
+        return column.in_(subtree_ids(department_id))
+    return column == department_id
+
+
+def get_descendant_ids(db: Session, department_id: int) -> set:
+    """id всех потомков подразделения (без него самого)."""
+    ids = set(db.scalars(subtree_ids(department_id)))
+    ids.discard(department_id)
+    return ids
@@ -0,0 +1,129 @@
+"""Сравнение двух версий сметы: hash join позиций по коду и нормализованному наименованию."""
+import re
+from decimal import Decimal
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.estimate import EstimateItem
+
+_SPACES = re.compile(r"\s+")
+_ZERO = Decimal(0)
+
+
+def normalize_work_name(name: str) -> str:
+    """Регистр, ё/е и повторные пробелы не считаются изменением наименования."""
+    return _SPACES.sub(" ", (name or "").casefold().replace("ё", "е")).strip()
+
+
+def _load_lines(db: Session, estimate_id: int) -> Dict[Tuple[str, str], dict]:
+    """Позиции сметы, свёрнутые по ключу (код, наименование); повторы ключа суммируются."""
+    rows = (
+        db.query(
+            EstimateItem.line_number,
+            EstimateItem.item_type,
+            EstimateItem.code,
+            EstimateItem.work_name,
+            EstimateItem.unit,
+            EstimateItem.quantity,
+            EstimateItem.unit_price,
+            EstimateItem.total_price,
+        )
+        .filter(EstimateItem.estimate_id == estimate_id)
+        .order_by(EstimateItem.line_number, EstimateItem.id)
+        .all()
+    )
+    lines: Dict[Tuple[str, str], dict] = {}
+    for line_number, item_type, code, work_name, unit, quantity, unit_price, total_price in rows:
+        key = ((code or "").strip().casefold(), normalize_work_name(work_name))
+        line = lines.get(key)
+        if line is None:
+            lines[key] = {
+                "line_number": line_number,
+                "item_type": getattr(item_type, "value", item_type),
+                "code": code,
+                "work_name": work_name,
+                "unit": unit,
+                "quantity": quantity or _ZERO,
+                "unit_price": unit_price,
+                "total_price": total_price or _ZERO,
+            }
+        else:
+            line["quantity"] += quantity or _ZERO
+            line["total_price"] += total_price or _ZERO
+    return lines
+
+
+def _add_total(totals: Dict[str, dict], category: str, side: str, amount: Decimal):
+    bucket = totals.get(category)
+    if bucket is None:
+        bucket = totals[category] = {"item_type": category, "total_a": _ZERO, "total_b": _ZERO}
+    bucket[side] += amount
+
+
+def diff_estimates(db: Session, estimate_a_id: int, estimate_b_id: int) -> dict:
+    """Добавленные, удалённые и изменённые позиции B относительно A и итоги по типам позиций.
+
+    Обе сметы читаются одним проходом каждая, сопоставление — через словарь: O(n + m).
+    """
+    lines_a = _load_lines(db, estimate_a_id)
+    lines_b = _load_lines(db, estimate_b_id)
+
+    added, removed, changed = [], [], []
+    unchanged = 0
+    totals: Dict[str, dict] = {}
+
+    for key, a in lines_a.items():
+        _add_total(totals, a["item_type"], "total_a", a["total_price"])
+        b = lines_b.get(key)
+        if b is None:
+            removed.append(a)
+            continue
+        if (
+            a["quantity"] == b["quantity"]
+            and a["unit_price"] == b["unit_price"]
+            and a["total_price"] == b["total_price"]
+        ):
+            unchanged += 1
+            continue
+        changed.append({
+            "code": b["code"],
+            "work_name": b["work_name"],
+            "unit": b["unit"],
+            "item_type": b["item_type"],
+            "line_number_a": a["line_number"],
+            "line_number_b": b["line_number"],
+            "quantity_a": a["quantity"],
+            "quantity_b": b["quantity"],
+            "quantity_delta": b["quantity"] - a["quantity"],
+            "unit_price_a": a["unit_price"],
+            "unit_price_b": b["unit_price"],
+            "unit_price_delta": (b["unit_price"] or _ZERO) - (a["unit_price"] or _ZERO),
+            "total_price_a": a["total_price"],
+            "total_price_b": b["total_price"],
+            "total_price_delta": b["total_price"] - a["total_price"],
+        })
+
+    for key, b in lines_b.items():
+        _add_total(totals, b["item_type"], "total_b", b["total_price"])
+        if key not in lines_a:
+            added.append(b)
+
+    category_totals = [
+        {**bucket, "delta": bucket["total_b"] - bucket["total_a"]}
+        for bucket in sorted(totals.values(), key=lambda t: t["item_type"])
+    ]
+    total_a = sum((t["total_a"] for t in category_totals), _ZERO)
+    total_b = sum((t["total_b"] for t in category_totals), _ZERO)
+    return {
+        "estimate_a_id": estimate_a_id,
+        "estimate_b_id": estimate_b_id,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "unchanged_count": unchanged,
+        "category_totals": category_totals,
+        "total_a": total_a,
+        "total_b": total_b,
+        "total_delta": total_b - total_a,
+    }
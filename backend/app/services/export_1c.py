@@ -0,0 +1,195 @@
+"""Выгрузка документов в 1С: сериализация КС-2, КС-3 и актов списания и потоковый экспорт.
+
+Потоковый экспорт читает документы пачками по первичному ключу (WHERE id > :last
+ORDER BY id LIMIT :n) с подгрузкой строк и связанных объектов через selectinload,
+а после каждой пачки очищает сессию — память не растёт с объемом выгрузки.
+Каждая запись несет тип и id документа, поэтому прерванную выгрузку можно
+продолжить с последнего полученного документа (параметр after=<тип>:<id>).
+"""
+import json
+import xml.etree.ElementTree as ET
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models.ks2 import KS2
+from app.models.ks3 import KS3
+from app.models.material import MaterialWriteOff, MaterialWriteOffItem
+
+EXPORT_BATCH_SIZE = 200
+
+
+def _str(value) -> Optional[str]:
+    return str(value) if value else None
+
+
+def ks2_to_dict(ks2: KS2) -> Dict:
+    return {
+        "id": ks2.id,
+        "number": ks2.number,
+        "date": ks2.date,
+        "project_name": ks2.project.name if ks2.project else "",
+        "customer": ks2.customer,
+        "contractor": ks2.contractor,
+        "total_amount": ks2.total_amount,
+        "items": [
+            {
+                "work_name": item.work_name,
+                "unit": item.unit,
+                "volume_completed": str(item.volume_completed),
+                "price": _str(item.price),
+                "amount": _str(item.amount),
+            }
+            for item in ks2.items
+        ],
+    }
+
+
+def ks3_to_dict(ks3: KS3) -> Dict:
+    return {
+        "id": ks3.id,
+        "number": ks3.number,
+        "date": ks3.date,
+        "project_name": ks3.project.name if ks3.project else "",
+        "customer": ks3.customer,
+        "contractor": ks3.contractor,
+        "total_amount": ks3.total_amount,
+        "total_vat": ks3.total_vat,
+        "total_with_vat": ks3.total_with_vat,
+        "items": [
+            {
+                "work_name": item.work_name,
+                "unit": item.unit,
+                "volume": str(item.volume),
+                "price": _str(item.price),
+                "amount": _str(item.amount),
+                "vat_rate": _str(item.vat_rate),
+                "vat_amount": _str(item.vat_amount),
+                "amount_with_vat": _str(item.amount_with_vat),
+            }
+            for item in ks3.items
+        ],
+    }
+
+
+def write_off_to_dict(write_off: MaterialWriteOff) -> Dict:
+    return {
+        "id": write_off.id,
+        "write_off_number": write_off.write_off_number,
+        "write_off_date": write_off.write_off_date,
+        "project_name": write_off.project.name if write_off.project else "",
+        "total_amount": write_off.total_amount,
+        "items": [
+            {
+                "material_code": item.material.code if item.material else "",
+                "material_name": item.material.name if item.material else "",
+                "quantity": str(item.quantity),
+                "price": _str(item.price),
+                "amount": _str(item.amount),
+            }
+            for item in write_off.items
+        ],
+    }
+
+
+# Тип выгрузки → (модель, колонка даты, параметры загрузки, сериализатор)
+EXPORT_TYPES = {
+    "ks2": (KS2, KS2.date, (joinedload(KS2.project), selectinload(KS2.items)), ks2_to_dict),
+    "ks3": (KS3, KS3.date, (joinedload(KS3.project), selectinload(KS3.items)), ks3_to_dict),
+    "write_offs": (
+        MaterialWriteOff,
+        MaterialWriteOff.write_off_date,
+        (
+            joinedload(MaterialWriteOff.project),
+            selectinload(MaterialWriteOff.items).joinedload(MaterialWriteOffItem.material),
+        ),
+        write_off_to_dict,
+    ),
+}
+
+
+def parse_types(value: str) -> List[str]:
+    """Список типов из строки «ks2,ks3,write_offs» (ValueError при неизвестном типе)."""
+    types = [t.strip() for t in value.split(",") if t.strip()]
+    unknown = [t for t in types if t not in EXPORT_TYPES]
+    if unknown:
+        raise ValueError(f"неизвестные типы документов: {', '.join(unknown)}")
+    if not types:
+        raise ValueError("не указаны типы документов")
+    return list(dict.fromkeys(types))
+
+
+def parse_cursor(value: Optional[str], types: List[str]) -> Optional[Tuple[str, int]]:
+    """Позиция продолжения «тип:id» (ValueError, если тип не входит в выгрузку)."""
+    if not value:
+        return None
+    doc_type, _, last_id = value.partition(":")
+    if doc_type not in types or not last_id.isdigit():
+        raise ValueError(f"некорректная позиция продолжения: {value}")
+    return doc_type, int(last_id)
+
+
+def iter_documents(
+    db: Session,
+    types: List[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[Tuple[str, int]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[Tuple[str, Dict]]:
+    """Документы выгрузки по типам в порядке types, внутри типа — по возрастанию id."""
+    if after is not None:
+        types = types[types.index(after[0]):]
+    for doc_type in types:
+        model, date_col, options, serialize = EXPORT_TYPES[doc_type]
+        last_id = after[1] if after is not None and after[0] == doc_type else 0
+        while True:
+            stmt = select(model).options(*options).where(model.id > last_id)
+            if date_from is not None:
+                stmt = stmt.where(date_col >= date_from)
+            if date_to is not None:
+                stmt = stmt.where(date_col <= date_to)
+            batch = db.scalars(stmt.order_by(model.id).limit(batch_size)).unique().all()
+            if not batch:
+                break
+            for document in batch:
+                yield doc_type, serialize(document)
+            last_id = batch[-1].id
+            # Пачка выдана — освобождаем карту идентичности сессии
+            db.expunge_all()
+            if len(batch) < batch_size:
+                break
+
+
+def _json_default(value):
+    return str(value)
+
+
+def ndjson_lines(documents: Iterator[Tuple[str, Dict]]) -> Iterator[str]:
+    for doc_type, data in documents:
+        record = {"type": doc_type, "cursor": f"{doc_type}:{data['id']}", **data}
+        yield json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def _xml_element(tag: str, data: Dict) -> ET.Element:
+    element = ET.Element(tag)
+    for key, value in data.items():
+        if key == "items":
+            items = ET.SubElement(element, "Items")
+            for item in value:
+                items.append(_xml_element("Item", item))
+        elif value is not None:
+            ET.SubElement(element, key).text = str(value)
+    return element
+
+
+def xml_chunks(documents: Iterator[Tuple[str, Dict]]) -> Iterator[str]:
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<Export>\n'
+    for doc_type, data in documents:
+        element = _xml_element("Document", data)
+        element.set("type", doc_type)
+        element.set("cursor", f"{doc_type}:{data['id']}")
+        yield ET.tostring(element, encoding="unicode") + "\n"
+    yield "</Export>\n"
@@ -0,0 +1,362 @@
+"""Расчет критического пути (CPM) для ГПР.
+
+Зависимости задач (GPRTask.dependencies — ID предшественников через запятую) разбираются
+в ориентированный граф «окончание — начало». Порядок обхода строится алгоритмом Кана;
+если обойти все вершины не удалось, в графе есть цикл, и он возвращается в ошибке.
+Прямой проход дает ранние даты, обратный — поздние, разность — полный резерв;
+задачи без резерва образуют критический путь.
+
+Даты внутри расчета — целые смещения в днях от начала ГПР, задача занимает
+дни [начало, окончание] включительно. Результат кэшируется по ГПР и сбрасывается
+при изменении задач через ORM (события маппера), а изменения из других процессов
+отсекаются сравнением отпечатка задач в БД.
+"""
+import math
+from collections import deque
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.gpr import GPR, GPRTask
+from app.services.cache import TTLCache
+from app.services.work_calendar import WorkCalendar, get_calendar
+
+SCHEDULE_CACHE_TTL = 600
+schedule_cache = TTLCache(ttl=SCHEDULE_CACHE_TTL)
+
+
+@event.listens_for(GPRTask, "after_insert")
+@event.listens_for(GPRTask, "after_update")
+@event.listens_for(GPRTask, "after_delete")
+def _invalidate_on_task_change(mapper, connection, target):
+    schedule_cache.invalidate(target.gpr_id)
+
+
+@event.listens_for(GPR, "after_update")
+@event.listens_for(GPR, "after_delete")
+def _invalidate_on_gpr_change(mapper, connection, target):
+    schedule_cache.invalidate(target.id)
+
+
+class ScheduleCycleError(ValueError):
+    """Зависимости задач образуют цикл."""
+
+    def __init__(self, cycle: List[int]):
+        self.cycle = cycle
+        super().__init__("Зависимости задач образуют цикл: " + " → ".join(str(t) for t in cycle))
+
+
+def parse_dependencies(value: Optional[str]) -> List[int]:
+    """ID предшественников из строки «12, 15;18» (нечисловые части пропускаются)."""
+    ids = []
+    for part in (value or "").replace(";", ",").split(","):
+        part = part.strip()
+        if part.isdigit():
+            ids.append(int(part))
+    return ids
+
+
+def task_duration(start: date, end: date) -> int:
+    """Длительность в календарных днях по датам задачи (не меньше 1).
+
+    Плановая длительность задается в рабочих днях и уже учтена в дате окончания
+    через производственный календарь (app.services.work_calendar).
+    """
+    return max((end - start).days + 1, 1)
+
+
+def working_duration(calendar: WorkCalendar, start: date, end: date) -> int:
+    """Длительность задачи в рабочих днях по ее датам (не меньше 1).
+
+    Сроки пересчитываются по датам, а не по planned_duration: в строках, созданных
+    до перехода на рабочие дни (миграция 0004), там записаны календарные дни.
+    """
+    return max(calendar.working_days_between(start, end), 1)
+
+
+class TaskGraph:
+    """Граф зависимостей задач ГПР в виде массивов по позициям задач."""
+
+    def __init__(self, ids: Sequence[int], dependencies: Sequence[Optional[str]]):
+        self.ids = list(ids)
+        self.index: Dict[int, int] = {task_id: i for i, task_id in enumerate(self.ids)}
+        n = len(self.ids)
+        self.preds: List[List[int]] = [[] for _ in range(n)]
+        self.succs: List[List[int]] = [[] for _ in range(n)]
+        self.missing: List[Tuple[int, int]] = []
+        for i, value in enumerate(dependencies):
+            for dep_id in parse_dependencies(value):
+                j = self.index.get(dep_id)
+                if j is None:
+                    self.missing.append((self.ids[i], dep_id))
+                elif j not in self.preds[i]:
+                    self.preds[i].append(j)
+                    self.succs[j].append(i)
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[int]:
+        indegree = [len(p) for p in self.preds]
+        queue = deque(i for i, d in enumerate(indegree) if d == 0)
+        order = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for s in self.succs[i]:
+                indegree[s] -= 1
+                if indegree[s] == 0:
+                    queue.append(s)
+        if len(order) < len(self.ids):
+            raise ScheduleCycleError(self._find_cycle({i for i, d in enumerate(indegree) if d > 0}))
+        return order
+
+    def _find_cycle(self, nodes: set) -> List[int]:
+        """Один цикл среди вершин, не вошедших в порядок обхода (итеративный DFS)."""
+        state: Dict[int, int] = {}  # 1 — в стеке, 2 — обработана
+        for root in sorted(nodes):
+            if root in state:
+                continue
+            stack = [(root, iter(self.succs[root]))]
+            path = [root]
+            state[root] = 1
+            while stack:
+                node, successors = stack[-1]
+                for s in successors:
+                    if s not in nodes:
+                        continue
+                    if state.get(s) == 1:
+                        cycle = path[path.index(s):] + [s]
+                        return [self.ids[i] for i in cycle]
+                    if s not in state:
+                        state[s] = 1
+                        path.append(s)
+                        stack.append((s, iter(self.succs[s])))
+                        break
+                else:
+                    state[node] = 2
+                    path.pop()
+                    stack.pop()
+        return []
+
+    def downstream(self, starts: Iterable[int]) -> List[int]:
+        """Позиции задач starts и всех зависящих от них (прямо или через цепочку) в порядке обхода."""
+        seen = set(starts)
+        queue = deque(seen)
+        while queue:
+            for s in self.succs[queue.popleft()]:
+                if s not in seen:
+                    seen.add(s)
+                    queue.append(s)
+        return [i for i in self.order if i in seen]
+
+
+def forward_pass(graph: TaskGraph, anchors: List[int], durations: List[int],
+                 actual_starts: List[Optional[int]], actual_ends: List[Optional[int]]) -> Tuple[List[int], List[int]]:
+    """Ранние начало и окончание. Задачи без предшественников начинаются в свою плановую дату,
+    фактические даты фиксируют начало/окончание задачи."""
+    n = len(graph.ids)
+    es, ef = [0] * n, [0] * n
+    for i in graph.order:
+        preds = graph.preds[i]
+        start = max(ef[p] for p in preds) + 1 if preds else anchors[i]
+        if actual_starts[i] is not None:
+            start = actual_starts[i]
+        es[i] = start
+        ef[i] = actual_ends[i] if actual_ends[i] is not None else start + durations[i] - 1
+    return es, ef
+
+
+def backward_pass(graph: TaskGraph, durations: List[int], finish: int) -> Tuple[List[int], List[int]]:
+    """Поздние начало и окончание при сроке окончания графика finish."""
+    n = len(graph.ids)
+    ls, lf = [0] * n, [0] * n
+    for i in reversed(graph.order):
+        succs = graph.succs[i]
+        lf[i] = min(ls[s] for s in succs) - 1 if succs else finish
+        ls[i] = lf[i] - durations[i] + 1
+    return ls, lf
+
+
+def _critical_chain(graph: TaskGraph, es: List[int], ef: List[int], total_float: List[int], finish: int) -> List[int]:
+    """Цепочка критических задач от начала до окончания графика."""
+    ends = [i for i in graph.order if total_float[i] <= 0 and ef[i] == finish]
+    if not ends:
+        return []
+    chain = [ends[0]]
+    while True:
+        i = chain[-1]
+        prev = [p for p in graph.preds[i] if total_float[p] <= 0 and ef[p] + 1 == es[i]]
+        if not prev:
+            break
+        chain.append(prev[0])
+    return [graph.ids[i] for i in reversed(chain)]
+
+
+def _load_tasks(db: Session, gpr_id: int):
+    return db.execute(
+        select(
+            GPRTask.id, GPRTask.name, GPRTask.start_date, GPRTask.end_date, GPRTask.planned_duration,
+            GPRTask.actual_start_date, GPRTask.actual_end_date, GPRTask.dependencies,
+        )
+        .where(GPRTask.gpr_id == gpr_id)
+        .order_by(GPRTask.id)
+    ).all()
+
+
+def _fingerprint(db: Session, gpr: GPR) -> tuple:
+    row = db.execute(
+        select(
+            func.count(GPRTask.id),
+            func.max(GPRTask.id),
+            func.max(func.coalesce(GPRTask.updated_at, GPRTask.created_at)),
+        ).where(GPRTask.gpr_id == gpr.id)
+    ).one()
+    return (gpr.start_date, gpr.updated_at, *row)
+
+
+def compute_schedule(gpr: GPR, rows) -> Dict:
+    """Полный расчет CPM по строкам задач (id, name, даты, длительность, факт, зависимости)."""
+    base = gpr.start_date
+
+    def offset(d: Optional[date]) -> Optional[int]:
+        return (d - base).days if d is not None else None
+
+    graph = TaskGraph([r.id for r in rows], [r.dependencies for r in rows])
+    durations = [task_duration(r.start_date, r.end_date) for r in rows]
+    anchors = [offset(r.start_date) for r in rows]
+    es, ef = forward_pass(graph, anchors, durations,
+                          [offset(r.actual_start_date) for r in rows], [offset(r.actual_end_date) for r in rows])
+    finish = max(ef) if ef else 0
+    ls, lf = backward_pass(graph, durations, finish)
+    total_float = [ls[i] - es[i] for i in range(len(rows))]
+
+    tasks = []
+    for i in graph.order:
+        succs = graph.succs[i]
+        free_float = (min(es[s] for s in succs) if succs else finish + 1) - ef[i] - 1
+        tasks.append({
+            "id": graph.ids[i],
+            "name": rows[i].name,
+            "duration": durations[i],
+            "early_start": base + timedelta(days=es[i]),
+            "early_finish": base + timedelta(days=ef[i]),
+            "late_start": base + timedelta(days=ls[i]),
+            "late_finish": base + timedelta(days=lf[i]),
+            "total_float": total_float[i],
+            "free_float": free_float,
+            "is_critical": total_float[i] <= 0,
+        })
+    return {
+        "gpr_id": gpr.id,
+        "project_start": base + timedelta(days=min(es)) if es else base,
+        "project_finish": base + timedelta(days=finish),
+        "duration_days": (finish - min(es) + 1) if es else 0,
+        "critical_path": _critical_chain(graph, es, ef, total_float, finish),
+        "tasks": tasks,
+        "missing_dependencies": [{"task_id": t, "dependency_id": d} for t, d in graph.missing],
+    }
+
+
+def get_schedule(db: Session, gpr: GPR) -> Dict:
+    """Расчет CPM для ГПР с кэшированием; ScheduleCycleError при цикле зависимостей."""
+    fingerprint = _fingerprint(db, gpr)
+    cached = schedule_cache.get(gpr.id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    result = compute_schedule(gpr, _load_tasks(db, gpr.id))
+    schedule_cache.set(gpr.id, (fingerprint, result))
+    return result
+
+
+def forecast_finish(calendar: WorkCalendar, start: date, end: date, duration: int,
+                    actual_start: Optional[date], actual_end: Optional[date],
+                    progress: Optional[int], today: date) -> date:
+    """Прогноз окончания задачи для её последователей.
+
+    Завершенная задача — фактическая дата окончания. Начатая задача (есть факт начала
+    или процент выполнения) заканчивается не раньше, чем через оставшуюся по проценту
+    часть длительности в рабочих днях, считая от сегодняшнего дня.
+    """
+    if actual_end is not None:
+        return actual_end
+    progress = progress or 0
+    if (actual_start is not None or progress > 0) and progress < 100:
+        remaining = math.ceil(duration * (100 - progress) / 100)
+        return max(end, calendar.add_working_days(today, remaining))
+    return end
+
+
+def propagate_changes(db: Session, gpr_id: int, changed_ids: Iterable[int],
+                      today: Optional[date] = None, calendar: Optional[WorkCalendar] = None) -> List[Dict]:
+    """Сдвинуть последователей измененных задач (инкрементальный пересчет).
+
+    Пересчитывается только нисходящий конус измененных задач: в порядке обхода
+    каждая задача начинается не раньше первого рабочего дня после прогнозного окончания
+    предшественников и сохраняет длительность в рабочих днях (календарь объекта ГПР).
+    Задачи сдвигаются только вперед (плановые даты не подтягиваются раньше), начатые
+    задачи (есть факт начала) не двигаются. Новые даты записываются одним пакетным
+    UPDATE в текущей транзакции; возвращается список сдвинутых задач.
+    ScheduleCycleError — если зависимости образуют цикл.
+    """
+    today = today or date.today()
+    db.flush()
+    if calendar is None:
+        calendar = get_calendar(db, db.scalar(select(GPR.project_id).where(GPR.id == gpr_id)))
+    rows = db.execute(
+        select(
+            GPRTask.id, GPRTask.name, GPRTask.start_date, GPRTask.end_date, GPRTask.planned_duration,
+            GPRTask.actual_start_date, GPRTask.actual_end_date, GPRTask.progress, GPRTask.dependencies,
+        )
+        .where(GPRTask.gpr_id == gpr_id)
+        .order_by(GPRTask.id)
+    ).all()
+    graph = TaskGraph([r.id for r in rows], [r.dependencies for r in rows])
+    roots = [graph.index[t] for t in set(changed_ids) if t in graph.index]
+    if not roots:
+        return []
+
+    def duration_of(r) -> int:
+        return working_duration(calendar, r.start_date, r.end_date)
+
+    finishes: Dict[int, date] = {}
+
+    def finish_of(i: int) -> date:
+        if i not in finishes:
+            r = rows[i]
+            finishes[i] = forecast_finish(calendar, r.start_date, r.end_date, duration_of(r),
+                                          r.actual_start_date, r.actual_end_date, r.progress, today)
+        return finishes[i]
+
+    affected = []
+    for i in graph.downstream(roots):
+        r = rows[i]
+        start, end = r.start_date, r.end_date
+        duration = duration_of(r)
+        preds = graph.preds[i]
+        if r.actual_start_date is None and preds:
+            earliest = calendar.next_working_day(max(finish_of(p) for p in preds) + timedelta(days=1))
+            if earliest > start:
+                start = earliest
+                end = calendar.add_working_days(start, duration)
+        finishes[i] = forecast_finish(calendar, start, end, duration, r.actual_start_date,
+                                      r.actual_end_date, r.progress, today)
+        if start != r.start_date:
+            affected.append({
+                "id": r.id,
+                "name": r.name,
+                "previous_start_date": r.start_date,
+                "previous_end_date": r.end_date,
+                "start_date": start,
+                "end_date": end,
+                "shift_days": (start - r.start_date).days,
+            })
+
+    if affected:
+        db.execute(
+            update(GPRTask),
+            [{"id": t["id"], "start_date": t["start_date"], "end_date": t["end_date"]} for t in affected],
+        )
+    # Пакетный UPDATE идет мимо событий маппера
+    schedule_cache.invalidate(gpr_id)
+    return affected
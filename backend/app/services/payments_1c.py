@@ -0,0 +1,150 @@
+"""Пакетный идемпотентный импорт платежей из 1С.
+
+Ключ идемпотентности — номер платежного поручения. Каждый проведенный номер
+записывается в журнал imported_payments с уникальным ограничением; номер
+захватывается вставкой INSERT ... ON CONFLICT DO NOTHING, и проводятся только
+захваченные номера. Номер в оплаченном счете для этого не годится: следующий
+платеж по счету его перезаписывает. Счета и связанные задолженности читаются
+пачками, изменения пишутся пакетными INSERT/UPDATE в одной транзакции вместе
+с журналом. Для каждой строки возвращается результат.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.bulk import chunked, dialect_insert
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.receivables import ImportedPayment, Receivable, ReceivablePayment, ReceivableStatus
+
+PAYMENT_METHOD = "1С"
+
+# Статусы строки пакета
+IMPORTED = "imported"
+DUPLICATE = "duplicate"
+NOT_FOUND = "not_found"
+INVALID = "invalid"
+
+_IN_CHUNK = 500
+
+
+def _claim_numbers(db: Session, claims: List[Dict]) -> set:
+    """Записать номера поручений в журнал; вернуть номера, которых в журнале еще не было."""
+    table = ImportedPayment.__table__
+    claimed = set()
+    for batch in chunked(claims, _IN_CHUNK):
+        claimed.update(db.execute(
+            dialect_insert(db.bind, table).values(batch)
+            .on_conflict_do_nothing(index_elements=["payment_number"])
+            .returning(table.c.payment_number)
+        ).scalars())
+    return claimed
+
+
+def import_payments(db: Session, payments: List[Dict]) -> List[Dict]:
+    """Провести платежи из 1С: {invoice_id, payment_date, payment_number, amount}.
+
+    Счет отмечается оплаченным; если по счету ведется задолженность, создается
+    платеж по ней и пересчитываются оплачено/остаток/статус.
+    """
+    results = [
+        {"index": i, "payment_number": p.get("payment_number"), "invoice_id": p.get("invoice_id"),
+         "receivable_id": None, "status": None, "message": None}
+        for i, p in enumerate(payments)
+    ]
+
+    numbers = {}
+    for payment, result in zip(payments, results):
+        number = (payment.get("payment_number") or "").strip()
+        if not number:
+            result.update(status=INVALID, message="Не указан номер платежного поручения")
+        elif not payment.get("amount") or Decimal(str(payment["amount"])) <= 0:
+            result.update(status=INVALID, message="Сумма платежа должна быть больше нуля")
+        elif number in numbers:
+            result.update(status=DUPLICATE, message=f"Повтор в пакете (строка {numbers[number]})")
+        else:
+            numbers[number] = result["index"]
+            result["payment_number"] = number
+
+    invoice_ids = {p["invoice_id"] for p, r in zip(payments, results) if r["status"] is None}
+    invoices = set()
+    receivables: Dict[int, dict] = {}
+    for chunk in chunked(invoice_ids, _IN_CHUNK):
+        invoices.update(db.execute(select(Invoice.id).where(Invoice.id.in_(chunk))).scalars())
+        rows = db.execute(
+            select(Receivable.id, Receivable.invoice_id, Receivable.total_amount, Receivable.paid_amount,
+                   Receivable.last_payment_date)
+            .where(Receivable.invoice_id.in_(chunk))
+            .order_by(Receivable.id)
+        )
+        for receivable_id, invoice_id, total, paid, last_date in rows:
+            receivables.setdefault(invoice_id, {
+                "id": receivable_id, "total": Decimal(str(total or 0)), "paid": Decimal(str(paid or 0)),
+                "last_payment_date": last_date,
+            })
+
+    claims = []
+    for payment, result in zip(payments, results):
+        if result["status"] is not None:
+            continue
+        invoice_id = payment["invoice_id"]
+        if invoice_id not in invoices:
+            result.update(status=NOT_FOUND, message="Счет не найден")
+            continue
+        receivable = receivables.get(invoice_id)
+        claims.append({
+            "payment_number": result["payment_number"], "invoice_id": invoice_id,
+            "receivable_id": receivable["id"] if receivable is not None else None,
+            "payment_date": payment["payment_date"], "amount": Decimal(str(payment["amount"])),
+        })
+    claimed = _claim_numbers(db, claims)
+
+    invoice_updates: Dict[int, dict] = {}
+    new_payments = []
+    touched: Dict[int, dict] = {}
+    for payment, result in zip(payments, results):
+        if result["status"] is not None:
+            continue
+        number = result["payment_number"]
+        if number not in claimed:
+            result.update(status=DUPLICATE, message="Платеж уже импортирован")
+            continue
+        invoice_id = payment["invoice_id"]
+
+        amount = Decimal(str(payment["amount"]))
+        invoice_updates[invoice_id] = {
+            "id": invoice_id, "status": InvoiceStatus.PAID,
+            "paid_date": payment["payment_date"], "payment_number": number,
+        }
+        receivable = receivables.get(invoice_id)
+        if receivable is not None:
+            receivable["paid"] += amount
+            if receivable["last_payment_date"] is None or payment["payment_date"] > receivable["last_payment_date"]:
+                receivable["last_payment_date"] = payment["payment_date"]
+            touched[receivable["id"]] = receivable
+            new_payments.append({
+                "receivable_id": receivable["id"], "payment_date": payment["payment_date"],
+                "payment_number": number, "amount": amount, "payment_method": PAYMENT_METHOD,
+            })
+            result["receivable_id"] = receivable["id"]
+        result["status"] = IMPORTED
+
+    receivable_updates = [
+        {
+            "id": r["id"],
+            "paid_amount": r["paid"],
+            "remaining_amount": r["total"] - r["paid"],
+            "last_payment_date": r["last_payment_date"],
+            "status": ReceivableStatus.PAID if r["total"] - r["paid"] <= 0 else ReceivableStatus.PARTIALLY_PAID,
+        }
+        for r in touched.values()
+    ]
+    for batch in chunked(invoice_updates.values(), 1000):
+        db.execute(update(Invoice), batch)
+    for batch in chunked(new_payments, 1000):
+        db.execute(insert(ReceivablePayment), batch)
+    for batch in chunked(receivable_updates, 1000):
+        db.execute(update(Receivable), batch)
+    db.commit()
+    return results
@@ -0,0 +1,106 @@
+"""Сводная аналитика по дебиторской задолженности и ее кэш.
+
+Агрегаты считаются в SQL (условные SUM/COUNT и GROUP BY), Python только
+форматирует суммы. Результат кэшируется в overview_cache; обработчики, меняющие
+задолженности и платежи (в том числе импорт из 1С), вызывают overview_cache.invalidate().
+"""
+from decimal import Decimal
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.receivables import Receivable, ReceivableAging
+from app.services.cache import TTLCache
+from app.services.receivables_aging import AGING_BUCKETS
+
+# Сводная аналитика пересчитывается не чаще раза в OVERVIEW_CACHE_TTL секунд
+# и сбрасывается при изменении задолженностей и платежей
+OVERVIEW_CACHE_TTL = 30
+overview_cache = TTLCache(ttl=OVERVIEW_CACHE_TTL)
+
+
+def _aggregate_columns():
+    """Агрегаты по задолженностям: одно выражение SQL с условными SUM/COUNT."""
+    R = Receivable
+    overdue = R.days_overdue > 0
+    total = func.coalesce(func.sum(R.total_amount), 0)
+    paid = func.coalesce(func.sum(func.coalesce(R.paid_amount, 0)), 0)
+    return [
+        func.count(R.id).label("count"),
+        total.label("total_amount"),
+        paid.label("total_paid"),
+        func.coalesce(func.sum(case((overdue, 1), else_=0)), 0).label("overdue_count"),
+        func.coalesce(func.sum(case((overdue, func.coalesce(R.remaining_amount, 0)), else_=0)), 0).label("overdue_amount"),
+    ]
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+
+def _aggregate_row(row) -> dict:
+    total_amount = _money(row.total_amount)
+    total_paid = _money(row.total_paid)
+    return {
+        "count": row.count,
+        "total_amount": str(total_amount),
+        "total_paid": str(total_paid),
+        "total_remaining": str(total_amount - total_paid),
+        "overdue_count": int(row.overdue_count or 0),
+        "overdue_amount": str(_money(row.overdue_amount)),
+    }
+
+
+def receivables_overview(db: Session) -> dict:
+    """Сводная аналитика: итоги, возрастная структура и разрезы по объектам, заказчикам, статусам."""
+    totals = db.query(*_aggregate_columns()).one()
+    aging = db.query(
+        *(func.coalesce(func.sum(getattr(ReceivableAging, name)), 0) for name, _ in AGING_BUCKETS),
+        func.max(ReceivableAging.as_of),
+    ).one()
+    total_amount = _money(totals.total_amount)
+    total_paid = _money(totals.total_paid)
+
+    by_project = (
+        db.query(Receivable.project_id, Project.name, *_aggregate_columns())
+        .outerjoin(Project, Project.id == Receivable.project_id)
+        .group_by(Receivable.project_id, Project.name)
+        .all()
+    )
+    by_customer = (
+        db.query(Receivable.customer_name, *_aggregate_columns())
+        .group_by(Receivable.customer_name)
+        .all()
+    )
+    by_status = (
+        db.query(Receivable.status, *_aggregate_columns())
+        .group_by(Receivable.status)
+        .all()
+    )
+
+    return {
+        "total_receivables": totals.count,
+        "total_amount": str(total_amount),
+        "total_paid": str(total_paid),
+        "total_remaining": str(total_amount - total_paid),
+        "overdue_count": int(totals.overdue_count or 0),
+        "overdue_amount": str(_money(totals.overdue_amount)),
+        "payment_percentage": str((total_paid / total_amount * 100) if total_amount > 0 else 0),
+        "aging": {
+            "as_of": aging[-1],
+            **{name: str(_money(value)) for (name, _), value in zip(AGING_BUCKETS, aging)},
+        },
+        "by_project": [
+            {"project_id": row.project_id, "project_name": row.name, **_aggregate_row(row)}
+            for row in by_project
+        ],
+        "by_customer": [
+            {"customer_name": row.customer_name, **_aggregate_row(row)}
+            for row in sorted(by_customer, key=lambda r: -(r.total_amount or 0))
+        ],
+        "by_status": [
+            {"status": getattr(row.status, "value", row.status), **_aggregate_row(row)}
+            for row in by_status
+        ],
+    }
@@ -0,0 +1,161 @@
+"""Ночной пересчёт просрочки дебиторской задолженности и возрастной структуры долга.
+
+days_overdue, статус и остаток хранятся в receivables и сами со временем не меняются,
+поэтому раз в сутки задание пересчитывает их набором UPDATE по всем открытым
+задолженностям, а затем перестраивает receivable_aging (INSERT ... SELECT с группировкой).
+Python не читает строки задолженностей — только список различных сроков оплаты.
+"""
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import and_, bindparam, case, delete, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.bulk import chunked
+from app.models.receivables import Receivable, ReceivableAging, ReceivableStatus
+
+# Границы корзин: (колонка, максимальное число дней просрочки включительно)
+AGING_BUCKETS = (
+    ("bucket_0_30", 30),
+    ("bucket_31_60", 60),
+    ("bucket_61_90", 90),
+    ("bucket_90_plus", None),
+)
+
+_CLOSED = (ReceivableStatus.PAID, ReceivableStatus.WRITTEN_OFF)
+
+
+def _open():
+    return or_(Receivable.status.is_(None), Receivable.status.notin_(_CLOSED))
+
+
+def _remaining():
+    return func.coalesce(Receivable.remaining_amount, 0)
+
+
+def recompute_overdue(db: Session, today: date) -> Dict[str, int]:
+    """Остаток, дни просрочки и статусы открытых задолженностей на дату today."""
+    R = Receivable
+    remaining = R.total_amount - func.coalesce(R.paid_amount, 0)
+    result = {}
+
+    result["remaining_updated"] = db.execute(
+        update(R)
+        .where(_open(), or_(R.remaining_amount.is_(None), R.remaining_amount != remaining))
+        .values(remaining_amount=remaining)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # Не просрочено: срок не наступил или долг погашен
+    not_overdue = db.execute(
+        update(R)
+        .where(
+            _open(),
+            or_(R.due_date >= today, _remaining() <= 0),
+            or_(R.days_overdue.is_(None), R.days_overdue != 0),
+        )
+        .values(days_overdue=0)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # Просрочено: одно выражение на каждый срок оплаты (разность дат считается
+    # в Python, чтобы не зависеть от диалекта БД)
+    due_dates = db.execute(
+        select(R.due_date).distinct().where(_open(), R.due_date < today, _remaining() > 0)
+    ).scalars().all()
+    params = [{"due": due, "days": (today - due).days} for due in due_dates]
+    # executemany не допускает IN-списков, поэтому закрытые статусы исключаются через !=
+    table = R.__table__
+    overdue_stmt = (
+        update(table)
+        .where(
+            table.c.due_date == bindparam("due"),
+            or_(table.c.days_overdue.is_(None), table.c.days_overdue != bindparam("days")),
+            or_(table.c.status.is_(None), and_(*(table.c.status != status for status in _CLOSED))),
+            func.coalesce(table.c.remaining_amount, 0) > 0,
+        )
+        .values(days_overdue=bindparam("days"))
+    )
+    overdue = 0
+    for batch in chunked(params, 1000):
+        overdue += db.execute(overdue_stmt, batch).rowcount
+    result["days_overdue_updated"] = not_overdue + overdue
+
+    paid = db.execute(
+        update(R)
+        .where(_open(), _remaining() <= 0)
+        .values(status=ReceivableStatus.PAID)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    became_overdue = db.execute(
+        update(R)
+        .where(
+            or_(R.status.is_(None), R.status.in_((ReceivableStatus.PENDING, ReceivableStatus.PARTIALLY_PAID))),
+            R.days_overdue > 0,
+        )
+        .values(status=ReceivableStatus.OVERDUE)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    # Срок оплаты перенесли — задолженность больше не просрочена
+    back_to_partial = db.execute(
+        update(R)
+        .where(R.status == ReceivableStatus.OVERDUE, R.days_overdue == 0, func.coalesce(R.paid_amount, 0) > 0)
+        .values(status=ReceivableStatus.PARTIALLY_PAID)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    back_to_pending = db.execute(
+        update(R)
+        .where(R.status == ReceivableStatus.OVERDUE, R.days_overdue == 0)
+        .values(status=ReceivableStatus.PENDING)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    result["status_updated"] = paid + became_overdue + back_to_partial + back_to_pending
+    return result
+
+
+def rebuild_aging(db: Session, today: date) -> int:
+    """Перестроить receivable_aging по открытым задолженностям. Возвращает число строк."""
+    R = Receivable
+    days = func.coalesce(R.days_overdue, 0)
+    columns = []
+    lower = None
+    for name, upper in AGING_BUCKETS:
+        conditions = []
+        if lower is not None:
+            conditions.append(days > lower)
+        if upper is not None:
+            conditions.append(days <= upper)
+        columns.append(
+            func.coalesce(func.sum(case((and_(*conditions), _remaining()), else_=0)), 0).label(name)
+        )
+        lower = upper
+
+    source = (
+        select(
+            R.project_id,
+            R.customer_name,
+            literal(today, ReceivableAging.as_of.type).label("as_of"),
+            func.count(R.id).label("receivables_count"),
+            *columns,
+            func.coalesce(func.sum(_remaining()), 0).label("total_remaining"),
+        )
+        .where(_open(), _remaining() > 0)
+        .group_by(R.project_id, R.customer_name)
+    )
+    target_columns = ["project_id", "customer_name", "as_of", "receivables_count",
+                      *(name for name, _ in AGING_BUCKETS), "total_remaining"]
+    db.execute(delete(ReceivableAging))
+    return db.execute(insert(ReceivableAging).from_select(target_columns, source)).rowcount
+
+
+def run_aging(db: Session, today: Optional[date] = None) -> Dict[str, int]:
+    """Пересчитать просрочку и возрастную структуру долга в одной транзакции."""
+    today = today or date.today()
+    try:
+        result = recompute_overdue(db, today)
+        result["aging_rows"] = rebuild_aging(db, today)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
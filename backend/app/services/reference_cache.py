@@ -0,0 +1,265 @@
+"""Кэш справочников в памяти процесса: версии справочников и ответы с ETag/304.
+
+Справочники (организации, контрагенты, роли, секции дорожной карты и т.д.) фронтенд
+запрашивает почти на каждом экране, а меняются они редко. GET-ответ справочника хранится
+готовым JSON вместе с версией, при которой он построен. Обработчики событий сессии
+увеличивают версию справочника при фиксации транзакции, изменившей его модель
+(вставка/изменение/удаление через ORM и пакетные UPDATE/DELETE).
+
+ETag — хэш тела ответа, поэтому для одних и тех же данных он одинаков во всех воркерах;
+клиент с совпадающим If-None-Match получает 304 без тела.
+
+Хранилище версий (REFERENCE_CACHE_BACKEND):
+- local — счетчики в памяти процесса; изменения, сделанные другими воркерами
+  и скриптами, видны через REFERENCE_CACHE_TTL_S;
+- db — таблица reference_versions: версия увеличивается в той же транзакции, что и
+  изменение справочника, а воркеры перечитывают версии не чаще раза в REFERENCE_CACHE_POLL_S.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document_roadmap import DocumentRoadmapSection
+from app.models.lab_test import LabTestType, Laboratory
+from app.models.material import MaterialTypeRef
+from app.models.reference_version import ReferenceVersion
+from app.models.references import Counterparty, MaterialKind, Organization, PaymentType
+from app.models.user import Permission, Role, RolePermission
+
+# Справочник → модели, изменение которых меняет его ответ
+REFERENCE_MODELS = {
+    "organizations": (Organization,),
+    "counterparties": (Counterparty,),
+    "payment_types": (PaymentType,),
+    "material_kinds": (MaterialKind,),
+    "material_types": (MaterialTypeRef,),
+    "lab_test_types": (LabTestType,),
+    "laboratories": (Laboratory,),
+    "permissions": (Permission,),
+    "roles": (Role,),
+    "role_permissions": (Role, RolePermission),
+    "roadmap_sections": (DocumentRoadmapSection,),
+}
+
+_REFERENCES_BY_MODEL: Dict[type, Tuple[str, ...]] = {}
+for _name, _models in REFERENCE_MODELS.items():
+    for _model in _models:
+        _REFERENCES_BY_MODEL[_model] = _REFERENCES_BY_MODEL.get(_model, ()) + (_name,)
+
+# Ключ session.info: справочники, измененные в текущей транзакции
+_CHANGED = "reference_changes"
+
+
+class LocalVersions:
+    """Версии справочников в памяти процесса."""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump_in_transaction(self, connection, names: Iterable[str]):
+        """Вызывается внутри транзакции, изменившей справочники."""
+
+    def committed(self, names: Iterable[str]):
+        """Вызывается после фиксации транзакции, изменившей справочники."""
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+    def get(self, db: Session, name: str) -> int:
+        return self._versions.get(name, 0)
+
+
+class DatabaseVersions(LocalVersions):
+    """Версии справочников в таблице reference_versions, общие для всех воркеров."""
+
+    def __init__(self, poll: float):
+        super().__init__()
+        self.poll = poll
+        # (момент чтения, версии) подменяются одним присваиванием
+        self._snapshot: Tuple[float, Dict[str, int]] = (0.0, {})
+
+    def bump_in_transaction(self, connection, names: Iterable[str]):
+        table = ReferenceVersion.__table__
+        for name in sorted(names):
+            result = connection.execute(
+                update(table).where(table.c.name == name).values(version=table.c.version + 1)
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(name=name, version=1))
+
+    def committed(self, names: Iterable[str]):
+        # Свой воркер видит изменение сразу, не дожидаясь следующего опроса
+        self._snapshot = (0.0, self._snapshot[1])
+
+    def get(self, db: Session, name: str) -> int:
+        read_at, versions = self._snapshot
+        now = time.monotonic()
+        if now - read_at >= self.poll:
+            table = ReferenceVersion.__table__
+            versions = dict(db.execute(select(table.c.name, table.c.version)).all())
+            self._snapshot = (now, versions)
+        return versions.get(name, 0)
+
+
+class _Entry(NamedTuple):
+    version: int
+    expires_at: float
+    body: bytes
+    etag: str
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ReferenceCache:
+    """Готовые JSON-ответы справочников по версиям.
+
+    Запись действительна, пока версия справочника не изменилась и не истек ttl
+    (ttl=0 отключает хранение ответов, ETag/304 при этом работают). Записей не больше
+    max_entries: параметры запроса (skip/limit) задает клиент, поэтому при переполнении
+    сначала удаляются истекшие записи, затем давно не запрошенные.
+    """
+
+    def __init__(self, versions: LocalVersions, ttl: float, max_entries: int = 256):
+        self.versions = versions
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._adapters: Dict[Any, TypeAdapter] = {}
+
+    def _adapter(self, schema) -> TypeAdapter:
+        adapter = self._adapters.get(schema)
+        if adapter is None:
+            adapter = self._adapters[schema] = TypeAdapter(schema)
+        return adapter
+
+    def response(
+        self,
+        request: Request,
+        db: Session,
+        name: str,
+        schema,
+        load: Callable[[], Any],
+        params: Tuple = (),
+    ) -> Response:
+        """Ответ справочника name: load() вызывается только при промахе кэша.
+
+        schema — тип ответа (как response_model эндпоинта), params — параметры запроса,
+        от которых зависит ответ (например, skip/limit).
+        """
+        # Версия читается до данных: данные не старше версии, под которой сохраняются
+        version = self.versions.get(db, name)
+        key = (name,) + tuple(params)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry.version != version or entry.expires_at <= now:
+            adapter = self._adapter(schema)
+            body = adapter.dump_json(adapter.validate_python(load(), from_attributes=True))
+            etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+            entry = _Entry(version, now + self.ttl, body, etag)
+            if self.ttl > 0 and self.max_entries > 0:
+                self._store(key, entry, now)
+        else:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def _store(self, key: Hashable, entry: _Entry, now: float):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) <= self.max_entries:
+                return
+            for stale in [k for k, e in self._entries.items() if e.expires_at <= now]:
+                del self._entries[stale]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Сбросить ответы одного справочника или, без имени, все."""
+        with self._lock:
+            for key in list(self._entries):
+                if name is None or key[0] == name:
+                    del self._entries[key]
+
+
+def create_versions(config=settings) -> LocalVersions:
+    backend = config.REFERENCE_CACHE_BACKEND
+    if backend == "local":
+        return LocalVersions()
+    if backend == "db":
+        return DatabaseVersions(poll=config.REFERENCE_CACHE_POLL_S)
+    raise ValueError(f"неизвестное хранилище версий справочников: {backend}")
+
+
+reference_cache = ReferenceCache(
+    create_versions(),
+    ttl=settings.REFERENCE_CACHE_TTL_S,
+    max_entries=settings.REFERENCE_CACHE_MAX_ENTRIES,
+)
+
+
+def _mark_changed(session: Session, names: Iterable[str]):
+    changed = session.info.setdefault(_CHANGED, set())
+    new = set(names) - changed
+    if new:
+        changed.update(new)
+        reference_cache.versions.bump_in_transaction(session.connection(), new)
+
+
+def _after_flush(session: Session, flush_context):
+    names = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        names.update(_REFERENCES_BY_MODEL.get(type(obj), ()))
+    if names:
+        _mark_changed(session, names)
+
+
+def _do_orm_execute(state):
+    """Пакетные UPDATE/DELETE (db.query(Model).filter(...).delete(), db.execute(update(Model)))."""
+    if not (state.is_update or state.is_delete or state.is_insert) or state.bind_mapper is None:
+        return
+    names = _REFERENCES_BY_MODEL.get(state.bind_mapper.class_)
+    if names:
+        _mark_changed(state.session, names)
+
+
+def _after_commit(session: Session):
+    changed = session.info.pop(_CHANGED, None)
+    if changed:
+        reference_cache.versions.committed(changed)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_CHANGED, None)
+
+
+def register_reference_tracking(session_factory):
+    """Подключить версии справочников к фабрике сессий (повторный вызов ничего не делает)."""
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+        event.listen(session_factory, "do_orm_execute", _do_orm_execute)
+        event.listen(session_factory, "after_commit", _after_commit)
+        event.listen(session_factory, "after_rollback", _after_rollback)
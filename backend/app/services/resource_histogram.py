@@ -0,0 +1,222 @@
+"""Загрузка ответственных сотрудников по дням по всем действующим ГПР и выравнивание.
+
+Гистограмма строится разностным массивом: для каждой задачи +1 в день начала и −1
+в день после окончания (в пределах окна), затем накопленная сумма (itertools.accumulate)
+дает загрузку по дням — O(задачи + дни) на сотрудника вместо перебора дней каждой задачи.
+
+Выравнивание — жадный последовательный проход: задачи сотрудника в порядке начала
+ставятся в первую позицию, где загрузка в рабочие дни не превышает допустимую.
+Сдвигаются только не начатые задачи с резервом: окончание не может
+выйти за начало ближайшего последователя (или за окончание ГПР), поэтому сдвиг
+не меняет ни другие задачи, ни срок графика. Критические задачи резерва не имеют
+и остаются на месте.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.models.gpr import GPR, GPRTask
+from app.models.personnel import Personnel
+from app.services.gpr_schedule import TaskGraph
+from app.services.work_calendar import get_calendar
+
+# ГПР, задачи которых учитываются в загрузке
+ACTIVE_GPR_STATUSES = ("approved", "active")
+
+
+def _load_tasks(db: Session, date_from: date, date_to: date, project_id: Optional[int],
+                personnel_ids: Optional[List[int]], include_drafts: bool) -> List:
+    statuses = ACTIVE_GPR_STATUSES + (("draft",) if include_drafts else ())
+    stmt = (
+        select(
+            GPRTask.id, GPRTask.gpr_id, GPRTask.name, GPRTask.responsible_personnel_id,
+            GPRTask.start_date, GPRTask.end_date, GPRTask.actual_start_date, GPR.project_id,
+        )
+        .join(GPR, GPR.id == GPRTask.gpr_id)
+        .where(
+            GPRTask.responsible_personnel_id.isnot(None),
+            GPRTask.actual_end_date.is_(None),
+            or_(GPRTask.status.is_(None), GPRTask.status != "completed"),
+            GPRTask.start_date <= date_to,
+            GPRTask.end_date >= date_from,
+            or_(GPR.status.in_(statuses), GPR.status.is_(None)),
+        )
+    )
+    if project_id:
+        stmt = stmt.where(GPR.project_id == project_id)
+    if personnel_ids:
+        stmt = stmt.where(GPRTask.responsible_personnel_id.in_(personnel_ids))
+    return db.execute(stmt.order_by(GPRTask.start_date, GPRTask.id)).all()
+
+
+def daily_load(intervals: Iterable, days: int) -> List[int]:
+    """Загрузка по дням окна длиной days по интервалам (начало, окончание) — смещениям от начала окна."""
+    diff = [0] * (days + 1)
+    for start, end in intervals:
+        start = max(start, 0)
+        end = min(end, days - 1)
+        if start <= end:
+            diff[start] += 1
+            diff[end + 1] -= 1
+    return list(accumulate(diff[:days]))
+
+
+def _slack_limits(db: Session, gpr_ids: Iterable[int]) -> Dict[int, date]:
+    """Задача → последний день, до которого её окончание можно сдвинуть без влияния на другие задачи."""
+    limits = {}
+    for gpr_id in gpr_ids:
+        gpr_end = db.scalar(select(GPR.end_date).where(GPR.id == gpr_id))
+        rows = db.execute(
+            select(GPRTask.id, GPRTask.start_date, GPRTask.dependencies).where(GPRTask.gpr_id == gpr_id)
+        ).all()
+        graph = TaskGraph([r.id for r in rows], [r.dependencies for r in rows])
+        for i, row in enumerate(rows):
+            succs = graph.succs[i]
+            limits[row.id] = (
+                min(rows[s].start_date for s in succs) - timedelta(days=1) if succs else gpr_end
+            )
+    return limits
+
+
+def build_histogram(db: Session, date_from: date, date_to: date, project_id: Optional[int] = None,
+                    personnel_ids: Optional[List[int]] = None, capacity: int = 1,
+                    include_drafts: bool = False, level: bool = False, today: Optional[date] = None) -> Dict:
+    """Загрузка сотрудников по дням окна [date_from, date_to].
+
+    load — число одновременных задач сотрудника по дням (смещение от date_from);
+    перегрузка — рабочие дни (общий производственный календарь), где загрузка больше capacity.
+    С level=True дополнительно предлагаются сдвиги некритичных задач и загрузка после них.
+    """
+    days = (date_to - date_from).days + 1
+    calendar = get_calendar(db)
+    working = [calendar.is_working_day(date_from + timedelta(days=k)) for k in range(days)]
+    rows = _load_tasks(db, date_from, date_to, project_id, personnel_ids, include_drafts)
+
+    by_person: Dict[int, List] = defaultdict(list)
+    for row in rows:
+        by_person[row.responsible_personnel_id].append(row)
+    names = {
+        pid: (full_name, position)
+        for pid, full_name, position in db.execute(
+            select(Personnel.id, Personnel.full_name, Personnel.position).where(Personnel.id.in_(list(by_person)))
+        )
+    }
+
+    limits = _slack_limits(db, {row.gpr_id for row in rows}) if level else {}
+    today = today or date.today()
+
+    personnel = []
+    proposals = []
+    for pid, tasks in by_person.items():
+        intervals = [((t.start_date - date_from).days, (t.end_date - date_from).days) for t in tasks]
+        load = daily_load(intervals, days)
+        overloaded = [k for k in range(days) if working[k] and load[k] > capacity]
+        full_name, position = names.get(pid, (None, None))
+        item = {
+            "personnel_id": pid,
+            "full_name": full_name,
+            "position": position,
+            "tasks_count": len(tasks),
+            "load": load,
+            "peak": max(load) if load else 0,
+            "overloaded_days": overloaded,
+        }
+        if level and overloaded:
+            shifts = _level_person(tasks, limits, capacity, date_from, days, working, db, today)
+            proposals.extend({**shift, "personnel_id": pid} for shift in shifts)
+            moved = {shift["task_id"]: shift for shift in shifts}
+            leveled = daily_load(
+                (
+                    (
+                        ((moved[t.id]["proposed_start_date"] if t.id in moved else t.start_date) - date_from).days,
+                        ((moved[t.id]["proposed_end_date"] if t.id in moved else t.end_date) - date_from).days,
+                    )
+                    for t in tasks
+                ),
+                days,
+            )
+            item["leveled_load"] = leveled
+            item["leveled_overloaded_days"] = [k for k in range(days) if working[k] and leveled[k] > capacity]
+        personnel.append(item)
+
+    personnel.sort(key=lambda p: (-len(p["overloaded_days"]), -p["peak"], p["personnel_id"]))
+    result = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "capacity": capacity,
+        "personnel": personnel,
+    }
+    if level:
+        result["proposals"] = proposals
+    return result
+
+
+def _level_person(tasks: List, limits: Dict[int, date], capacity: int, date_from: date, days: int,
+                  working: List[bool], db: Session, today: date) -> List[Dict]:
+    """Жадное выравнивание задач одного сотрудника; возвращает предлагаемые сдвиги."""
+    # Загрузка на расширенном окне: сдвинутая задача может выйти за date_to
+    horizon = days + max(
+        ((limits.get(t.id, t.end_date) - date_from).days - days + 1 for t in tasks), default=0
+    )
+    horizon = max(horizon, days)
+    load = [0] * horizon
+
+    def fits(start: int, end: int) -> bool:
+        return all(
+            load[k] < capacity
+            for k in range(max(start, 0), min(end, horizon - 1) + 1)
+            if k >= days or working[k]
+        )
+
+    def place(start: int, end: int):
+        for k in range(max(start, 0), min(end, horizon - 1) + 1):
+            load[k] += 1
+
+    # Сначала задачи без резерва — их позиция фиксирована
+    def slack(t) -> int:
+        if t.actual_start_date is not None or t.start_date <= today:
+            return 0
+        return max((limits.get(t.id, t.end_date) - t.end_date).days, 0)
+
+    ordered = sorted(tasks, key=lambda t: (slack(t) > 0, t.start_date, slack(t), t.id))
+    shifts = []
+    for t in ordered:
+        start = (t.start_date - date_from).days
+        end = (t.end_date - date_from).days
+        task_slack = slack(t)
+        if task_slack == 0 or fits(start, end):
+            place(start, end)
+            continue
+        calendar = get_calendar(db, t.project_id)
+        duration = max(calendar.working_days_between(t.start_date, t.end_date), 1)
+        limit = limits.get(t.id, t.end_date)
+        best = None
+        candidate = calendar.next_working_day(t.start_date + timedelta(days=1))
+        while True:
+            candidate_end = calendar.add_working_days(candidate, duration)
+            if candidate_end > limit:
+                break
+            if fits((candidate - date_from).days, (candidate_end - date_from).days):
+                best = (candidate, candidate_end)
+                break
+            candidate = calendar.next_working_day(candidate + timedelta(days=1))
+        if best is None:
+            place(start, end)
+            continue
+        place((best[0] - date_from).days, (best[1] - date_from).days)
+        shifts.append({
+            "task_id": t.id,
+            "gpr_id": t.gpr_id,
+            "name": t.name,
+            "start_date": t.start_date,
+            "end_date": t.end_date,
+            "proposed_start_date": best[0],
+            "proposed_end_date": best[1],
+            "shift_days": (best[0] - t.start_date).days,
+            "slack_days": task_slack,
+        })
+    return shifts
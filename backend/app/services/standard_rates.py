@@ -0,0 +1,209 @@
+"""Загрузка сборников нормативных расценок (ГЭСН/ФЕР) и префиксный индекс по коду."""
+import csv
+import threading
+import time
+from bisect import bisect_left
+from decimal import Decimal, InvalidOperation
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.bulk import chunked, dialect_insert
+from app.models.standard_rate import StandardRate
+
+IMPORT_BATCH_SIZE = 1000
+# Ошибок в ответе загрузки не больше MAX_IMPORT_ERRORS, остальные только считаются
+MAX_IMPORT_ERRORS = 100
+
+_MONEY_FIELDS = ("materials_cost", "labor_cost", "equipment_cost", "total_cost")
+_UPDATABLE_FIELDS = (
+    "name", "unit", "materials_cost", "labor_cost", "equipment_cost",
+    "total_cost", "collection", "section", "notes", "is_active",
+)
+
+
+def _to_decimal(value) -> Optional[Decimal]:
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return value
+    value = str(value).strip().replace(" ", "").replace(",", ".")
+    if not value:
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"некорректное число: {value}")
+
+
+def normalize_rate_row(raw: Dict, catalog_version: str) -> Dict:
+    """Привести строку сборника к набору колонок standard_rates (ValueError при ошибке)."""
+    code = (raw.get("code") or "").strip()
+    name = (raw.get("name") or "").strip()
+    if not code:
+        raise ValueError("не указан код расценки")
+    if not name:
+        raise ValueError("не указано наименование")
+    row = {
+        "code": code,
+        "catalog_version": catalog_version,
+        "name": name,
+        "unit": (raw.get("unit") or "").strip() or None,
+        "collection": (raw.get("collection") or "").strip() or None,
+        "section": (raw.get("section") or "").strip() or None,
+        "notes": (raw.get("notes") or "").strip() or None,
+        "is_active": True,
+    }
+    for field in _MONEY_FIELDS:
+        row[field] = _to_decimal(raw.get(field))
+    for field in ("materials_cost", "labor_cost", "equipment_cost"):
+        if row[field] is None:
+            row[field] = Decimal(0)
+    if row["total_cost"] is None:
+        row["total_cost"] = row["materials_cost"] + row["labor_cost"] + row["equipment_cost"]
+    return row
+
+
+def iter_csv_rows(stream: IO[str]) -> Iterator[Tuple[int, Dict]]:
+    """Построчно читать CSV сборника: пары (номер строки файла, строка).
+
+    Первая строка — заголовок с именами колонок standard_rates (code;name;unit;materials_cost;...),
+    разделитель ; или , определяется по заголовку. Номер строки берется из csv.reader
+    (line_num), поэтому учитывает заголовок, пустые строки и переносы внутри кавычек.
+    """
+    header = stream.readline()
+    delimiter = ";" if header.count(";") >= header.count(",") else ","
+    fields = [f.strip().lower() for f in next(csv.reader([header], delimiter=delimiter))]
+    reader = csv.reader(stream, delimiter=delimiter)
+    read = 0
+    for values in reader:
+        # Запись начинается на строке, следующей за прочитанными (+1 — заголовок)
+        line_no, read = read + 2, reader.line_num
+        if not any(v.strip() for v in values):
+            continue
+        yield line_no, dict(zip(fields, values))
+
+
+def import_rates(
+    db: Session,
+    rows: Iterable[Tuple[int, Dict]],
+    catalog_version: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> Dict:
+    """Пакетная загрузка сборника: INSERT ... ON CONFLICT (code, catalog_version) DO UPDATE.
+
+    rows — пары (номер строки в источнике, строка), как их выдает iter_csv_rows.
+    Строки читаются потоком и пишутся пачками по batch_size, вся загрузка — одна транзакция.
+    Возвращает статистику и первые MAX_IMPORT_ERRORS ошибок с номерами строк источника;
+    число не вошедших в список ошибок — в truncated.
+    """
+    table = StandardRate.__table__
+    processed = 0
+    errors = []
+    truncated = 0
+
+    def _valid_rows():
+        nonlocal processed, truncated
+        for line_no, raw in rows:
+            try:
+                row = normalize_rate_row(raw, catalog_version)
+            except ValueError as e:
+                if len(errors) < MAX_IMPORT_ERRORS:
+                    errors.append({"line": line_no, "error": str(e)})
+                else:
+                    truncated += 1
+                continue
+            processed += 1
+            yield row
+
+    batches = 0
+    for batch in chunked(_valid_rows(), batch_size):
+        # ON CONFLICT не допускает повтор ключа в одном INSERT: при повторе кода побеждает последняя строка
+        batch = list({r["code"]: r for r in batch}.values())
+        stmt = dialect_insert(db.bind, table).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["code", "catalog_version"],
+            set_={field: stmt.excluded[field] for field in _UPDATABLE_FIELDS},
+        )
+        db.execute(stmt)
+        batches += 1
+    db.commit()
+    rate_index.invalidate()
+    return {
+        "catalog_version": catalog_version,
+        "processed": processed,
+        "batches": batches,
+        "errors": errors,
+        "truncated": truncated,
+    }
+
+
+class RatePrefixIndex:
+    """Префиксный индекс активных расценок в памяти процесса (отсортированный массив + bisect).
+
+    Перестраивается лениво: после invalidate() (изменения сборника в этом процессе)
+    либо по истечении ttl секунд (изменения, сделанные другими воркерами).
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        # (ключи, записи) подменяются одним присваиванием, чтобы читатели не видели смесь версий
+        self._data: tuple = ([], [])
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._built_at = None
+
+    def _is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.ttl
+
+    def _build(self, db: Session):
+        rows = (
+            db.query(
+                StandardRate.code,
+                StandardRate.id,
+                StandardRate.name,
+                StandardRate.unit,
+                StandardRate.total_cost,
+                StandardRate.catalog_version,
+            )
+            .filter(StandardRate.is_active == True)
+            .all()
+        )
+        entries = sorted(((r.code.casefold(),) + tuple(r) for r in rows), key=lambda e: (e[0], e[6]))
+        self._data = ([e[0] for e in entries], entries)
+        self._built_at = time.monotonic()
+
+    def lookup(
+        self,
+        db: Session,
+        prefix: str,
+        limit: int = 20,
+        catalog_version: Optional[str] = None,
+    ) -> List[Dict]:
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    self._build(db)
+        keys, entries = self._data
+        prefix = prefix.strip().casefold()
+        result = []
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and len(result) < limit and keys[i].startswith(prefix):
+            _, code, rate_id, name, unit, total_cost, version = entries[i]
+            i += 1
+            if catalog_version is not None and version != catalog_version:
+                continue
+            result.append({
+                "id": rate_id,
+                "code": code,
+                "name": name,
+                "unit": unit,
+                "total_cost": total_cost,
+                "catalog_version": version,
+            })
+        return result
+
+
+rate_index = RatePrefixIndex()
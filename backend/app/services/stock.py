@@ -0,0 +1,144 @@
+"""Атомарное обновление складских остатков и их стоимости (warehouse_stocks).
+
+Остаток меняется одним SQL-выражением quantity = quantity + :delta, без чтения строки
+в Python, поэтому параллельные движения по одному материалу не теряют обновления.
+
+Стоимость остатка ведётся по скользящей средней: приход увеличивает amount
+и пересчитывает average_price, расход списывает quantity * average_price
+и возвращает цену, по которой списан материал (UPDATE ... RETURNING).
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.bulk import dialect_insert
+from app.models.material import WarehouseStock
+
+StockKey = Tuple[int, int]  # (warehouse_id, material_id)
+
+_ZERO = Decimal(0)
+_CENT = Decimal("0.01")
+
+
+def money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(_CENT)
+
+
+def receive_stock(db: Session, warehouse_id: int, material_id: int, quantity: Decimal,
+                  amount: Optional[Decimal] = None, moved_at: Optional[datetime] = None) -> Decimal:
+    """Приход на склад: INSERT ... ON CONFLICT (warehouse_id, material_id) DO UPDATE.
+
+    amount — стоимость прихода; если не указана, приход оценивается по текущей
+    средней цене остатка. Возвращает среднюю цену после прихода.
+    """
+    moved_at = moved_at or datetime.now()
+    table = WarehouseStock.__table__
+    stmt = dialect_insert(db.bind, table).values(
+        warehouse_id=warehouse_id,
+        material_id=material_id,
+        quantity=quantity,
+        reserved_quantity=0,
+        amount=amount or 0,
+        average_price=(amount / quantity) if amount and quantity else 0,
+        last_movement_date=moved_at,
+    )
+    current_amount = func.coalesce(table.c.amount, 0)
+    current_price = func.coalesce(table.c.average_price, 0)
+    added_amount = stmt.excluded.amount if amount is not None else current_price * quantity
+    new_quantity = table.c.quantity + stmt.excluded.quantity
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["warehouse_id", "material_id"],
+        set_={
+            "quantity": new_quantity,
+            "amount": current_amount + added_amount,
+            "average_price": case(
+                (new_quantity > 0, (current_amount + added_amount) / new_quantity),
+                else_=current_price,
+            ),
+            "last_movement_date": stmt.excluded.last_movement_date,
+        },
+    ).returning(table.c.average_price)
+    return Decimal(str(db.execute(stmt).scalar() or 0))
+
+
+def issue_stock(db: Session, warehouse_id: int, material_id: int, quantity: Decimal,
+                moved_at: Optional[datetime] = None) -> Optional[Decimal]:
+    """Расход со склада: UPDATE ... SET quantity = quantity - :q, amount = amount - :q * average_price.
+
+    Возвращает среднюю цену, по которой списан материал, или None, если остатка
+    по материалу на складе нет (строка в этом случае не создаётся).
+    """
+    price = func.coalesce(WarehouseStock.average_price, 0)
+    result = db.execute(
+        update(WarehouseStock)
+        .where(
+            WarehouseStock.warehouse_id == warehouse_id,
+            WarehouseStock.material_id == material_id,
+        )
+        .values(
+            quantity=WarehouseStock.quantity - quantity,
+            amount=func.coalesce(WarehouseStock.amount, 0) - price * quantity,
+            last_movement_date=moved_at or datetime.now(),
+        )
+        .returning(WarehouseStock.average_price)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if result is None:
+        return None
+    return Decimal(str(result[0] or 0))
+
+
+def average_prices(db: Session, keys) -> Dict[StockKey, Decimal]:
+    """Текущие средние цены по парам (склад, материал)."""
+    keys = set(keys)
+    if not keys:
+        return {}
+    rows = db.execute(
+        select(WarehouseStock.warehouse_id, WarehouseStock.material_id, WarehouseStock.average_price).where(
+            WarehouseStock.warehouse_id.in_({w for w, _ in keys}),
+            WarehouseStock.material_id.in_({m for _, m in keys}),
+        )
+    )
+    return {(w, m): Decimal(str(p or 0)) for w, m, p in rows if (w, m) in keys}
+
+
+class StockDelta:
+    """Накопленное изменение остатка по паре (склад, материал) внутри одного документа."""
+
+    __slots__ = ("received", "received_amount", "received_unpriced", "issued")
+
+    def __init__(self):
+        self.received = _ZERO
+        self.received_amount = _ZERO
+        self.received_unpriced = _ZERO
+        self.issued = _ZERO
+
+    def receive(self, quantity: Decimal, amount: Optional[Decimal]):
+        if amount is None:
+            self.received_unpriced += quantity
+        else:
+            self.received += quantity
+            self.received_amount += amount
+
+    def issue(self, quantity: Decimal):
+        self.issued += quantity
+
+
+def apply_stock_deltas(db: Session, deltas: Dict[StockKey, StockDelta], moved_at: Optional[datetime] = None):
+    """Применить накопленные изменения остатков: не больше трёх выражений на пару (склад, материал).
+
+    Пары обрабатываются в отсортированном порядке, чтобы параллельные пакеты
+    на PostgreSQL брали блокировки строк в одинаковой последовательности.
+    Сначала приходы, затем расход — расход оценивается по средней цене с учётом прихода.
+    """
+    moved_at = moved_at or datetime.now()
+    for (warehouse_id, material_id), delta in sorted(deltas.items()):
+        if delta.received:
+            receive_stock(db, warehouse_id, material_id, delta.received, delta.received_amount, moved_at)
+        if delta.received_unpriced:
+            receive_stock(db, warehouse_id, material_id, delta.received_unpriced, None, moved_at)
+        if delta.issued:
+            issue_stock(db, warehouse_id, material_id, delta.issued, moved_at)
@@ -0,0 +1,252 @@
+"""Складской регистр: остатки на дату по месячным снимкам (warehouse_stock_snapshots).
+
+Остаток склада на дату = ближайший снимок на конец месяца не позже этой даты
++ движения и списания после снимка. Поэтому запрос на дату читает не больше
+одного месяца движений, а не всю историю.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.bulk import chunked, dialect_insert
+from app.models.material import (
+    MaterialMovement,
+    MaterialWriteOff,
+    MaterialWriteOffItem,
+    Warehouse,
+    WarehouseStockSnapshot,
+)
+
+_QUANTUM = Decimal("0.001")
+_CENT = Decimal("0.01")
+_ZERO = Decimal(0)
+
+
+def month_end(d: date) -> date:
+    first_of_next = (d.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return first_of_next - timedelta(days=1)
+
+
+def last_closed_month_end(today: Optional[date] = None) -> date:
+    """Конец последнего завершившегося месяца."""
+    today = today or date.today()
+    return today.replace(day=1) - timedelta(days=1)
+
+
+def _q(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(_QUANTUM)
+
+
+def _m(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(_CENT)
+
+
+def ledger_rows(
+    db: Session,
+    until: date,
+    after: Optional[date] = None,
+    warehouse_id: Optional[int] = None,
+) -> Iterator[Tuple[int, int, date, Decimal, Decimal]]:
+    """Изменения остатков по дням: (склад, материал, дата, количество и стоимость со знаком).
+
+    Учитываются движения (приход на склад-получатель, расход со склада-отправителя)
+    и акты списания со склада; диапазон дат — (after, until].
+    """
+    M = MaterialMovement
+    I = MaterialWriteOffItem
+    sources = [
+        (M.to_warehouse_id, M.movement_date, M.quantity, M.amount, 1, None),
+        (M.from_warehouse_id, M.movement_date, M.quantity, M.amount, -1, None),
+        (MaterialWriteOff.warehouse_id, MaterialWriteOff.write_off_date, I.quantity, I.amount, -1, I.write_off),
+    ]
+    for warehouse_col, date_col, quantity_col, amount_col, sign, join in sources:
+        material_col = I.material_id if join is not None else M.material_id
+        stmt = select(warehouse_col, material_col, date_col, func.sum(quantity_col), func.sum(amount_col))
+        if join is not None:
+            stmt = stmt.select_from(MaterialWriteOffItem).join(join)
+        stmt = stmt.where(warehouse_col.isnot(None), date_col <= until)
+        if after is not None:
+            stmt = stmt.where(date_col > after)
+        if warehouse_id is not None:
+            stmt = stmt.where(warehouse_col == warehouse_id)
+        stmt = stmt.group_by(warehouse_col, material_col, date_col)
+        for w_id, material_id, day, quantity, amount in db.execute(stmt):
+            yield w_id, material_id, day, _q(quantity) * sign, _m(amount) * sign
+
+
+def _latest_snapshot_date(db: Session, warehouse_id: int, as_of: date) -> Optional[date]:
+    return db.execute(
+        select(func.max(WarehouseStockSnapshot.period_end)).where(
+            WarehouseStockSnapshot.warehouse_id == warehouse_id,
+            WarehouseStockSnapshot.period_end <= as_of,
+        )
+    ).scalar()
+
+
+def stock_as_of(
+    db: Session, warehouse_id: int, as_of: date,
+) -> Tuple[Optional[date], Dict[int, Tuple[Decimal, Decimal]]]:
+    """Остатки склада на конец дня as_of.
+
+    Возвращает (дату использованного снимка, {material_id: (количество, стоимость)}).
+    """
+    snapshot_date = _latest_snapshot_date(db, warehouse_id, as_of)
+    balances: Dict[int, list] = defaultdict(lambda: [_ZERO, _ZERO])
+    if snapshot_date is not None:
+        rows = db.execute(
+            select(
+                WarehouseStockSnapshot.material_id,
+                WarehouseStockSnapshot.quantity,
+                WarehouseStockSnapshot.amount,
+            ).where(
+                WarehouseStockSnapshot.warehouse_id == warehouse_id,
+                WarehouseStockSnapshot.period_end == snapshot_date,
+            )
+        )
+        for material_id, quantity, amount in rows:
+            balances[material_id] = [_q(quantity), _m(amount)]
+    for _, material_id, _, quantity, amount in ledger_rows(db, as_of, after=snapshot_date, warehouse_id=warehouse_id):
+        balance = balances[material_id]
+        balance[0] += quantity
+        balance[1] += amount
+    return snapshot_date, {material_id: tuple(b) for material_id, b in balances.items()}
+
+
+def _write_snapshots(db: Session, rows: Iterable[dict]) -> int:
+    written = 0
+    for batch in chunked(rows, 1000):
+        db.execute(insert(WarehouseStockSnapshot), batch)
+        written += len(batch)
+    return written
+
+
+def close_period(db: Session, period_end: date, warehouse_ids: Optional[Iterable[int]] = None) -> int:
+    """Зафиксировать закрывающие остатки на period_end (перезаписывает снимки этой даты).
+
+    Каждый склад считается от своего предыдущего снимка, поэтому ежемесячное закрытие
+    читает только движения закрываемого месяца. Возвращает число записанных строк.
+    """
+    if warehouse_ids is None:
+        warehouse_ids = [row[0] for row in db.execute(select(Warehouse.id))]
+    rows = []
+    for warehouse_id in sorted(warehouse_ids):
+        db.execute(
+            delete(WarehouseStockSnapshot).where(
+                WarehouseStockSnapshot.warehouse_id == warehouse_id,
+                WarehouseStockSnapshot.period_end == period_end,
+            )
+        )
+        _, balances = stock_as_of(db, warehouse_id, period_end)
+        rows.extend(
+            {"warehouse_id": warehouse_id, "material_id": material_id, "period_end": period_end,
+             "quantity": quantity, "amount": amount}
+            for material_id, (quantity, amount) in sorted(balances.items())
+            if quantity != 0 or amount != 0
+        )
+    written = _write_snapshots(db, rows)
+    db.commit()
+    return written
+
+
+def snapshot_rows(balances: Dict[Tuple[int, int], list], period_end: date) -> Iterator[dict]:
+    for (w_id, material_id), (quantity, amount) in sorted(balances.items()):
+        if quantity != 0 or amount != 0:
+            yield {"warehouse_id": w_id, "material_id": material_id, "period_end": period_end,
+                   "quantity": quantity, "amount": _m(amount)}
+
+
+def rebuild_snapshots(db: Session, until: Optional[date] = None, warehouse_id: Optional[int] = None) -> int:
+    """Пересоздать все месячные снимки по истории движений (одним проходом по дням).
+
+    До until включительно (по умолчанию — конец последнего закрытого месяца).
+    Возвращает число записанных строк.
+    """
+    until = month_end(until) if until else last_closed_month_end()
+    stmt = delete(WarehouseStockSnapshot)
+    if warehouse_id is not None:
+        stmt = stmt.where(WarehouseStockSnapshot.warehouse_id == warehouse_id)
+    db.execute(stmt)
+
+    days = sorted(ledger_rows(db, until, warehouse_id=warehouse_id), key=lambda r: r[2])
+    if not days:
+        db.commit()
+        return 0
+
+    balances: Dict[Tuple[int, int], list] = defaultdict(lambda: [_ZERO, _ZERO])
+    rows = []
+    period_end = month_end(days[0][2])
+    i = 0
+    while period_end <= until:
+        while i < len(days) and days[i][2] <= period_end:
+            w_id, material_id, _, quantity, amount = days[i]
+            balance = balances[(w_id, material_id)]
+            balance[0] += quantity
+            balance[1] += amount
+            i += 1
+        rows.extend(snapshot_rows(balances, period_end))
+        period_end = month_end(period_end + timedelta(days=1))
+
+    written = _write_snapshots(db, rows)
+    db.commit()
+    return written
+
+
+def adjust_snapshots(db: Session, changes: Iterable[Tuple[int, int, date, Decimal, Decimal]]):
+    """Учесть проведенные задним числом изменения в уже закрытых снимках.
+
+    changes — строки в формате ledger_rows: (склад, материал, дата, количество и стоимость
+    со знаком). Изменение с датой d входит во все снимки склада с period_end >= d:
+    существующая строка снимка увеличивается SQL-выражением, а если материала в снимке
+    периода не было, строка добавляется. Вызывается в транзакции проведения, поэтому
+    снимки остаются верными и остаток на дату по-прежнему читает не больше месяца движений.
+    """
+    merged: Dict[Tuple[int, int, date], list] = defaultdict(lambda: [_ZERO, _ZERO])
+    for warehouse_id, material_id, day, quantity, amount in changes:
+        if warehouse_id:
+            delta = merged[(warehouse_id, material_id, day)]
+            delta[0] += _q(quantity)
+            delta[1] += _m(amount)
+    merged = {key: delta for key, delta in merged.items() if delta[0] or delta[1]}
+    if not merged:
+        return
+
+    since: Dict[int, date] = {}
+    for warehouse_id, _, day in merged:
+        since[warehouse_id] = min(day, since.get(warehouse_id, day))
+    S = WarehouseStockSnapshot
+    periods: Dict[int, list] = defaultdict(list)
+    for warehouse_id, day in since.items():
+        periods[warehouse_id] = db.scalars(
+            select(S.period_end).distinct()
+            .where(S.warehouse_id == warehouse_id, S.period_end >= day)
+            .order_by(S.period_end)
+        ).all()
+
+    # Одна строка на (склад, материал, период): ON CONFLICT не допускает повтор ключа в одном INSERT
+    totals: Dict[Tuple[int, int, date], list] = defaultdict(lambda: [_ZERO, _ZERO])
+    for (warehouse_id, material_id, day), (quantity, amount) in merged.items():
+        for period_end in periods[warehouse_id]:
+            if period_end >= day:
+                total = totals[(warehouse_id, material_id, period_end)]
+                total[0] += quantity
+                total[1] += amount
+    rows = [
+        {"warehouse_id": warehouse_id, "material_id": material_id, "period_end": period_end,
+         "quantity": quantity, "amount": amount}
+        for (warehouse_id, material_id, period_end), (quantity, amount) in sorted(totals.items())
+    ]
+    table = S.__table__
+    for batch in chunked(rows, 500):
+        stmt = dialect_insert(db.bind, table).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["warehouse_id", "material_id", "period_end"],
+            set_={
+                "quantity": table.c.quantity + stmt.excluded.quantity,
+                "amount": table.c.amount + stmt.excluded.amount,
+            },
+        )
+        db.execute(stmt)
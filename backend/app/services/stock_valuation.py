@@ -0,0 +1,186 @@
+"""Переоценка складских остатков по скользящей средней за период.
+
+Текущая оценка ведётся инкрементально (app.services.stock). Переоценка нужна, когда
+задним числом изменились приходы или цены: движения периода проигрываются одним
+проходом в порядке дат, после чего цены расхода, перемещений и списаний, итоги актов,
+месячные снимки и средние цены остатков записываются пакетными UPDATE.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.bulk import chunked
+from app.models.material import (
+    MaterialMovement,
+    MaterialWriteOff,
+    MaterialWriteOffItem,
+    Warehouse,
+    WarehouseStock,
+    WarehouseStockSnapshot,
+)
+from app.services.stock import money
+from app.services.stock_ledger import last_closed_month_end, month_end, snapshot_rows, stock_as_of
+
+_ZERO = Decimal(0)
+
+# Порядок событий внутри дня: приходы, затем расход и перемещения, затем списания
+_RECEIPT, _ISSUE, _WRITE_OFF = 0, 1, 2
+
+
+def _dec(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _load_events(db: Session, since: Optional[date]):
+    M = MaterialMovement
+    stmt = select(M.id, M.movement_date, M.material_id, M.from_warehouse_id, M.to_warehouse_id,
+                  M.quantity, M.price, M.amount)
+    if since is not None:
+        stmt = stmt.where(M.movement_date >= since)
+    events = [
+        (day, _ISSUE if from_w else _RECEIPT, movement_id, material_id, from_w, to_w, quantity, price, amount)
+        for movement_id, day, material_id, from_w, to_w, quantity, price, amount in db.execute(stmt)
+    ]
+
+    W, I = MaterialWriteOff, MaterialWriteOffItem
+    stmt = (
+        select(I.id, W.write_off_date, I.material_id, W.warehouse_id, I.quantity, I.price, I.amount, W.id)
+        .join(W, I.write_off_id == W.id)
+        .where(W.warehouse_id.isnot(None))
+    )
+    if since is not None:
+        stmt = stmt.where(W.write_off_date >= since)
+    events.extend(
+        (day, _WRITE_OFF, item_id, material_id, warehouse_id, write_off_id, quantity, price, amount)
+        for item_id, day, material_id, warehouse_id, quantity, price, amount, write_off_id in db.execute(stmt)
+    )
+    events.sort(key=lambda e: (e[0], e[1], e[2]))
+    return events
+
+
+def revalue(db: Session, since: Optional[date] = None) -> Dict[str, int]:
+    """Переоценить движения начиная с даты since (по умолчанию — всю историю).
+
+    Остатки на начало периода берутся из складского регистра (снимок + движения),
+    поэтому закрытые периоды до since не пересчитываются.
+    """
+    state: Dict[Tuple[int, int], list] = defaultdict(lambda: [_ZERO, _ZERO])  # [количество, стоимость]
+    last_price: Dict[Tuple[int, int], Decimal] = {}
+
+    if since is not None:
+        opening = since - timedelta(days=1)
+        for (warehouse_id,) in db.execute(select(Warehouse.id)):
+            _, balances = stock_as_of(db, warehouse_id, opening)
+            for material_id, (quantity, amount) in balances.items():
+                state[(warehouse_id, material_id)] = [quantity, amount]
+                if quantity > 0:
+                    last_price[(warehouse_id, material_id)] = amount / quantity
+
+    def price_of(key) -> Decimal:
+        quantity, amount = state[key]
+        if quantity > 0:
+            return amount / quantity
+        return last_price.get(key, _ZERO)
+
+    def receive(key, quantity, amount):
+        balance = state[key]
+        balance[0] += quantity
+        balance[1] += amount
+        if balance[0] > 0:
+            last_price[key] = balance[1] / balance[0]
+
+    def issue(key, quantity) -> Decimal:
+        price = price_of(key)
+        balance = state[key]
+        balance[0] -= quantity
+        balance[1] -= price * quantity
+        last_price[key] = price
+        return price
+
+    events = _load_events(db, since)
+    movement_updates, item_updates = [], []
+    write_off_totals: Dict[int, Decimal] = defaultdict(lambda: _ZERO)
+    snapshots = []
+    last_closed = last_closed_month_end()
+    period_end = month_end(since or (events[0][0] if events else last_closed))
+
+    for event in events:
+        day, kind = event[0], event[1]
+        while period_end < day and period_end <= last_closed:
+            snapshots.extend(snapshot_rows(state, period_end))
+            period_end = month_end(period_end + timedelta(days=1))
+
+        if kind == _WRITE_OFF:
+            _, _, item_id, material_id, warehouse_id, write_off_id, quantity, price, amount = event
+            quantity = _dec(quantity)
+            new_price = issue((warehouse_id, material_id), quantity)
+            new_amount = money(new_price * quantity)
+            write_off_totals[write_off_id] += new_amount
+            if price is None or money(price) != money(new_price) or _dec(amount) != new_amount:
+                item_updates.append({"id": item_id, "price": money(new_price), "amount": new_amount})
+            continue
+
+        _, _, movement_id, material_id, from_w, to_w, quantity, price, amount = event
+        quantity = _dec(quantity)
+        new_price = price
+        if from_w:
+            new_price = issue((from_w, material_id), quantity)
+        if new_price is not None:
+            new_amount = money(_dec(new_price) * quantity)
+        else:
+            new_amount = money(price_of((to_w, material_id)) * quantity)
+        if to_w:
+            receive((to_w, material_id), quantity, new_amount)
+        if (from_w and money(price) != money(new_price)) or _dec(amount) != new_amount:
+            movement_updates.append({
+                "id": movement_id,
+                "price": money(new_price) if new_price is not None else None,
+                "amount": new_amount,
+            })
+
+    while period_end <= last_closed:
+        snapshots.extend(snapshot_rows(state, period_end))
+        period_end = month_end(period_end + timedelta(days=1))
+
+    # Пакетная запись результатов
+    for batch in chunked(movement_updates, 1000):
+        db.execute(update(MaterialMovement), batch)
+    for batch in chunked(item_updates, 1000):
+        db.execute(update(MaterialWriteOffItem), batch)
+    for batch in chunked(({"id": k, "total_amount": v} for k, v in write_off_totals.items()), 1000):
+        db.execute(update(MaterialWriteOff), batch)
+
+    stmt = delete(WarehouseStockSnapshot)
+    if since is not None:
+        stmt = stmt.where(WarehouseStockSnapshot.period_end >= since)
+    db.execute(stmt)
+    for batch in chunked(snapshots, 1000):
+        db.execute(insert(WarehouseStockSnapshot), batch)
+
+    # Средняя цена остатков; стоимость — от фактического количества на складе
+    table = WarehouseStock.__table__
+    price_params = [
+        {"w_id": w_id, "m_id": material_id, "price": price_of((w_id, material_id))}
+        for w_id, material_id in sorted(state)
+    ]
+    stock_update = (
+        update(table)
+        .where(table.c.warehouse_id == bindparam("w_id"), table.c.material_id == bindparam("m_id"))
+        .values(average_price=bindparam("price"), amount=table.c.quantity * bindparam("price"))
+    )
+    for batch in chunked(price_params, 1000):
+        db.execute(stock_update, batch)
+
+    db.commit()
+    return {
+        "events": len(events),
+        "movements_updated": len(movement_updates),
+        "write_off_items_updated": len(item_updates),
+        "write_offs_updated": len(write_off_totals),
+        "snapshots": len(snapshots),
+        "stocks_updated": len(price_params),
+    }
@@ -0,0 +1,144 @@
+"""Производственный календарь: рабочие дни с учетом выходных, праздников и исключений объекта.
+
+Для каждого года один раз строится накопленный массив: cumulative[k] — число рабочих
+дней среди первых k дней года, и список порядковых номеров рабочих дней. Тогда число
+рабочих дней между датами — разность двух элементов массива, а дата N-го рабочего дня —
+индекс в списке; обе операции O(1) (плюс по шагу на каждый пересеченный год).
+
+Правила дня по убыванию приоритета: исключение объекта, запись производственного
+календаря, затем суббота/воскресенье — выходные. Календари кэшируются по объекту
+и сбрасываются при изменении праздников и исключений через ORM.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.calendar import Holiday, ProjectCalendarException
+from app.services.cache import TTLCache
+
+CALENDAR_CACHE_TTL = 3600
+calendar_cache = TTLCache(ttl=CALENDAR_CACHE_TTL)
+
+# Предел длительности для add_working_days: календарь строится по годам до даты окончания
+MAX_WORKING_DAYS = 25000
+
+
+def national_holidays(config=settings) -> List[Tuple[int, int, str]]:
+    """Праздники с постоянной датой из настройки NATIONAL_HOLIDAYS: (месяц, день, наименование)."""
+    holidays = []
+    for entry in config.NATIONAL_HOLIDAYS:
+        month_day, _, name = entry.strip().partition(" ")
+        try:
+            month, day = (int(part) for part in month_day.split("-"))
+        except ValueError:
+            raise ValueError(f"NATIONAL_HOLIDAYS: ожидается «ММ-ДД Наименование», получено «{entry}»")
+        holidays.append((month, day, name.strip()))
+    return holidays
+
+
+@event.listens_for(Holiday, "after_insert")
+@event.listens_for(Holiday, "after_update")
+@event.listens_for(Holiday, "after_delete")
+def _invalidate_on_holiday_change(mapper, connection, target):
+    calendar_cache.invalidate()
+
+
+@event.listens_for(ProjectCalendarException, "after_insert")
+@event.listens_for(ProjectCalendarException, "after_update")
+@event.listens_for(ProjectCalendarException, "after_delete")
+def _invalidate_on_exception_change(mapper, connection, target):
+    calendar_cache.invalidate(target.project_id)
+
+
+class WorkCalendar:
+    """Календарь рабочих дней. overrides — дата → рабочий ли день (поверх правила выходных)."""
+
+    def __init__(self, overrides: Optional[Dict[date, bool]] = None):
+        self.overrides = overrides or {}
+        self._years: Dict[int, Tuple[List[int], List[int]]] = {}
+
+    def _year(self, year: int) -> Tuple[List[int], List[int]]:
+        """(cumulative, working): cumulative[k] — рабочих дней среди первых k дней года,
+        working[n] — порядковый номер (от 0) n-го рабочего дня года."""
+        cached = self._years.get(year)
+        if cached is not None:
+            return cached
+        first = date(year, 1, 1)
+        days = (date(year + 1, 1, 1) - first).days
+        weekday = first.weekday()
+        cumulative = [0] * (days + 1)
+        working = []
+        for k in range(days):
+            day_weekday = (weekday + k) % 7
+            flag = self.overrides.get(first + timedelta(days=k)) if self.overrides else None
+            if flag is None:
+                flag = day_weekday < 5
+            if flag:
+                working.append(k)
+            cumulative[k + 1] = len(working)
+        self._years[year] = (cumulative, working)
+        return cumulative, working
+
+    def _rank(self, day: date) -> Tuple[int, int]:
+        """(год, рабочих дней в году до day, не включая day)."""
+        cumulative, _ = self._year(day.year)
+        return day.year, cumulative[day.timetuple().tm_yday - 1]
+
+    def is_working_day(self, day: date) -> bool:
+        cumulative, _ = self._year(day.year)
+        k = day.timetuple().tm_yday - 1
+        return cumulative[k + 1] > cumulative[k]
+
+    def working_days_between(self, start: date, end: date) -> int:
+        """Число рабочих дней в интервале [start, end] включительно (0, если end < start)."""
+        if end < start:
+            return 0
+        start_year, before_start = self._rank(start)
+        end_year, before_end = self._rank(end)
+        total = before_end + (1 if self.is_working_day(end) else 0) - before_start
+        for year in range(start_year, end_year):
+            total += self._year(year)[0][-1]
+        return total
+
+    def next_working_day(self, day: date) -> date:
+        """Ближайший рабочий день, начиная с day."""
+        return self.add_working_days(day, 1)
+
+    def add_working_days(self, start: date, days: int) -> date:
+        """Дата окончания работы длительностью days рабочих дней, начатой в start
+        (start засчитывается, если он рабочий). При days <= 0 — start.
+
+        ValueError, если days больше MAX_WORKING_DAYS или дата окончания вне диапазона дат.
+        """
+        if days <= 0:
+            return start
+        if days > MAX_WORKING_DAYS:
+            raise ValueError(f"Длительность больше {MAX_WORKING_DAYS} рабочих дней")
+        year, index = self._rank(start)
+        index += days - 1
+        while True:
+            _, working = self._year(year)
+            if index < len(working):
+                return date(year, 1, 1) + timedelta(days=working[index])
+            index -= len(working)
+            year += 1
+            if year > date.max.year:
+                raise ValueError("Дата окончания вне допустимого диапазона дат")
+
+
+def _load_overrides(db: Session, project_id: Optional[int]) -> Dict[date, bool]:
+    overrides = dict(db.execute(select(Holiday.date, Holiday.is_working)).all())
+    if project_id is not None:
+        overrides.update(db.execute(
+            select(ProjectCalendarException.date, ProjectCalendarException.is_working)
+            .where(ProjectCalendarException.project_id == project_id)
+        ).all())
+    return overrides
+
+
+def get_calendar(db: Session, project_id: Optional[int] = None) -> WorkCalendar:
+    """Календарь объекта (или общий производственный календарь при project_id=None)."""
+    return calendar_cache.get_or_set(project_id, lambda: WorkCalendar(_load_overrides(db, project_id)))
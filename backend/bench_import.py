@@ -0,0 +1,59 @@
+"""Замер времени импорта приложения (холодный старт воркера).
+
+Каждый замер — отдельный процесс `import app.main` на несуществующей SQLite-БД.
+После импорта файл БД не должен появиться: при старте воркер не подключается к БД
+и не выполняет DDL (схема создается миграциями: alembic upgrade head).
+
+    python bench_import.py [--runs 5] [--modules document_roadmap,personnel]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent
+
+SNIPPET = (
+    "import resource, time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+)
+
+
+def run_once(db_path: Path, modules: str) -> tuple:
+    """(секунды импорта, пиковая память процесса в КБ)."""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", AUTO_CREATE_SCHEMA="false",
+               ENABLED_MODULES=modules)
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", SNIPPET],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    seconds, max_rss = out.stdout.strip().splitlines()[-1].split()
+    return float(seconds), int(max_rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время импорта app.main")
+    parser.add_argument("--runs", type=int, default=5, help="Число замеров")
+    parser.add_argument("--modules", default="*", help="Модули API через запятую (ENABLED_MODULES)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        runs = [run_once(db_path, args.modules) for _ in range(args.runs)]
+        touched_db = db_path.exists()
+
+    timings = [seconds for seconds, _ in runs]
+    print(f"Импорт app.main (модули: {args.modules}), {args.runs} замеров: "
+          f"мин {min(timings) * 1000:.0f} мс, медиана {statistics.median(timings) * 1000:.0f} мс, "
+          f"макс {max(timings) * 1000:.0f} мс; память до {max(rss for _, rss in runs) / 1024:.0f} МБ")
+    if touched_db:
+        print("ВНИМАНИЕ: при импорте создан файл БД — приложение обращается к БД при старте")
+        sys.exit(1)
+    print("Обращений к БД при импорте нет.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Пропускная способность чтения SQLite при одновременной записи: профиль по умолчанию и WAL.
+
+Во временной БД один поток непрерывно пишет короткими транзакциями, несколько
+потоков читают. Сравниваются движок без настроек (журнал отката) и движок
+с профилем из настроек (app.db.database.sqlite_pragmas).
+
+    python bench_sqlite.py [--seconds 5] [--readers 4]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine, text
+
+from app.db.database import apply_sqlite_profile
+
+ROWS = 20000
+
+
+def make_engine(path: Path, profile: bool):
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=16, max_overflow=0,
+    )
+    if profile:
+        apply_sqlite_profile(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE bench (id INTEGER PRIMARY KEY, grp INTEGER, value NUMERIC)"))
+        conn.execute(text("CREATE INDEX ix_bench_grp ON bench (grp)"))
+        conn.execute(
+            text("INSERT INTO bench (grp, value) VALUES (:grp, :value)"),
+            [{"grp": i % 100, "value": i} for i in range(ROWS)],
+        )
+    return engine
+
+
+def run(engine, seconds: float, readers: int) -> dict:
+    stop = time.monotonic() + seconds
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def writer():
+        while time.monotonic() < stop:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("UPDATE bench SET value = value + 1 WHERE id = :id"),
+                        [{"id": random.randint(1, ROWS)} for _ in range(20)],
+                    )
+                    conn.execute(text("INSERT INTO bench (grp, value) VALUES (:grp, 0)"), {"grp": random.randint(0, 99)})
+                bump("writes")
+            except Exception:
+                bump("errors")
+
+    def reader():
+        while time.monotonic() < stop:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT COUNT(*), SUM(value) FROM bench WHERE grp = :grp"), {"grp": random.randint(0, 99)}
+                    ).one()
+                bump("reads")
+            except Exception:
+                bump("errors")
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Чтение SQLite при одновременной записи")
+    parser.add_argument("--seconds", type=float, default=5, help="Длительность каждого прогона")
+    parser.add_argument("--readers", type=int, default=4, help="Число читающих потоков")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, profile in (("по умолчанию", False), ("профиль (WAL)", True)):
+            engine = make_engine(Path(tmp) / f"{int(profile)}.db", profile)
+            counts = run(engine, args.seconds, args.readers)
+            engine.dispose()
+            print(f"{name:>14}: чтений/с {counts['reads'] / args.seconds:8.0f}, "
+                  f"записей/с {counts['writes'] / args.seconds:6.0f}, ошибок {counts['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Пиковая пропускная способность записи SQLite: сессии с собственной фиксацией и очередь записи.
+
+Во временной БД с профилем из настроек несколько потоков выполняют короткие
+ORM-транзакции (строка движения + обновление остатка), как изменяющие эндпоинты.
+Сравниваются обычные сессии (каждая ждет блокировку записи в busy-обработчике)
+и сессии очереди app.db.writer (один писатель, групповая фиксация). --processes
+запускает несколько процессов на одной БД, как воркеры uvicorn.
+
+    python bench_writes.py [--seconds 5] [--writers 16] [--processes 1] [--synchronous NORMAL] [--dir .]
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import Column, Integer, Numeric, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.config import settings
+from app.db.database import apply_sqlite_profile, sqlite_pragmas
+from app.db.writer import QueuedWriteSession, WriteQueue
+
+ROWS = 1000
+
+BenchBase = declarative_base()
+
+
+class Stock(BenchBase):
+    __tablename__ = "bench_stock"
+    id = Column(Integer, primary_key=True)
+    quantity = Column(Numeric(15, 3), nullable=False, default=0)
+
+
+class Movement(BenchBase):
+    __tablename__ = "bench_movements"
+    id = Column(Integer, primary_key=True)
+    stock_id = Column(Integer, nullable=False)
+    quantity = Column(Numeric(15, 3), nullable=False)
+
+
+def make_engine(path: Path, synchronous: str, writers: int):
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=writers + 2, max_overflow=0,
+    )
+    config = settings.model_copy(update={"SQLITE_SYNCHRONOUS": synchronous})
+    apply_sqlite_profile(engine, sqlite_pragmas(config))
+    return engine
+
+
+def create_schema(engine):
+    BenchBase.metadata.create_all(engine)
+    with sessionmaker(bind=engine).begin() as session:
+        session.add_all(Stock(id=i, quantity=0) for i in range(1, ROWS + 1))
+
+
+def run(session_factory, seconds: float, writers: int) -> dict:
+    stop = time.monotonic() + seconds
+    counts = {"writes": 0, "errors": 0, "latencies": []}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def writer():
+        while time.monotonic() < stop:
+            session = session_factory()
+            started = time.perf_counter()
+            try:
+                stock = session.get(Stock, random.randint(1, ROWS))
+                session.add(Movement(stock_id=stock.id, quantity=1))
+                stock.quantity += 1
+                session.commit()
+                bump("writes")
+                with lock:
+                    counts["latencies"].append(time.perf_counter() - started)
+            except Exception:
+                session.rollback()
+                bump("errors")
+            finally:
+                session.close()
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def worker(path: Path, queued: bool, args, results):
+    """Один процесс: свой движок и, для очереди, свой писатель (согласуются файловой блокировкой)."""
+    engine = make_engine(path, args.synchronous, args.writers)
+    write_queue = None
+    if queued:
+        write_queue = WriteQueue(engine, batch_size=settings.WRITE_QUEUE_BATCH)
+        session_class = type("BenchWriteSession", (QueuedWriteSession,), {"write_queue": write_queue})
+        factory = sessionmaker(bind=engine, autoflush=False, class_=session_class)
+    else:
+        factory = sessionmaker(bind=engine, autoflush=False)
+    counts = run(factory, args.seconds, args.writers)
+    if write_queue is not None:
+        write_queue.stop()
+    engine.dispose()
+    results.put(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пиковая запись SQLite: обычные сессии и очередь записи")
+    parser.add_argument("--seconds", type=float, default=5, help="Длительность каждого прогона")
+    parser.add_argument("--writers", type=int, default=16, help="Число пишущих потоков")
+    parser.add_argument("--processes", type=int, default=1, help="Число процессов на одной БД")
+    parser.add_argument("--synchronous", default=settings.SQLITE_SYNCHRONOUS, help="PRAGMA synchronous")
+    parser.add_argument("--dir", default=None, help="Каталог временной БД (диск, а не tmpfs, чтобы учесть fsync)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for name, queued in (("обычные сессии", False), ("очередь записи", True)):
+            path = Path(tmp) / f"{int(queued)}.db"
+            engine = make_engine(path, args.synchronous, 1)
+            create_schema(engine)
+            engine.dispose()
+
+            results = multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(target=worker, args=(path, queued, args, results))
+                for _ in range(args.processes)
+            ]
+            for p in processes:
+                p.start()
+            counts = {"writes": 0, "errors": 0, "latencies": []}
+            for _ in processes:
+                for key, value in results.get().items():
+                    counts[key] += value
+            latencies = sorted(counts["latencies"]) or [0]
+            for p in processes:
+                p.join()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(f"{name:>15}: транзакций/с {counts['writes'] / args.seconds:7.0f}, "
+                  f"p50 {p50:6.1f} мс, p99 {p99:7.1f} мс, ошибок {counts['errors']}")
+
+
+if __name__ == "__main__":
+    main()
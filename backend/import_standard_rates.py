@@ -0,0 +1,40 @@
+"""Загрузка сборника нормативных расценок (ГЭСН/ФЕР) из CSV.
+
+Пример:
+    python import_standard_rates.py gesn_2022.csv --catalog-version ГЭСН-2022
+    python import_standard_rates.py fer.csv --catalog-version ФЕР-2020 --encoding cp1251
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app.models  # noqa: F401  (регистрация всех моделей для ORM-запросов)
+from app.db.database import SessionLocal
+from app.services.standard_rates import IMPORT_BATCH_SIZE, import_rates, iter_csv_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Загрузка сборника нормативных расценок из CSV")
+    parser.add_argument("path", help="CSV-файл сборника (заголовок: code;name;unit;materials_cost;...)")
+    parser.add_argument("--catalog-version", required=True, help="Версия сборника, например ГЭСН-2022")
+    parser.add_argument("--encoding", default="utf-8-sig")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding=args.encoding, newline="") as f:
+            result = import_rates(db, iter_csv_rows(f), args.catalog_version, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"Сборник {result['catalog_version']}: загружено {result['processed']} расценок "
+          f"({result['batches']} пачек), ошибок: {len(result['errors'])}")
+    for err in result["errors"][:50]:
+        print(f"  строка {err['line']}: {err['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Окружение Alembic: подключение из настроек приложения, метаданные всех моделей."""
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.database import Base, engine
+import app.models  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        if connection.dialect.name == "sqlite":
+            # Пересоздание таблицы в batch-режиме удаляет старую таблицу: с включенными
+            # внешними ключами SQLite отклонил бы это для таблиц, на которые есть ссылки
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+        # batch-режим: SQLite не умеет ALTER для ограничений, таблица пересоздается
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,1853 @@
+"""Базовая схема: таблицы моделей на момент перехода на миграции.
+
+Схема зафиксирована явными create_table/create_index, а не create_all по текущим
+моделям: новая БД после upgrade head получает ту же схему, что и обновленная старая,
+а изменения моделей оформляются следующими ревизиями.
+
+До появления миграций схема создавалась create_all при импорте приложения, поэтому
+таблицы, уже существующие в БД на момент upgrade, пропускаются вместе с их индексами —
+на старой БД ревизия создает только недостающие таблицы.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    def create_table(name, *columns, **kw):
+        if name not in existing:
+            op.create_table(name, *columns, **kw)
+
+    def create_index(index_name, table_name, columns, **kw):
+        if table_name not in existing:
+            op.create_index(index_name, table_name, columns, **kw)
+
+    create_table('calendar_holidays',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False, comment='Дата'),
+    sa.Column('name', sa.String(length=200), nullable=True, comment='Наименование праздника или переноса'),
+    sa.Column('is_working', sa.Boolean(), nullable=False, comment='Рабочий день (перенос выходного)'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('date')
+    )
+    create_index(op.f('ix_calendar_holidays_id'), 'calendar_holidays', ['id'], unique=False)
+
+    create_table('change_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=False, comment='Тип документа (ks2, ks3, invoices, write_offs, work_volumes)'),
+    sa.Column('entity_id', sa.Integer(), nullable=False, comment='ID документа'),
+    sa.Column('operation', sa.String(length=20), nullable=False, comment='Операция (insert, update, delete)'),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True, comment='Дата изменения'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index('ix_change_log_entity', 'change_log', ['entity_type', 'entity_id'], unique=False)
+    create_index(op.f('ix_change_log_id'), 'change_log', ['id'], unique=False)
+
+    create_table('contractors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование'),
+    sa.Column('inn', sa.String(length=20), nullable=True, comment='ИНН'),
+    sa.Column('kpp', sa.String(length=20), nullable=True, comment='КПП'),
+    sa.Column('address', sa.String(length=1000), nullable=True, comment='Адрес'),
+    sa.Column('phone', sa.String(length=50), nullable=True, comment='Телефон'),
+    sa.Column('email', sa.String(length=200), nullable=True, comment='Email'),
+    sa.Column('contact_person', sa.String(length=200), nullable=True, comment='Контактное лицо'),
+    sa.Column('specialization', sa.String(length=500), nullable=True, comment='Специализация'),
+    sa.Column('rating', sa.Integer(), nullable=True, comment='Рейтинг'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_contractors_id'), 'contractors', ['id'], unique=False)
+
+    create_table('counterparties',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False),
+    sa.Column('inn', sa.String(length=50), nullable=True),
+    sa.Column('kpp', sa.String(length=50), nullable=True),
+    sa.Column('contacts', sa.Text(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_counterparties_id'), 'counterparties', ['id'], unique=False)
+
+    create_table('departments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True, comment='Родительское подразделение'),
+    sa.Column('code', sa.String(length=50), nullable=True, comment='Код подразделения'),
+    sa.Column('name', sa.String(length=200), nullable=False, comment='Наименование'),
+    sa.Column('short_name', sa.String(length=50), nullable=True, comment='Краткое наименование'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('head', sa.String(length=200), nullable=True, comment='Руководитель'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активно'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['departments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_departments_code'), 'departments', ['code'], unique=True)
+    create_index(op.f('ix_departments_id'), 'departments', ['id'], unique=False)
+    create_index(op.f('ix_departments_parent_id'), 'departments', ['parent_id'], unique=False)
+
+    create_table('document_npa',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False, comment='Название НПА'),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('number', sa.String(length=100), nullable=True, comment='Номер НПА'),
+    sa.Column('date', sa.Date(), nullable=True, comment='Дата НПА'),
+    sa.Column('file_name', sa.String(length=500), nullable=True, comment='Оригинальное имя файла'),
+    sa.Column('stored_path', sa.String(length=1000), nullable=True, comment='Путь к файлу на сервере'),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_document_npa_id'), 'document_npa', ['id'], unique=False)
+
+    create_table('document_roadmap_sections',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=200), nullable=False, comment='Код узла (например: sketch.itc.heat_supply)'),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование узла'),
+    sa.Column('parent_id', sa.Integer(), nullable=True, comment='ID родительского узла'),
+    sa.Column('order_number', sa.Integer(), nullable=True, comment='Порядковый номер для сортировки'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание узла'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['document_roadmap_sections.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_document_roadmap_sections_code'), 'document_roadmap_sections', ['code'], unique=True)
+    create_index(op.f('ix_document_roadmap_sections_id'), 'document_roadmap_sections', ['id'], unique=False)
+
+    create_table('document_versions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document_type', sa.String(length=100), nullable=False, comment='Тип документа (executive_doc, project_doc, etc.)'),
+    sa.Column('document_id', sa.Integer(), nullable=False, comment='ID документа'),
+    sa.Column('version_number', sa.String(length=50), nullable=False, comment='Номер версии'),
+    sa.Column('version_date', sa.Date(), nullable=False, comment='Дата версии'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу версии'),
+    sa.Column('file_name', sa.String(length=500), nullable=True, comment='Имя файла'),
+    sa.Column('file_size', sa.Integer(), nullable=True, comment='Размер файла (байт)'),
+    sa.Column('mime_type', sa.String(length=100), nullable=True, comment='MIME тип'),
+    sa.Column('changes_description', sa.Text(), nullable=True, comment='Описание изменений'),
+    sa.Column('created_by', sa.String(length=200), nullable=False, comment='Создал'),
+    sa.Column('is_current', sa.Boolean(), nullable=True, comment='Текущая версия'),
+    sa.Column('previous_version_id', sa.Integer(), nullable=True, comment='Предыдущая версия'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['previous_version_id'], ['document_versions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_document_versions_document_id'), 'document_versions', ['document_id'], unique=False)
+    create_index(op.f('ix_document_versions_document_type'), 'document_versions', ['document_type'], unique=False)
+    create_index(op.f('ix_document_versions_id'), 'document_versions', ['id'], unique=False)
+
+    create_table('lab_test_types',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('code', sa.String(length=80), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    create_index(op.f('ix_lab_test_types_code'), 'lab_test_types', ['code'], unique=True)
+    create_index(op.f('ix_lab_test_types_id'), 'lab_test_types', ['id'], unique=False)
+
+    create_table('laboratories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=300), nullable=False),
+    sa.Column('code', sa.String(length=80), nullable=True),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('phone', sa.String(length=80), nullable=True),
+    sa.Column('email', sa.String(length=200), nullable=True),
+    sa.Column('contact_person', sa.String(length=200), nullable=True),
+    sa.Column('contacts', sa.Text(), nullable=True, comment='Контакты'),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    create_index(op.f('ix_laboratories_code'), 'laboratories', ['code'], unique=True)
+    create_index(op.f('ix_laboratories_id'), 'laboratories', ['id'], unique=False)
+
+    create_table('material_kinds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('code', sa.String(length=80), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_material_kinds_code'), 'material_kinds', ['code'], unique=True)
+    create_index(op.f('ix_material_kinds_id'), 'material_kinds', ['id'], unique=False)
+
+    create_table('material_type_refs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=80), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_material_type_refs_code'), 'material_type_refs', ['code'], unique=True)
+    create_index(op.f('ix_material_type_refs_id'), 'material_type_refs', ['id'], unique=False)
+
+    create_table('materials',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=100), nullable=True, comment='Код материала'),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование'),
+    sa.Column('material_type', sa.Enum('CONSTRUCTION', 'EQUIPMENT', 'TOOLS', 'CONSUMABLES', 'OTHER', name='materialtype'), nullable=False, comment='Тип материала'),
+    sa.Column('unit', sa.String(length=50), nullable=False, comment='Единица измерения'),
+    sa.Column('specification', sa.String(length=1000), nullable=True, comment='Характеристики/спецификация'),
+    sa.Column('standard_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Нормативная цена'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_materials_code'), 'materials', ['code'], unique=True)
+    create_index(op.f('ix_materials_id'), 'materials', ['id'], unique=False)
+
+    create_table('object_constructs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=True, comment='Код конструктива'),
+    sa.Column('name', sa.String(length=200), nullable=False, comment='Наименование'),
+    sa.Column('category', sa.String(length=100), nullable=True, comment='Категория'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_object_constructs_code'), 'object_constructs', ['code'], unique=True)
+    create_index(op.f('ix_object_constructs_id'), 'object_constructs', ['id'], unique=False)
+
+    create_table('organizations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False),
+    sa.Column('code', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_organizations_code'), 'organizations', ['code'], unique=True)
+    create_index(op.f('ix_organizations_id'), 'organizations', ['id'], unique=False)
+
+    create_table('payment_types',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('code', sa.String(length=80), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_payment_types_code'), 'payment_types', ['code'], unique=True)
+    create_index(op.f('ix_payment_types_id'), 'payment_types', ['id'], unique=False)
+
+    create_table('permissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=100), nullable=False, comment='Код разрешения'),
+    sa.Column('name', sa.String(length=200), nullable=False, comment='Наименование'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('module', sa.String(length=100), nullable=True, comment='Модуль'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_permissions_code'), 'permissions', ['code'], unique=True)
+    create_index(op.f('ix_permissions_id'), 'permissions', ['id'], unique=False)
+
+    create_table('roles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=100), nullable=False, comment='Код роли'),
+    sa.Column('name', sa.String(length=200), nullable=False, comment='Наименование'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_roles_code'), 'roles', ['code'], unique=True)
+    create_index(op.f('ix_roles_id'), 'roles', ['id'], unique=False)
+
+    create_table('standard_rates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=100), nullable=False, comment='Код расценки'),
+    sa.Column('catalog_version', sa.String(length=50), server_default='', nullable=False, comment='Версия сборника (ГЭСН-2022, ФЕР-2020 и т.п.)'),
+    sa.Column('name', sa.String(length=1000), nullable=False, comment='Наименование'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('materials_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Стоимость материалов'),
+    sa.Column('labor_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Заработная плата'),
+    sa.Column('equipment_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Стоимость механизмов'),
+    sa.Column('total_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Всего'),
+    sa.Column('collection', sa.String(length=200), nullable=True, comment='Сборник'),
+    sa.Column('section', sa.String(length=100), nullable=True, comment='Раздел'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активна'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_standard_rates_code'), 'standard_rates', ['code'], unique=False)
+    create_index(op.f('ix_standard_rates_id'), 'standard_rates', ['id'], unique=False)
+    create_index('uq_standard_rates_code_version', 'standard_rates', ['code', 'catalog_version'], unique=True)
+
+    create_table('warehouses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=True, comment='Код склада'),
+    sa.Column('name', sa.String(length=200), nullable=False, comment='Наименование'),
+    sa.Column('location', sa.String(length=500), nullable=True, comment='Адрес/местоположение'),
+    sa.Column('responsible', sa.String(length=200), nullable=True, comment='Ответственный'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_warehouses_code'), 'warehouses', ['code'], unique=True)
+    create_index(op.f('ix_warehouses_id'), 'warehouses', ['id'], unique=False)
+
+    create_table('document_npa_sections',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('npa_id', sa.Integer(), nullable=False),
+    sa.Column('section_id', sa.Integer(), nullable=False),
+    sa.Column('section_code', sa.String(length=200), nullable=False),
+    sa.ForeignKeyConstraint(['npa_id'], ['document_npa.id'], ),
+    sa.ForeignKeyConstraint(['section_id'], ['document_roadmap_sections.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_document_npa_sections_id'), 'document_npa_sections', ['id'], unique=False)
+    create_index(op.f('ix_document_npa_sections_npa_id'), 'document_npa_sections', ['npa_id'], unique=False)
+    create_index(op.f('ix_document_npa_sections_section_code'), 'document_npa_sections', ['section_code'], unique=False)
+    create_index(op.f('ix_document_npa_sections_section_id'), 'document_npa_sections', ['section_id'], unique=False)
+
+    create_table('projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование проекта'),
+    sa.Column('code', sa.String(length=100), nullable=True, comment='Код проекта'),
+    sa.Column('address', sa.String(length=1000), nullable=True, comment='Адрес объекта'),
+    sa.Column('customer', sa.String(length=500), nullable=True, comment='Заказчик'),
+    sa.Column('contractor', sa.String(length=500), nullable=True, comment='Подрядчик'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание проекта'),
+    sa.Column('work_type', sa.String(length=200), nullable=True, comment='Вид работ'),
+    sa.Column('department_id', sa.Integer(), nullable=True, comment='Подразделение (ПТО)'),
+    sa.Column('start_date', sa.Date(), nullable=True, comment='Дата начала работ'),
+    sa.Column('end_date', sa.Date(), nullable=True, comment='Планируемая дата окончания работ'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус проекта'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен ли проект'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_projects_code'), 'projects', ['code'], unique=True)
+    create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+
+    create_table('role_permissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(length=100), nullable=False, comment='Код роли'),
+    sa.Column('permission_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['permission_id'], ['permissions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_role_permissions_id'), 'role_permissions', ['id'], unique=False)
+    create_index(op.f('ix_role_permissions_permission_id'), 'role_permissions', ['permission_id'], unique=False)
+    create_index(op.f('ix_role_permissions_role'), 'role_permissions', ['role'], unique=False)
+
+    create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False, comment='Логин'),
+    sa.Column('email', sa.String(length=200), nullable=True, comment='Email'),
+    sa.Column('full_name', sa.String(length=200), nullable=False, comment='ФИО'),
+    sa.Column('role', sa.Enum('ADMIN', 'PTO_HEAD', 'PTO_ENGINEER', 'SITE_MANAGER', 'FOREMAN', 'MASTER', 'STOREKEEPER', 'OPERATOR', 'GEODESIST', 'OGE_HEAD', 'OGM_HEAD', 'ARCHITECT', 'SALES_MANAGER', 'ACCOUNTANT', 'DEBT_COLLECTOR', name='userrole'), nullable=False, comment='Роль'),
+    sa.Column('department_id', sa.Integer(), nullable=True, comment='Подразделение'),
+    sa.Column('position', sa.String(length=200), nullable=True, comment='Должность'),
+    sa.Column('phone', sa.String(length=50), nullable=True, comment='Телефон'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('password_hash', sa.String(length=255), nullable=True, comment='Хэш пароля (для будущей аутентификации)'),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True, comment='Последний вход'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    create_table('warehouse_stock_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('warehouse_id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False, comment='Последний день периода'),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=False, comment='Остаток на конец периода'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Стоимость остатка на конец периода'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('warehouse_id', 'material_id', 'period_end', name='uq_stock_snapshots_warehouse_material_period')
+    )
+    create_index(op.f('ix_warehouse_stock_snapshots_id'), 'warehouse_stock_snapshots', ['id'], unique=False)
+    create_index(op.f('ix_warehouse_stock_snapshots_material_id'), 'warehouse_stock_snapshots', ['material_id'], unique=False)
+    create_index(op.f('ix_warehouse_stock_snapshots_period_end'), 'warehouse_stock_snapshots', ['period_end'], unique=False)
+    create_index(op.f('ix_warehouse_stock_snapshots_warehouse_id'), 'warehouse_stock_snapshots', ['warehouse_id'], unique=False)
+
+    create_table('warehouse_stocks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('warehouse_id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=True, comment='Количество'),
+    sa.Column('reserved_quantity', sa.Numeric(precision=15, scale=3), nullable=True, comment='Зарезервировано'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Стоимость остатка (по скользящей средней)'),
+    sa.Column('average_price', sa.Numeric(precision=15, scale=4), nullable=True, comment='Средняя себестоимость единицы'),
+    sa.Column('last_movement_date', sa.DateTime(timezone=True), nullable=True, comment='Дата последнего движения'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('warehouse_id', 'material_id', name='uq_warehouse_stocks_warehouse_material')
+    )
+    create_index(op.f('ix_warehouse_stocks_id'), 'warehouse_stocks', ['id'], unique=False)
+    create_index(op.f('ix_warehouse_stocks_material_id'), 'warehouse_stocks', ['material_id'], unique=False)
+    create_index(op.f('ix_warehouse_stocks_warehouse_id'), 'warehouse_stocks', ['warehouse_id'], unique=False)
+
+    create_table('document_section_statuses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('section_id', sa.Integer(), nullable=False),
+    sa.Column('section_code', sa.String(length=200), nullable=False, comment='Код секции (для быстрого поиска)'),
+    sa.Column('request_date', sa.Date(), nullable=True, comment='Дата обращения'),
+    sa.Column('due_date', sa.Date(), nullable=True, comment='Срок исполнения (до)'),
+    sa.Column('valid_until_date', sa.Date(), nullable=True, comment='Срок действия документа (до)'),
+    sa.Column('executor_company', sa.String(length=500), nullable=True, comment='Исполнитель от компании'),
+    sa.Column('executor_authority', sa.String(length=500), nullable=True, comment='Исполнитель от гос органа'),
+    sa.Column('execution_status', sa.Enum('NOT_STARTED', 'IN_PROGRESS', 'ON_APPROVAL', 'COMPLETED', name='executionstatus'), nullable=True, comment='Статус выполнения'),
+    sa.Column('note', sa.Text(), nullable=True, comment='Примечание'),
+    sa.Column('document_status', sa.Enum('VALID', 'EXPIRING', 'EXPIRED', name='documentstatus'), nullable=True, comment='Статус документа (автоматически рассчитывается)'),
+    sa.Column('document_status_calculated_at', sa.DateTime(timezone=True), nullable=True, comment='Дата последнего расчета статуса'),
+    sa.Column('created_by', sa.String(length=200), nullable=True, comment='Создал'),
+    sa.Column('updated_by', sa.String(length=200), nullable=True, comment='Обновил'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['section_id'], ['document_roadmap_sections.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_document_section_statuses_id'), 'document_section_statuses', ['id'], unique=False)
+    create_index(op.f('ix_document_section_statuses_project_id'), 'document_section_statuses', ['project_id'], unique=False)
+    create_index(op.f('ix_document_section_statuses_section_code'), 'document_section_statuses', ['section_code'], unique=False)
+    create_index(op.f('ix_document_section_statuses_section_id'), 'document_section_statuses', ['section_id'], unique=False)
+
+    create_table('lab_tests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('test_type_id', sa.Integer(), nullable=True, comment='Вид испытания (справочник)'),
+    sa.Column('test_type', sa.String(length=200), nullable=False, comment='Вид испытания (legacy, текст)'),
+    sa.Column('sample_description', sa.String(length=500), nullable=True, comment='Описание образца/участка'),
+    sa.Column('laboratory_id', sa.Integer(), nullable=True, comment='Лаборатория (справочник)'),
+    sa.Column('lab_name', sa.String(length=300), nullable=True, comment='Лаборатория / исполнитель (legacy, текст)'),
+    sa.Column('protocol_number', sa.String(length=120), nullable=True, comment='Номер протокола'),
+    sa.Column('protocol_date', sa.Date(), nullable=True, comment='Дата протокола'),
+    sa.Column('sample_date', sa.Date(), nullable=True, comment='Дата отбора'),
+    sa.Column('test_date', sa.Date(), nullable=True, comment='Дата испытания'),
+    sa.Column('result', sa.String(length=50), nullable=True, comment='Результат: pending|pass|fail'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание/показатели'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('file_name', sa.String(length=500), nullable=True, comment='Имя файла протокола'),
+    sa.Column('stored_path', sa.String(length=1000), nullable=True, comment='Путь к файлу на сервере'),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['laboratory_id'], ['laboratories.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['test_type_id'], ['lab_test_types.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_lab_tests_id'), 'lab_tests', ['id'], unique=False)
+    create_index(op.f('ix_lab_tests_project_id'), 'lab_tests', ['project_id'], unique=False)
+
+    create_table('personnel',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tab_number', sa.String(length=50), nullable=True, comment='Табельный номер'),
+    sa.Column('full_name', sa.String(length=200), nullable=False, comment='ФИО'),
+    sa.Column('position', sa.String(length=200), nullable=False, comment='Должность'),
+    sa.Column('department_id', sa.Integer(), nullable=True, comment='Подразделение'),
+    sa.Column('hire_date', sa.Date(), nullable=False, comment='Дата приёма'),
+    sa.Column('dismissal_date', sa.Date(), nullable=True, comment='Дата увольнения'),
+    sa.Column('birth_date', sa.Date(), nullable=True, comment='Дата рождения'),
+    sa.Column('phone', sa.String(length=50), nullable=True, comment='Телефон'),
+    sa.Column('email', sa.String(length=200), nullable=True, comment='Email'),
+    sa.Column('inn', sa.String(length=12), nullable=True, comment='ИНН'),
+    sa.Column('passport_series', sa.String(length=10), nullable=True, comment='Серия паспорта'),
+    sa.Column('passport_number', sa.String(length=20), nullable=True, comment='Номер паспорта'),
+    sa.Column('address', sa.Text(), nullable=True, comment='Адрес проживания'),
+    sa.Column('status', sa.Enum('EMPLOYED', 'DISMISSED', 'VACATION', 'MATERNITY', 'SICK_LEAVE', name='personnelstatus', native_enum=False), nullable=True, comment='Статус'),
+    sa.Column('user_id', sa.Integer(), nullable=True, comment='Связь с учётной записью'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_personnel_department_id'), 'personnel', ['department_id'], unique=False)
+    create_index(op.f('ix_personnel_id'), 'personnel', ['id'], unique=False)
+    create_index(op.f('ix_personnel_tab_number'), 'personnel', ['tab_number'], unique=True)
+
+    create_table('ppr',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование ППР'),
+    sa.Column('number', sa.String(length=100), nullable=True, comment='Номер ППР'),
+    sa.Column('version', sa.String(length=50), nullable=True, comment='Версия'),
+    sa.Column('development_date', sa.Date(), nullable=True, comment='Дата разработки'),
+    sa.Column('developer', sa.String(length=200), nullable=True, comment='Разработчик'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (draft, approved, active)'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Общее описание'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_ppr_id'), 'ppr', ['id'], unique=False)
+    create_index(op.f('ix_ppr_project_id'), 'ppr', ['project_id'], unique=False)
+
+    create_table('project_calendar_exceptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False, comment='Дата'),
+    sa.Column('is_working', sa.Boolean(), nullable=False, comment='Рабочий день'),
+    sa.Column('reason', sa.String(length=500), nullable=True, comment='Причина (остановка площадки, работа в выходной)'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'date', name='uq_project_calendar_exceptions_project_date')
+    )
+    create_index(op.f('ix_project_calendar_exceptions_id'), 'project_calendar_exceptions', ['id'], unique=False)
+    create_index(op.f('ix_project_calendar_exceptions_project_id'), 'project_calendar_exceptions', ['project_id'], unique=False)
+
+    create_table('project_documentation',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('doc_type', sa.String(length=50), nullable=False, comment='Тип документации'),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование'),
+    sa.Column('number', sa.String(length=100), nullable=True, comment='Номер документа'),
+    sa.Column('version', sa.String(length=50), nullable=True, comment='Версия'),
+    sa.Column('development_date', sa.Date(), nullable=True, comment='Дата разработки'),
+    sa.Column('developer', sa.String(length=200), nullable=True, comment='Разработчик'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('approval_date', sa.Date(), nullable=True, comment='Дата утверждения'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активна'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_project_documentation_id'), 'project_documentation', ['id'], unique=False)
+    create_index(op.f('ix_project_documentation_project_id'), 'project_documentation', ['project_id'], unique=False)
+
+    create_table('project_stages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='Проект (объект)'),
+    sa.Column('code', sa.String(length=50), nullable=True, comment='Код этапа'),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование этапа'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание этапа'),
+    sa.Column('stage_type', sa.String(length=100), nullable=True, comment='Тип этапа (подготовительный, основной, отделочный, завершающий)'),
+    sa.Column('order_number', sa.Integer(), nullable=True, comment='Порядковый номер этапа'),
+    sa.Column('planned_start_date', sa.Date(), nullable=True, comment='Планируемая дата начала этапа'),
+    sa.Column('planned_end_date', sa.Date(), nullable=True, comment='Планируемая дата окончания этапа'),
+    sa.Column('actual_start_date', sa.Date(), nullable=True, comment='Фактическая дата начала этапа'),
+    sa.Column('actual_end_date', sa.Date(), nullable=True, comment='Фактическая дата окончания этапа'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус этапа (planned, in_progress, completed, suspended)'),
+    sa.Column('progress_percentage', sa.Numeric(precision=5, scale=2), nullable=True, comment='Процент выполнения этапа'),
+    sa.Column('responsible', sa.String(length=200), nullable=True, comment='Ответственный за этап'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_project_stages_id'), 'project_stages', ['id'], unique=False)
+    create_index(op.f('ix_project_stages_project_id'), 'project_stages', ['project_id'], unique=False)
+
+    create_table('receivable_aging',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('customer_name', sa.String(length=500), nullable=False, comment='Дебитор (заказчик)'),
+    sa.Column('as_of', sa.Date(), nullable=False, comment='Дата расчета'),
+    sa.Column('receivables_count', sa.Integer(), nullable=False, comment='Открытых задолженностей'),
+    sa.Column('bucket_0_30', sa.Numeric(precision=15, scale=2), nullable=False, comment='Просрочка 0–30 дней (включая непросроченную)'),
+    sa.Column('bucket_31_60', sa.Numeric(precision=15, scale=2), nullable=False, comment='Просрочка 31–60 дней'),
+    sa.Column('bucket_61_90', sa.Numeric(precision=15, scale=2), nullable=False, comment='Просрочка 61–90 дней'),
+    sa.Column('bucket_90_plus', sa.Numeric(precision=15, scale=2), nullable=False, comment='Просрочка более 90 дней'),
+    sa.Column('total_remaining', sa.Numeric(precision=15, scale=2), nullable=False, comment='Остаток задолженности'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'customer_name', name='uq_receivable_aging_project_customer')
+    )
+    create_index(op.f('ix_receivable_aging_customer_name'), 'receivable_aging', ['customer_name'], unique=False)
+    create_index(op.f('ix_receivable_aging_id'), 'receivable_aging', ['id'], unique=False)
+    create_index(op.f('ix_receivable_aging_project_id'), 'receivable_aging', ['project_id'], unique=False)
+
+    create_table('tenders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('number', sa.String(length=100), nullable=False, comment='Номер тендера'),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование тендера'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание работ/услуг'),
+    sa.Column('announcement_date', sa.Date(), nullable=True, comment='Дата объявления'),
+    sa.Column('submission_deadline', sa.Date(), nullable=True, comment='Срок подачи предложений'),
+    sa.Column('evaluation_date', sa.Date(), nullable=True, comment='Дата оценки'),
+    sa.Column('budget', sa.Numeric(precision=15, scale=2), nullable=True, comment='Бюджет тендера'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус'),
+    sa.Column('winner_id', sa.Integer(), nullable=True, comment='Победитель'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['winner_id'], ['contractors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_tenders_id'), 'tenders', ['id'], unique=False)
+    create_index(op.f('ix_tenders_number'), 'tenders', ['number'], unique=True)
+    create_index(op.f('ix_tenders_project_id'), 'tenders', ['project_id'], unique=False)
+
+    create_table('user_permissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('permission_id', sa.Integer(), nullable=False),
+    sa.Column('granted', sa.Boolean(), nullable=True, comment='Разрешено'),
+    sa.Column('granted_by', sa.String(length=200), nullable=True, comment='Выдал'),
+    sa.Column('granted_date', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True, comment='Дата выдачи'),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True, comment='Дата истечения'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.ForeignKeyConstraint(['permission_id'], ['permissions.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_user_permissions_id'), 'user_permissions', ['id'], unique=False)
+    create_index(op.f('ix_user_permissions_permission_id'), 'user_permissions', ['permission_id'], unique=False)
+    create_index(op.f('ix_user_permissions_user_id'), 'user_permissions', ['user_id'], unique=False)
+
+    create_table('applications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='Объект строительства/проект'),
+    sa.Column('application_type', sa.String(length=50), nullable=False, comment='Тип заявки'),
+    sa.Column('number', sa.String(length=100), nullable=False, comment='Номер заявки'),
+    sa.Column('date', sa.Date(), nullable=False, comment='Дата заявки'),
+    sa.Column('requested_by', sa.String(length=200), nullable=True, comment='Инициатор (поставщик/подрядчик) - текст, если используется'),
+    sa.Column('requested_by_personnel_id', sa.Integer(), nullable=True, comment='Сотрудник, подавший заявку'),
+    sa.Column('department', sa.String(length=200), nullable=True, comment='Подразделение (текст, если используется)'),
+    sa.Column('department_id', sa.Integer(), nullable=True, comment='Подразделение (справочник)'),
+    sa.Column('organization_id', sa.Integer(), nullable=True, comment='Организация'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус заявки'),
+    sa.Column('basis', sa.Text(), nullable=True, comment='Основание'),
+    sa.Column('old_number', sa.String(length=120), nullable=True, comment='Старый номер'),
+    sa.Column('material_kind_id', sa.Integer(), nullable=True, comment='Вид материала (справочник)'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание/обоснование'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Общая сумма'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('approval_date', sa.Date(), nullable=True, comment='Дата утверждения'),
+    sa.Column('warehouse', sa.String(length=200), nullable=True, comment='Склад (текст)'),
+    sa.Column('warehouse_id', sa.Integer(), nullable=True, comment='Склад (справочник)'),
+    sa.Column('payment_type_id', sa.Integer(), nullable=True, comment='Вид оплаты (по умолчанию)'),
+    sa.Column('counterparty_id', sa.Integer(), nullable=True, comment='Контрагент (по умолчанию)'),
+    sa.Column('initiator_counterparty_id', sa.Integer(), nullable=True, comment='Инициатор (поставщик/подрядчик)'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('author_user_id', sa.Integer(), nullable=True, comment='Автор (пользователь)'),
+    sa.Column('responsible_personnel_id', sa.Integer(), nullable=True, comment='Ответственный (сотрудник)'),
+    sa.Column('comment', sa.Text(), nullable=True, comment='Комментарий'),
+    sa.Column('is_posted', sa.Boolean(), nullable=True, comment='Проведен'),
+    sa.ForeignKeyConstraint(['author_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['counterparty_id'], ['counterparties.id'], ),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.ForeignKeyConstraint(['initiator_counterparty_id'], ['counterparties.id'], ),
+    sa.ForeignKeyConstraint(['material_kind_id'], ['material_kinds.id'], ),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.ForeignKeyConstraint(['payment_type_id'], ['payment_types.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['requested_by_personnel_id'], ['personnel.id'], ),
+    sa.ForeignKeyConstraint(['responsible_personnel_id'], ['personnel.id'], ),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_applications_id'), 'applications', ['id'], unique=False)
+    create_index(op.f('ix_applications_project_id'), 'applications', ['project_id'], unique=False)
+
+    create_table('commercial_proposals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tender_id', sa.Integer(), nullable=False),
+    sa.Column('contractor_id', sa.Integer(), nullable=False),
+    sa.Column('number', sa.String(length=100), nullable=True, comment='Номер КП'),
+    sa.Column('date', sa.Date(), nullable=False, comment='Дата КП'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Общая сумма'),
+    sa.Column('validity_period', sa.Date(), nullable=True, comment='Срок действия'),
+    sa.Column('payment_terms', sa.Text(), nullable=True, comment='Условия оплаты'),
+    sa.Column('delivery_terms', sa.Text(), nullable=True, comment='Условия поставки'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['contractor_id'], ['contractors.id'], ),
+    sa.ForeignKeyConstraint(['tender_id'], ['tenders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_commercial_proposals_contractor_id'), 'commercial_proposals', ['contractor_id'], unique=False)
+    create_index(op.f('ix_commercial_proposals_id'), 'commercial_proposals', ['id'], unique=False)
+    create_index(op.f('ix_commercial_proposals_tender_id'), 'commercial_proposals', ['tender_id'], unique=False)
+
+    create_table('contracts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('contractor_name', sa.String(length=500), nullable=False, comment='Наименование подрядчика'),
+    sa.Column('contract_number', sa.String(length=100), nullable=False, comment='Номер договора'),
+    sa.Column('contract_date', sa.Date(), nullable=False, comment='Дата договора'),
+    sa.Column('start_date', sa.Date(), nullable=True, comment='Дата начала действия'),
+    sa.Column('end_date', sa.Date(), nullable=True, comment='Дата окончания действия'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма договора'),
+    sa.Column('advance_payment', sa.Numeric(precision=15, scale=2), nullable=True, comment='Аванс'),
+    sa.Column('work_description', sa.Text(), nullable=True, comment='Описание работ'),
+    sa.Column('terms', sa.Text(), nullable=True, comment='Условия договора'),
+    sa.Column('status', sa.Enum('DRAFT', 'SIGNED', 'ACTIVE', 'SUSPENDED', 'COMPLETED', 'TERMINATED', name='contractstatus'), nullable=True, comment='Статус'),
+    sa.Column('signed_by_customer', sa.String(length=200), nullable=True, comment='Подписан заказчиком'),
+    sa.Column('signed_by_contractor', sa.String(length=200), nullable=True, comment='Подписан подрядчиком'),
+    sa.Column('tender_id', sa.Integer(), nullable=True, comment='Связанный тендер'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['tender_id'], ['tenders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_contracts_contract_number'), 'contracts', ['contract_number'], unique=True)
+    create_index(op.f('ix_contracts_id'), 'contracts', ['id'], unique=False)
+    create_index(op.f('ix_contracts_project_id'), 'contracts', ['project_id'], unique=False)
+
+    create_table('document_files',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status_id', sa.Integer(), nullable=False),
+    sa.Column('file_name', sa.String(length=500), nullable=False, comment='Оригинальное имя файла'),
+    sa.Column('stored_path', sa.String(length=1000), nullable=False, comment='Путь к файлу на сервере'),
+    sa.Column('file_size', sa.Integer(), nullable=True, comment='Размер файла в байтах'),
+    sa.Column('mime_type', sa.String(length=100), nullable=True, comment='MIME тип файла'),
+    sa.Column('uploaded_by', sa.String(length=200), nullable=True, comment='Загрузил'),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание файла'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активен'),
+    sa.ForeignKeyConstraint(['status_id'], ['document_section_statuses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_document_files_id'), 'document_files', ['id'], unique=False)
+    create_index(op.f('ix_document_files_status_id'), 'document_files', ['status_id'], unique=False)
+
+    create_table('document_notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status_id', sa.Integer(), nullable=False),
+    sa.Column('notification_type', sa.Enum('STATUS_COMPLETED', 'DOCUMENT_30_DAYS', 'DOCUMENT_7_DAYS', 'DOCUMENT_EXPIRED', name='notificationtype'), nullable=False, comment='Тип уведомления'),
+    sa.Column('channel', sa.Enum('IN_APP', 'EMAIL', 'PUSH', name='notificationchannel'), nullable=False, comment='Канал уведомления'),
+    sa.Column('title', sa.String(length=500), nullable=False, comment='Заголовок уведомления'),
+    sa.Column('message', sa.Text(), nullable=False, comment='Текст уведомления'),
+    sa.Column('is_read', sa.Boolean(), nullable=True, comment='Прочитано'),
+    sa.Column('is_sent', sa.Boolean(), nullable=True, comment='Отправлено'),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True, comment='Дата отправки'),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True, comment='Дата прочтения'),
+    sa.Column('recipient_user_id', sa.Integer(), nullable=True, comment='Получатель'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['recipient_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['status_id'], ['document_section_statuses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_document_notifications_id'), 'document_notifications', ['id'], unique=False)
+    create_index(op.f('ix_document_notifications_status_id'), 'document_notifications', ['status_id'], unique=False)
+
+    create_table('estimates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='Проект (объект)'),
+    sa.Column('stage_id', sa.Integer(), nullable=True, comment='Этап проекта (опционально, для иерархии)'),
+    sa.Column('estimate_type', sa.Enum('LOCAL', 'OBJECT', 'SUMMARY', 'CONSOLIDATED', name='estimatetype'), nullable=False, comment='Тип сметы'),
+    sa.Column('number', sa.String(length=100), nullable=False, comment='Номер сметы'),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование сметы'),
+    sa.Column('date', sa.Date(), nullable=False, comment='Дата сметы'),
+    sa.Column('version', sa.String(length=50), nullable=True, comment='Версия'),
+    sa.Column('base_estimate_id', sa.Integer(), nullable=True, comment='Базовая смета (для сводной)'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Общая стоимость'),
+    sa.Column('materials_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Стоимость материалов'),
+    sa.Column('labor_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Стоимость работ'),
+    sa.Column('equipment_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Стоимость механизмов'),
+    sa.Column('overhead_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Накладные расходы'),
+    sa.Column('related_costs', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сопутствующие затраты'),
+    sa.Column('developed_by', sa.String(length=200), nullable=True, comment='Разработал'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='Активна'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['base_estimate_id'], ['estimates.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['stage_id'], ['project_stages.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_estimates_id'), 'estimates', ['id'], unique=False)
+    create_index(op.f('ix_estimates_project_id'), 'estimates', ['project_id'], unique=False)
+
+    create_table('executive_surveys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('survey_type', sa.Enum('EXECUTIVE', 'CONTROL', 'MARKING', 'OTHER', name='surveytype', native_enum=False), nullable=False, comment='Тип съемки'),
+    sa.Column('number', sa.String(length=100), nullable=True, comment='Номер съемки'),
+    sa.Column('survey_date', sa.Date(), nullable=False, comment='Дата съемки'),
+    sa.Column('surveyor', sa.String(length=200), nullable=True, comment='Геодезист'),
+    sa.Column('surveyor_personnel_id', sa.Integer(), nullable=True, comment='Сотрудник-геодезист'),
+    sa.Column('department', sa.String(length=200), nullable=True, comment='Подразделение (геодезия)'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание работ'),
+    sa.Column('coordinates', sa.Text(), nullable=True, comment='Координаты/отметки'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу'),
+    sa.Column('drawing_path', sa.String(length=1000), nullable=True, comment='Путь к чертежу'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['surveyor_personnel_id'], ['personnel.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_executive_surveys_id'), 'executive_surveys', ['id'], unique=False)
+    create_index(op.f('ix_executive_surveys_project_id'), 'executive_surveys', ['project_id'], unique=False)
+
+    create_table('gpr',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование графика'),
+    sa.Column('version', sa.String(length=50), nullable=True, comment='Версия графика'),
+    sa.Column('start_date', sa.Date(), nullable=False, comment='Дата начала'),
+    sa.Column('end_date', sa.Date(), nullable=False, comment='Дата окончания'),
+    sa.Column('created_by', sa.String(length=200), nullable=True, comment='Создал'),
+    sa.Column('created_by_personnel_id', sa.Integer(), nullable=True, comment='Сотрудник-создатель'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (draft, approved, active)'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_personnel_id'], ['personnel.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_gpr_id'), 'gpr', ['id'], unique=False)
+    create_index(op.f('ix_gpr_project_id'), 'gpr', ['project_id'], unique=False)
+
+    create_table('material_specifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_documentation_id', sa.Integer(), nullable=False),
+    sa.Column('construct_id', sa.Integer(), nullable=True, comment='Конструктив'),
+    sa.Column('material_code', sa.String(length=100), nullable=True, comment='Код материала'),
+    sa.Column('material_name', sa.String(length=500), nullable=False, comment='Наименование материала'),
+    sa.Column('specification', sa.Text(), nullable=True, comment='Характеристики/спецификация (детальное описание)'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=True, comment='Количество по проекту'),
+    sa.Column('unit_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Цена за единицу'),
+    sa.Column('total_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Общая стоимость'),
+    sa.Column('brand', sa.String(length=200), nullable=True, comment='Марка/производитель'),
+    sa.Column('standard', sa.String(length=200), nullable=True, comment='ГОСТ/СП/СНиП'),
+    sa.Column('manufacturer', sa.String(length=500), nullable=True, comment='Производитель'),
+    sa.Column('supplier', sa.String(length=500), nullable=True, comment='Поставщик'),
+    sa.Column('delivery_date', sa.Date(), nullable=True, comment='Срок поставки'),
+    sa.Column('quality_certificate', sa.String(length=500), nullable=True, comment='Сертификат качества'),
+    sa.Column('storage_conditions', sa.Text(), nullable=True, comment='Условия хранения'),
+    sa.Column('installation_requirements', sa.Text(), nullable=True, comment='Требования к монтажу'),
+    sa.Column('compatibility', sa.Text(), nullable=True, comment='Совместимость с другими материалами'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['construct_id'], ['object_constructs.id'], ),
+    sa.ForeignKeyConstraint(['project_documentation_id'], ['project_documentation.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_material_specifications_id'), 'material_specifications', ['id'], unique=False)
+    create_index(op.f('ix_material_specifications_project_documentation_id'), 'material_specifications', ['project_documentation_id'], unique=False)
+
+    create_table('personnel_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('personnel_id', sa.Integer(), nullable=False),
+    sa.Column('document_type', sa.Enum('RESUME', 'AUTOBIOGRAPHY', 'DIPLOMA', 'CERTIFICATE', 'CONTRACT', 'OTHER', name='personneldocumenttype', native_enum=False), nullable=False, comment='Тип документа'),
+    sa.Column('file_name', sa.String(length=255), nullable=False, comment='Оригинальное имя файла'),
+    sa.Column('file_path', sa.String(length=500), nullable=False, comment='Путь к файлу на сервере'),
+    sa.Column('file_size', sa.Integer(), nullable=True, comment='Размер в байтах'),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['personnel_id'], ['personnel.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_personnel_documents_id'), 'personnel_documents', ['id'], unique=False)
+    create_index(op.f('ix_personnel_documents_personnel_id'), 'personnel_documents', ['personnel_id'], unique=False)
+
+    create_table('personnel_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('personnel_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.Enum('CREATED', 'UPDATED', name='personnelhistoryaction', native_enum=False), nullable=False, comment='Создание/обновление'),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('field_name', sa.String(length=100), nullable=True, comment='Изменённое поле (при обновлении)'),
+    sa.Column('old_value', sa.Text(), nullable=True, comment='Старое значение'),
+    sa.Column('new_value', sa.Text(), nullable=True, comment='Новое значение'),
+    sa.Column('description', sa.String(length=500), nullable=True, comment='Описание изменения'),
+    sa.ForeignKeyConstraint(['personnel_id'], ['personnel.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_personnel_history_id'), 'personnel_history', ['id'], unique=False)
+    create_index(op.f('ix_personnel_history_personnel_id'), 'personnel_history', ['personnel_id'], unique=False)
+
+    create_table('ppr_sections',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ppr_id', sa.Integer(), nullable=False),
+    sa.Column('section_type', sa.String(length=100), nullable=False, comment='Тип раздела'),
+    sa.Column('title', sa.String(length=500), nullable=False, comment='Заголовок раздела'),
+    sa.Column('content', sa.Text(), nullable=True, comment='Содержание раздела'),
+    sa.Column('order_number', sa.Integer(), nullable=True, comment='Порядковый номер'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу раздела'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['ppr_id'], ['ppr.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_ppr_sections_id'), 'ppr_sections', ['id'], unique=False)
+    create_index(op.f('ix_ppr_sections_ppr_id'), 'ppr_sections', ['ppr_id'], unique=False)
+
+    create_table('project_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('change_type', sa.String(length=50), nullable=False, comment='Тип изменения'),
+    sa.Column('change_number', sa.String(length=100), nullable=False, comment='Номер изменения'),
+    sa.Column('title', sa.String(length=500), nullable=False, comment='Наименование изменения'),
+    sa.Column('description', sa.Text(), nullable=False, comment='Описание изменения'),
+    sa.Column('justification', sa.Text(), nullable=True, comment='Обоснование'),
+    sa.Column('impact_volume', sa.Numeric(precision=15, scale=3), nullable=True, comment='Влияние на объем'),
+    sa.Column('impact_cost', sa.Numeric(precision=15, scale=2), nullable=True, comment='Влияние на стоимость'),
+    sa.Column('impact_schedule', sa.Integer(), nullable=True, comment='Влияние на сроки (дней)'),
+    sa.Column('related_document_id', sa.Integer(), nullable=True, comment='Связанный документ'),
+    sa.Column('related_construct_id', sa.Integer(), nullable=True, comment='Связанный конструктив'),
+    sa.Column('initiator', sa.String(length=200), nullable=False, comment='Инициатор'),
+    sa.Column('initiator_date', sa.Date(), nullable=False, comment='Дата инициации'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус'),
+    sa.Column('approved_date', sa.Date(), nullable=True, comment='Дата утверждения'),
+    sa.Column('implemented_date', sa.Date(), nullable=True, comment='Дата реализации'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлам (эскизы, расчеты)'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['related_construct_id'], ['object_constructs.id'], ),
+    sa.ForeignKeyConstraint(['related_document_id'], ['project_documentation.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_project_changes_change_number'), 'project_changes', ['change_number'], unique=True)
+    create_index(op.f('ix_project_changes_id'), 'project_changes', ['id'], unique=False)
+    create_index(op.f('ix_project_changes_project_id'), 'project_changes', ['project_id'], unique=False)
+
+    create_table('project_constructs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='Проект (объект)'),
+    sa.Column('stage_id', sa.Integer(), nullable=True, comment='Этап проекта (опционально, для иерархии)'),
+    sa.Column('construct_id', sa.Integer(), nullable=False, comment='Конструктив'),
+    sa.Column('planned_volume', sa.String(length=500), nullable=True, comment='Планируемый объем'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['construct_id'], ['object_constructs.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['stage_id'], ['project_stages.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_project_constructs_construct_id'), 'project_constructs', ['construct_id'], unique=False)
+    create_index(op.f('ix_project_constructs_id'), 'project_constructs', ['id'], unique=False)
+    create_index(op.f('ix_project_constructs_project_id'), 'project_constructs', ['project_id'], unique=False)
+
+    create_table('project_personnel',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('personnel_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.Enum('MANAGER', 'FOREMAN', 'ENGINEER', 'GEODESIST', 'MASTER', 'OTHER', name='projectpersonnelrole', native_enum=False), nullable=True, comment='Роль на проекте'),
+    sa.Column('date_from', sa.Date(), nullable=False, comment='Дата назначения'),
+    sa.Column('date_to', sa.Date(), nullable=True, comment='Дата снятия с проекта'),
+    sa.Column('is_main', sa.Boolean(), nullable=True, comment='Основной ответственный'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['personnel_id'], ['personnel.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_project_personnel_id'), 'project_personnel', ['id'], unique=False)
+    create_index(op.f('ix_project_personnel_personnel_id'), 'project_personnel', ['personnel_id'], unique=False)
+    create_index(op.f('ix_project_personnel_project_id'), 'project_personnel', ['project_id'], unique=False)
+
+    create_table('work_volumes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='Проект (объект)'),
+    sa.Column('stage_id', sa.Integer(), nullable=True, comment='Этап проекта (опционально, для иерархии)'),
+    sa.Column('construct_id', sa.Integer(), nullable=True, comment='Конструктив'),
+    sa.Column('work_code', sa.String(length=100), nullable=True, comment='Код работы'),
+    sa.Column('work_name', sa.String(length=1000), nullable=False, comment='Наименование работы'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('planned_volume', sa.Numeric(precision=15, scale=3), nullable=False, comment='Плановый объем'),
+    sa.Column('actual_volume', sa.Numeric(precision=15, scale=3), nullable=True, comment='Фактический объем'),
+    sa.Column('completed_percentage', sa.Numeric(precision=5, scale=2), nullable=True, comment='Процент выполнения'),
+    sa.Column('estimated_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Расценка за единицу'),
+    sa.Column('planned_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Плановая сумма'),
+    sa.Column('actual_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Фактическая сумма'),
+    sa.Column('contractor_id', sa.Integer(), nullable=True, comment='Подрядчик'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (planned, in_progress, completed, suspended)'),
+    sa.Column('start_date', sa.Date(), nullable=True, comment='Дата начала'),
+    sa.Column('end_date', sa.Date(), nullable=True, comment='Дата окончания'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['construct_id'], ['object_constructs.id'], ),
+    sa.ForeignKeyConstraint(['contractor_id'], ['contractors.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['stage_id'], ['project_stages.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_work_volumes_id'), 'work_volumes', ['id'], unique=False)
+    create_index(op.f('ix_work_volumes_project_id'), 'work_volumes', ['project_id'], unique=False)
+
+    create_table('application_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Номер строки'),
+    sa.Column('material_name', sa.String(length=500), nullable=False, comment='Наименование материала/услуги'),
+    sa.Column('specification', sa.String(length=1000), nullable=True, comment='Характеристики/спецификация'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=False, comment='Количество'),
+    sa.Column('price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Цена за единицу'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма'),
+    sa.Column('delivery_date', sa.Date(), nullable=True, comment='Требуемая дата поставки'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('payment_type_id', sa.Integer(), nullable=True, comment='Вид оплаты'),
+    sa.Column('counterparty_id', sa.Integer(), nullable=True, comment='Контрагент'),
+    sa.Column('contractor_id', sa.Integer(), nullable=True, comment='Подрядчик'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ),
+    sa.ForeignKeyConstraint(['contractor_id'], ['counterparties.id'], ),
+    sa.ForeignKeyConstraint(['counterparty_id'], ['counterparties.id'], ),
+    sa.ForeignKeyConstraint(['payment_type_id'], ['payment_types.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_application_items_application_id'), 'application_items', ['application_id'], unique=False)
+    create_index(op.f('ix_application_items_id'), 'application_items', ['id'], unique=False)
+
+    create_table('application_workflows',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('order_number', sa.Integer(), nullable=False, comment='Порядковый номер этапа'),
+    sa.Column('approver_role', sa.String(length=100), nullable=False, comment='Роль согласующего'),
+    sa.Column('approver_name', sa.String(length=200), nullable=True, comment='Имя согласующего'),
+    sa.Column('approver_department', sa.String(length=200), nullable=True, comment='Подразделение согласующего'),
+    sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', 'CANCELLED', name='approvalstatus'), nullable=True, comment='Статус согласования'),
+    sa.Column('comment', sa.Text(), nullable=True, comment='Комментарий'),
+    sa.Column('approved_date', sa.DateTime(timezone=True), nullable=True, comment='Дата согласования'),
+    sa.Column('is_parallel', sa.Boolean(), nullable=True, comment='Параллельное согласование'),
+    sa.Column('is_required', sa.Boolean(), nullable=True, comment='Обязательное согласование'),
+    sa.Column('notification_sent', sa.Boolean(), nullable=True, comment='Уведомление отправлено'),
+    sa.Column('notification_date', sa.DateTime(timezone=True), nullable=True, comment='Дата отправки уведомления'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_application_workflows_application_id'), 'application_workflows', ['application_id'], unique=False)
+    create_index(op.f('ix_application_workflows_id'), 'application_workflows', ['id'], unique=False)
+
+    create_table('change_approvals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_change_id', sa.Integer(), nullable=False),
+    sa.Column('order_number', sa.Integer(), nullable=False, comment='Порядковый номер в маршруте'),
+    sa.Column('approver_role', sa.String(length=100), nullable=False, comment='Роль согласующего'),
+    sa.Column('approver_name', sa.String(length=200), nullable=True, comment='Имя согласующего'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус согласования'),
+    sa.Column('comment', sa.Text(), nullable=True, comment='Комментарий'),
+    sa.Column('approved_date', sa.DateTime(timezone=True), nullable=True, comment='Дата согласования'),
+    sa.Column('is_parallel', sa.Boolean(), nullable=True, comment='Параллельное согласование'),
+    sa.Column('is_required', sa.Boolean(), nullable=True, comment='Обязательное согласование'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_change_id'], ['project_changes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_change_approvals_id'), 'change_approvals', ['id'], unique=False)
+    create_index(op.f('ix_change_approvals_project_change_id'), 'change_approvals', ['project_change_id'], unique=False)
+
+    create_table('commercial_proposal_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('commercial_proposal_id', sa.Integer(), nullable=False),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Номер строки'),
+    sa.Column('work_name', sa.String(length=1000), nullable=False, comment='Наименование работ/материалов'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=True, comment='Количество'),
+    sa.Column('price', sa.Numeric(precision=15, scale=2), nullable=False, comment='Цена'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['commercial_proposal_id'], ['commercial_proposals.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_commercial_proposal_items_commercial_proposal_id'), 'commercial_proposal_items', ['commercial_proposal_id'], unique=False)
+    create_index(op.f('ix_commercial_proposal_items_id'), 'commercial_proposal_items', ['id'], unique=False)
+
+    create_table('cost_controls',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estimate_id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=True, comment='Связанный договор'),
+    sa.Column('control_date', sa.Date(), nullable=False, comment='Дата контроля'),
+    sa.Column('planned_amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Плановая сумма'),
+    sa.Column('actual_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Фактическая сумма'),
+    sa.Column('deviation_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Отклонение'),
+    sa.Column('deviation_percentage', sa.Numeric(precision=5, scale=2), nullable=True, comment='Процент отклонения'),
+    sa.Column('materials_planned', sa.Numeric(precision=15, scale=2), nullable=True, comment='План: материалы'),
+    sa.Column('materials_actual', sa.Numeric(precision=15, scale=2), nullable=True, comment='Факт: материалы'),
+    sa.Column('labor_planned', sa.Numeric(precision=15, scale=2), nullable=True, comment='План: работы'),
+    sa.Column('labor_actual', sa.Numeric(precision=15, scale=2), nullable=True, comment='Факт: работы'),
+    sa.Column('equipment_planned', sa.Numeric(precision=15, scale=2), nullable=True, comment='План: механизмы'),
+    sa.Column('equipment_actual', sa.Numeric(precision=15, scale=2), nullable=True, comment='Факт: механизмы'),
+    sa.Column('related_costs_planned', sa.Numeric(precision=15, scale=2), nullable=True, comment='План: сопутствующие'),
+    sa.Column('related_costs_actual', sa.Numeric(precision=15, scale=2), nullable=True, comment='Факт: сопутствующие'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (normal, warning, critical)'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_cost_controls_estimate_id'), 'cost_controls', ['estimate_id'], unique=False)
+    create_index(op.f('ix_cost_controls_id'), 'cost_controls', ['id'], unique=False)
+
+    create_table('defects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('project_change_id', sa.Integer(), nullable=True, comment='Связанное изменение'),
+    sa.Column('defect_number', sa.String(length=100), nullable=True, comment='Номер замечания'),
+    sa.Column('title', sa.String(length=500), nullable=False, comment='Наименование замечания'),
+    sa.Column('description', sa.Text(), nullable=False, comment='Описание проблемы'),
+    sa.Column('severity', sa.String(length=50), nullable=True, comment='Критичность (low, medium, high, critical)'),
+    sa.Column('location', sa.String(length=500), nullable=True, comment='Место обнаружения'),
+    sa.Column('detected_by', sa.String(length=200), nullable=True, comment='Обнаружил'),
+    sa.Column('detected_date', sa.Date(), nullable=False, comment='Дата обнаружения'),
+    sa.Column('responsible', sa.String(length=200), nullable=True, comment='Ответственный за устранение'),
+    sa.Column('due_date', sa.Date(), nullable=True, comment='Срок устранения'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (open, in_progress, fixed, verified, closed)'),
+    sa.Column('fixed_date', sa.Date(), nullable=True, comment='Дата устранения'),
+    sa.Column('fixed_by', sa.String(length=200), nullable=True, comment='Устранил'),
+    sa.Column('verified_date', sa.Date(), nullable=True, comment='Дата проверки'),
+    sa.Column('verified_by', sa.String(length=200), nullable=True, comment='Проверил'),
+    sa.Column('photos', sa.Text(), nullable=True, comment='Пути к фотографиям (JSON массив)'),
+    sa.Column('fix_confirmation', sa.Text(), nullable=True, comment='Подтверждение устранения'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_change_id'], ['project_changes.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_defects_id'), 'defects', ['id'], unique=False)
+    create_index(op.f('ix_defects_project_id'), 'defects', ['project_id'], unique=False)
+
+    create_table('estimate_contract_links',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estimate_id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('is_primary', sa.Boolean(), nullable=True, comment='Основная смета для договора'),
+    sa.Column('usage_type', sa.String(length=50), nullable=True, comment='Тип использования (basis, control, comparison)'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_estimate_contract_links_contract_id'), 'estimate_contract_links', ['contract_id'], unique=False)
+    create_index(op.f('ix_estimate_contract_links_estimate_id'), 'estimate_contract_links', ['estimate_id'], unique=False)
+    create_index(op.f('ix_estimate_contract_links_id'), 'estimate_contract_links', ['id'], unique=False)
+
+    create_table('estimate_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estimate_id', sa.Integer(), nullable=False),
+    sa.Column('item_type', sa.Enum('MATERIALS', 'LABOR', 'EQUIPMENT', 'OVERHEAD', 'OTHER', name='estimateitemtype'), nullable=False, comment='Тип позиции'),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Номер строки'),
+    sa.Column('code', sa.String(length=100), nullable=True, comment='Код расценки'),
+    sa.Column('work_name', sa.String(length=1000), nullable=False, comment='Наименование работ/материалов'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=False, comment='Количество'),
+    sa.Column('unit_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Расценка за единицу'),
+    sa.Column('total_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Всего по расценке'),
+    sa.Column('materials_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Материалы'),
+    sa.Column('labor_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Заработная плата'),
+    sa.Column('equipment_price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Механизмы'),
+    sa.Column('standard_rate_id', sa.Integer(), nullable=True, comment='Нормативная расценка'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.ForeignKeyConstraint(['standard_rate_id'], ['standard_rates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_estimate_items_estimate_id'), 'estimate_items', ['estimate_id'], unique=False)
+    create_index(op.f('ix_estimate_items_id'), 'estimate_items', ['id'], unique=False)
+
+    create_table('estimate_validations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estimate_id', sa.Integer(), nullable=False),
+    sa.Column('validation_type', sa.String(length=100), nullable=False, comment='Тип проверки'),
+    sa.Column('rule', sa.Enum('VOLUME_MATCH', 'SPECIFICATION_MATCH', 'COST_RANGE', 'CONSTRUCT_COMPLETE', 'DOCUMENTATION_COMPLETE', name='validationrule'), nullable=False, comment='Правило проверки'),
+    sa.Column('status', sa.Enum('PENDING', 'IN_PROGRESS', 'PASSED', 'FAILED', 'NEEDS_REVIEW', name='validationstatus'), nullable=True, comment='Статус'),
+    sa.Column('checked_by', sa.String(length=200), nullable=True, comment='Проверил'),
+    sa.Column('checked_date', sa.DateTime(timezone=True), nullable=True, comment='Дата проверки'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание проверки'),
+    sa.Column('expected_value', sa.String(length=500), nullable=True, comment='Ожидаемое значение'),
+    sa.Column('actual_value', sa.String(length=500), nullable=True, comment='Фактическое значение'),
+    sa.Column('deviation_percentage', sa.Numeric(precision=5, scale=2), nullable=True, comment='Процент отклонения'),
+    sa.Column('is_critical', sa.Boolean(), nullable=True, comment='Критичное отклонение'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_estimate_validations_estimate_id'), 'estimate_validations', ['estimate_id'], unique=False)
+    create_index(op.f('ix_estimate_validations_id'), 'estimate_validations', ['id'], unique=False)
+
+    create_table('gpr_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('gpr_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование работы'),
+    sa.Column('work_type', sa.String(length=200), nullable=True, comment='Вид работ'),
+    sa.Column('responsible', sa.String(length=200), nullable=True, comment='Ответственный'),
+    sa.Column('responsible_personnel_id', sa.Integer(), nullable=True, comment='Ответственный сотрудник'),
+    sa.Column('start_date', sa.Date(), nullable=False, comment='Дата начала'),
+    sa.Column('end_date', sa.Date(), nullable=False, comment='Дата окончания'),
+    sa.Column('planned_duration', sa.Integer(), nullable=True, comment='Планируемая длительность (дни)'),
+    sa.Column('actual_start_date', sa.Date(), nullable=True, comment='Фактическая дата начала'),
+    sa.Column('actual_end_date', sa.Date(), nullable=True, comment='Фактическая дата окончания'),
+    sa.Column('progress', sa.Integer(), nullable=True, comment='Процент выполнения (0-100)'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (planned, in_progress, completed, delayed)'),
+    sa.Column('dependencies', sa.String(length=500), nullable=True, comment='Зависимости (ID задач через запятую)'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['gpr_id'], ['gpr.id'], ),
+    sa.ForeignKeyConstraint(['responsible_personnel_id'], ['personnel.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_gpr_tasks_gpr_id'), 'gpr_tasks', ['gpr_id'], unique=False)
+    create_index(op.f('ix_gpr_tasks_id'), 'gpr_tasks', ['id'], unique=False)
+
+    create_table('ks2',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=True, comment='Связанный договор'),
+    sa.Column('number', sa.String(length=100), nullable=False, comment='Номер акта'),
+    sa.Column('date', sa.Date(), nullable=False, comment='Дата акта'),
+    sa.Column('period_from', sa.Date(), nullable=True, comment='Период с'),
+    sa.Column('period_to', sa.Date(), nullable=True, comment='Период по'),
+    sa.Column('customer', sa.String(length=500), nullable=True, comment='Заказчик'),
+    sa.Column('contractor', sa.String(length=500), nullable=True, comment='Подрядчик'),
+    sa.Column('object_name', sa.String(length=1000), nullable=True, comment='Наименование объекта'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Общая сумма'),
+    sa.Column('contractor_signature', sa.String(length=200), nullable=True, comment='Подпись подрядчика'),
+    sa.Column('customer_signature', sa.String(length=200), nullable=True, comment='Подпись заказчика'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (draft, in_review, signed, approved, rejected)'),
+    sa.Column('verified_by', sa.String(length=200), nullable=True, comment='Проверил (ПТО)'),
+    sa.Column('verification_date', sa.Date(), nullable=True, comment='Дата проверки'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_ks2_id'), 'ks2', ['id'], unique=False)
+    create_index(op.f('ix_ks2_project_id'), 'ks2', ['project_id'], unique=False)
+
+    create_table('material_movements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('movement_type', sa.Enum('RECEIPT', 'TRANSFER', 'WRITE_OFF', 'RETURN', 'ADJUSTMENT', name='movementtype'), nullable=False, comment='Тип движения'),
+    sa.Column('movement_number', sa.String(length=100), nullable=False, comment='Номер документа движения'),
+    sa.Column('movement_date', sa.Date(), nullable=False, comment='Дата движения'),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=False, comment='Количество'),
+    sa.Column('price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Цена за единицу'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма'),
+    sa.Column('from_warehouse_id', sa.Integer(), nullable=True, comment='Склад-отправитель'),
+    sa.Column('to_warehouse_id', sa.Integer(), nullable=True, comment='Склад-получатель'),
+    sa.Column('project_id', sa.Integer(), nullable=False, comment='Проект (объект) - обязательная привязка'),
+    sa.Column('application_id', sa.Integer(), nullable=True, comment='Связанная заявка'),
+    sa.Column('supplier', sa.String(length=500), nullable=True, comment='Поставщик'),
+    sa.Column('batch_number', sa.String(length=100), nullable=True, comment='Номер партии'),
+    sa.Column('receipt_date', sa.Date(), nullable=True, comment='Дата поступления'),
+    sa.Column('responsible', sa.String(length=200), nullable=True, comment='Ответственный'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ),
+    sa.ForeignKeyConstraint(['from_warehouse_id'], ['warehouses.id'], ),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['to_warehouse_id'], ['warehouses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index('ix_material_movements_from_warehouse_date', 'material_movements', ['from_warehouse_id', 'movement_date'], unique=False)
+    create_index(op.f('ix_material_movements_id'), 'material_movements', ['id'], unique=False)
+    create_index(op.f('ix_material_movements_material_id'), 'material_movements', ['material_id'], unique=False)
+    create_index(op.f('ix_material_movements_movement_number'), 'material_movements', ['movement_number'], unique=False)
+    create_index(op.f('ix_material_movements_project_id'), 'material_movements', ['project_id'], unique=False)
+    create_index('ix_material_movements_to_warehouse_date', 'material_movements', ['to_warehouse_id', 'movement_date'], unique=False)
+
+    create_table('material_write_offs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('write_off_number', sa.String(length=100), nullable=False, comment='Номер акта списания'),
+    sa.Column('write_off_date', sa.Date(), nullable=False, comment='Дата списания'),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('work_volume_id', sa.Integer(), nullable=True, comment='Связанная работа'),
+    sa.Column('warehouse_id', sa.Integer(), nullable=True, comment='Склад'),
+    sa.Column('reason', sa.Enum('PRODUCTION', 'DEFECT', 'LOSS', 'TESTING', 'DAMAGE', 'OTHER', name='writeoffreason'), nullable=False, comment='Причина списания'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('responsible', sa.String(length=200), nullable=False, comment='Ответственный за списание'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('approved_date', sa.Date(), nullable=True, comment='Дата утверждения'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (draft, approved, executed)'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Общая сумма списания'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ),
+    sa.ForeignKeyConstraint(['work_volume_id'], ['work_volumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_material_write_offs_id'), 'material_write_offs', ['id'], unique=False)
+    create_index(op.f('ix_material_write_offs_project_id'), 'material_write_offs', ['project_id'], unique=False)
+    create_index(op.f('ix_material_write_offs_write_off_number'), 'material_write_offs', ['write_off_number'], unique=True)
+
+    create_table('related_costs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estimate_id', sa.Integer(), nullable=False),
+    sa.Column('cost_type', sa.String(length=100), nullable=False, comment='Тип затрат'),
+    sa.Column('description', sa.String(length=500), nullable=True, comment='Описание'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Сумма'),
+    sa.Column('percentage', sa.Numeric(precision=5, scale=2), nullable=True, comment='Процент от стоимости'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_related_costs_estimate_id'), 'related_costs', ['estimate_id'], unique=False)
+    create_index(op.f('ix_related_costs_id'), 'related_costs', ['id'], unique=False)
+
+    create_table('sales_proposals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('estimate_id', sa.Integer(), nullable=True, comment='Связанная смета'),
+    sa.Column('proposal_number', sa.String(length=100), nullable=False, comment='Номер КП'),
+    sa.Column('proposal_date', sa.Date(), nullable=False, comment='Дата КП'),
+    sa.Column('customer_name', sa.String(length=500), nullable=False, comment='Клиент'),
+    sa.Column('customer_contact', sa.String(length=200), nullable=True, comment='Контактное лицо'),
+    sa.Column('customer_phone', sa.String(length=50), nullable=True, comment='Телефон'),
+    sa.Column('customer_email', sa.String(length=200), nullable=True, comment='Email'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Общая сумма'),
+    sa.Column('discount_percentage', sa.Numeric(precision=5, scale=2), nullable=True, comment='Скидка (%)'),
+    sa.Column('discount_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма скидки'),
+    sa.Column('final_amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Итоговая сумма'),
+    sa.Column('validity_period', sa.Date(), nullable=True, comment='Срок действия КП'),
+    sa.Column('payment_terms', sa.Text(), nullable=True, comment='Условия оплаты'),
+    sa.Column('delivery_terms', sa.Text(), nullable=True, comment='Условия поставки'),
+    sa.Column('status', sa.Enum('DRAFT', 'SENT', 'UNDER_REVIEW', 'APPROVED', 'REJECTED', 'EXPIRED', name='salesproposalstatus'), nullable=True, comment='Статус'),
+    sa.Column('prepared_by', sa.String(length=200), nullable=False, comment='Подготовил (менеджер по продажам)'),
+    sa.Column('sent_date', sa.Date(), nullable=True, comment='Дата отправки'),
+    sa.Column('response_date', sa.Date(), nullable=True, comment='Дата ответа клиента'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу КП'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_sales_proposals_id'), 'sales_proposals', ['id'], unique=False)
+    create_index(op.f('ix_sales_proposals_project_id'), 'sales_proposals', ['project_id'], unique=False)
+    create_index(op.f('ix_sales_proposals_proposal_number'), 'sales_proposals', ['proposal_number'], unique=True)
+
+    create_table('tender_participants',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tender_id', sa.Integer(), nullable=False),
+    sa.Column('contractor_id', sa.Integer(), nullable=False),
+    sa.Column('commercial_proposal_id', sa.Integer(), nullable=True, comment='Коммерческое предложение'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус участия'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['commercial_proposal_id'], ['commercial_proposals.id'], ),
+    sa.ForeignKeyConstraint(['contractor_id'], ['contractors.id'], ),
+    sa.ForeignKeyConstraint(['tender_id'], ['tenders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_tender_participants_contractor_id'), 'tender_participants', ['contractor_id'], unique=False)
+    create_index(op.f('ix_tender_participants_id'), 'tender_participants', ['id'], unique=False)
+    create_index(op.f('ix_tender_participants_tender_id'), 'tender_participants', ['tender_id'], unique=False)
+
+    create_table('volume_project_matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('construct_id', sa.Integer(), nullable=True, comment='Конструктив'),
+    sa.Column('work_volume_id', sa.Integer(), nullable=True, comment='Объем работ'),
+    sa.Column('estimate_id', sa.Integer(), nullable=True, comment='Смета'),
+    sa.Column('project_documentation_id', sa.Integer(), nullable=True, comment='Проектная документация'),
+    sa.Column('work_code', sa.String(length=100), nullable=True, comment='Код работы'),
+    sa.Column('work_name', sa.String(length=1000), nullable=True, comment='Наименование работы'),
+    sa.Column('project_volume', sa.Numeric(precision=15, scale=3), nullable=True, comment='Объем по проекту'),
+    sa.Column('estimated_volume', sa.Numeric(precision=15, scale=3), nullable=True, comment='Объем по смете'),
+    sa.Column('actual_volume', sa.Numeric(precision=15, scale=3), nullable=True, comment='Фактический объем'),
+    sa.Column('deviation_estimate', sa.Numeric(precision=15, scale=3), nullable=True, comment='Отклонение сметы от проекта'),
+    sa.Column('deviation_actual', sa.Numeric(precision=15, scale=3), nullable=True, comment='Отклонение факта от проекта'),
+    sa.Column('deviation_percentage', sa.Numeric(precision=5, scale=2), nullable=True, comment='Процент отклонения'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус проверки'),
+    sa.Column('checked_by', sa.String(length=200), nullable=True, comment='Проверил'),
+    sa.Column('checked_date', sa.DateTime(timezone=True), nullable=True, comment='Дата проверки'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['construct_id'], ['object_constructs.id'], ),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.ForeignKeyConstraint(['project_documentation_id'], ['project_documentation.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['work_volume_id'], ['work_volumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_volume_project_matches_id'), 'volume_project_matches', ['id'], unique=False)
+    create_index(op.f('ix_volume_project_matches_project_id'), 'volume_project_matches', ['project_id'], unique=False)
+
+    create_table('work_volume_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('work_volume_id', sa.Integer(), nullable=False),
+    sa.Column('entry_date', sa.Date(), nullable=False, comment='Дата ввода'),
+    sa.Column('actual_volume', sa.Numeric(precision=15, scale=3), nullable=False, comment='Фактический объем'),
+    sa.Column('location', sa.String(length=500), nullable=True, comment='Локация/участок'),
+    sa.Column('entered_by', sa.String(length=200), nullable=True, comment='Ввел'),
+    sa.Column('contractor_id', sa.Integer(), nullable=True, comment='Подрядчик (если применимо)'),
+    sa.Column('photos', sa.Text(), nullable=True, comment='Пути к фотографиям (JSON массив)'),
+    sa.Column('survey_id', sa.Integer(), nullable=True, comment='Исполнительная съемка'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['contractor_id'], ['contractors.id'], ),
+    sa.ForeignKeyConstraint(['survey_id'], ['executive_surveys.id'], ),
+    sa.ForeignKeyConstraint(['work_volume_id'], ['work_volumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_work_volume_entries_id'), 'work_volume_entries', ['id'], unique=False)
+    create_index(op.f('ix_work_volume_entries_work_volume_id'), 'work_volume_entries', ['work_volume_id'], unique=False)
+
+    create_table('customer_agreements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('proposal_id', sa.Integer(), nullable=True, comment='Связанное КП'),
+    sa.Column('estimate_id', sa.Integer(), nullable=True, comment='Связанная смета'),
+    sa.Column('agreement_date', sa.Date(), nullable=False, comment='Дата согласования'),
+    sa.Column('customer_name', sa.String(length=500), nullable=False, comment='Клиент'),
+    sa.Column('agreed_amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Согласованная сумма'),
+    sa.Column('changes_requested', sa.Text(), nullable=True, comment='Запрошенные изменения'),
+    sa.Column('agreement_status', sa.String(length=50), nullable=True, comment='Статус (pending, approved, rejected, modified)'),
+    sa.Column('agreed_by', sa.String(length=200), nullable=True, comment='Согласовал (от клиента)'),
+    sa.Column('sales_manager', sa.String(length=200), nullable=False, comment='Менеджер по продажам'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['proposal_id'], ['sales_proposals.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_customer_agreements_id'), 'customer_agreements', ['id'], unique=False)
+    create_index(op.f('ix_customer_agreements_project_id'), 'customer_agreements', ['project_id'], unique=False)
+
+    create_table('executive_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('doc_type', sa.String(length=50), nullable=False, comment='Тип документа'),
+    sa.Column('name', sa.String(length=500), nullable=False, comment='Наименование документа'),
+    sa.Column('number', sa.String(length=100), nullable=True, comment='Номер документа'),
+    sa.Column('date', sa.Date(), nullable=True, comment='Дата документа'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Описание'),
+    sa.Column('file_path', sa.String(length=1000), nullable=True, comment='Путь к файлу'),
+    sa.Column('created_by', sa.String(length=200), nullable=True, comment='Создал'),
+    sa.Column('created_by_personnel_id', sa.Integer(), nullable=True, comment='Сотрудник-создатель'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (draft, in_work, in_review, approved, signed, rejected)'),
+    sa.Column('department', sa.String(length=200), nullable=True, comment='Подразделение (геодезия)'),
+    sa.Column('ks2_id', sa.Integer(), nullable=True, comment='Связанный КС-2'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_personnel_id'], ['personnel.id'], ),
+    sa.ForeignKeyConstraint(['ks2_id'], ['ks2.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_executive_documents_id'), 'executive_documents', ['id'], unique=False)
+    create_index(op.f('ix_executive_documents_project_id'), 'executive_documents', ['project_id'], unique=False)
+
+    create_table('ks2_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ks2_id', sa.Integer(), nullable=False),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Номер строки'),
+    sa.Column('work_name', sa.String(length=1000), nullable=False, comment='Наименование работ'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('volume_estimated', sa.Numeric(precision=15, scale=3), nullable=True, comment='Объем по проекту'),
+    sa.Column('volume_completed', sa.Numeric(precision=15, scale=3), nullable=False, comment='Объем выполненных работ'),
+    sa.Column('volume_total', sa.Numeric(precision=15, scale=3), nullable=True, comment='Объем всего'),
+    sa.Column('price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Цена за единицу'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['ks2_id'], ['ks2.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_ks2_items_id'), 'ks2_items', ['id'], unique=False)
+    create_index(op.f('ix_ks2_items_ks2_id'), 'ks2_items', ['ks2_id'], unique=False)
+
+    create_table('ks3',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('ks2_id', sa.Integer(), nullable=True, comment='Связанный акт КС-2'),
+    sa.Column('number', sa.String(length=100), nullable=False, comment='Номер справки'),
+    sa.Column('date', sa.Date(), nullable=False, comment='Дата справки'),
+    sa.Column('period_from', sa.Date(), nullable=True, comment='Период с'),
+    sa.Column('period_to', sa.Date(), nullable=True, comment='Период по'),
+    sa.Column('customer', sa.String(length=500), nullable=True, comment='Заказчик'),
+    sa.Column('contractor', sa.String(length=500), nullable=True, comment='Подрядчик'),
+    sa.Column('object_name', sa.String(length=1000), nullable=True, comment='Наименование объекта'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Общая сумма'),
+    sa.Column('total_vat', sa.Numeric(precision=15, scale=2), nullable=True, comment='НДС'),
+    sa.Column('total_with_vat', sa.Numeric(precision=15, scale=2), nullable=True, comment='Всего с НДС'),
+    sa.Column('contractor_signature', sa.String(length=200), nullable=True, comment='Подпись подрядчика'),
+    sa.Column('customer_signature', sa.String(length=200), nullable=True, comment='Подпись заказчика'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (draft, submitted, verified, signed, approved, rejected)'),
+    sa.Column('estimate_id', sa.Integer(), nullable=True, comment='Связанная смета'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['estimate_id'], ['estimates.id'], ),
+    sa.ForeignKeyConstraint(['ks2_id'], ['ks2.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_ks3_id'), 'ks3', ['id'], unique=False)
+    create_index(op.f('ix_ks3_project_id'), 'ks3', ['project_id'], unique=False)
+
+    create_table('material_write_off_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('write_off_id', sa.Integer(), nullable=False),
+    sa.Column('material_id', sa.Integer(), nullable=False),
+    sa.Column('movement_id', sa.Integer(), nullable=True, comment='Ссылка на поступление (FIFO)'),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Номер строки'),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=False, comment='Количество'),
+    sa.Column('price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Цена'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма'),
+    sa.Column('batch_number', sa.String(length=100), nullable=True, comment='Номер партии'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ),
+    sa.ForeignKeyConstraint(['movement_id'], ['material_movements.id'], ),
+    sa.ForeignKeyConstraint(['write_off_id'], ['material_write_offs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_material_write_off_items_id'), 'material_write_off_items', ['id'], unique=False)
+    create_index(op.f('ix_material_write_off_items_material_id'), 'material_write_off_items', ['material_id'], unique=False)
+    create_index(op.f('ix_material_write_off_items_write_off_id'), 'material_write_off_items', ['write_off_id'], unique=False)
+
+    create_table('sales_proposal_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('proposal_id', sa.Integer(), nullable=False),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Номер строки'),
+    sa.Column('work_name', sa.String(length=1000), nullable=False, comment='Наименование работ/услуг'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('quantity', sa.Numeric(precision=15, scale=3), nullable=True, comment='Количество'),
+    sa.Column('unit_price', sa.Numeric(precision=15, scale=2), nullable=False, comment='Цена за единицу'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['proposal_id'], ['sales_proposals.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_sales_proposal_items_id'), 'sales_proposal_items', ['id'], unique=False)
+    create_index(op.f('ix_sales_proposal_items_proposal_id'), 'sales_proposal_items', ['proposal_id'], unique=False)
+
+    create_table('invoices',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('ks3_id', sa.Integer(), nullable=True, comment='Связанная форма КС-3'),
+    sa.Column('invoice_number', sa.String(length=100), nullable=False, comment='Номер счета'),
+    sa.Column('invoice_date', sa.Date(), nullable=False, comment='Дата счета'),
+    sa.Column('contractor', sa.String(length=500), nullable=True, comment='Подрядчик'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Сумма счета'),
+    sa.Column('vat_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='НДС'),
+    sa.Column('total_with_vat', sa.Numeric(precision=15, scale=2), nullable=True, comment='Всего с НДС'),
+    sa.Column('payment_terms', sa.Text(), nullable=True, comment='Условия оплаты'),
+    sa.Column('due_date', sa.Date(), nullable=True, comment='Срок оплаты'),
+    sa.Column('status', sa.Enum('DRAFT', 'SUBMITTED', 'VERIFIED', 'APPROVED', 'PAID', 'CANCELLED', name='invoicestatus'), nullable=True, comment='Статус'),
+    sa.Column('verified_by', sa.String(length=200), nullable=True, comment='Проверил'),
+    sa.Column('verified_date', sa.Date(), nullable=True, comment='Дата проверки'),
+    sa.Column('approved_by', sa.String(length=200), nullable=True, comment='Утвердил'),
+    sa.Column('approved_date', sa.Date(), nullable=True, comment='Дата утверждения'),
+    sa.Column('paid_date', sa.Date(), nullable=True, comment='Дата оплаты'),
+    sa.Column('payment_number', sa.String(length=100), nullable=True, comment='Номер платежного поручения'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['ks3_id'], ['ks3.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_invoices_id'), 'invoices', ['id'], unique=False)
+    create_index(op.f('ix_invoices_invoice_number'), 'invoices', ['invoice_number'], unique=True)
+    create_index(op.f('ix_invoices_payment_number'), 'invoices', ['payment_number'], unique=False)
+    create_index(op.f('ix_invoices_project_id'), 'invoices', ['project_id'], unique=False)
+
+    create_table('ks3_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ks3_id', sa.Integer(), nullable=False),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Номер строки'),
+    sa.Column('work_name', sa.String(length=1000), nullable=False, comment='Наименование работ'),
+    sa.Column('unit', sa.String(length=50), nullable=True, comment='Единица измерения'),
+    sa.Column('volume', sa.Numeric(precision=15, scale=3), nullable=False, comment='Объем'),
+    sa.Column('price', sa.Numeric(precision=15, scale=2), nullable=True, comment='Цена за единицу'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма'),
+    sa.Column('vat_rate', sa.Numeric(precision=5, scale=2), nullable=True, comment='Ставка НДС (%)'),
+    sa.Column('vat_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма НДС'),
+    sa.Column('amount_with_vat', sa.Numeric(precision=15, scale=2), nullable=True, comment='Сумма с НДС'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['ks3_id'], ['ks3.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_ks3_items_id'), 'ks3_items', ['id'], unique=False)
+    create_index(op.f('ix_ks3_items_ks3_id'), 'ks3_items', ['ks3_id'], unique=False)
+
+    create_table('receivables',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('invoice_id', sa.Integer(), nullable=True, comment='Связанный счет'),
+    sa.Column('customer_name', sa.String(length=500), nullable=False, comment='Дебитор (заказчик)'),
+    sa.Column('invoice_number', sa.String(length=100), nullable=True, comment='Номер счета'),
+    sa.Column('invoice_date', sa.Date(), nullable=False, comment='Дата счета'),
+    sa.Column('due_date', sa.Date(), nullable=False, comment='Срок оплаты'),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Сумма задолженности'),
+    sa.Column('paid_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Оплачено'),
+    sa.Column('remaining_amount', sa.Numeric(precision=15, scale=2), nullable=True, comment='Остаток задолженности'),
+    sa.Column('days_overdue', sa.Integer(), nullable=True, comment='Дней просрочки'),
+    sa.Column('status', sa.Enum('PENDING', 'PARTIALLY_PAID', 'PAID', 'OVERDUE', 'IN_COLLECTION', 'WRITTEN_OFF', name='receivablestatus'), nullable=True, comment='Статус'),
+    sa.Column('last_payment_date', sa.Date(), nullable=True, comment='Дата последнего платежа'),
+    sa.Column('responsible', sa.String(length=200), nullable=True, comment='Ответственный за взыскание'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_receivables_id'), 'receivables', ['id'], unique=False)
+    create_index(op.f('ix_receivables_project_id'), 'receivables', ['project_id'], unique=False)
+    create_index('ix_receivables_status_due_date', 'receivables', ['status', 'due_date'], unique=False)
+
+    create_table('collection_actions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('receivable_id', sa.Integer(), nullable=False),
+    sa.Column('action_date', sa.Date(), nullable=False, comment='Дата меры'),
+    sa.Column('action_type', sa.String(length=100), nullable=False, comment='Тип меры (letter, call, legal_action, etc.)'),
+    sa.Column('description', sa.Text(), nullable=False, comment='Описание меры'),
+    sa.Column('responsible', sa.String(length=200), nullable=False, comment='Ответственный'),
+    sa.Column('result', sa.String(length=500), nullable=True, comment='Результат'),
+    sa.Column('next_action_date', sa.Date(), nullable=True, comment='Дата следующей меры'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (planned, in_progress, completed)'),
+    sa.Column('documents', sa.Text(), nullable=True, comment='Пути к документам (JSON массив)'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['receivable_id'], ['receivables.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_collection_actions_id'), 'collection_actions', ['id'], unique=False)
+    create_index(op.f('ix_collection_actions_receivable_id'), 'collection_actions', ['receivable_id'], unique=False)
+
+    create_table('receivable_notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('receivable_id', sa.Integer(), nullable=False),
+    sa.Column('notification_type', sa.Enum('PAYMENT_REMINDER', 'OVERDUE_NOTIFICATION', 'PAYMENT_RECEIVED', 'COLLECTION_ACTION', name='notificationtype'), nullable=False, comment='Тип уведомления'),
+    sa.Column('notification_date', sa.DateTime(timezone=True), nullable=False, comment='Дата уведомления'),
+    sa.Column('sent_to', sa.String(length=500), nullable=True, comment='Отправлено кому'),
+    sa.Column('sent_by', sa.String(length=200), nullable=True, comment='Отправил'),
+    sa.Column('subject', sa.String(length=500), nullable=True, comment='Тема'),
+    sa.Column('message', sa.Text(), nullable=True, comment='Сообщение'),
+    sa.Column('is_sent', sa.Boolean(), nullable=True, comment='Отправлено'),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True, comment='Дата отправки'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['receivable_id'], ['receivables.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_receivable_notifications_id'), 'receivable_notifications', ['id'], unique=False)
+    create_index(op.f('ix_receivable_notifications_receivable_id'), 'receivable_notifications', ['receivable_id'], unique=False)
+
+    create_table('receivable_payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('receivable_id', sa.Integer(), nullable=False),
+    sa.Column('payment_date', sa.Date(), nullable=False, comment='Дата платежа'),
+    sa.Column('payment_number', sa.String(length=100), nullable=True, comment='Номер платежного поручения'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Сумма платежа'),
+    sa.Column('payment_method', sa.String(length=100), nullable=True, comment='Способ оплаты'),
+    sa.Column('bank_account', sa.String(length=200), nullable=True, comment='Банковский счет'),
+    sa.Column('received_by', sa.String(length=200), nullable=True, comment='Получено кем'),
+    sa.Column('notes', sa.Text(), nullable=True, comment='Примечания'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['receivable_id'], ['receivables.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_receivable_payments_id'), 'receivable_payments', ['id'], unique=False)
+    create_index(op.f('ix_receivable_payments_payment_number'), 'receivable_payments', ['payment_number'], unique=False)
+    create_index(op.f('ix_receivable_payments_receivable_id'), 'receivable_payments', ['receivable_id'], unique=False)
+
+    create_table('bank_statement_lines',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('statement_file', sa.String(length=500), nullable=True, comment='Имя файла выписки'),
+    sa.Column('line_number', sa.Integer(), nullable=True, comment='Порядковый номер документа в выписке'),
+    sa.Column('document_number', sa.String(length=100), nullable=True, comment='Номер платежного поручения'),
+    sa.Column('document_date', sa.Date(), nullable=False, comment='Дата платежа'),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False, comment='Сумма платежа'),
+    sa.Column('payer_name', sa.String(length=500), nullable=True, comment='Плательщик'),
+    sa.Column('payer_inn', sa.String(length=20), nullable=True, comment='ИНН плательщика'),
+    sa.Column('payer_account', sa.String(length=50), nullable=True, comment='Счет плательщика'),
+    sa.Column('purpose', sa.Text(), nullable=True, comment='Назначение платежа'),
+    sa.Column('status', sa.String(length=50), nullable=True, comment='Статус (pending, matched, dismissed)'),
+    sa.Column('receivable_id', sa.Integer(), nullable=True, comment='Сопоставленная задолженность'),
+    sa.Column('invoice_id', sa.Integer(), nullable=True, comment='Оплаченный счет без записи о задолженности'),
+    sa.Column('payment_id', sa.Integer(), nullable=True, comment='Созданный платеж'),
+    sa.Column('resolved_by', sa.String(length=200), nullable=True, comment='Разобрал'),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True, comment='Дата разбора'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ),
+    sa.ForeignKeyConstraint(['payment_id'], ['receivable_payments.id'], ),
+    sa.ForeignKeyConstraint(['receivable_id'], ['receivables.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index(op.f('ix_bank_statement_lines_document_date'), 'bank_statement_lines', ['document_date'], unique=False)
+    create_index(op.f('ix_bank_statement_lines_document_number'), 'bank_statement_lines', ['document_number'], unique=False)
+    create_index(op.f('ix_bank_statement_lines_id'), 'bank_statement_lines', ['id'], unique=False)
+    create_index(op.f('ix_bank_statement_lines_status'), 'bank_statement_lines', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_table('bank_statement_lines')
+    op.drop_table('receivable_payments')
+    op.drop_table('receivable_notifications')
+    op.drop_table('collection_actions')
+    op.drop_table('receivables')
+    op.drop_table('ks3_items')
+    op.drop_table('invoices')
+    op.drop_table('sales_proposal_items')
+    op.drop_table('material_write_off_items')
+    op.drop_table('ks3')
+    op.drop_table('ks2_items')
+    op.drop_table('executive_documents')
+    op.drop_table('customer_agreements')
+    op.drop_table('work_volume_entries')
+    op.drop_table('volume_project_matches')
+    op.drop_table('tender_participants')
+    op.drop_table('sales_proposals')
+    op.drop_table('related_costs')
+    op.drop_table('material_write_offs')
+    op.drop_table('material_movements')
+    op.drop_table('ks2')
+    op.drop_table('gpr_tasks')
+    op.drop_table('estimate_validations')
+    op.drop_table('estimate_items')
+    op.drop_table('estimate_contract_links')
+    op.drop_table('defects')
+    op.drop_table('cost_controls')
+    op.drop_table('commercial_proposal_items')
+    op.drop_table('change_approvals')
+    op.drop_table('application_workflows')
+    op.drop_table('application_items')
+    op.drop_table('work_volumes')
+    op.drop_table('project_personnel')
+    op.drop_table('project_constructs')
+    op.drop_table('project_changes')
+    op.drop_table('ppr_sections')
+    op.drop_table('personnel_history')
+    op.drop_table('personnel_documents')
+    op.drop_table('material_specifications')
+    op.drop_table('gpr')
+    op.drop_table('executive_surveys')
+    op.drop_table('estimates')
+    op.drop_table('document_notifications')
+    op.drop_table('document_files')
+    op.drop_table('contracts')
+    op.drop_table('commercial_proposals')
+    op.drop_table('applications')
+    op.drop_table('user_permissions')
+    op.drop_table('tenders')
+    op.drop_table('receivable_aging')
+    op.drop_table('project_stages')
+    op.drop_table('project_documentation')
+    op.drop_table('project_calendar_exceptions')
+    op.drop_table('ppr')
+    op.drop_table('personnel')
+    op.drop_table('lab_tests')
+    op.drop_table('document_section_statuses')
+    op.drop_table('warehouse_stocks')
+    op.drop_table('warehouse_stock_snapshots')
+    op.drop_table('users')
+    op.drop_table('role_permissions')
+    op.drop_table('projects')
+    op.drop_table('document_npa_sections')
+    op.drop_table('warehouses')
+    op.drop_table('standard_rates')
+    op.drop_table('roles')
+    op.drop_table('permissions')
+    op.drop_table('payment_types')
+    op.drop_table('organizations')
+    op.drop_table('object_constructs')
+    op.drop_table('materials')
+    op.drop_table('material_type_refs')
+    op.drop_table('material_kinds')
+    op.drop_table('laboratories')
+    op.drop_table('lab_test_types')
+    op.drop_table('document_versions')
+    op.drop_table('document_roadmap_sections')
+    op.drop_table('document_npa')
+    op.drop_table('departments')
+    op.drop_table('counterparties')
+    op.drop_table('contractors')
+    op.drop_table('change_log')
+    op.drop_table('calendar_holidays')
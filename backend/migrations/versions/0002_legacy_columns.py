@@ -0,0 +1,167 @@
+"""Колонки и индексы, которые раньше добавлялись скриптами fix_*_table.py и при импорте роутеров.
+
+- departments.parent_id (раньше — при импорте app.api.v1.departments);
+- новые поля заявок, справочников лабораторий, executive_documents.department;
+- версия сборника standard_rates.catalog_version, уникальность (code, catalog_version)
+  вместо уникального кода;
+- уникальность остатка warehouse_stocks по (склад, материал) со сверткой накопленных
+  дублей, стоимость остатков и снимков. После миграции старой БД запустите
+  `python stock_snapshots.py revalue`, чтобы оценить накопленные остатки;
+- недостающие индексы моделей на таблицах, созданных до их появления
+  (в т.ч. индексы дебиторской задолженности и номеров платежных поручений).
+
+Проверки идут через инспектор SQLAlchemy, поэтому миграция повторяема и не зависит от СУБД.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.database import Base
+import app.models  # noqa: F401
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _fk(table: str, name: str, target: str) -> sa.Column:
+    # batch-режим требует имя ограничения
+    return sa.Column(name, sa.Integer, sa.ForeignKey(target, name=f"fk_{table}_{name}"))
+
+
+LEGACY_COLUMNS = {
+    "departments": [_fk("departments", "parent_id", "departments.id")],
+    "executive_documents": [sa.Column("department", sa.String(200))],
+    "applications": [
+        _fk("applications", "department_id", "departments.id"),
+        _fk("applications", "organization_id", "organizations.id"),
+        sa.Column("basis", sa.Text),
+        sa.Column("old_number", sa.String(120)),
+        _fk("applications", "material_kind_id", "material_kinds.id"),
+        _fk("applications", "warehouse_id", "warehouses.id"),
+        _fk("applications", "payment_type_id", "payment_types.id"),
+        _fk("applications", "counterparty_id", "counterparties.id"),
+        _fk("applications", "initiator_counterparty_id", "counterparties.id"),
+        _fk("applications", "author_user_id", "users.id"),
+        _fk("applications", "responsible_personnel_id", "personnel.id"),
+        sa.Column("comment", sa.Text),
+        sa.Column("is_posted", sa.Boolean, server_default=sa.false()),
+    ],
+    "application_items": [
+        _fk("application_items", "payment_type_id", "payment_types.id"),
+        _fk("application_items", "counterparty_id", "counterparties.id"),
+        _fk("application_items", "contractor_id", "counterparties.id"),
+    ],
+    "lab_test_types": [
+        sa.Column("code", sa.String(80)),
+        sa.Column("description", sa.Text),
+    ],
+    "laboratories": [
+        sa.Column("code", sa.String(80)),
+        sa.Column("address", sa.String(500)),
+        sa.Column("phone", sa.String(80)),
+        sa.Column("email", sa.String(200)),
+        sa.Column("contact_person", sa.String(200)),
+        sa.Column("notes", sa.Text),
+    ],
+    "standard_rates": [
+        sa.Column("catalog_version", sa.String(50), nullable=False, server_default=""),
+    ],
+    "warehouse_stocks": [
+        sa.Column("amount", sa.Numeric(15, 2), server_default="0"),
+        sa.Column("average_price", sa.Numeric(15, 4), server_default="0"),
+    ],
+    "warehouse_stock_snapshots": [
+        sa.Column("amount", sa.Numeric(15, 2), nullable=False, server_default="0"),
+    ],
+}
+
+
+def _add_missing_columns(inspector):
+    for table, columns in LEGACY_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        missing = [c for c in columns if c.name not in existing]
+        if not missing:
+            continue
+        with op.batch_alter_table(table) as batch:
+            for column in missing:
+                batch.add_column(column)
+                print(f"  + {table}.{column.name}")
+
+
+def _index_names(inspector, table: str) -> dict:
+    return {ix["name"]: ix for ix in inspector.get_indexes(table)}
+
+
+def _collapse_stock_duplicates(bind, inspector):
+    """Свернуть дубли остатков (склад, материал) перед созданием уникального индекса."""
+    if not inspector.has_table("warehouse_stocks"):
+        return
+    name = "uq_warehouse_stocks_warehouse_material"
+    if name in _index_names(inspector, "warehouse_stocks") or any(
+        uc["name"] == name for uc in inspector.get_unique_constraints("warehouse_stocks")
+    ):
+        return
+    duplicates = bind.execute(sa.text(
+        "SELECT warehouse_id, material_id, MIN(id), SUM(quantity), SUM(reserved_quantity), "
+        "MAX(last_movement_date) FROM warehouse_stocks "
+        "GROUP BY warehouse_id, material_id HAVING COUNT(*) > 1"
+    )).fetchall()
+    for warehouse_id, material_id, keep_id, quantity, reserved, last_date in duplicates:
+        bind.execute(
+            sa.text("UPDATE warehouse_stocks SET quantity = :q, reserved_quantity = :r, "
+                    "last_movement_date = :d WHERE id = :id"),
+            {"q": quantity, "r": reserved or 0, "d": last_date, "id": keep_id},
+        )
+        bind.execute(
+            sa.text("DELETE FROM warehouse_stocks WHERE warehouse_id = :w AND material_id = :m AND id != :id"),
+            {"w": warehouse_id, "m": material_id, "id": keep_id},
+        )
+    if duplicates:
+        print(f"  ~ свёрнуто дублей остатков: {len(duplicates)}")
+    op.create_index(name, "warehouse_stocks", ["warehouse_id", "material_id"], unique=True)
+    print(f"  + {name}")
+
+
+def _drop_unique_rate_code(inspector):
+    """Раньше код расценки был уникален сам по себе; теперь — в паре с версией сборника."""
+    if not inspector.has_table("standard_rates"):
+        return
+    index = _index_names(inspector, "standard_rates").get("ix_standard_rates_code")
+    if index is not None and index["unique"]:
+        op.drop_index("ix_standard_rates_code", table_name="standard_rates")
+        print("  ~ ix_standard_rates_code: снята уникальность")
+
+
+def _create_missing_indexes(bind):
+    inspector = sa.inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = set(_index_names(inspector, table.name))
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if index.name in existing or not {c.name for c in index.columns} <= columns:
+                continue
+            index.create(bind)
+            print(f"  + {index.name}")
+
+
+def upgrade():
+    bind = op.get_bind()
+    _add_missing_columns(sa.inspect(bind))
+    inspector = sa.inspect(bind)
+    _collapse_stock_duplicates(bind, inspector)
+    _drop_unique_rate_code(inspector)
+    _create_missing_indexes(bind)
+
+
+def downgrade():
+    # Колонки и индексы входят в текущие модели; откат к схеме до миграций не поддерживается
+    pass
@@ -0,0 +1,89 @@
+"""Версии справочников для общего кэша, начальные типы материалов и роли.
+
+- таблица reference_versions (app.services.reference_cache, REFERENCE_CACHE_BACKEND=db)
+  со строкой для каждого справочника;
+- типы материалов по умолчанию (коды совпадают с MaterialType), если справочник пуст —
+  раньше их добавлял GET /materials/material-types/ при первом запросе;
+- роли по умолчанию (коды совпадают с UserRole), если справочник пуст — раньше их
+  добавляли GET /roles/ и GET /roles/permissions.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+REFERENCE_NAMES = [
+    "organizations",
+    "counterparties",
+    "payment_types",
+    "material_kinds",
+    "material_types",
+    "lab_test_types",
+    "laboratories",
+    "permissions",
+    "roles",
+    "role_permissions",
+    "roadmap_sections",
+]
+
+DEFAULT_MATERIAL_TYPES = [
+    {"code": "construction", "name": "Строительные материалы"},
+    {"code": "equipment", "name": "Оборудование"},
+    {"code": "tools", "name": "Инструменты"},
+    {"code": "consumables", "name": "Расходные материалы"},
+    {"code": "other", "name": "Прочее"},
+]
+
+DEFAULT_ROLES = [
+    {"code": "admin", "name": "Администратор"},
+    {"code": "pto_head", "name": "Руководитель ПТО"},
+    {"code": "pto_engineer", "name": "Инженер ПТО"},
+    {"code": "site_manager", "name": "Начальник участка"},
+    {"code": "foreman", "name": "Прораб"},
+    {"code": "master", "name": "Мастер"},
+    {"code": "storekeeper", "name": "Заведующий складом"},
+    {"code": "operator", "name": "Оператор СМУ"},
+    {"code": "geodesist", "name": "Геодезист"},
+    {"code": "oge_head", "name": "Руководитель ОГЭ"},
+    {"code": "ogm_head", "name": "Руководитель ОГМ"},
+    {"code": "architect", "name": "Архитектор"},
+    {"code": "sales_manager", "name": "Менеджер по продажам"},
+    {"code": "accountant", "name": "Бухгалтер"},
+    {"code": "debt_collector", "name": "Отдел дебиторки"},
+]
+
+
+def _seed_if_empty(bind, name: str, rows):
+    table = sa.table(
+        name,
+        sa.column("code", sa.String),
+        sa.column("name", sa.String),
+        sa.column("is_active", sa.Boolean),
+    )
+    if bind.execute(sa.select(sa.func.count()).select_from(table)).scalar() == 0:
+        bind.execute(sa.insert(table), [dict(row, is_active=True) for row in rows])
+
+
+def upgrade():
+    versions = op.create_table(
+        "reference_versions",
+        sa.Column("name", sa.String(length=50), nullable=False, comment="Справочник (organizations, roles, ...)"),
+        sa.Column("version", sa.Integer(), nullable=False, comment="Номер версии"),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.bulk_insert(versions, [{"name": name, "version": 0} for name in REFERENCE_NAMES])
+
+    bind = op.get_bind()
+    _seed_if_empty(bind, "material_type_refs", DEFAULT_MATERIAL_TYPES)
+    _seed_if_empty(bind, "roles", DEFAULT_ROLES)
+
+
+def downgrade():
+    op.drop_table("reference_versions")
@@ -0,0 +1,96 @@
+"""Плановая длительность задач ГПР в рабочих днях.
+
+До перехода на производственный календарь gpr_tasks.planned_duration хранил
+календарные дни (так его заполняли и сиды). Теперь длительность — рабочие дни
+по календарю объекта, поэтому она пересчитывается по датам начала и окончания
+задачи: праздники и переносы (calendar_holidays) и исключения объекта
+(project_calendar_exceptions) учитываются так же, как в API.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.work_calendar import WorkCalendar
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+
+gpr = sa.table("gpr", sa.column("id", sa.Integer), sa.column("project_id", sa.Integer))
+gpr_tasks = sa.table(
+    "gpr_tasks",
+    sa.column("id", sa.Integer),
+    sa.column("gpr_id", sa.Integer),
+    sa.column("start_date", sa.Date),
+    sa.column("end_date", sa.Date),
+    sa.column("planned_duration", sa.Integer),
+)
+holidays = sa.table("calendar_holidays", sa.column("date", sa.Date), sa.column("is_working", sa.Boolean))
+exceptions = sa.table(
+    "project_calendar_exceptions",
+    sa.column("project_id", sa.Integer),
+    sa.column("date", sa.Date),
+    sa.column("is_working", sa.Boolean),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    common = dict(bind.execute(sa.select(holidays.c.date, holidays.c.is_working)).all())
+    calendars = {}
+
+    def calendar_for(project_id):
+        if project_id not in calendars:
+            overrides = dict(common)
+            if project_id is not None:
+                overrides.update(bind.execute(
+                    sa.select(exceptions.c.date, exceptions.c.is_working)
+                    .where(exceptions.c.project_id == project_id)
+                ).all())
+            calendars[project_id] = WorkCalendar(overrides)
+        return calendars[project_id]
+
+    rows = bind.execute(
+        sa.select(gpr_tasks.c.id, gpr.c.project_id, gpr_tasks.c.start_date, gpr_tasks.c.end_date,
+                  gpr_tasks.c.planned_duration)
+        .join(gpr, gpr.c.id == gpr_tasks.c.gpr_id)
+        .order_by(gpr_tasks.c.id)
+    ).all()
+    updates = []
+    for task_id, project_id, start, end, stored in rows:
+        if start is None or end is None:
+            continue
+        duration = max(calendar_for(project_id).working_days_between(start, end), 1)
+        if duration != stored:
+            updates.append({"task_id": task_id, "duration": duration})
+
+    stmt = (
+        sa.update(gpr_tasks)
+        .where(gpr_tasks.c.id == sa.bindparam("task_id"))
+        .values(planned_duration=sa.bindparam("duration"))
+    )
+    for i in range(0, len(updates), _BATCH):
+        bind.execute(stmt, updates[i:i + _BATCH])
+
+
+def downgrade():
+    # Календарные дни по датам, как их записывали сиды (окончание = начало + длительность)
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(gpr_tasks.c.id, gpr_tasks.c.start_date, gpr_tasks.c.end_date)).all()
+    stmt = (
+        sa.update(gpr_tasks)
+        .where(gpr_tasks.c.id == sa.bindparam("task_id"))
+        .values(planned_duration=sa.bindparam("duration"))
+    )
+    updates = [
+        {"task_id": task_id, "duration": max((end - start).days, 1)}
+        for task_id, start, end in rows if start is not None and end is not None
+    ]
+    for i in range(0, len(updates), _BATCH):
+        bind.execute(stmt, updates[i:i + _BATCH])
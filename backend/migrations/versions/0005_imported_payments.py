@@ -0,0 +1,88 @@
+"""Журнал номеров платежей, импортированных из 1С (imported_payments).
+
+Ключ идемпотентности импорта платежей — номер платежного поручения с уникальным
+ограничением. Раньше повтор определялся по номеру в платежах по задолженности
+и в оплаченном счете; номер счета перезаписывается следующим платежом, и повтор
+первого платежа проводился заново. Журнал заполняется уже проведенными номерами:
+платежами по задолженностям и номерами оплаченных счетов.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+
+receivables = sa.table("receivables", sa.column("id", sa.Integer), sa.column("invoice_id", sa.Integer))
+receivable_payments = sa.table(
+    "receivable_payments",
+    sa.column("receivable_id", sa.Integer),
+    sa.column("payment_number", sa.String),
+    sa.column("payment_date", sa.Date),
+    sa.column("amount", sa.Numeric),
+)
+invoices = sa.table(
+    "invoices",
+    sa.column("id", sa.Integer),
+    sa.column("status", sa.String),
+    sa.column("payment_number", sa.String),
+    sa.column("paid_date", sa.Date),
+)
+
+
+def upgrade():
+    ledger = op.create_table(
+        "imported_payments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("payment_number", sa.String(length=100), nullable=False, comment="Номер платежного поручения"),
+        sa.Column("invoice_id", sa.Integer(), nullable=True, comment="Оплаченный счет"),
+        sa.Column("receivable_id", sa.Integer(), nullable=True, comment="Задолженность, по которой проведен платеж"),
+        sa.Column("payment_date", sa.Date(), nullable=True, comment="Дата платежа"),
+        sa.Column("amount", sa.Numeric(precision=15, scale=2), nullable=True, comment="Сумма платежа"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["invoice_id"], ["invoices.id"]),
+        sa.ForeignKeyConstraint(["receivable_id"], ["receivables.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("payment_number"),
+    )
+    op.create_index(op.f("ix_imported_payments_id"), "imported_payments", ["id"], unique=False)
+    op.create_index(op.f("ix_imported_payments_invoice_id"), "imported_payments", ["invoice_id"], unique=False)
+
+    bind = op.get_bind()
+    rows = {}
+    for number, receivable_id, invoice_id, payment_date, amount in bind.execute(
+        sa.select(
+            receivable_payments.c.payment_number, receivable_payments.c.receivable_id,
+            receivables.c.invoice_id, receivable_payments.c.payment_date, receivable_payments.c.amount,
+        )
+        .join(receivables, receivables.c.id == receivable_payments.c.receivable_id)
+        .where(receivable_payments.c.payment_number.is_not(None))
+    ):
+        rows.setdefault(number.strip(), {
+            "invoice_id": invoice_id, "receivable_id": receivable_id,
+            "payment_date": payment_date, "amount": amount,
+        })
+    # Статус счета хранится именем элемента InvoiceStatus
+    for number, invoice_id, paid_date in bind.execute(
+        sa.select(invoices.c.payment_number, invoices.c.id, invoices.c.paid_date)
+        .where(invoices.c.payment_number.is_not(None), invoices.c.status == "PAID")
+    ):
+        rows.setdefault(number.strip(), {
+            "invoice_id": invoice_id, "receivable_id": None, "payment_date": paid_date, "amount": None,
+        })
+    rows = [dict(row, payment_number=number) for number, row in rows.items() if number]
+    for i in range(0, len(rows), _BATCH):
+        op.bulk_insert(ledger, rows[i:i + _BATCH])
+
+
+def downgrade():
+    op.drop_index(op.f("ix_imported_payments_invoice_id"), table_name="imported_payments")
+    op.drop_index(op.f("ix_imported_payments_id"), table_name="imported_payments")
+    op.drop_table("imported_payments")
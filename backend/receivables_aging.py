@@ -0,0 +1,38 @@
+"""Ночной пересчёт дебиторской задолженности: дни просрочки, статусы, возрастная структура.
+
+Запускается планировщиком раз в сутки, например cron:
+    5 0 * * *  cd /opt/pto/backend && python receivables_aging.py
+
+Примеры:
+    python receivables_aging.py                    # пересчитать на сегодня
+    python receivables_aging.py --date 2026-03-31  # пересчитать на дату
+
+Схема БД (таблица возрастной структуры, индексы) создается миграциями: alembic upgrade head.
+"""
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app.models  # noqa: F401  (регистрация всех моделей для ORM-запросов)
+from app.db.database import SessionLocal
+from app.services.receivables_aging import run_aging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пересчёт просрочки дебиторской задолженности")
+    parser.add_argument("--date", type=date.fromisoformat, help="Дата расчета, ГГГГ-ММ-ДД (по умолчанию — сегодня)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = run_aging(db, args.date)
+        print("Пересчёт задолженности завершён: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ from app.db.database import SessionLocal, engine, Base
 from app.models.project import Project
 from app.models.executive_doc import ExecutiveDocument, DocumentType
 from app.models.gpr import GPR, GPRTask
+from app.services.gpr_schedule import working_duration
+from app.services.work_calendar import get_calendar
 from app.models.ppr import PPR, PPRSection
 from app.models.application import Application, ApplicationItem, ApplicationType, ApplicationStatus
 from app.models.tender import Tender, Contractor, TenderParticipant, CommercialProposal, CommercialProposalItem, TenderStatus
@@ -124,13 +126,16 @@ def create_gpr_ppr(db: Session, projects):
                 {"name": "Возведение каркаса", "start": 135, "dur": 120},
             ]
             
+            calendar = get_calendar(db, project.id)
             for i, task in enumerate(tasks):
+                start = gpr.start_date + timedelta(days=task["start"])
+                end = gpr.start_date + timedelta(days=task["start"] + task["dur"])
                 t = GPRTask(
                     gpr_id=gpr.id,
                     name=task["name"],
-                    start_date=gpr.start_date + timedelta(days=task["start"]),
-                    end_date=gpr.start_date + timedelta(days=task["start"] + task["dur"]),
-                    planned_duration=task["dur"],
+                    start_date=start,
+                    end_date=end,
+                    planned_duration=working_duration(calendar, start, end),
                     status="planned"
                 )
                 db.add(t)
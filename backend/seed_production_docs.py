@@ -20,6 +20,8 @@ from app.db.database import SessionLocal, engine
 from app.models.ks2 import KS2, KS2Item
 from app.models.ks3 import KS3, KS3Item
 from app.models.gpr import GPR, GPRTask
+from app.services.gpr_schedule import working_duration
+from app.services.work_calendar import get_calendar
 from app.models.ppr import PPR, PPRSection
 from app.models.project import Project
 from decimal import Decimal
@@ -342,6 +344,7 @@ def create_gprs(db: Session, projects: list):
             
             # Создаем задачи для ГПР
             num_tasks = random.randint(5, 15)
+            calendar = get_calendar(db, project.id)
             task_dates = []
             current_date = start_date
             
@@ -389,7 +392,7 @@ def create_gprs(db: Session, projects: list):
                         "responsible": fake_name(),
                         "start_date": task_start,
                         "end_date": task_end,
-                        "planned_duration": task_duration,
+                        "planned_duration": working_duration(calendar, task_start, task_end),
                         "actual_start_date": actual_start,
                         "actual_end_date": actual_end,
                         "progress": progress,
@@ -0,0 +1,66 @@
+"""Месячные снимки складских остатков (warehouse_stock_snapshots).
+
+Примеры:
+    python stock_snapshots.py rebuild                  # пересоздать все снимки по истории движений
+    python stock_snapshots.py rebuild --warehouse-id 3
+    python stock_snapshots.py close                    # закрыть последний завершившийся месяц
+    python stock_snapshots.py close --period 2026-02   # закрыть февраль 2026
+    python stock_snapshots.py revalue --since 2026-01  # переоценка по скользящей средней с января
+
+Схема БД (таблица снимков, индексы регистра) создается миграциями: alembic upgrade head.
+"""
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app.models  # noqa: F401  (регистрация всех моделей для ORM-запросов)
+from app.db.database import SessionLocal
+from app.services.stock_ledger import close_period, last_closed_month_end, month_end, rebuild_snapshots
+from app.services.change_log import register_change_tracking
+from app.services.stock_valuation import revalue
+
+
+def _parse_month(value: str) -> date:
+    year, month = value.split("-")[:2]
+    return date(int(year), int(month), 1)
+
+
+def _parse_period(value: str) -> date:
+    return month_end(_parse_month(value))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Месячные снимки складских остатков")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rebuild = sub.add_parser("rebuild", help="Пересоздать снимки по всей истории движений")
+    rebuild.add_argument("--warehouse-id", type=int)
+    rebuild.add_argument("--until", type=_parse_period, help="Последний месяц, ГГГГ-ММ")
+    close = sub.add_parser("close", help="Зафиксировать остатки на конец месяца")
+    close.add_argument("--period", type=_parse_period, help="Месяц, ГГГГ-ММ (по умолчанию — прошлый)")
+    revaluation = sub.add_parser("revalue", help="Переоценка по скользящей средней")
+    revaluation.add_argument("--since", type=_parse_month, help="Первый месяц периода, ГГГГ-ММ (по умолчанию — вся история)")
+    args = parser.parse_args()
+
+    # Переоценка меняет суммы актов списания — они попадают в журнал изменений для 1С
+    register_change_tracking(SessionLocal)
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            written = rebuild_snapshots(db, until=args.until, warehouse_id=args.warehouse_id)
+            print(f"Снимки остатков пересозданы: {written} строк.")
+        elif args.command == "revalue":
+            result = revalue(db, args.since)
+            print("Переоценка завершена: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+        else:
+            period_end = args.period or last_closed_month_end()
+            written = close_period(db, period_end)
+            print(f"Остатки на {period_end.isoformat()} зафиксированы: {written} строк.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Общая настройка тестов: приложение работает с отдельной временной БД.
+
+По умолчанию — временный файл SQLite, схема создается при старте приложения
+(AUTO_CREATE_SCHEMA). Если задан TEST_DATABASE_URL (PostgreSQL), тесты идут на нем,
+а схема создается миграциями (alembic upgrade head), как в эксплуатации.
+Переменные окружения задаются до импорта app: настройки и движки создаются при импорте.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+_tmp = tempfile.TemporaryDirectory(prefix="pto-tests-")
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ["AUTO_CREATE_SCHEMA"] = "false"
+else:
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmp.name) / 'test.db'}"
+    os.environ["AUTO_CREATE_SCHEMA"] = "true"
+os.environ.pop("DATABASE_READ_URL", None)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+def run_migrations():
+    """alembic upgrade head на БД из DATABASE_URL (migrations/env.py берет движок приложения)."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(BACKEND / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND / "migrations"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(scope="session")
+def client():
+    if TEST_DATABASE_URL:
+        run_migrations()
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,63 @@
+"""Банковская выписка обрабатывается пачками: сопоставление и отсечение повторов работают между пачками."""
+from decimal import Decimal
+
+import pytest
+
+CSV_HEADER = "Номер;Дата;Сумма;Плательщик;Назначение\n"
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    from app.services import bank_statements
+
+    monkeypatch.setattr(bank_statements, "IMPORT_CHUNK", 2)
+
+
+def _receivable(client, project_id: int, number: str, customer: str, total: str) -> dict:
+    response = client.post("/api/v1/receivables/", json={
+        "project_id": project_id, "customer_name": customer, "invoice_number": number,
+        "invoice_date": "2026-03-01", "due_date": "2099-12-31", "total_amount": total,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _import(client, rows) -> dict:
+    content = (CSV_HEADER + "".join(";".join(row) + "\n" for row in rows)).encode("utf-8")
+    response = client.post(
+        "/api/v1/receivables/bank-statements/import",
+        data={"format": "csv"}, files={"file": ("statement.csv", content, "text/csv")},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _receivable_state(client, receivable_id: int):
+    body = client.get(f"/api/v1/receivables/{receivable_id}/analytics").json()
+    return Decimal(body["paid_amount"]), Decimal(body["remaining_amount"])
+
+
+def test_statement_chunks_share_matching_and_duplicates(client, small_chunks):
+    project_id = client.post("/api/v1/projects/", json={"name": "Выписка пачками", "start_date": "2026-01-01"}).json()["id"]
+    by_number = _receivable(client, project_id, "СЧ-77", "ООО «Ромашка»", "1000")
+    by_amount = _receivable(client, project_id, "СЧ-78", "ООО «Василек»", "250")
+
+    rows = [
+        ("ПП-1", "10.03.2026", "400,00", "ООО Ромашка", "Оплата по счету № сч-77"),
+        ("ПП-2", "11.03.2026", "не число", "ООО Ромашка", ""),
+        # Вторая пачка: остаток задолженности уже уменьшен первой
+        ("ПП-3", "12.03.2026", "600,00", "Ромашка", "Доплата по счету № СЧ-77"),
+        ("ПП-4", "12.03.2026", "250,00", "ВАСИЛЕК ООО", "Оплата за работы"),
+        # Третья пачка: повтор строки из первой и нераспознанное поступление
+        ("ПП-1", "10.03.2026", "400,00", "ООО Ромашка", "Оплата по счету № сч-77"),
+        ("ПП-5", "13.03.2026", "99,00", "ИП Неизвестный", "Аванс"),
+    ]
+    result = _import(client, rows)
+    assert (result["lines"], result["matched"], result["duplicates"], result["unmatched"]) == (6, 3, 1, 1)
+    assert result["errors"][0]["line"] == 2
+    assert _receivable_state(client, by_number["id"]) == (Decimal(1000), Decimal(0))
+    assert _receivable_state(client, by_amount["id"]) == (Decimal(250), Decimal(0))
+
+    # Повторная загрузка той же выписки ничего не проводит
+    again = _import(client, rows)
+    assert (again["matched"], again["duplicates"], again["unmatched"]) == (0, 5, 0)
@@ -0,0 +1,78 @@
+"""Журнал изменений для синхронизации с 1С: токены в порядке фиксации транзакций."""
+from decimal import Decimal
+
+import pytest
+
+from conftest import TEST_DATABASE_URL
+
+
+def _last_token(db) -> int:
+    from app.services.change_log import read_changes
+
+    token = 0
+    while True:
+        page = read_changes(db, token, limit=10000)
+        token = page["next_token"]
+        if not page["has_more"]:
+            return token
+
+
+def _work_volume(db, project_id: int, name: str):
+    from app.models.work_volume import WorkVolume
+
+    volume = WorkVolume(project_id=project_id, work_name=name, planned_volume=Decimal(1))
+    db.add(volume)
+    db.flush()
+    return volume
+
+
+@pytest.fixture
+def project_id(client):
+    response = client.post("/api/v1/projects/", json={"name": "Журнал изменений", "start_date": "2026-01-01"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_changes_are_logged_on_commit_only(client, project_id):
+    from app.db.database import SessionLocal
+    from app.services.change_log import read_changes
+
+    with SessionLocal() as db:
+        since = _last_token(db)
+        _work_volume(db, project_id, "Откатывается")
+        db.rollback()
+        volume = _work_volume(db, project_id, "Фиксируется")
+        volume.work_name = "Фиксируется, изменена"
+        volume_id = volume.id
+        db.commit()
+
+        page = read_changes(db, since, types=["work_volumes"])
+    assert [(c["entity_id"], c["operation"]) for c in page["changes"]] == [(volume_id, "insert")]
+    assert page["next_token"] > since
+
+
+@pytest.mark.skipif(
+    not (TEST_DATABASE_URL or "").startswith("postgresql"),
+    reason="нужен TEST_DATABASE_URL (PostgreSQL): в SQLite пишущие транзакции не пересекаются",
+)
+def test_token_does_not_skip_transaction_committed_later(client, project_id):
+    """Транзакция A начала изменения раньше B, но фиксируется позже: чтение между
+    фиксациями B и A не должно выдать токен, после которого изменение A не видно."""
+    from app.db.database import SessionLocal
+    from app.services.change_log import read_changes
+
+    with SessionLocal() as first, SessionLocal() as second, SessionLocal() as reader:
+        since = _last_token(reader)
+        reader.rollback()
+
+        early = _work_volume(first, project_id, "A: начата раньше, зафиксирована позже").id
+        late = _work_volume(second, project_id, "B: начата позже, зафиксирована раньше").id
+        second.commit()
+
+        page = read_changes(reader, since, types=["work_volumes"])
+        reader.rollback()
+        assert [c["entity_id"] for c in page["changes"]] == [late]
+
+        first.commit()
+        page = read_changes(reader, page["next_token"], types=["work_volumes"])
+        assert [c["entity_id"] for c in page["changes"]] == [early]
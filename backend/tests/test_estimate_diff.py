@@ -0,0 +1,61 @@
+"""Сравнение версий сметы: добавленные, удаленные, измененные позиции и итоги по типам."""
+from decimal import Decimal
+
+
+def _estimate(client, project_id: int, number: str, items) -> int:
+    response = client.post("/api/v1/estimates/", json={
+        "project_id": project_id, "estimate_type": "LOCAL", "number": number,
+        "name": f"Смета {number}", "date": "2026-02-01",
+        "items": [
+            {"item_type": item_type, "line_number": i, "code": code, "work_name": name,
+             "unit": "м3", "quantity": quantity, "unit_price": price,
+             "total_price": str(Decimal(quantity) * Decimal(price))}
+            for i, (item_type, code, name, quantity, price) in enumerate(items, start=1)
+        ],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_estimate_diff(client):
+    project_id = client.post("/api/v1/projects/", json={"name": "Версии сметы", "start_date": "2026-01-01"}).json()["id"]
+    estimate_a = _estimate(client, project_id, "ED-1", [
+        ("LABOR", "01-01-001", "Разработка грунта", "10", "100"),
+        ("LABOR", "06-01-001", "Бетонирование  фундаментов", "5", "200"),
+        ("MATERIALS", "", "Бетон В25", "5", "50"),
+        ("EQUIPMENT", "", "Экскаватор", "2", "300"),
+    ])
+    estimate_b = _estimate(client, project_id, "ED-2", [
+        # Регистр и повторные пробелы в наименовании изменением не считаются
+        ("LABOR", "01-01-001", "РАЗРАБОТКА ГРУНТА", "10", "100"),
+        ("LABOR", "06-01-001", "Бетонирование фундаментов", "6", "200"),
+        ("MATERIALS", "", "Бетон В25", "6", "50"),
+        ("MATERIALS", "", "Арматура А500", "1", "700"),
+    ])
+
+    response = client.get(f"/api/v1/estimates/{estimate_a}/diff/{estimate_b}")
+    assert response.status_code == 200, response.text
+    diff = response.json()
+
+    assert [line["work_name"] for line in diff["added"]] == ["Арматура А500"]
+    assert [line["work_name"] for line in diff["removed"]] == ["Экскаватор"]
+    changed = {line["work_name"]: line for line in diff["changed"]}
+    assert set(changed) == {"Бетонирование фундаментов", "Бетон В25"}
+    assert Decimal(changed["Бетонирование фундаментов"]["quantity_delta"]) == 1
+    assert Decimal(changed["Бетон В25"]["total_price_delta"]) == 50
+    assert diff["unchanged_count"] == 1
+
+    totals = {t["item_type"]: (Decimal(t["total_a"]), Decimal(t["total_b"]), Decimal(t["delta"]))
+              for t in diff["category_totals"]}
+    assert totals == {
+        "equipment": (Decimal(600), Decimal(0), Decimal(-600)),
+        "labor": (Decimal(2000), Decimal(2200), Decimal(200)),
+        "materials": (Decimal(250), Decimal(1000), Decimal(750)),
+    }
+    assert (Decimal(diff["total_a"]), Decimal(diff["total_b"]), Decimal(diff["total_delta"])) == (
+        Decimal(2850), Decimal(3200), Decimal(350),
+    )
+
+
+def test_estimate_diff_unknown_estimate(client):
+    assert client.get("/api/v1/estimates/999999/diff/999998").status_code == 404
@@ -0,0 +1,51 @@
+"""ГПР: сдвиг сроков задачи распространяется по цепочке зависимостей."""
+
+
+def _create_gpr(client) -> dict:
+    project = client.post("/api/v1/projects/", json={"name": "ГПР: цепочка", "start_date": "2026-03-01"}).json()
+    response = client.post("/api/v1/gpr/", json={
+        "project_id": project["id"], "name": "ГПР цепочки", "start_date": "2026-03-02",
+        "tasks": [
+            {"name": "Котлован", "start_date": "2026-03-02", "end_date": "2026-03-06"},
+            {"name": "Фундамент", "start_date": "2026-03-09", "end_date": "2026-03-13"},
+            {"name": "Каркас", "start_date": "2026-03-16", "end_date": "2026-03-20"},
+        ],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_update_gpr_propagates_through_dependency_chain(client):
+    gpr = _create_gpr(client)
+    pit, foundation, frame = (task["id"] for task in gpr["tasks"])
+    url = f"/api/v1/gpr/{gpr['id']}"
+
+    response = client.put(url, json={"tasks": [
+        {"id": foundation, "dependencies": str(pit)},
+        {"id": frame, "dependencies": str(foundation)},
+    ]})
+    assert response.status_code == 200, response.text
+    assert response.json()["affected"] == []
+
+    # Котлован сдвигается на неделю — фундамент и каркас сдвигаются за ним с сохранением длительности
+    response = client.put(url, json={"tasks": [{"id": pit, "start_date": "2026-03-09"}]})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert {task["id"]: (task["start_date"], task["end_date"]) for task in body["tasks"]} == {
+        pit: ("2026-03-09", "2026-03-13"),
+        foundation: ("2026-03-16", "2026-03-20"),
+        frame: ("2026-03-23", "2026-03-27"),
+    }
+    affected = {task["id"]: task for task in body["affected"]}
+    assert set(affected) == {foundation, frame}
+    assert affected[frame]["previous_start_date"] == "2026-03-16"
+    assert affected[frame]["start_date"] == "2026-03-23"
+    assert affected[frame]["shift_days"] == 7
+
+
+def test_update_gpr_without_schedule_changes_has_no_affected(client):
+    gpr = _create_gpr(client)
+    response = client.put(f"/api/v1/gpr/{gpr['id']}", json={"description": "Без изменения сроков"})
+    assert response.status_code == 200, response.text
+    assert response.json()["affected"] == []
+    assert response.json()["description"] == "Без изменения сроков"
@@ -0,0 +1,61 @@
+"""Критический путь ГПР (CPM): резервы, критическая цепочка и циклы зависимостей."""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.gpr_schedule import ScheduleCycleError, compute_schedule
+
+GPR = SimpleNamespace(id=1, start_date=date(2026, 3, 1))
+
+
+def _task(task_id: int, start: str, end: str, dependencies: str = None):
+    return SimpleNamespace(
+        id=task_id, name=f"Задача {task_id}", start_date=date.fromisoformat(start), end_date=date.fromisoformat(end),
+        planned_duration=None, actual_start_date=None, actual_end_date=None, dependencies=dependencies,
+    )
+
+
+def test_float_and_critical_path():
+    # 1 → 2 → 4 — самая длинная цепочка; 3 параллельна 2 и короче на 3 дня
+    rows = [
+        _task(1, "2026-03-01", "2026-03-03"),
+        _task(2, "2026-03-02", "2026-03-06", "1"),
+        _task(3, "2026-03-02", "2026-03-03", "1"),
+        _task(4, "2026-03-10", "2026-03-11", "2, 3; 99"),
+    ]
+    schedule = compute_schedule(GPR, rows)
+    tasks = {task["id"]: task for task in schedule["tasks"]}
+
+    assert schedule["critical_path"] == [1, 2, 4]
+    assert (schedule["project_finish"], schedule["duration_days"]) == (date(2026, 3, 10), 10)
+    assert {t: (task["total_float"], task["free_float"]) for t, task in tasks.items()} == {
+        1: (0, 0), 2: (0, 0), 3: (3, 3), 4: (0, 0),
+    }
+    assert [t for t, task in tasks.items() if task["is_critical"]] == [1, 2, 4]
+    assert (tasks[3]["early_start"], tasks[3]["late_start"]) == (date(2026, 3, 4), date(2026, 3, 7))
+    # Задача с предшественниками начинается на следующий день после них, а не в плановую дату
+    assert tasks[4]["early_start"] == date(2026, 3, 9)
+    assert schedule["missing_dependencies"] == [{"task_id": 4, "dependency_id": 99}]
+
+
+def test_actual_dates_fix_task_and_shift_successors():
+    rows = [
+        _task(1, "2026-03-01", "2026-03-03"),
+        _task(2, "2026-03-04", "2026-03-05", "1"),
+    ]
+    rows[0].actual_end_date = date(2026, 3, 6)
+    tasks = {task["id"]: task for task in compute_schedule(GPR, rows)["tasks"]}
+    assert tasks[1]["early_finish"] == date(2026, 3, 6)
+    assert (tasks[2]["early_start"], tasks[2]["early_finish"]) == (date(2026, 3, 7), date(2026, 3, 8))
+
+
+def test_cycle_is_reported():
+    rows = [
+        _task(1, "2026-03-01", "2026-03-02"),
+        _task(2, "2026-03-03", "2026-03-04", "1, 3"),
+        _task(3, "2026-03-05", "2026-03-06", "2"),
+    ]
+    with pytest.raises(ScheduleCycleError) as error:
+        compute_schedule(GPR, rows)
+    assert error.value.cycle in ([2, 3, 2], [3, 2, 3])
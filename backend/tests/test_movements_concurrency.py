@@ -0,0 +1,78 @@
+"""Параллельные движения материалов не теряют обновления остатков (warehouse_stocks).
+
+Приходы и перемещения по одному материалу идут одновременно из нескольких потоков;
+итоговые количество и стоимость остатков должны совпасть с расчетом точно.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from sqlalchemy import select
+
+RECEIPTS = 200
+TRANSFERS = 100
+THREADS = 16
+
+
+def _create(client, path: str, payload: dict) -> int:
+    response = client.post(f"/api/v1{path}", json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _stock(warehouse_id: int, material_id: int):
+    from app.db.database import engine
+    from app.models.material import WarehouseStock
+
+    with engine.connect() as conn:
+        return conn.execute(
+            select(WarehouseStock.quantity, WarehouseStock.amount).where(
+                WarehouseStock.warehouse_id == warehouse_id,
+                WarehouseStock.material_id == material_id,
+            )
+        ).one()
+
+
+def test_parallel_receipts_and_transfers(client):
+    project_id = _create(client, "/projects/", {"name": "Параллельные движения", "start_date": "2026-01-01"})
+    material_id = _create(client, "/materials/materials/", {
+        "code": "CONC-M1", "name": "Арматура", "material_type": "CONSTRUCTION", "unit": "т",
+    })
+    source = _create(client, "/materials/warehouses/", {"code": "CONC-W1", "name": "Склад 1"})
+    target = _create(client, "/materials/warehouses/", {"code": "CONC-W2", "name": "Склад 2"})
+
+    def movement(number: str, **fields) -> dict:
+        return {
+            "movement_number": number, "movement_date": "2026-02-01",
+            "material_id": material_id, "project_id": project_id, **fields,
+        }
+
+    # Начальный остаток покрывает все перемещения: средняя цена склада всегда 10,
+    # и стоимость перемещения не зависит от порядка выполнения
+    opening = movement("CONC-0", movement_type="receipt", quantity="100", price="10", to_warehouse_id=source)
+    assert client.post("/api/v1/materials/movements/", json=opening).status_code == 200
+
+    payloads = [
+        movement(f"CONC-R{i}", movement_type="receipt", quantity="2", price="10", to_warehouse_id=source)
+        for i in range(RECEIPTS)
+    ] + [
+        movement(f"CONC-T{i}", movement_type="transfer", quantity="1",
+                 from_warehouse_id=source, to_warehouse_id=target)
+        for i in range(TRANSFERS)
+    ]
+    # Приходы и перемещения вперемешку
+    payloads = payloads[::2] + payloads[1::2]
+
+    def post(payload: dict) -> int:
+        return client.post("/api/v1/materials/movements/", json=payload).status_code
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        statuses = list(pool.map(post, payloads))
+    assert statuses == [200] * len(payloads)
+
+    quantity, amount = _stock(source, material_id)
+    assert Decimal(quantity) == Decimal(100 + 2 * RECEIPTS - TRANSFERS)
+    assert Decimal(amount) == Decimal(10 * (100 + 2 * RECEIPTS - TRANSFERS))
+
+    quantity, amount = _stock(target, material_id)
+    assert Decimal(quantity) == Decimal(TRANSFERS)
+    assert Decimal(amount) == Decimal(10 * TRANSFERS)
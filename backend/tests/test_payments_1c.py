@@ -0,0 +1,46 @@
+"""Импорт платежей из 1С: повтор номера поручения не проводится, даже если номер в счете уже перезаписан."""
+
+IMPORT_URL = "/api/v1/integration/1c/import/payments"
+
+
+def _invoice(client, number: str) -> dict:
+    project = client.post("/api/v1/projects/", json={"name": f"Платежи 1С: {number}", "start_date": "2026-01-01"}).json()
+    response = client.post("/api/v1/invoices/", json={
+        "project_id": project["id"], "invoice_number": number, "invoice_date": "2026-02-01",
+        "total_amount": "1000",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _import(client, *payments) -> list:
+    response = client.post(IMPORT_URL, json={"payments": list(payments)})
+    assert response.status_code == 200, response.text
+    return [line["status"] for line in response.json()["lines"]]
+
+
+def test_replayed_payment_is_duplicate_after_number_overwritten(client):
+    invoice = _invoice(client, "1C-PAY-1")
+    first = {"invoice_id": invoice["id"], "payment_date": "2026-02-10", "payment_number": "П-101", "amount": "400"}
+    second = {"invoice_id": invoice["id"], "payment_date": "2026-02-20", "payment_number": "П-102", "amount": "600"}
+
+    assert _import(client, first) == ["imported"]
+    assert _import(client, second) == ["imported"]
+    # В счете уже номер второго поручения; повтор первого определяется по журналу
+    assert _import(client, first, dict(second, payment_number=" П-102 ")) == ["duplicate", "duplicate"]
+
+    paid = client.get(f"/api/v1/invoices/{invoice['id']}").json()
+    assert (paid["payment_number"], paid["paid_date"]) == ("П-102", "2026-02-20")
+
+
+def test_batch_statuses(client):
+    assert _import(
+        client,
+        {"invoice_id": 10 ** 9, "payment_date": "2026-02-10", "payment_number": "П-NF", "amount": "1"},
+        {"invoice_id": 1, "payment_date": "2026-02-10", "payment_number": "", "amount": "1"},
+    ) == ["not_found", "invalid"]
+    # Номер ненайденного счета в журнал не попадает
+    invoice = _invoice(client, "1C-PAY-2")
+    assert _import(
+        client, {"invoice_id": invoice["id"], "payment_date": "2026-02-11", "payment_number": "П-NF", "amount": "1"},
+    ) == ["imported"]
@@ -0,0 +1,54 @@
+"""Пересчет просрочки и возрастной структуры долга: границы корзин и статусы."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+TODAY = date(2030, 6, 30)
+
+
+def _receivable(client, project_id: int, customer: str, overdue_days: int, total: str) -> int:
+    response = client.post("/api/v1/receivables/", json={
+        "project_id": project_id, "customer_name": customer, "invoice_date": "2030-01-01",
+        "due_date": (TODAY - timedelta(days=overdue_days)).isoformat(), "total_amount": total,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_aging_buckets(client):
+    from app.db.database import SessionLocal
+    from app.services.receivables_aging import run_aging
+
+    project_id = client.post("/api/v1/projects/", json={"name": "Возраст долга", "start_date": "2030-01-01"}).json()["id"]
+    # Срок сегодня и ровно 30 дней просрочки — первая корзина; далее границы 31, 60/61 и 91 день
+    for days, total in ((0, "1"), (30, "2"), (31, "10"), (60, "20"), (61, "100"), (91, "1000")):
+        _receivable(client, project_id, "ООО Альфа", days, total)
+    partial = _receivable(client, project_id, "ООО Бета", 45, "500")
+    paid = _receivable(client, project_id, "ООО Бета", 100, "700")
+    for receivable_id, amount in ((partial, "200"), (paid, "700")):
+        response = client.post(f"/api/v1/receivables/{receivable_id}/payment", json={
+            "payment_date": "2030-05-01", "amount": amount,
+        })
+        assert response.status_code == 200, response.text
+
+    with SessionLocal() as db:
+        run_aging(db, TODAY)
+
+    rows = client.get("/api/v1/receivables/analytics/aging", params={"project_id": project_id}).json()
+    buckets = {
+        row["customer_name"]: (
+            row["receivables_count"],
+            *(Decimal(row[name]) for name in ("bucket_0_30", "bucket_31_60", "bucket_61_90", "bucket_90_plus")),
+            Decimal(row["total_remaining"]),
+        )
+        for row in rows
+    }
+    assert buckets == {
+        "ООО Альфа": (6, Decimal(3), Decimal(30), Decimal(100), Decimal(1000), Decimal(1133)),
+        # Погашенная задолженность в структуру долга не входит
+        "ООО Бета": (1, Decimal(0), Decimal(300), Decimal(0), Decimal(0), Decimal(300)),
+    }
+    assert all(row["as_of"] == TODAY.isoformat() for row in rows)
+
+    partial_state = client.get(f"/api/v1/receivables/{partial}/analytics").json()
+    assert (partial_state["days_overdue"], partial_state["status"]) == (45, "overdue")
+    assert client.get(f"/api/v1/receivables/{paid}/analytics").json()["status"] == "paid"
@@ -0,0 +1,43 @@
+"""Кэш справочников: ETag/304 и увеличение версии справочника при фиксации изменений."""
+
+URL = "/api/v1/materials/material-types/"
+
+
+def test_etag_not_modified_until_reference_changes(client):
+    first = client.get(URL)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get(URL, headers={"If-None-Match": etag})
+    assert (cached.status_code, cached.content) == (304, b"")
+    assert cached.headers["ETag"] == etag
+    assert client.get(URL, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+
+    response = client.post(URL, json={"code": "ETAG-TEST", "name": "Тип для проверки ETag"})
+    assert response.status_code == 200, response.text
+
+    changed = client.get(URL, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "ETAG-TEST" in {row["code"] for row in changed.json()}
+
+
+def test_version_bumps_on_commit_only(client):
+    from app.db.database import SessionLocal
+    from app.models.material import MaterialTypeRef
+    from app.services.reference_cache import reference_cache
+
+    versions = reference_cache.versions
+    with SessionLocal() as db:
+        before = versions.get(db, "material_types")
+        roles = versions.get(db, "roles")
+        db.add(MaterialTypeRef(code="ETAG-ROLLBACK", name="Откатывается"))
+        db.flush()
+        db.rollback()
+        assert versions.get(db, "material_types") == before
+
+        db.add(MaterialTypeRef(code="ETAG-COMMIT", name="Фиксируется"))
+        db.commit()
+        assert versions.get(db, "material_types") == before + 1
+        # Другие справочники не затронуты
+        assert versions.get(db, "roles") == roles
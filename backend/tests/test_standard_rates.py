@@ -0,0 +1,40 @@
+"""Загрузка сборника расценок: номера строк файла в ошибках и ограничение списка ошибок."""
+from app.services.standard_rates import MAX_IMPORT_ERRORS
+
+
+def _import(client, version: str, text: str) -> dict:
+    response = client.post(
+        "/api/v1/standard-rates/import",
+        data={"catalog_version": version},
+        files={"file": ("rates.csv", text.encode("utf-8"), "text/csv")},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_import_errors_report_file_lines(client):
+    text = (
+        "code;name;unit;labor_cost\n"
+        "01-01-001-01;Разработка грунта;1000 м3;100\n"
+        "\n"
+        '01-01-002-01;"Засыпка траншей\nс уплотнением";1000 м3;50\n'
+        ";Без кода;м3;1\n"
+        "01-01-003-01;Планировка;1000 м2;не число\n"
+    )
+    result = _import(client, "LINES-TEST", text)
+    assert result["processed"] == 2
+    assert result["errors"] == [
+        {"line": 6, "error": "не указан код расценки"},
+        {"line": 7, "error": "некорректное число: нечисло"},
+    ]
+    assert result["truncated"] == 0
+
+
+def test_import_errors_are_capped(client):
+    extra = 25
+    text = "code;name\n" + ";Без кода\n" * (MAX_IMPORT_ERRORS + extra) + "02-01-001-01;Сваи\n"
+    result = _import(client, "CAP-TEST", text)
+    assert result["processed"] == 1
+    assert len(result["errors"]) == MAX_IMPORT_ERRORS
+    assert result["errors"][-1]["line"] == MAX_IMPORT_ERRORS + 1
+    assert result["truncated"] == extra
@@ -0,0 +1,78 @@
+"""Атомарные изменения остатков: INSERT ... ON CONFLICT DO UPDATE и UPDATE ... RETURNING."""
+from datetime import datetime
+from decimal import Decimal
+from itertools import count
+
+import pytest
+from sqlalchemy import func, select
+
+_codes = count(1)
+MOVED_AT = datetime(2026, 2, 1, 12, 0)
+
+
+def _create(client, path: str, payload: dict) -> int:
+    response = client.post(f"/api/v1/materials{path}", json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+@pytest.fixture
+def stock_key(client):
+    n = next(_codes)
+    warehouse_id = _create(client, "/warehouses/", {"code": f"ST-W{n}", "name": f"Склад {n}"})
+    material_id = _create(client, "/materials/", {
+        "code": f"ST-M{n}", "name": "Щебень", "material_type": "CONSTRUCTION", "unit": "м3",
+    })
+    return warehouse_id, material_id
+
+
+def _stock(db, warehouse_id: int, material_id: int):
+    from app.models.material import WarehouseStock
+
+    return db.execute(
+        select(WarehouseStock.quantity, WarehouseStock.amount, WarehouseStock.average_price, func.count().over())
+        .where(WarehouseStock.warehouse_id == warehouse_id, WarehouseStock.material_id == material_id)
+    ).one_or_none()
+
+
+def test_receive_inserts_then_updates_moving_average(client, stock_key):
+    from app.db.database import SessionLocal
+    from app.services.stock import receive_stock
+
+    with SessionLocal() as db:
+        assert receive_stock(db, *stock_key, Decimal(10), Decimal(100), MOVED_AT) == Decimal(10)
+        assert receive_stock(db, *stock_key, Decimal(10), Decimal(300), MOVED_AT) == Decimal(20)
+        # Приход без стоимости оценивается по текущей средней цене и ее не меняет
+        assert receive_stock(db, *stock_key, Decimal(5), None, MOVED_AT) == Decimal(20)
+        db.commit()
+        assert _stock(db, *stock_key) == (Decimal(25), Decimal(500), Decimal(20), 1)
+
+
+def test_issue_returns_cost_price_and_skips_missing_row(client, stock_key):
+    from app.db.database import SessionLocal
+    from app.services.stock import issue_stock, receive_stock
+
+    with SessionLocal() as db:
+        assert issue_stock(db, *stock_key, Decimal(1), MOVED_AT) is None
+        assert _stock(db, *stock_key) is None
+
+        receive_stock(db, *stock_key, Decimal(8), Decimal(400), MOVED_AT)
+        assert issue_stock(db, *stock_key, Decimal(3), MOVED_AT) == Decimal(50)
+        db.commit()
+        assert _stock(db, *stock_key) == (Decimal(5), Decimal(250), Decimal(50), 1)
+
+
+def test_apply_deltas_receives_before_issuing(client, stock_key):
+    from app.db.database import SessionLocal
+    from app.services.stock import StockDelta, apply_stock_deltas, receive_stock
+
+    with SessionLocal() as db:
+        receive_stock(db, *stock_key, Decimal(10), Decimal(100), MOVED_AT)
+        delta = StockDelta()
+        delta.issue(Decimal(12))
+        delta.receive(Decimal(10), Decimal(300))
+        delta.receive(Decimal(5), None)
+        apply_stock_deltas(db, {stock_key: delta}, MOVED_AT)
+        db.commit()
+        # Расход 12 оценен по средней 20 после приходов: 500 - 240
+        assert _stock(db, *stock_key) == (Decimal(13), Decimal(260), Decimal(20), 1)
@@ -0,0 +1,80 @@
+"""Производственный календарь: рабочие дни с праздниками, переносами и переходом через год."""
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.services.work_calendar import MAX_WORKING_DAYS, WorkCalendar, national_holidays
+
+# Новогодние праздники ТК КР и рабочая суббота (перенос)
+CALENDAR = WorkCalendar({
+    date(2026, 1, 1): False,
+    date(2026, 1, 7): False,
+    date(2026, 1, 10): True,
+})
+
+
+def test_working_days_between_across_new_year():
+    # 29–31.12 (пн–ср), 2.01 (пт), 5, 6, 8, 9.01 и рабочая суббота 10.01
+    assert CALENDAR.working_days_between(date(2025, 12, 29), date(2026, 1, 11)) == 9
+    assert CALENDAR.working_days_between(date(2026, 1, 1), date(2026, 1, 1)) == 0
+    assert CALENDAR.working_days_between(date(2026, 1, 10), date(2026, 1, 10)) == 1
+    assert CALENDAR.working_days_between(date(2026, 1, 9), date(2026, 1, 8)) == 0
+
+
+def test_working_days_between_whole_years():
+    calendar = WorkCalendar()
+    # 2024 — високосный год, начинается с понедельника: 52 недели и 2 дня
+    assert calendar.working_days_between(date(2024, 1, 1), date(2024, 12, 31)) == 262
+    assert calendar.working_days_between(date(2023, 6, 1), date(2025, 5, 31)) == (
+        calendar.working_days_between(date(2023, 6, 1), date(2023, 12, 31))
+        + 262
+        + calendar.working_days_between(date(2025, 1, 1), date(2025, 5, 31))
+    )
+
+
+def test_add_working_days_skips_holidays_across_new_year():
+    start = date(2025, 12, 30)
+    assert CALENDAR.add_working_days(start, 1) == start
+    assert CALENDAR.add_working_days(start, 3) == date(2026, 1, 2)
+    assert CALENDAR.add_working_days(start, 6) == date(2026, 1, 8)
+    assert CALENDAR.add_working_days(start, 8) == date(2026, 1, 10)
+    # Начало в выходной переносится на ближайший рабочий день
+    assert CALENDAR.add_working_days(date(2026, 1, 3), 1) == date(2026, 1, 5)
+    assert CALENDAR.add_working_days(start, 0) == start
+
+
+def test_add_working_days_inverse_of_working_days_between():
+    start = date(2025, 11, 3)
+    for days in (1, 5, 40, 300):
+        end = CALENDAR.add_working_days(start, days)
+        assert CALENDAR.working_days_between(start, end) == days
+        assert CALENDAR.is_working_day(end)
+
+
+def test_add_working_days_bounds():
+    with pytest.raises(ValueError):
+        WorkCalendar().add_working_days(date(2026, 1, 1), MAX_WORKING_DAYS + 1)
+    with pytest.raises(ValueError):
+        WorkCalendar().add_working_days(date(9999, 6, 1), 1000)
+
+
+def test_add_working_days_endpoint_rejects_unbounded_days(client):
+    url = "/api/v1/calendar/add-working-days"
+    response = client.get(url, params={"start": "2026-01-05", "days": 10 ** 9})
+    assert response.status_code == 422
+    response = client.get(url, params={"start": "9999-12-01", "days": MAX_WORKING_DAYS})
+    assert response.status_code == 422
+    response = client.get(url, params={"start": "2026-01-05", "days": 5})
+    assert response.json()["end"] == "2026-01-09"
+
+
+def test_national_holidays_from_settings():
+    holidays = {(month, day) for month, day, _ in national_holidays()}
+    assert {(3, 21), (8, 31), (11, 7)} <= holidays
+    assert (6, 12) not in holidays
+
+    config = settings.model_copy(update={"NATIONAL_HOLIDAYS": ["01-01 Новый год", "12-31 Канун"]})
+    assert national_holidays(config) == [(1, 1, "Новый год"), (12, 31, "Канун")]
+    with pytest.raises(ValueError):
+        national_holidays(settings.model_copy(update={"NATIONAL_HOLIDAYS": ["Новый год"]}))
@@ -0,0 +1,53 @@
+"""Списание материалов со склада оценивается по той же себестоимости, что уменьшает остаток."""
+from decimal import Decimal
+
+from sqlalchemy import select
+
+
+def _create(client, path: str, payload: dict) -> dict:
+    response = client.post(f"/api/v1{path}", json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _stock_amount(warehouse_id: int, material_id: int) -> Decimal:
+    from app.db.database import engine
+    from app.models.material import WarehouseStock
+
+    with engine.connect() as conn:
+        return conn.scalar(select(WarehouseStock.amount).where(
+            WarehouseStock.warehouse_id == warehouse_id, WarehouseStock.material_id == material_id,
+        ))
+
+
+def test_write_off_costs_at_average_price(client):
+    project_id = _create(client, "/projects/", {"name": "Списание по средней", "start_date": "2026-01-01"})["id"]
+    material_id = _create(client, "/materials/materials/", {
+        "code": "WO-M1", "name": "Цемент", "material_type": "CONSTRUCTION", "unit": "т",
+    })["id"]
+    unstocked_id = _create(client, "/materials/materials/", {
+        "code": "WO-M2", "name": "Песок", "material_type": "CONSTRUCTION", "unit": "т",
+    })["id"]
+    warehouse_id = _create(client, "/materials/warehouses/", {"code": "WO-W1", "name": "Склад списаний"})["id"]
+    _create(client, "/materials/movements/", {
+        "movement_type": "receipt", "movement_number": "WO-R1", "movement_date": "2026-02-01",
+        "material_id": material_id, "quantity": "10", "price": "100",
+        "to_warehouse_id": warehouse_id, "project_id": project_id,
+    })
+
+    write_off = _create(client, "/materials/write-offs/", {
+        "write_off_number": "WO-1", "write_off_date": "2026-02-10", "project_id": project_id,
+        "warehouse_id": warehouse_id, "reason": "PRODUCTION", "responsible": "Прораб",
+        "items": [
+            # Цена клиента не совпадает со средней себестоимостью склада
+            {"material_id": material_id, "quantity": "2", "price": "150"},
+            # Остатка нет — позиция оценивается по цене из запроса
+            {"material_id": unstocked_id, "quantity": "1", "price": "30"},
+        ],
+    })
+    items = {item["material_id"]: item for item in write_off["items"]}
+    assert Decimal(items[material_id]["price"]) == Decimal(100)
+    assert Decimal(items[material_id]["amount"]) == Decimal(200)
+    assert Decimal(items[unstocked_id]["amount"]) == Decimal(30)
+    assert Decimal(write_off["total_amount"]) == Decimal(230)
+    assert _stock_amount(warehouse_id, material_id) == Decimal(800)